@@ -7,10 +7,14 @@ from .database import DatabaseManager
 from .models import DDUDocument
 from .embeddings import DualLanguageEmbeddings
 from .pdf_to_image import PDFImageExtractor
+from .corpus import CorpusReader, CorpusWriter, open_corpus
 
 __all__ = [
     "DatabaseManager",
     "DDUDocument", 
     "DualLanguageEmbeddings",
-    "PDFImageExtractor"
+    "PDFImageExtractor",
+    "CorpusReader",
+    "CorpusWriter",
+    "open_corpus"
 ]
\ No newline at end of file
@@ -0,0 +1,286 @@
+"""
+Sharded JSONL Corpus for DDU Documents
+Pickle 전체 로드 대신 배치 단위로 스트리밍하는 코퍼스 포맷
+
+디렉토리 구조:
+    <name>.corpus/
+        manifest.json        # 행 수, 샤드 목록, 컬럼 메타데이터, 문서 통계
+        part-00000.jsonl     # 한 줄에 문서 1건
+        part-00001.jsonl
+
+- 통계(get_statistics)는 manifest만 읽음 (문서 객체 생성 없음)
+- 읽기는 샤드를 한 줄씩 읽어 배치로 반환하므로 메모리 사용량이 배치 크기에 비례
+"""
+
+import os
+import json
+import pickle
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from langchain_core.documents import Document
+from dotenv import load_dotenv
+
+from .loader import DDUPickleLoader, DocumentStatistics
+from .models import DDUDocument
+
+load_dotenv()
+
+CORPUS_FORMAT = "ddu-jsonl-shards"
+CORPUS_VERSION = 1
+MANIFEST_FILENAME = "manifest.json"
+SHARD_PATTERN = "part-{:05d}.jsonl"
+
+
+def default_corpus_path(pickle_path: Union[str, Path]) -> Path:
+    """pickle 경로에 대응하는 기본 코퍼스 디렉토리 (foo.pkl -> foo.corpus)"""
+    return Path(pickle_path).with_suffix(".corpus")
+
+
+def is_corpus(path: Union[str, Path]) -> bool:
+    """코퍼스 디렉토리 여부 (manifest 존재)"""
+    return (Path(path) / MANIFEST_FILENAME).is_file()
+
+
+def _to_record(doc: Any) -> Optional[Dict[str, Any]]:
+    """원본 요소를 JSON 레코드로 변환 (Document는 page_content/metadata, dict는 그대로)"""
+    if hasattr(doc, 'page_content') and hasattr(doc, 'metadata'):
+        return {"page_content": doc.page_content, "metadata": dict(doc.metadata)}
+    if isinstance(doc, dict):
+        return {"dict": doc}
+    return None
+
+
+def _from_record(record: Dict[str, Any]) -> Union[Document, Dict[str, Any]]:
+    """JSON 레코드를 원본 요소(LangChain Document 또는 dict)로 복원"""
+    if "dict" in record:
+        return record["dict"]
+    return Document(page_content=record.get("page_content") or "", metadata=record.get("metadata") or {})
+
+
+class CorpusWriter:
+    """원본 요소를 JSONL 샤드로 쓰면서 컬럼 메타데이터/통계를 누적"""
+
+    def __init__(self, path: Union[str, Path], shard_size: Optional[int] = None):
+        """
+        Args:
+            path: 코퍼스 디렉토리
+            shard_size: 샤드당 행 수 (INGEST_CORPUS_SHARD_SIZE)
+        """
+        self.path = Path(path)
+        self.shard_size = max(1, shard_size or int(os.getenv("INGEST_CORPUS_SHARD_SIZE", "5000")))
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        # 이전 변환 결과 정리 (manifest를 먼저 지워 중단 시 불완전한 코퍼스로 읽히지 않게)
+        (self.path / MANIFEST_FILENAME).unlink(missing_ok=True)
+        for old_shard in self.path.glob("part-*.jsonl"):
+            old_shard.unlink()
+
+        self.rows = 0
+        self.skipped = 0
+        self.shards: List[Dict[str, Any]] = []
+        self.columns: Dict[str, int] = {}
+        self.statistics = DocumentStatistics()
+        self._file = None
+        self._closed = False
+
+    def __enter__(self) -> "CorpusWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        elif self._file is not None:
+            self._file.close()
+
+    def _open_shard(self):
+        if self._file is not None:
+            self._file.close()
+        name = SHARD_PATTERN.format(len(self.shards))
+        self.shards.append({"file": name, "rows": 0})
+        self._file = open(self.path / name, "w", encoding="utf-8")
+
+    def write(self, doc: Any) -> bool:
+        """
+        원본 요소 1건 기록
+
+        Args:
+            doc: LangChain Document 또는 딕셔너리
+
+        Returns:
+            기록 여부 (지원하지 않는 형식이면 False)
+        """
+        record = _to_record(doc)
+        if record is None:
+            self.skipped += 1
+            return False
+
+        if self._file is None or self.shards[-1]["rows"] >= self.shard_size:
+            self._open_shard()
+        self._file.write(json.dumps(record, ensure_ascii=False, default=str))
+        self._file.write("\n")
+        self.shards[-1]["rows"] += 1
+        self.rows += 1
+
+        # 컬럼 메타데이터: 필드별 non-null 개수
+        fields = record.get("metadata") or record.get("dict") or {}
+        for key, value in fields.items():
+            if value not in (None, ""):
+                self.columns[key] = self.columns.get(key, 0) + 1
+
+        # 통계는 로더와 같은 변환 규칙으로 유효 문서만 집계
+        ddu_doc = DDUPickleLoader.convert_raw(doc)
+        if ddu_doc is not None:
+            self.statistics.add(ddu_doc)
+        return True
+
+    def write_many(self, docs: Iterable[Any]) -> int:
+        """여러 건 기록, 기록한 건수 반환"""
+        return sum(1 for doc in docs if self.write(doc))
+
+    def close(self) -> Dict[str, Any]:
+        """샤드를 닫고 manifest를 원자적으로 기록"""
+        if self._closed:
+            return self.manifest
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+        self.manifest = {
+            "format": CORPUS_FORMAT,
+            "version": CORPUS_VERSION,
+            "rows": self.rows,
+            "skipped": self.skipped,
+            "shard_size": self.shard_size,
+            "shards": self.shards,
+            "columns": dict(sorted(self.columns.items())),
+            "statistics": self.statistics.to_dict()
+        }
+        tmp_path = self.path / (MANIFEST_FILENAME + ".tmp")
+        tmp_path.write_text(json.dumps(self.manifest, ensure_ascii=False, indent=1), encoding="utf-8")
+        os.replace(tmp_path, self.path / MANIFEST_FILENAME)
+        self._closed = True
+        return self.manifest
+
+
+class CorpusReader:
+    """JSONL 샤드 코퍼스 스트리밍 리더 (DDUPickleLoader와 같은 검증/통계/배치 인터페이스)"""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Args:
+            path: 코퍼스 디렉토리
+
+        Raises:
+            FileNotFoundError: manifest가 없을 때
+            ValueError: 지원하지 않는 포맷
+        """
+        self.path = Path(path)
+        manifest_path = self.path / MANIFEST_FILENAME
+        if not manifest_path.is_file():
+            raise FileNotFoundError(f"Corpus manifest not found: {manifest_path}")
+
+        self.manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        if self.manifest.get("format") != CORPUS_FORMAT:
+            raise ValueError(f"Unsupported corpus format: {self.manifest.get('format')}")
+
+    @property
+    def rows(self) -> int:
+        """전체 행 수 (변환 불가 문서 포함)"""
+        return int(self.manifest.get("rows", 0))
+
+    def __len__(self) -> int:
+        return self.rows
+
+    @property
+    def columns(self) -> Dict[str, int]:
+        """필드별 non-null 개수"""
+        return dict(self.manifest.get("columns", {}))
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """변환 시 기록된 문서 통계 (문서 로드 없음)"""
+        return json.loads(json.dumps(self.manifest["statistics"]))
+
+    def validate(self) -> bool:
+        """manifest와 샤드 파일 일치 여부 검증"""
+        shards = self.manifest.get("shards", [])
+        if self.rows == 0 or sum(s.get("rows", 0) for s in shards) != self.rows:
+            return False
+        return all((self.path / s["file"]).is_file() for s in shards)
+
+    def iter_records(self, batch_size: int = 100) -> Iterator[List[Dict[str, Any]]]:
+        """
+        JSON 레코드 배치 순회 (샤드를 한 줄씩 읽음)
+
+        Args:
+            batch_size: 배치 크기
+        """
+        batch: List[Dict[str, Any]] = []
+        for shard in self.manifest.get("shards", []):
+            with open(self.path / shard["file"], "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    batch.append(json.loads(line))
+                    if len(batch) >= batch_size:
+                        yield batch
+                        batch = []
+        if batch:
+            yield batch
+
+    def iter_raw(self, batch_size: int = 100) -> Iterator[List[Union[Document, Dict[str, Any]]]]:
+        """원본 요소(LangChain Document 또는 dict) 배치 순회"""
+        for records in self.iter_records(batch_size):
+            yield [_from_record(record) for record in records]
+
+    def iter_documents(self, batch_size: int = 100) -> Iterator[List[DDUDocument]]:
+        """
+        DDUDocument 배치 순회 (변환 불가 문서는 건너뜀)
+
+        Args:
+            batch_size: 읽기 배치 크기 (건너뛴 문서만큼 작아질 수 있음)
+        """
+        for raw_batch in self.iter_raw(batch_size):
+            documents = [d for d in map(DDUPickleLoader.convert_raw, raw_batch) if d is not None]
+            if documents:
+                yield documents
+
+
+def open_corpus(path: Union[str, Path]) -> Union[CorpusReader, DDUPickleLoader]:
+    """
+    코퍼스 디렉토리면 CorpusReader, 아니면 DDUPickleLoader 반환
+
+    두 객체 모두 validate(), get_statistics(), iter_documents(batch_size)를 제공
+    """
+    if is_corpus(path):
+        return CorpusReader(path)
+    return DDUPickleLoader(str(path))
+
+
+def convert_pickle_to_corpus(
+    pickle_path: Union[str, Path],
+    output_dir: Optional[Union[str, Path]] = None,
+    shard_size: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Pickle 파일을 JSONL 샤드 코퍼스로 변환 (unpickle 1회)
+
+    Args:
+        pickle_path: 원본 pickle 경로
+        output_dir: 코퍼스 디렉토리 (None이면 <pickle>.corpus)
+        shard_size: 샤드당 행 수
+
+    Returns:
+        기록된 manifest
+
+    Raises:
+        ValueError: pickle 형식이 유효하지 않을 때
+    """
+    with open(pickle_path, "rb") as f:
+        data = pickle.load(f)
+    if not DDUPickleLoader._validate_data(data):
+        raise ValueError(f"Invalid DDU pickle file: {pickle_path}")
+
+    with CorpusWriter(output_dir or default_corpus_path(pickle_path), shard_size=shard_size) as writer:
+        writer.write_many(data)
+    return writer.manifest
@@ -28,6 +28,7 @@ class DatabaseManager:
                 f"@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
             )
         self.pool: Optional[ConnectionPool] = None
+        self.table_name = os.getenv("DB_TABLE_NAME", "mvp_ddu_documents")
     
     def initialize(self):
         """데이터베이스 연결 풀 초기화"""
@@ -39,12 +40,14 @@ class DatabaseManager:
             configure=self._configure_connection,
             open=True  # 즉시 연결 시작
         )
-        self.table_name = os.getenv("DB_TABLE_NAME", "mvp_ddu_documents")
     
     def _configure_connection(self, conn):
         """연결 설정 (session-level 설정)"""
         with conn.cursor() as cur:
             cur.execute("SET statement_timeout = '30000'")
+        # 임베딩을 float32 배열(바이너리)로 주고받도록 pgvector 어댑터 등록
+        from ingest.vector_io import register_vector_adapter
+        register_vector_adapter(conn)
         conn.commit()  # 트랜잭션 커밋하여 INTRANS 상태 방지
     
     
@@ -144,14 +147,95 @@ class DatabaseManager:
                 # 커밋을 수동으로 호출
                 conn.commit()
             
+            # MVPSearchFilter 조건용 인덱스 (entity type/keywords, trigram ILIKE, (source, page))
+            created = self.create_filter_indexes(conn=conn)
+            if created:
+                print(f"✅ 필터 인덱스 생성: {', '.join(created)}")
+            
+            # 모든 쓰기 경로에서 코퍼스 버전 증가 (검색 결과 캐시 무효화)
+            self.ensure_corpus_version_trigger(conn=conn)
+            
         print("✅ 데이터베이스 스키마 설정 완료")
     
+    def create_filter_indexes(self, concurrently: bool = False, conn=None) -> list:
+        """
+        필터 인덱스 팩 생성 (ingest.indexes)
+        
+        Args:
+            concurrently: CREATE INDEX CONCURRENTLY 사용 (운영 중 마이그레이션)
+            conn: 사용할 연결 (None이면 풀에서 획득)
+            
+        Returns:
+            새로 생성된 인덱스 이름 목록
+        """
+        from ingest.indexes import ensure_filter_indexes
+        
+        if conn is not None:
+            return ensure_filter_indexes(conn, self.table_name, concurrently)
+        with self.pool.connection() as pooled:
+            return ensure_filter_indexes(pooled, self.table_name, concurrently)
+    
+    def create_vector_tier_indexes(self, tiers: list, concurrently: bool = False) -> list:
+        """
+        벡터 티어 shortlist 인덱스 생성 (ingest.vector_tiers)
+        
+        Args:
+            tiers: 티어 이름 목록 (halfvec / binary / matryoshka)
+            concurrently: CREATE INDEX CONCURRENTLY 사용 (운영 중 마이그레이션)
+            
+        Returns:
+            새로 생성된 인덱스 이름 목록
+        """
+        from ingest.vector_tiers import ensure_tier_indexes
+        
+        with self.pool.connection() as conn:
+            return ensure_tier_indexes(conn, tiers, self.table_name, concurrently)
+    
+    def verify_filter_indexes(self) -> dict:
+        """
+        필터 형태별 EXPLAIN으로 Seq Scan 여부 확인 (ingest.indexes)
+        
+        Returns:
+            형태별 검증 결과
+        """
+        from ingest.indexes import verify_filter_indexes
+        
+        with self.pool.connection() as conn:
+            return verify_filter_indexes(conn, self.table_name)
+    
+    def ensure_corpus_version_trigger(self, conn=None) -> bool:
+        """
+        코퍼스 버전 트리거 설치 (기존 테이블 마이그레이션 포함, 이미 있으면 건너뜀)
+        
+        Returns:
+            새로 설치했으면 True
+        """
+        from retrieval.result_cache import ensure_corpus_version_trigger
+        
+        if conn is not None:
+            return ensure_corpus_version_trigger(conn, self.table_name)
+        with self.pool.connection() as pooled:
+            return ensure_corpus_version_trigger(pooled, self.table_name)
+    
+    def bump_corpus_version(self) -> int:
+        """
+        코퍼스 버전 증가 (인제스트 후 호출, 검색 결과 캐시 무효화)
+        
+        Returns:
+            새 버전 번호
+        """
+        from retrieval.result_cache import bump_corpus_version
+        
+        with self.pool.connection() as conn:
+            return bump_corpus_version(conn, self.table_name)
+    
     def clear_table(self):
         """테이블 데이터 초기화 (테스트용)"""
         with self.pool.connection() as conn:
             with conn.cursor() as cur:
                 cur.execute("TRUNCATE TABLE mvp_ddu_documents RESTART IDENTITY")
                 conn.commit()
+        self.bump_corpus_version()
         print("✅ 테이블 데이터 초기화 완료")
     
     def get_table_stats(self) -> dict:
@@ -0,0 +1,190 @@
+"""
+Filter Index Pack
+MVPSearchFilter.to_sql_where()가 만드는 조건을 지원하는 인덱스 관리
+
+- entity->>'type' = ...           : 표현식 B-tree
+- entity->'keywords' ?| / ? ...   : 표현식 GIN (jsonb_ops, jsonb_path_ops는 ?| / ? 미지원)
+- entity->>'title' ILIKE '%..%'   : pg_trgm GIN
+- entity->>'details' ILIKE '%..%' : pg_trgm GIN
+- caption ILIKE '%..%'            : pg_trgm GIN
+- source = ANY(..) AND page = ANY(..) : 복합 (source, page)
+
+verify_filter_indexes()는 필터 형태별로 EXPLAIN을 실행해 Seq Scan이 남아 있으면 실패로 보고.
+작은 테이블에서는 플래너가 Seq Scan을 고르는 것이 정상이므로 검증 중에는
+enable_seqscan=off로 "사용 가능한 인덱스가 있는가"만 확인.
+
+주의: pg_trgm은 LC_CTYPE 기준 문자만 trigram으로 추출하므로 C 로케일 DB에서는
+한글 ILIKE가 인덱스를 활용하지 못함 (UTF-8 로케일 권장).
+"""
+
+import os
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from retrieval.search_filter import MVPSearchFilter
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_EXTENSIONS = ("pg_trgm",)
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    """관리 대상 인덱스 정의"""
+    name: str
+    definition: str  # "USING ... (...)" 또는 "(...)" (ON <table> 뒤에 붙음)
+    purpose: str
+
+    def ddl(self, table_name: str, concurrently: bool = False) -> str:
+        option = "CONCURRENTLY " if concurrently else ""
+        return f"CREATE INDEX {option}IF NOT EXISTS {self.name} ON {table_name} {self.definition}"
+
+
+FILTER_INDEXES = (
+    IndexSpec("idx_entity_type", "((entity->>'type'))", "entity->>'type' = ..."),
+    IndexSpec("idx_entity_keywords", "USING gin ((entity->'keywords'))", "entity->'keywords' ?| / ? ..."),
+    IndexSpec("idx_entity_title_trgm", "USING gin ((entity->>'title') gin_trgm_ops)", "entity->>'title' ILIKE ..."),
+    IndexSpec("idx_entity_details_trgm", "USING gin ((entity->>'details') gin_trgm_ops)", "entity->>'details' ILIKE ..."),
+    IndexSpec("idx_caption_trgm", "USING gin (caption gin_trgm_ops)", "caption ILIKE ..."),
+    IndexSpec("idx_source_page", "(source, page)", "source = ANY(..) AND page = ANY(..)"),
+)
+
+# 검증할 필터 형태 (값은 플랜 확인용 예시)
+FILTER_SHAPES: Dict[str, MVPSearchFilter] = {
+    "categories": MVPSearchFilter(categories=["table"]),
+    "pages": MVPSearchFilter(pages=[1, 2]),
+    "sources": MVPSearchFilter(sources=["manual.pdf"]),
+    "source_page": MVPSearchFilter(sources=["manual.pdf"], pages=[3]),
+    "entity_type": MVPSearchFilter(entity={"type": "똑딱이"}),
+    "entity_keywords": MVPSearchFilter(entity={"keywords": ["연비", "성능"]}),
+    "entity_keyword": MVPSearchFilter(entity={"keywords": "연비"}),
+    "entity_title": MVPSearchFilter(entity={"title": "디지털정부"}),
+    "entity_details": MVPSearchFilter(entity={"details": "혁신 추진"}),
+    "caption": MVPSearchFilter(caption="엔진오일"),
+}
+
+
+def _table_name(table_name: Optional[str]) -> str:
+    return table_name or os.getenv("DB_TABLE_NAME", "mvp_ddu_documents")
+
+
+def migration_statements(table_name: Optional[str] = None, concurrently: bool = False) -> List[str]:
+    """마이그레이션 SQL 목록 (확장 -> 인덱스 -> ANALYZE)"""
+    table_name = _table_name(table_name)
+    statements = [f"CREATE EXTENSION IF NOT EXISTS {extension}" for extension in REQUIRED_EXTENSIONS]
+    statements += [spec.ddl(table_name, concurrently) for spec in FILTER_INDEXES]
+    statements.append(f"ANALYZE {table_name}")
+    return statements
+
+
+def ensure_filter_indexes(conn, table_name: Optional[str] = None, concurrently: bool = False) -> List[str]:
+    """
+    필터 인덱스 생성 (이미 있으면 건너뜀)
+
+    Args:
+        conn: psycopg 연결 (트랜잭션 밖이어야 함)
+        table_name: 문서 테이블 (DB_TABLE_NAME)
+        concurrently: CREATE INDEX CONCURRENTLY 사용 (운영 중 테이블 잠금 방지, autocommit으로 실행)
+
+    Returns:
+        새로 생성된 인덱스 이름 목록
+    """
+    table_name = _table_name(table_name)
+    managed = [spec.name for spec in FILTER_INDEXES]
+    with conn.cursor() as cur:
+        cur.execute("SELECT indexname FROM pg_indexes WHERE tablename = %s", (table_name,))
+        existing = {row[0] for row in cur.fetchall()}
+        # 중단된 CONCURRENTLY 빌드가 남긴 INVALID 인덱스는 IF NOT EXISTS에 걸려 재생성되지 않으므로 제거
+        cur.execute(
+            "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE NOT i.indisvalid AND c.relname = ANY(%s)",
+            (managed,)
+        )
+        invalid = [row[0] for row in cur.fetchall()]
+    conn.commit()
+
+    previous_autocommit = conn.autocommit
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cur:
+            for name in invalid:
+                logger.warning(f"[INDEXES] Dropping invalid index {name}")
+                cur.execute(f"DROP INDEX {'CONCURRENTLY ' if concurrently else ''}IF EXISTS {name}")
+                existing.discard(name)
+            for statement in migration_statements(table_name, concurrently):
+                logger.info(f"[INDEXES] {statement}")
+                cur.execute(statement)
+    finally:
+        conn.autocommit = previous_autocommit
+
+    created = [spec.name for spec in FILTER_INDEXES if spec.name not in existing]
+    return created
+
+
+def find_seq_scans(plan: Any, table_name: str) -> List[str]:
+    """
+    EXPLAIN (FORMAT JSON) 플랜에서 대상 테이블의 Seq Scan 노드 찾기
+
+    Returns:
+        Seq Scan 노드 설명 목록 (비어 있으면 인덱스 사용)
+    """
+    found = []
+    if isinstance(plan, list):
+        for item in plan:
+            found.extend(find_seq_scans(item, table_name))
+    elif isinstance(plan, dict):
+        node = plan.get("Plan", plan)
+        if node.get("Node Type") == "Seq Scan" and node.get("Relation Name") == table_name:
+            found.append(f"Seq Scan on {table_name} (filter: {node.get('Filter', '')})")
+        for child in node.get("Plans", []):
+            found.extend(find_seq_scans(child, table_name))
+    return found
+
+
+def verify_filter_indexes(conn, table_name: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    필터 형태별 EXPLAIN으로 인덱스 사용 여부 확인
+
+    Args:
+        conn: psycopg 연결
+        table_name: 문서 테이블 (DB_TABLE_NAME)
+
+    Returns:
+        {형태: {"ok": bool, "where": str, "seq_scans": [...], "indexes": [...]}}
+    """
+    table_name = _table_name(table_name)
+    report = {}
+    with conn.cursor() as cur:
+        # 트랜잭션 범위에서만 Seq Scan 비활성화 (인덱스가 없으면 여전히 Seq Scan이 선택됨)
+        cur.execute("SET LOCAL enable_seqscan = off")
+        for shape, search_filter in FILTER_SHAPES.items():
+            where_clause, params = search_filter.to_sql_where()
+            cur.execute(f"EXPLAIN (FORMAT JSON) SELECT id FROM {table_name} WHERE {where_clause}", params)
+            plan = cur.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            seq_scans = find_seq_scans(plan, table_name)
+            report[shape] = {
+                "ok": not seq_scans,
+                "where": where_clause,
+                "seq_scans": seq_scans,
+                "indexes": sorted(set(_index_names(plan)))
+            }
+    conn.rollback()
+    return report
+
+
+def _index_names(plan: Any) -> List[str]:
+    names = []
+    if isinstance(plan, list):
+        for item in plan:
+            names.extend(_index_names(item))
+    elif isinstance(plan, dict):
+        node = plan.get("Plan", plan)
+        if node.get("Index Name"):
+            names.append(node["Index Name"])
+        for child in node.get("Plans", []):
+            names.extend(_index_names(child))
+    return names
@@ -5,12 +5,59 @@ Handles loading and processing of existing pickle data
 
 import pickle
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator
 from langchain_core.documents import Document
 from .models import DDUDocument, TEXT_CATEGORIES
 import json
 
 
+class DocumentStatistics:
+    """문서 통계 누적기 (pickle 로더와 코퍼스 변환기가 공유)"""
+    
+    def __init__(self):
+        self.total_documents = 0
+        self.categories: Dict[str, int] = {}
+        self.sources: Dict[str, int] = {}
+        self.entity_types: Dict[str, int] = {}
+        self.page_min: Optional[int] = None
+        self.page_max: Optional[int] = None
+        self.has_translation = 0
+        self.has_contextualize = 0
+        self.has_caption = 0
+    
+    def add(self, doc: DDUDocument):
+        """문서 1건 반영"""
+        self.total_documents += 1
+        self.categories[doc.category] = self.categories.get(doc.category, 0) + 1
+        self.sources[doc.source] = self.sources.get(doc.source, 0) + 1
+        
+        if doc.page is not None:
+            self.page_min = doc.page if self.page_min is None else min(self.page_min, doc.page)
+            self.page_max = doc.page if self.page_max is None else max(self.page_max, doc.page)
+        
+        if doc.entity and isinstance(doc.entity, dict):
+            entity_type = doc.entity.get('type')
+            if entity_type:
+                self.entity_types[entity_type] = self.entity_types.get(entity_type, 0) + 1
+        
+        self.has_translation += 1 if doc.translation_text else 0
+        self.has_contextualize += 1 if doc.contextualize_text else 0
+        self.has_caption += 1 if doc.caption else 0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """get_statistics() 형식의 딕셔너리"""
+        return {
+            "total_documents": self.total_documents,
+            "categories": dict(self.categories),
+            "sources": dict(self.sources),
+            "page_range": {"min": self.page_min, "max": self.page_max},
+            "entity_types": dict(self.entity_types),
+            "has_translation": self.has_translation,
+            "has_contextualize": self.has_contextualize,
+            "has_caption": self.has_caption
+        }
+
+
 class DDUPickleLoader:
     """DDU Pickle 파일 로더"""
     
@@ -22,43 +69,71 @@ class DDUPickleLoader:
         self.file_path = Path(file_path)
         if not self.file_path.exists():
             raise FileNotFoundError(f"Pickle file not found: {file_path}")
+        
+        # 한 번만 unpickle/변환하도록 캐시 (검증/통계/로드가 같은 데이터 공유)
+        self._raw: Optional[List[Any]] = None
+        self._documents: Optional[List[DDUDocument]] = None
     
     def load_raw(self) -> List[Any]:
         """
-        원본 pickle 데이터 로드
+        원본 pickle 데이터 로드 (최초 호출 시 1회만 unpickle)
         
         Returns:
             원본 데이터 리스트
         """
-        with open(self.file_path, 'rb') as f:
-            data = pickle.load(f)
-        return data
+        if self._raw is None:
+            with open(self.file_path, 'rb') as f:
+                self._raw = pickle.load(f)
+        return self._raw
     
     def load_documents(self) -> List[DDUDocument]:
         """
-        Pickle 파일에서 DDUDocument 객체 리스트로 변환
+        Pickle 파일에서 DDUDocument 객체 리스트로 변환 (결과 캐시)
         
         Returns:
             DDUDocument 객체 리스트
         """
-        raw_documents = self.load_raw()
-        ddu_documents = []
-        
-        for doc in raw_documents:
-            # LangChain Document 형식 처리
-            if hasattr(doc, 'page_content') and hasattr(doc, 'metadata'):
-                ddu_doc = self._convert_langchain_to_ddu(doc)
-                if ddu_doc:
-                    ddu_documents.append(ddu_doc)
-            # 딕셔너리 형식 처리
-            elif isinstance(doc, dict):
-                ddu_doc = self._convert_dict_to_ddu(doc)
+        if self._documents is None:
+            ddu_documents = []
+            for doc in self.load_raw():
+                ddu_doc = self.convert_raw(doc)
                 if ddu_doc:
                     ddu_documents.append(ddu_doc)
+            self._documents = ddu_documents
+        return self._documents
+    
+    def iter_documents(self, batch_size: int = 100) -> Iterator[List[DDUDocument]]:
+        """
+        DDUDocument 배치 단위 순회 (CorpusReader와 같은 인터페이스)
+        
+        Args:
+            batch_size: 배치 크기
+        """
+        documents = self.load_documents()
+        for i in range(0, len(documents), batch_size):
+            yield documents[i:i + batch_size]
+    
+    @classmethod
+    def convert_raw(cls, doc: Any) -> Optional[DDUDocument]:
+        """
+        원본 요소 1건을 DDUDocument로 변환
         
-        return ddu_documents
+        Args:
+            doc: LangChain Document 또는 딕셔너리
+            
+        Returns:
+            DDUDocument 객체 또는 None (필수 필드 누락/미지원 형식)
+        """
+        # LangChain Document 형식 처리
+        if hasattr(doc, 'page_content') and hasattr(doc, 'metadata'):
+            return cls._convert_langchain_to_ddu(doc)
+        # 딕셔너리 형식 처리
+        if isinstance(doc, dict):
+            return cls._convert_dict_to_ddu(doc)
+        return None
     
-    def _convert_langchain_to_ddu(self, doc: Document) -> Optional[DDUDocument]:
+    @staticmethod
+    def _convert_langchain_to_ddu(doc: Document) -> Optional[DDUDocument]:
         """
         LangChain Document를 DDUDocument로 변환
         
@@ -104,7 +179,8 @@ class DDUPickleLoader:
             print(f"Error converting document: {e}")
             return None
     
-    def _convert_dict_to_ddu(self, doc_dict: Dict[str, Any]) -> Optional[DDUDocument]:
+    @staticmethod
+    def _convert_dict_to_ddu(doc_dict: Dict[str, Any]) -> Optional[DDUDocument]:
         """
         딕셔너리를 DDUDocument로 변환
         
@@ -155,45 +231,18 @@ class DDUPickleLoader:
         Returns:
             통계 정보 딕셔너리
         """
-        documents = self.load_documents()
-        
-        # 카테고리별 통계
-        category_stats = {}
-        for doc in documents:
-            category = doc.category
-            category_stats[category] = category_stats.get(category, 0) + 1
-        
-        # 소스별 통계
-        source_stats = {}
-        for doc in documents:
-            source = doc.source
-            source_stats[source] = source_stats.get(source, 0) + 1
-        
-        # 페이지 범위
-        pages = [doc.page for doc in documents if doc.page is not None]
-        page_range = {
-            "min": min(pages) if pages else None,
-            "max": max(pages) if pages else None
-        }
-        
-        # Entity 타입 통계
-        entity_types = {}
-        for doc in documents:
-            if doc.entity and isinstance(doc.entity, dict):
-                entity_type = doc.entity.get('type')
-                if entity_type:
-                    entity_types[entity_type] = entity_types.get(entity_type, 0) + 1
-        
-        return {
-            "total_documents": len(documents),
-            "categories": category_stats,
-            "sources": source_stats,
-            "page_range": page_range,
-            "entity_types": entity_types,
-            "has_translation": sum(1 for doc in documents if doc.translation_text),
-            "has_contextualize": sum(1 for doc in documents if doc.contextualize_text),
-            "has_caption": sum(1 for doc in documents if doc.caption)
-        }
+        stats = DocumentStatistics()
+        for doc in self.load_documents():
+            stats.add(doc)
+        return stats.to_dict()
+    
+    def validate(self) -> bool:
+        """이미 로드한 데이터로 유효성 검증 (추가 unpickle 없음)"""
+        try:
+            return self._validate_data(self.load_raw())
+        except Exception as e:
+            print(f"Validation error: {e}")
+            return False
     
     @staticmethod
     def validate_pickle_file(file_path: str) -> bool:
@@ -209,26 +258,30 @@ class DDUPickleLoader:
         try:
             with open(file_path, 'rb') as f:
                 data = pickle.load(f)
-            
-            # 리스트 형식 확인
-            if not isinstance(data, list):
-                return False
-            
-            # 최소 하나 이상의 문서
-            if len(data) == 0:
-                return False
-            
-            # 첫 번째 문서 구조 확인
-            first_doc = data[0]
-            if hasattr(first_doc, 'metadata'):
-                # LangChain Document 형식
-                return hasattr(first_doc, 'page_content')
-            elif isinstance(first_doc, dict):
-                # 딕셔너리 형식
-                return 'source' in first_doc or 'metadata' in first_doc
-            
-            return False
+            return DDUPickleLoader._validate_data(data)
             
         except Exception as e:
             print(f"Validation error: {e}")
-            return False
\ No newline at end of file
+            return False
+    
+    @staticmethod
+    def _validate_data(data: Any) -> bool:
+        """unpickle된 데이터 구조 검증"""
+        # 리스트 형식 확인
+        if not isinstance(data, list):
+            return False
+        
+        # 최소 하나 이상의 문서
+        if len(data) == 0:
+            return False
+        
+        # 첫 번째 문서 구조 확인
+        first_doc = data[0]
+        if hasattr(first_doc, 'metadata'):
+            # LangChain Document 형식
+            return hasattr(first_doc, 'page_content')
+        elif isinstance(first_doc, dict):
+            # 딕셔너리 형식
+            return 'source' in first_doc or 'metadata' in first_doc
+        
+        return False
\ No newline at end of file
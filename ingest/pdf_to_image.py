@@ -4,9 +4,13 @@ Converts PDF files to page images for multimodal processing
 """
 
 import os
+import json
+import hashlib
 import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Sequence, Tuple
 from tqdm import tqdm
 
 try:
@@ -21,6 +25,172 @@ except ImportError:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+MANIFEST_FILENAME = ".render_manifest.json"
+
+# Compressed variant formats (webp needs Pillow, jpeg falls back to PyMuPDF)
+VARIANT_FORMATS = ("webp", "jpeg")
+
+
+@dataclass(frozen=True)
+class ImageVariant:
+    """Downscaled page image variant for display (e.g. thumbnail)"""
+    name: str
+    max_width: int
+
+
+DEFAULT_VARIANTS = (ImageVariant("thumbnail", 240), ImageVariant("medium", 960))
+
+
+def save_pixmap(pix: "fitz.Pixmap", path: Path, image_format: str, quality: int = 80) -> None:
+    """
+    Save a pixmap as png, jpeg or webp
+
+    Args:
+        pix: Rendered pixmap
+        path: Output path
+        image_format: "png", "jpeg"/"jpg" or "webp"
+        quality: Lossy compression quality (jpeg/webp)
+    """
+    image_format = image_format.lower()
+    if image_format == "webp":
+        try:
+            pix.pil_save(str(path), format="WEBP", quality=quality, method=4)
+            return
+        except ImportError:
+            raise ImportError("WebP variants require Pillow. Install it or use jpeg variants.")
+    if image_format in ("jpeg", "jpg"):
+        pix.save(str(path), output="jpeg", jpg_quality=quality)
+        return
+    pix.save(str(path), output=image_format)
+
+
+def page_image_stem(source: str, page_number: int) -> str:
+    """File name stem of a page image ({pdf stem}-page-{n}, shared with the page image service)"""
+    return f"{Path(source).stem}-page-{page_number}"
+
+
+def variant_filename(page_stem: str, variant: ImageVariant, image_format: str, quality: int = 80) -> str:
+    """Variant file name ({page stem}-{variant}{width}q{quality}.{format}, shared with the page image service)"""
+    extension = "jpg" if image_format == "jpeg" else image_format
+    return f"{page_stem}-{variant.name}{variant.max_width}q{quality}.{extension}"
+
+
+def variant_path(base_path: Path, variant: ImageVariant, image_format: str, quality: int = 80) -> Path:
+    """Variant file path next to the full-size image"""
+    return base_path.with_name(variant_filename(base_path.stem, variant, image_format, quality))
+
+
+def render_variants(
+    page: "fitz.Page",
+    base_path: Path,
+    variants: Sequence[ImageVariant],
+    image_format: str = "webp",
+    quality: int = 80,
+    only: Optional[Sequence[str]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Render downscaled variants of a page (never upscaled beyond 72 DPI * max_width / page width)
+
+    Args:
+        page: PyMuPDF page
+        base_path: Full-size image path (variant names are derived from it)
+        variants: Variants to render
+        image_format: "webp" or "jpeg"
+        quality: Compression quality
+        only: Render only these variant names
+
+    Returns:
+        Mapping of variant name to {"path", "width", "height", "format"}
+    """
+    rendered = {}
+    page_width = page.rect.width or 1
+    for variant in variants:
+        if only is not None and variant.name not in only:
+            continue
+        zoom = variant.max_width / page_width
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+        path = variant_path(base_path, variant, image_format, quality)
+        save_pixmap(pix, path, image_format, quality)
+        rendered[variant.name] = {
+            "path": str(path),
+            "width": pix.width,
+            "height": pix.height,
+            "format": image_format
+        }
+    return rendered
+
+
+def _file_sha256(path: Path) -> str:
+    """Hash a file in 1 MB blocks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _render_pages(
+    pdf_path: str,
+    page_indices: List[int],
+    dpi: int,
+    image_format: str,
+    output_dir: str,
+    variants: Sequence[ImageVariant] = (),
+    variant_format: str = "webp",
+    variant_quality: int = 80
+) -> List[Dict[str, Any]]:
+    """
+    Render a set of pages (runs in worker processes, opens its own document)
+
+    Args:
+        pdf_path: Path to the PDF file
+        page_indices: 0-based page indices to render
+        dpi: Render resolution
+        image_format: Image format
+        output_dir: Directory to save images
+        variants: Downscaled variants to render next to each page
+        variant_format: Variant image format ("webp" or "jpeg")
+        variant_quality: Variant compression quality
+
+    Returns:
+        List of page image metadata dictionaries
+    """
+    zoom = dpi / 72.0  # PDF default is 72 DPI
+    matrix = fitz.Matrix(zoom, zoom)
+    results = []
+
+    with fitz.open(pdf_path) as pdf_document:
+        for page_idx in page_indices:
+            page_num = page_idx + 1  # 1-based page number
+            page = pdf_document[page_idx]
+            pix = page.get_pixmap(matrix=matrix)
+
+            output_path = Path(output_dir) / f"{page_image_stem(pdf_path, page_num)}.{image_format}"
+            pix.save(str(output_path))
+
+            result = {
+                "source_pdf": pdf_path,
+                "page_number": page_num,
+                "image_path": str(output_path),
+                "width": pix.width,
+                "height": pix.height,
+                "dpi": dpi
+            }
+            if variants:
+                result["variants"] = render_variants(page, output_path, variants, variant_format, variant_quality)
+            results.append(result)
+
+    return results
+
+
+@dataclass
+class _RenderPlan:
+    """Pages of one PDF that still need rendering"""
+    pdf_path: str
+    manifest_key: str
+    done: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+    pending: List[int] = field(default_factory=list)
+
 
 class PDFImageExtractor:
     """Extract pages from PDF files as images"""
@@ -29,7 +199,12 @@ class PDFImageExtractor:
         self,
         output_dir: str = "data/images",
         dpi: int = 150,
-        image_format: str = "png"
+        image_format: str = "png",
+        workers: Optional[int] = 1,
+        use_manifest: bool = True,
+        variants: Optional[Sequence[ImageVariant]] = None,
+        variant_format: str = "webp",
+        variant_quality: int = 80
     ):
         """
         Initialize PDF Image Extractor
@@ -38,129 +213,267 @@ class PDFImageExtractor:
             output_dir: Directory to save extracted images
             dpi: Resolution for image extraction (default: 150)
             image_format: Image format (default: 'png')
+            workers: Render processes (1 = serial in-process, None/0 = all CPU cores)
+            use_manifest: Skip pages already rendered with the same PDF hash, DPI and format
+            variants: Downscaled display variants per page (e.g. DEFAULT_VARIANTS)
+            variant_format: Variant format, "webp" or "jpeg"
+            variant_quality: Variant compression quality (1-100)
         """
+        if variant_format not in VARIANT_FORMATS:
+            raise ValueError(f"Unsupported variant format '{variant_format}', expected one of {VARIANT_FORMATS}")
         self.output_dir = Path(output_dir)
         self.dpi = dpi
         self.image_format = image_format
+        self.workers = workers if workers else (os.cpu_count() or 1)
+        self.use_manifest = use_manifest
+        self.variants = tuple(variants or ())
+        self.variant_format = variant_format
+        self.variant_quality = variant_quality
+        self.manifest_path = self.output_dir / MANIFEST_FILENAME
         self._ensure_output_directory()
+        self._manifest = self._load_manifest()
     
     def _ensure_output_directory(self) -> None:
         """Create output directory if it doesn't exist"""
         self.output_dir.mkdir(parents=True, exist_ok=True)
         logger.info(f"Output directory ready: {self.output_dir}")
     
-    def convert_pdf_to_images(
+    def _load_manifest(self) -> Dict[str, Any]:
+        """Load the render manifest (empty if missing or unreadable)"""
+        if not self.use_manifest or not self.manifest_path.exists():
+            return {}
+        try:
+            return json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable render manifest {self.manifest_path}: {e}")
+            return {}
+    
+    def _save_manifest(self) -> None:
+        """Write the manifest atomically so an interrupted run can resume"""
+        if not self.use_manifest:
+            return
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._manifest, ensure_ascii=False, indent=1), encoding="utf-8")
+        os.replace(tmp_path, self.manifest_path)
+    
+    def _plan(
         self,
         pdf_path: str,
         start_page: Optional[int] = None,
-        end_page: Optional[int] = None
-    ) -> List[Dict[str, Any]]:
+        end_page: Optional[int] = None,
+        force: bool = False
+    ) -> _RenderPlan:
         """
-        Convert PDF pages to images
+        Validate a PDF and split its page range into already-rendered and pending pages
         
         Args:
             pdf_path: Path to the PDF file
             start_page: Starting page number (1-based, inclusive)
             end_page: Ending page number (1-based, inclusive)
+            force: Re-render even if the manifest says the page is up to date
         
         Returns:
-            List of dictionaries containing image paths and metadata
+            Render plan for the PDF
         """
-        pdf_path = Path(pdf_path)
-        if not pdf_path.exists():
-            raise FileNotFoundError(f"PDF file not found: {pdf_path}")
+        pdf_file = Path(pdf_path)
+        if not pdf_file.exists():
+            raise FileNotFoundError(f"PDF file not found: {pdf_file}")
         
-        if not pdf_path.suffix.lower() == '.pdf':
-            raise ValueError(f"File is not a PDF: {pdf_path}")
+        if not pdf_file.suffix.lower() == '.pdf':
+            raise ValueError(f"File is not a PDF: {pdf_file}")
         
-        # Extract filename without extension
-        filename_base = pdf_path.stem
+        with fitz.open(str(pdf_file)) as pdf_document:
+            total_pages = len(pdf_document)
         
-        results = []
+        # Determine page range
+        start_idx = (start_page - 1) if start_page else 0
+        end_idx = end_page if end_page else total_pages
         
-        try:
-            # Open PDF document
-            pdf_document = fitz.open(str(pdf_path))
-            total_pages = len(pdf_document)
-            
-            # Determine page range
-            start_idx = (start_page - 1) if start_page else 0
-            end_idx = end_page if end_page else total_pages
-            
-            # Validate page range
-            if start_idx < 0 or end_idx > total_pages:
-                raise ValueError(f"Invalid page range. PDF has {total_pages} pages.")
-            
-            logger.info(f"Processing {pdf_path.name}: {end_idx - start_idx} pages")
-            
-            # Convert each page
-            for page_idx in range(start_idx, end_idx):
-                page = pdf_document[page_idx]
-                page_num = page_idx + 1  # 1-based page number
-                
-                # Set up the transformation matrix for the desired DPI
-                zoom = self.dpi / 72.0  # PDF default is 72 DPI
-                matrix = fitz.Matrix(zoom, zoom)
-                
-                # Render page to image
-                pix = page.get_pixmap(matrix=matrix)
-                
-                # Generate output filename (1-based indexing)
-                output_filename = f"{filename_base}-page-{page_num}.{self.image_format}"
-                output_path = self.output_dir / output_filename
-                
-                # Save image
-                pix.save(str(output_path))
-                
-                # Collect metadata
-                result = {
-                    "source_pdf": str(pdf_path),
-                    "page_number": page_num,
-                    "image_path": str(output_path),
-                    "width": pix.width,
-                    "height": pix.height,
-                    "dpi": self.dpi
+        # Validate page range
+        if start_idx < 0 or end_idx > total_pages:
+            raise ValueError(f"Invalid page range. PDF has {total_pages} pages.")
+        
+        plan = _RenderPlan(pdf_path=str(pdf_file), manifest_key=pdf_file.stem)
+        page_indices = list(range(start_idx, end_idx))
+        
+        if not self.use_manifest:
+            plan.pending = page_indices
+            return plan
+        
+        # Reuse the manifest entry only if the PDF and render settings are unchanged
+        signature = {"pdf_sha256": _file_sha256(pdf_file), "dpi": self.dpi, "format": self.image_format}
+        if self.variants:
+            signature["variants"] = [
+                [v.name, v.max_width, self.variant_format, self.variant_quality] for v in self.variants
+            ]
+        entry = self._manifest.get(plan.manifest_key)
+        if force or entry is None or any(entry.get(k) != v for k, v in signature.items()):
+            entry = {**signature, "source_pdf": str(pdf_file), "total_pages": total_pages, "pages": {}}
+            self._manifest[plan.manifest_key] = entry
+        
+        for page_idx in page_indices:
+            rendered = entry["pages"].get(str(page_idx + 1))
+            # Variants are checked under their current file names (older runs used a different naming)
+            if rendered and all(
+                path.exists()
+                for path in [Path(rendered["image_path"])] + [
+                    variant_path(Path(rendered["image_path"]), v, self.variant_format, self.variant_quality)
+                    for v in self.variants
+                ]
+            ):
+                plan.done[page_idx + 1] = rendered
+            else:
+                plan.pending.append(page_idx)
+        
+        logger.info(
+            f"Processing {pdf_file.name}: {len(page_indices)} pages "
+            f"({len(plan.done)} up to date, {len(plan.pending)} to render)"
+        )
+        return plan
+    
+    def _record(self, plan: _RenderPlan, results: List[Dict[str, Any]]) -> None:
+        """Store rendered pages in the plan and the manifest"""
+        for result in results:
+            plan.done[result["page_number"]] = result
+            if self.use_manifest:
+                self._manifest[plan.manifest_key]["pages"][str(result["page_number"])] = result
+        self._save_manifest()
+    
+    def _chunks(self, pages: List[int]) -> List[List[int]]:
+        """Split pages into contiguous chunks (several per worker for load balancing)"""
+        size = max(1, min(16, len(pages) // (self.workers * 4) or 1))
+        return [pages[i:i + size] for i in range(0, len(pages), size)]
+    
+    def _render(self, plans: List[_RenderPlan], show_progress: bool = False) -> Dict[str, Exception]:
+        """
+        Render pending pages of all plans, serially or across a process pool
+        
+        Args:
+            plans: Render plans
+            show_progress: Show progress bar
+        
+        Returns:
+            Mapping of PDF path to the error that stopped its rendering
+        """
+        jobs: List[Tuple[_RenderPlan, List[int]]] = [
+            (plan, chunk) for plan in plans for chunk in self._chunks(plan.pending)
+        ]
+        errors: Dict[str, Exception] = {}
+        if not jobs:
+            return errors
+        
+        total = sum(len(chunk) for _, chunk in jobs)
+        progress = tqdm(total=total, desc="Rendering pages") if show_progress else None
+        
+        def finish(plan: _RenderPlan, chunk: List[int], results=None, error=None):
+            if error is not None:
+                logger.error(f"Error rendering {plan.pdf_path} pages {chunk[0] + 1}-{chunk[-1] + 1}: {error}")
+                errors.setdefault(plan.pdf_path, error)
+            else:
+                self._record(plan, results)
+            if progress is not None:
+                progress.update(len(chunk))
+        
+        args = (
+            self.dpi, self.image_format, str(self.output_dir),
+            self.variants, self.variant_format, self.variant_quality
+        )
+        if self.workers <= 1:
+            for plan, chunk in jobs:
+                try:
+                    finish(plan, chunk, _render_pages(plan.pdf_path, chunk, *args))
+                except Exception as e:
+                    finish(plan, chunk, error=e)
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(jobs))) as executor:
+                futures = {
+                    executor.submit(_render_pages, plan.pdf_path, chunk, *args): (plan, chunk)
+                    for plan, chunk in jobs
                 }
-                results.append(result)
-                
-                logger.debug(f"Saved page {page_num} to {output_path}")
-            
-            pdf_document.close()
-            logger.info(f"Successfully converted {len(results)} pages from {pdf_path.name}")
-            
+                for future in as_completed(futures):
+                    plan, chunk = futures[future]
+                    try:
+                        finish(plan, chunk, future.result())
+                    except Exception as e:
+                        finish(plan, chunk, error=e)
+        
+        if progress is not None:
+            progress.close()
+        return errors
+    
+    def convert_pdf_to_images(
+        self,
+        pdf_path: str,
+        start_page: Optional[int] = None,
+        end_page: Optional[int] = None,
+        force: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Convert PDF pages to images
+        
+        Pages already rendered from the same PDF content with the same DPI and
+        format are skipped, so an interrupted run resumes where it stopped.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            start_page: Starting page number (1-based, inclusive)
+            end_page: Ending page number (1-based, inclusive)
+            force: Re-render all pages in the range
+        
+        Returns:
+            List of dictionaries containing image paths and metadata
+        """
+        try:
+            plan = self._plan(pdf_path, start_page, end_page, force)
+            errors = self._render([plan])
+            if errors:
+                raise errors[plan.pdf_path]
         except Exception as e:
             logger.error(f"Error processing PDF {pdf_path}: {str(e)}")
             raise
         
+        results = [plan.done[page_num] for page_num in sorted(plan.done)]
+        logger.info(f"Successfully converted {len(results)} pages from {Path(pdf_path).name}")
         return results
     
     def batch_convert(
         self,
         pdf_files: List[str],
-        show_progress: bool = True
+        show_progress: bool = True,
+        force: bool = False
     ) -> Dict[str, List[Dict[str, Any]]]:
         """
         Convert multiple PDF files to images
         
+        With workers > 1, pages of all PDFs share one process pool.
+        
         Args:
             pdf_files: List of PDF file paths
             show_progress: Show progress bar
+            force: Re-render pages even if they are up to date
         
         Returns:
             Dictionary mapping PDF paths to their extracted image metadata
         """
         all_results = {}
+        plans = {}
         
-        # Use tqdm for progress if requested
-        iterator = tqdm(pdf_files, desc="Converting PDFs") if show_progress else pdf_files
-        
-        for pdf_path in iterator:
+        for pdf_path in pdf_files:
             try:
-                results = self.convert_pdf_to_images(pdf_path)
-                all_results[pdf_path] = results
+                plans[pdf_path] = self._plan(pdf_path, force=force)
             except Exception as e:
                 logger.error(f"Failed to process {pdf_path}: {str(e)}")
+        
+        errors = self._render(list(plans.values()), show_progress=show_progress)
+        
+        for pdf_path in pdf_files:
+            plan = plans.get(pdf_path)
+            if plan is None or plan.pdf_path in errors:
+                if plan is not None:
+                    logger.error(f"Failed to process {pdf_path}: {str(errors[plan.pdf_path])}")
                 all_results[pdf_path] = []
+            else:
+                all_results[pdf_path] = [plan.done[page_num] for page_num in sorted(plan.done)]
         
         # Summary
         total_pages = sum(len(results) for results in all_results.values())
@@ -0,0 +1,79 @@
+"""
+Search Text Builder
+인제스트 시 전문 검색 벡터(search_vector_korean/english)에 들어가는 텍스트 구성
+(키워드 검색 인덱스도 같은 텍스트를 사용)
+"""
+
+from typing import Any, Dict, Tuple
+
+
+def extract_entity_text(entity_dict: dict) -> str:
+    """
+    Entity 딕셔너리에서 검색 가능한 텍스트 추출
+    
+    Args:
+        entity_dict: Entity 정보를 담은 딕셔너리
+        
+    Returns:
+        검색용 텍스트 문자열
+    """
+    if not entity_dict:
+        return ""
+    
+    text_parts = []
+    
+    # title 추출
+    if entity_dict.get("title"):
+        text_parts.append(str(entity_dict["title"]))
+    
+    # details 추출
+    if entity_dict.get("details"):
+        text_parts.append(str(entity_dict["details"]))
+    
+    # keywords 리스트 추출
+    if entity_dict.get("keywords"):
+        keywords = entity_dict["keywords"]
+        if isinstance(keywords, list):
+            text_parts.extend([str(k) for k in keywords if k])
+        elif isinstance(keywords, str):
+            text_parts.append(keywords)
+    
+    # hypothetical_questions 리스트 추출
+    if entity_dict.get("hypothetical_questions"):
+        questions = entity_dict["hypothetical_questions"]
+        if isinstance(questions, list):
+            text_parts.extend([str(q) for q in questions if q])
+        elif isinstance(questions, str):
+            text_parts.append(questions)
+    
+    return " ".join(text_parts)
+
+
+def build_search_texts(doc_dict: Dict[str, Any]) -> Tuple[str, str]:
+    """
+    한국어/영어 검색 텍스트 구성 (entity와 human_feedback 포함)
+    
+    Args:
+        doc_dict: 문서 딕셔너리 (DDUDocument.to_db_dict() 또는 DB 행)
+        
+    Returns:
+        (한국어 검색 텍스트, 영어 검색 텍스트)
+    """
+    entity = doc_dict.get("entity")
+    entity_text = extract_entity_text(entity if isinstance(entity, dict) else {})
+    
+    # 한국어 검색 텍스트
+    search_korean = (
+        (doc_dict.get("contextualize_text") or "") + " " +
+        (doc_dict.get("page_content") or "") + " " +
+        (doc_dict.get("caption") or "") + " " +
+        entity_text + " " +
+        (doc_dict.get("human_feedback") or "")
+    )
+    # 영어 검색 텍스트
+    search_english = (
+        (doc_dict.get("translation_text") or "") + " " +
+        entity_text + " " +
+        (doc_dict.get("human_feedback") or "")
+    )
+    return search_korean, search_english
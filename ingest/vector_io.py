@@ -0,0 +1,76 @@
+"""
+pgvector Binary Transport
+임베딩을 텍스트 리터럴('[0.1,0.2,...]') 대신 float32 NumPy 배열로 주고받음
+
+- 풀의 모든 연결에 pgvector psycopg 어댑터 등록 (DatabaseManager._configure_connection)
+- 파라미터: np.float32 배열 -> 바이너리 덤퍼 (문자열 포맷팅 / 서버 측 파싱 없음)
+- 결과: 바이너리 커서(binary=True)에서 vector 컬럼이 np.ndarray(float32)로 로드
+- 어댑터가 없는 연결(vector 확장 생성 전, pgvector 패키지 미설치)은 텍스트 리터럴로 폴백
+
+SQL은 그대로 %(embedding)s::vector를 사용 (배열이면 바이너리 vector, 문자열이면 캐스트).
+psycopg3는 같은 이름의 파라미터를 하나의 바인드 파라미터로 보내므로 similarity와 ORDER BY에서
+두 번 참조해도 벡터는 한 번만 전송됨.
+"""
+
+import logging
+from typing import Any, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def register_vector_adapter(conn) -> bool:
+    """
+    연결에 pgvector 어댑터 등록 (vector / halfvec / bit / sparsevec)
+
+    Returns:
+        등록 성공 여부 (실패 시 해당 연결은 텍스트 리터럴 사용)
+    """
+    try:
+        from pgvector.psycopg import register_vector
+    except ImportError:
+        logger.warning("[VECTOR_IO] pgvector package not installed, sending embeddings as text")
+        return False
+    try:
+        register_vector(conn)
+        return True
+    except Exception as e:
+        # vector 확장이 아직 없음 (setup_database 전)
+        conn.rollback()
+        logger.warning(f"[VECTOR_IO] pgvector adapter not registered ({e}), sending embeddings as text")
+        return False
+
+
+def has_vector_adapter(conn) -> bool:
+    """연결에 vector 타입 어댑터가 등록되어 있는지"""
+    adapters = getattr(conn, "adapters", None)
+    return adapters is not None and adapters.types.get("vector") is not None
+
+
+def to_vector_array(embedding: Sequence[float]) -> np.ndarray:
+    """임베딩을 float32 배열로 (이미 float32 배열이면 복사 없음)"""
+    return np.asarray(embedding, dtype=np.float32)
+
+
+def format_vector(embedding: Sequence[float]) -> str:
+    """pgvector 텍스트 리터럴 (어댑터가 없을 때만 사용)"""
+    return f"[{','.join(map(str, embedding))}]"
+
+
+def vector_param(conn, embedding: Optional[Sequence[float]]) -> Any:
+    """
+    연결에 맞는 임베딩 파라미터
+
+    Args:
+        conn: psycopg 연결
+        embedding: 임베딩 (None이면 NULL)
+
+    Returns:
+        어댑터가 있으면 float32 배열 (바이너리 전송), 없으면 텍스트 리터럴
+    """
+    if embedding is None:
+        return None
+    if has_vector_adapter(conn):
+        return to_vector_array(embedding)
+    return format_vector(embedding)
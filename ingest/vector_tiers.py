@@ -0,0 +1,208 @@
+"""
+Vector Tier Pack
+전체 vector(1536) ANN 인덱스 대신 작은 표현식 인덱스로 후보(shortlist)를 뽑고
+전체 벡터의 정확한 코사인 거리로 재점수화 (FilteredVectorSearch, SEARCH_VECTOR_TIER)
+
+티어:
+    full       : 기존 vector(1536) IVFFlat (idx_korean_embedding / idx_english_embedding)
+    halfvec    : col::halfvec(1536), halfvec_cosine_ops               - 항목 크기 1/2
+    binary     : binary_quantize(col)::bit(1536), bit_hamming_ops     - 항목 크기 1/32
+    matryoshka : subvector(col, 1, 256)::vector(256), vector_cosine_ops - 항목 크기 1/6
+                 (text-embedding-3 계열은 앞쪽 차원만으로도 유효한 임베딩, Matryoshka 학습)
+
+새 컬럼 없이 기존 임베딩 컬럼에 대한 표현식 인덱스만 추가하므로 인제스트/스키마 변경이 없음.
+검색 ORDER BY가 인덱스 표현식과 글자 그대로 같아야 플래너가 인덱스를 사용하므로
+인덱스 DDL과 shortlist 정렬 키를 모두 VectorTier에서 생성. (pgvector 0.7+)
+
+코퍼스가 커져도 shortlist 인덱스가 shared_buffers 안에 머무는지 tier_index_sizes()로 확인
+(scripts/benchmark_vector_tiers.py가 recall@k / 지연 시간과 함께 보고).
+"""
+
+import os
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_COLUMNS = ("embedding_korean", "embedding_english")
+
+# 기존 전체 벡터 인덱스 (DatabaseManager.setup_database)
+FULL_INDEXES = {
+    "embedding_korean": "idx_korean_embedding",
+    "embedding_english": "idx_english_embedding",
+}
+
+TIER_NAMES = ("full", "halfvec", "binary", "matryoshka")
+
+
+@dataclass(frozen=True)
+class VectorTier:
+    """shortlist 인덱스 티어 정의 ({column}은 임베딩 컬럼으로 치환)"""
+    name: str
+    key: str          # 인덱스 표현식 = shortlist ORDER BY 좌변
+    query: str        # 쿼리 임베딩 표현식 (%(embedding)s 파라미터)
+    opclass: str
+    operator: str
+    size_ratio: float  # 전체 vector 대비 항목 크기 (보고용)
+
+    def key_sql(self, column: str) -> str:
+        return self.key.format(column=column)
+
+    def order_sql(self, column: str) -> str:
+        return f"{self.key_sql(column)} {self.operator} {self.query}"
+
+    def index_name(self, column: str) -> str:
+        return f"idx_{column}_{self.name}"
+
+    def ddl(self, table_name: str, column: str, lists: int = 100, concurrently: bool = False) -> str:
+        option = "CONCURRENTLY " if concurrently else ""
+        return (
+            f"CREATE INDEX {option}IF NOT EXISTS {self.index_name(column)} ON {table_name} "
+            f"USING ivfflat (({self.key_sql(column)}) {self.opclass}) WITH (lists = {int(lists)})"
+        )
+
+
+def _dimensions() -> int:
+    return int(os.getenv("OPENAI_EMBEDDING_DIMENSIONS", "1536"))
+
+
+def _matryoshka_dimensions() -> int:
+    return int(os.getenv("VECTOR_TIER_MATRYOSHKA_DIMS", "256"))
+
+
+def build_tiers(dimensions: Optional[int] = None, matryoshka_dims: Optional[int] = None) -> Dict[str, VectorTier]:
+    """
+    shortlist 티어 정의 (full 제외)
+
+    Args:
+        dimensions: 임베딩 차원 (OPENAI_EMBEDDING_DIMENSIONS)
+        matryoshka_dims: Matryoshka 접두 차원 (VECTOR_TIER_MATRYOSHKA_DIMS)
+    """
+    dims = dimensions or _dimensions()
+    prefix = min(matryoshka_dims or _matryoshka_dimensions(), dims)
+    embedding = "%(embedding)s::vector"
+    return {
+        "halfvec": VectorTier(
+            "halfvec",
+            f"({{column}}::halfvec({dims}))",
+            f"{embedding}::halfvec({dims})",
+            "halfvec_cosine_ops", "<=>", 0.5
+        ),
+        "binary": VectorTier(
+            "binary",
+            f"(binary_quantize({{column}})::bit({dims}))",
+            f"binary_quantize({embedding})::bit({dims})",
+            "bit_hamming_ops", "<~>", 1 / 32
+        ),
+        "matryoshka": VectorTier(
+            "matryoshka",
+            f"(subvector({{column}}, 1, {prefix})::vector({prefix}))",
+            f"subvector({embedding}, 1, {prefix})::vector({prefix})",
+            "vector_cosine_ops", "<=>", prefix / dims
+        ),
+    }
+
+
+def get_tier(name: Optional[str]) -> Optional[VectorTier]:
+    """
+    이름으로 티어 조회
+
+    Returns:
+        VectorTier (full / 빈 값이면 None -> 기존 전체 벡터 ANN)
+    """
+    name = (name or "full").lower()
+    if name == "full":
+        return None
+    tiers = build_tiers()
+    if name not in tiers:
+        raise ValueError(f"Unknown vector tier '{name}' (expected one of {', '.join(TIER_NAMES)})")
+    return tiers[name]
+
+
+def _table_name(table_name: Optional[str]) -> str:
+    return table_name or os.getenv("DB_TABLE_NAME", "mvp_ddu_documents")
+
+
+def tier_migration_statements(
+    tier_names: List[str],
+    table_name: Optional[str] = None,
+    concurrently: bool = False,
+    lists: Optional[int] = None
+) -> List[str]:
+    """티어 인덱스 마이그레이션 SQL 목록 (언어별 인덱스 -> ANALYZE)"""
+    table_name = _table_name(table_name)
+    lists = lists or int(os.getenv("VECTOR_TIER_IVFFLAT_LISTS", "100"))
+    statements = []
+    for name in tier_names:
+        tier = get_tier(name)
+        if tier is None:
+            continue
+        statements += [tier.ddl(table_name, column, lists, concurrently) for column in EMBEDDING_COLUMNS]
+    statements.append(f"ANALYZE {table_name}")
+    return statements
+
+
+def ensure_tier_indexes(
+    conn,
+    tier_names: List[str],
+    table_name: Optional[str] = None,
+    concurrently: bool = False
+) -> List[str]:
+    """
+    티어 인덱스 생성 (이미 있으면 건너뜀)
+
+    Args:
+        conn: psycopg 연결 (트랜잭션 밖이어야 함)
+        tier_names: 생성할 티어 (full은 무시)
+        table_name: 문서 테이블 (DB_TABLE_NAME)
+        concurrently: CREATE INDEX CONCURRENTLY 사용 (autocommit으로 실행)
+
+    Returns:
+        새로 생성된 인덱스 이름 목록
+    """
+    table_name = _table_name(table_name)
+    managed = [
+        tier.index_name(column)
+        for tier in filter(None, (get_tier(name) for name in tier_names))
+        for column in EMBEDDING_COLUMNS
+    ]
+    with conn.cursor() as cur:
+        cur.execute("SELECT indexname FROM pg_indexes WHERE tablename = %s", (table_name,))
+        existing = {row[0] for row in cur.fetchall()}
+    conn.commit()
+
+    previous_autocommit = conn.autocommit
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cur:
+            for statement in tier_migration_statements(tier_names, table_name, concurrently):
+                logger.info(f"[VECTOR_TIERS] {statement}")
+                cur.execute(statement)
+    finally:
+        conn.autocommit = previous_autocommit
+
+    return [name for name in managed if name not in existing]
+
+
+def tier_index_sizes(conn, table_name: Optional[str] = None) -> Dict[str, int]:
+    """
+    임베딩 인덱스 크기 (바이트, pg_relation_size) + shared_buffers 크기
+
+    Returns:
+        {인덱스 이름: 바이트, "shared_buffers": 바이트}
+    """
+    table_name = _table_name(table_name)
+    names = list(FULL_INDEXES.values()) + [
+        tier.index_name(column) for tier in build_tiers().values() for column in EMBEDDING_COLUMNS
+    ]
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT indexname, pg_relation_size(quote_ident(indexname)::regclass) "
+            "FROM pg_indexes WHERE tablename = %s AND indexname = ANY(%s)",
+            (table_name, names)
+        )
+        sizes = {row[0]: row[1] for row in cur.fetchall()}
+        cur.execute("SELECT pg_size_bytes(current_setting('shared_buffers'))")
+        sizes["shared_buffers"] = cur.fetchone()[0]
+    return sizes
@@ -9,6 +9,7 @@ import json
 from typing import Optional, Dict, Any
 from langgraph_sdk import get_client
 from langgraph_sdk.client import LangGraphClient
+from workflow.streaming import AnswerTokenFilter, is_synthesis_stream_chunk
 import httpx
 
 class MultimodalRAGClient:
@@ -89,13 +90,17 @@ class MultimodalRAGClient:
         print("-" * 50)
         
         if stream:
-            # Stream the response
+            # Stream state values and synthesis answer tokens together
+            # (answer tokens require SYNTHESIS_STREAMING=true on the server)
             result = {}
+            token_filter = None
+            current_message_id = None
+            streamed_answer = False
             async for chunk in self.client.runs.stream(
                 thread_id=thread_id,
                 assistant_id=self.assistant_id,
                 input=input_data,
-                stream_mode="values"
+                stream_mode=["values", "messages-tuple"]
             ):
                 # Process streaming chunks
                 if chunk.event == "values":
@@ -106,8 +111,37 @@ class MultimodalRAGClient:
                         print(f"⚙️  Processing: {result['current_node']}")
                     
                     # Show intermediate results
-                    if "intermediate_answer" in result and result["intermediate_answer"]:
+                    if "intermediate_answer" in result and result["intermediate_answer"] and not streamed_answer:
                         print(f"💭 Intermediate: {result['intermediate_answer'][:100]}...")
+                
+                elif chunk.event == "messages":
+                    message, metadata = chunk.data
+                    if not is_synthesis_stream_chunk(metadata):
+                        continue
+                    
+                    # New synthesis call (retry or next subtask) starts a new answer
+                    if token_filter is None or message.get("id") != current_message_id:
+                        if token_filter is not None:
+                            # Print text held back by the previous answer's filter
+                            print(token_filter.flush(), flush=True)
+                        token_filter = AnswerTokenFilter()
+                        current_message_id = message.get("id")
+                        print(f"\n✍️  Answer (streaming):")
+                        print("-" * 50)
+                    
+                    text = token_filter.feed(message.get("content") or "")
+                    if text:
+                        streamed_answer = True
+                        print(text, end="", flush=True)
+            
+            if token_filter is not None:
+                print(token_filter.flush(), end="", flush=True)
+            if streamed_answer:
+                print()
+            
+            # Streaming failed after the answer was partly shown
+            if result.get("error"):
+                print(f"\n❌ Error: {result['error']}")
                         
             # Get final answer
             if "final_answer" in result:
@@ -5,8 +5,21 @@ Handles search operations and filtering
 
 from .search_filter import MVPSearchFilter
 from .hybrid_search import HybridSearch
+from .vector_engine import VectorEngine
+from .keyword_engine import KeywordEngine
+from .filtered_ann import FilteredVectorSearch
+from .records import SearchRecord
+from .query_analysis import QueryAnalysis, QueryAnalyzer
+from .result_cache import RetrievalResultCache
 
 __all__ = [
     "MVPSearchFilter",
-    "HybridSearch"
+    "HybridSearch",
+    "VectorEngine",
+    "KeywordEngine",
+    "FilteredVectorSearch",
+    "SearchRecord",
+    "QueryAnalysis",
+    "QueryAnalyzer",
+    "RetrievalResultCache"
 ]
\ No newline at end of file
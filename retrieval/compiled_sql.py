@@ -0,0 +1,173 @@
+"""
+Compiled SQL Cache
+검색 SQL 텍스트를 (검색 모드, 컬럼, 필터 형태)별로 한 번만 만들고 서버 측 prepared statement로 실행
+
+- 필터 형태: MVPSearchFilter.shape() (값을 제외한 조건 종류). 형태가 같으면 WHERE 텍스트도 같으므로
+  f-string / to_sql_where() 재구성 없이 캐시된 텍스트에 파라미터만 바인딩
+- 실행: psycopg3 cursor.execute(..., prepare=True) -> 연결별로 첫 실행에서 PREPARE, 이후 계획 재사용
+  (풀 연결은 재사용되므로 질문 하나가 만드는 수십 번의 검색 대부분이 계획 단계를 건너뜀)
+- 계획 캐시: PostgreSQL은 prepared statement를 5회 실행한 뒤 generic plan(LIMIT $n, ANY($n) 값을 모름)으로
+  바꿀 수 있음. ivfflat ORDER BY ... LIMIT 계획은 LIMIT 값에 따라 달라지므로 custom_plan=True로 등록한
+  쿼리(벡터 검색)는 실행 전 SET LOCAL plan_cache_mode = force_custom_plan (파싱/분석은 계속 재사용)
+- 지표: 쿼리 라벨별 실행 횟수 / 클라이언트 측 실행 시간, SQL_PLAN_SAMPLE_EVERY회마다
+  EXPLAIN (ANALYZE, SUMMARY)로 준비하지 않은 경우의 Planning Time / Execution Time 샘플링
+"""
+
+import os
+import time
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+
+class CompiledQuery:
+    """캐시된 SQL 텍스트와 실행 지표"""
+
+    __slots__ = ("label", "sql", "custom_plan", "executions", "execute_ms", "plan_samples", "planning_ms", "execution_ms")
+
+    def __init__(self, label: str, sql: str, custom_plan: bool = False):
+        self.label = label
+        self.sql = sql
+        self.custom_plan = custom_plan
+        self.executions = 0
+        self.execute_ms = 0.0
+        self.plan_samples = 0
+        self.planning_ms = 0.0
+        self.execution_ms = 0.0
+
+
+class CompiledSQLCache:
+    """(모드, 컬럼, 필터 형태) -> SQL 텍스트 캐시 + prepared statement 실행기"""
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        prepare: Optional[bool] = None,
+        plan_sample_every: Optional[int] = None
+    ):
+        """
+        초기화 (인자가 없으면 환경변수 사용)
+
+        Args:
+            max_entries: 최대 엔트리 수 (SQL_CACHE_MAX_ENTRIES)
+            prepare: 서버 측 prepared statement 사용 (SEARCH_PREPARED_STATEMENTS)
+            plan_sample_every: N회 실행마다 EXPLAIN ANALYZE 샘플, 0이면 끔 (SQL_PLAN_SAMPLE_EVERY)
+        """
+        self.max_entries = max_entries if max_entries is not None else int(os.getenv("SQL_CACHE_MAX_ENTRIES", "512"))
+        self.prepare = prepare if prepare is not None else (
+            os.getenv("SEARCH_PREPARED_STATEMENTS", "true").lower() == "true"
+        )
+        self.plan_sample_every = plan_sample_every if plan_sample_every is not None else int(
+            os.getenv("SQL_PLAN_SAMPLE_EVERY", "0")
+        )
+        # 키 -> CompiledQuery 또는 WHERE/SELECT 조각
+        self.entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.builds = 0
+
+    def _lookup(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        with self._lock:
+            value = self.entries.get(key)
+            if value is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return value
+        value = build()
+        with self._lock:
+            self.builds += 1
+            self.entries[key] = value
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return value
+
+    def fragment(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """SQL 조각 (WHERE 절, SELECT 목록 등) 조회, 없으면 build()로 1회 생성"""
+        return self._lookup(key, build)
+
+    def get(self, key: Hashable, label: str, build: Callable[[], str], custom_plan: bool = False) -> CompiledQuery:
+        """
+        실행할 SQL 조회, 없으면 build()로 1회 생성
+
+        Args:
+            key: (모드, 컬럼, 필터 형태, ...) 해시 가능한 키
+            label: 지표 집계용 이름 (예: keyword:search_vector_korean)
+            build: SQL 텍스트 생성 함수
+            custom_plan: generic plan을 쓰지 않음 (파라미터 값에 따라 인덱스 선택이 달라지는 쿼리)
+        """
+        return self._lookup(key, lambda: CompiledQuery(label, build(), custom_plan))
+
+    def execute(self, cur, compiled: CompiledQuery, params: Dict[str, Any]):
+        """컴파일된 SQL 실행 (prepare=True), 결과는 cur에서 읽음"""
+        if self.plan_sample_every > 0 and compiled.executions % self.plan_sample_every == 0:
+            self._sample_plan(cur, compiled, params)
+        start = time.perf_counter()
+        if self.prepare:
+            if compiled.custom_plan:
+                cur.execute("SET LOCAL plan_cache_mode = force_custom_plan")
+            cur.execute(compiled.sql, params, prepare=True)
+        else:
+            cur.execute(compiled.sql, params)
+        compiled.execute_ms += (time.perf_counter() - start) * 1000
+        compiled.executions += 1
+
+    def _sample_plan(self, cur, compiled: CompiledQuery, params: Dict[str, Any]):
+        """
+        EXPLAIN (ANALYZE, SUMMARY)로 준비하지 않은 실행의 계획/실행 시간 샘플
+
+        호출자 트랜잭션 안에서 실행되므로 savepoint로 감쌈 (실패해도 트랜잭션이 aborted 상태로 남아
+        이어지는 실제 쿼리가 InFailedSqlTransaction으로 실패하지 않도록)
+        """
+        try:
+            with cur.connection.transaction():
+                cur.execute(f"EXPLAIN (ANALYZE, SUMMARY, FORMAT JSON) {compiled.sql}", params)
+                plan = cur.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            compiled.planning_ms += plan[0]["Planning Time"]
+            compiled.execution_ms += plan[0]["Execution Time"]
+            compiled.plan_samples += 1
+        except Exception as e:
+            logger.warning(f"[SQL_CACHE] Plan sample failed for {compiled.label}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 통계 + 라벨별 실행 지표 (ms 평균)"""
+        with self._lock:
+            compiled = [value for value in self.entries.values() if isinstance(value, CompiledQuery)]
+        queries: Dict[str, Dict[str, float]] = {}
+        for query in compiled:
+            stats = queries.setdefault(query.label, {
+                "shapes": 0, "executions": 0, "execute_ms": 0.0,
+                "plan_samples": 0, "planning_ms": 0.0, "execution_ms": 0.0
+            })
+            stats["shapes"] += 1
+            stats["executions"] += query.executions
+            stats["execute_ms"] += query.execute_ms
+            stats["plan_samples"] += query.plan_samples
+            stats["planning_ms"] += query.planning_ms
+            stats["execution_ms"] += query.execution_ms
+        report = {}
+        for label, stats in queries.items():
+            samples = stats["plan_samples"]
+            report[label] = {
+                "shapes": stats["shapes"],
+                "executions": stats["executions"],
+                "avg_execute_ms": round(stats["execute_ms"] / stats["executions"], 3) if stats["executions"] else None,
+                "plan_samples": samples,
+                "avg_planning_ms": round(stats["planning_ms"] / samples, 3) if samples else None,
+                "avg_execution_ms": round(stats["execution_ms"] / samples, 3) if samples else None
+            }
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "builds": self.builds,
+            "prepare": self.prepare,
+            "queries": report
+        }
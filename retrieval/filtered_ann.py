@@ -0,0 +1,299 @@
+"""
+Filtered Vector Search
+필터가 있는 pgvector 검색이 top-k를 채우지 못하는 문제 방지
+
+IVFFlat은 probes 개수만큼의 리스트에서 후보를 뽑은 뒤 WHERE 조건을 적용(post-filter)하므로
+제한적인 필터(단일 source, entity type, 특정 page)에서는 LIMIT보다 훨씬 적은 행이 나옴.
+
+전략 (SEARCH_FILTERED_ANN):
+    auto      : 필터 후보 수를 먼저 세고(필터 인덱스 사용, 상한까지만) 적으면 exact,
+                많으면 iterative scan, 그래도 부족하면 exact로 보완
+    iterative : pgvector 0.8+ ivfflat.iterative_scan (LIMIT을 채울 때까지 리스트 추가 탐색)
+    exact     : 필터 후보 전체에 대해 정확한 거리 정렬 (MATERIALIZED CTE로 ANN 인덱스 우회)
+    off       : 기존 동작 (ANN + post-filter)
+
+벡터 티어 (SEARCH_VECTOR_TIER, ingest.vector_tiers):
+    ANN 경로(ann / iterative)에서 halfvec / binary / matryoshka 표현식 인덱스로
+    limit * SEARCH_TIER_SHORTLIST_FACTOR개 후보를 뽑은 뒤 전체 벡터 코사인 거리로 재정렬.
+    exact 경로는 원래부터 전체 벡터를 사용하므로 그대로.
+"""
+
+import os
+import re
+import logging
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from ingest.vector_tiers import VectorTier, get_tier
+from retrieval.compiled_sql import CompiledSQLCache
+from retrieval.records import SearchRecord
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+STRATEGIES = ("auto", "iterative", "exact", "off")
+
+# ivfflat.iterative_scan을 지원하는 최소 pgvector 버전
+ITERATIVE_SCAN_MIN_VERSION = (0, 8, 0)
+
+
+def _parse_version(version: str) -> Tuple[int, ...]:
+    return tuple(int(part) for part in re.findall(r"\d+", version)[:3])
+
+
+class FilteredVectorSearch:
+    """필터 선택도에 따라 ANN / iterative scan / exact 검색을 선택하는 실행기"""
+
+    def __init__(
+        self,
+        table_name: str,
+        mode: Optional[str] = None,
+        exact_max_rows: Optional[int] = None,
+        max_probes: Optional[int] = None,
+        tier: Optional[str] = None,
+        shortlist_factor: Optional[int] = None,
+        sql_cache: Optional[CompiledSQLCache] = None
+    ):
+        """
+        초기화 (인자가 없으면 환경변수 사용)
+
+        Args:
+            table_name: 문서 테이블
+            mode: 전략 (SEARCH_FILTERED_ANN)
+            exact_max_rows: 후보가 이 수 이하이면 exact 검색 (SEARCH_EXACT_FILTER_MAX_ROWS)
+            max_probes: iterative scan 최대 리스트 수, 0이면 pgvector 기본값 (SEARCH_ITERATIVE_MAX_PROBES)
+            tier: shortlist 인덱스 티어 full | halfvec | binary | matryoshka (SEARCH_VECTOR_TIER)
+            shortlist_factor: 재점수화할 후보 수 = limit * factor (SEARCH_TIER_SHORTLIST_FACTOR)
+            sql_cache: 컴파일된 SQL 캐시 (None이면 매번 SQL을 만들어 그대로 실행)
+        """
+        self.table_name = table_name
+        self.mode = (mode or os.getenv("SEARCH_FILTERED_ANN", "auto")).lower()
+        if self.mode not in STRATEGIES:
+            logger.warning(f"[FILTERED_ANN] Unknown SEARCH_FILTERED_ANN '{self.mode}', using auto")
+            self.mode = "auto"
+        self.exact_max_rows = exact_max_rows if exact_max_rows is not None else int(
+            os.getenv("SEARCH_EXACT_FILTER_MAX_ROWS", "5000")
+        )
+        self.max_probes = max_probes if max_probes is not None else int(
+            os.getenv("SEARCH_ITERATIVE_MAX_PROBES", "0")
+        )
+        tier_name = tier or os.getenv("SEARCH_VECTOR_TIER", "full")
+        try:
+            self.tier: Optional[VectorTier] = get_tier(tier_name)
+        except ValueError as e:
+            logger.warning(f"[FILTERED_ANN] {e}, using full vectors")
+            self.tier = None
+        self.shortlist_factor = max(1, shortlist_factor if shortlist_factor is not None else int(
+            os.getenv("SEARCH_TIER_SHORTLIST_FACTOR", "4")
+        ))
+        if self.tier is not None:
+            logger.info(f"[FILTERED_ANN] Vector tier {self.tier.name}: "
+                        f"shortlist x{self.shortlist_factor}, exact re-scoring on full vectors")
+        self.sql_cache = sql_cache
+        self._iterative_supported: Optional[bool] = None
+        self.stats = {"ann": 0, "exact": 0, "iterative": 0, "exact_fallbacks": 0}
+
+    def search(
+        self,
+        conn,
+        embedding_column: str,
+        select_sql: str,
+        where_clause: str,
+        params: Dict[str, Any],
+        limit: int,
+        boost_where: Optional[str] = None
+    ) -> Tuple[List[SearchRecord], str]:
+        """
+        필터 벡터 검색 실행
+
+        Args:
+            conn: psycopg 연결 (SET LOCAL을 위해 트랜잭션 안에서 실행)
+            embedding_column: 임베딩 컬럼
+            select_sql: SELECT 목록 (similarity 컬럼 포함)
+            where_clause: MVPSearchFilter.to_sql_where() 조건
+            params: embedding, limit 및 필터 파라미터
+            limit: 최대 결과 수
+            boost_where: 우선 순위 조건 (예: entity 필터). 주어지면 이 조건의 top-limit(exact)을
+                         같은 쿼리에서 함께 가져와 boosted=True로 앞에 배치
+
+        Returns:
+            (결과 행 리스트, 사용한 전략)
+        """
+        filtered = where_clause.strip() != "1=1" and self.mode != "off"
+        candidates = None
+        if not filtered:
+            strategy = "ann"
+        elif self.mode == "exact":
+            strategy = "exact"
+        else:
+            if self.mode == "auto":
+                candidates = self._count_candidates(conn, embedding_column, where_clause, params)
+            if candidates is not None and candidates <= self.exact_max_rows:
+                logger.info(f"[FILTERED_ANN] {candidates} candidates <= {self.exact_max_rows}, using exact search")
+                strategy = "exact"
+            elif self._supports_iterative_scan(conn):
+                strategy = "iterative"
+                with conn.cursor() as cur:
+                    cur.execute("SET LOCAL ivfflat.iterative_scan = relaxed_order")
+                    if self.max_probes > 0:
+                        cur.execute(f"SET LOCAL ivfflat.max_probes = {int(self.max_probes)}")
+            else:
+                strategy = "ann"
+
+        rows = self._run(conn, strategy, embedding_column, select_sql, where_clause, params, boost_where)
+        if strategy == "iterative" and not boost_where:
+            # relaxed_order는 순서가 약간 어긋날 수 있으므로 재정렬
+            rows.sort(key=lambda row: (-row["similarity"], row["id"]))
+
+        # 후보가 충분한데 LIMIT을 못 채우면 exact로 보완 (필터 없는 재검색 대신)
+        general_rows = sum(1 for row in rows if not row.get("boosted"))
+        if filtered and strategy != "exact" and general_rows < limit:
+            if candidates is None:
+                # iterative 모드는 미리 세지 않으므로 부족할 때만 후보 수 확인 (exact_max_rows + 1에서 중단)
+                candidates = self._count_candidates(conn, embedding_column, where_clause, params)
+            if candidates <= general_rows:
+                return rows, strategy
+            logger.info(f"[FILTERED_ANN] {strategy} returned {general_rows}/{limit} rows, completing with exact search")
+            self.stats["exact_fallbacks"] += 1
+            strategy = "exact"
+            rows = self._run(conn, strategy, embedding_column, select_sql, where_clause, params, boost_where)
+        return rows, strategy
+
+    def _ann_sql(self, embedding_column: str, select_sql: str, where_clause: str) -> str:
+        if self.tier is not None:
+            return self._tier_sql(embedding_column, select_sql, where_clause)
+        return f"""
+        SELECT {select_sql}
+        FROM {self.table_name}
+        WHERE {where_clause}
+            AND {embedding_column} IS NOT NULL
+        ORDER BY {embedding_column} <=> %(embedding)s::vector
+        LIMIT %(limit)s
+        """
+
+    def _tier_sql(self, embedding_column: str, select_sql: str, where_clause: str) -> str:
+        # 티어 표현식 인덱스로 후보 id만 뽑고 (작은 인덱스, 메모리 상주) 전체 벡터로 정확히 재점수화.
+        # 재점수화도 MATERIALIZED CTE 안에서 shortlist와 조인해 계산 -> 바깥 ORDER BY가 전체 벡터
+        # ivfflat 인덱스와 맞아 플래너가 shortlist를 건너뛰고 post-filter하는 계획을 막음
+        return f"""
+        WITH shortlist AS MATERIALIZED (
+            SELECT id
+            FROM {self.table_name}
+            WHERE {where_clause}
+                AND {embedding_column} IS NOT NULL
+            ORDER BY {self.tier.order_sql(embedding_column)}
+            LIMIT %(limit)s * {self.shortlist_factor}
+        ), scored AS MATERIALIZED (
+            SELECT {select_sql}
+            FROM {self.table_name}
+            JOIN shortlist USING (id)
+        )
+        SELECT * FROM scored
+        ORDER BY similarity DESC, id
+        LIMIT %(limit)s
+        """
+
+    def _exact_sql(self, embedding_column: str, select_sql: str, where_clause: str) -> str:
+        # MATERIALIZED CTE: 필터는 B-tree/GIN 인덱스로, 거리 정렬은 후보 전체에 대해 정확히
+        return f"""
+        WITH candidates AS MATERIALIZED (
+            SELECT {select_sql}
+            FROM {self.table_name}
+            WHERE {where_clause}
+                AND {embedding_column} IS NOT NULL
+        )
+        SELECT * FROM candidates
+        ORDER BY similarity DESC, id
+        LIMIT %(limit)s
+        """
+
+    def _boosted_sql(self, embedding_column: str, select_sql: str, boost_where: str, general_sql: str) -> str:
+        # 우선 조건의 top-limit(exact, 보통 선택적인 조건)과 일반 결과를 한 번에 조회
+        return f"""
+        WITH boosted_rows AS MATERIALIZED (
+            SELECT {select_sql}
+            FROM {self.table_name}
+            WHERE ({boost_where})
+                AND {embedding_column} IS NOT NULL
+            ORDER BY similarity DESC, id
+            LIMIT %(limit)s
+        ), general_rows AS (
+            {general_sql}
+        )
+        SELECT *, true AS boosted FROM boosted_rows
+        UNION ALL
+        SELECT *, false AS boosted FROM general_rows
+        ORDER BY boosted DESC, similarity DESC, id
+        """
+
+    def _run(
+        self,
+        conn,
+        strategy: str,
+        embedding_column: str,
+        select_sql: str,
+        where_clause: str,
+        params: Dict[str, Any],
+        boost_where: Optional[str] = None
+    ) -> List[SearchRecord]:
+        def build() -> str:
+            if strategy == "exact":
+                sql = self._exact_sql(embedding_column, select_sql, where_clause)
+            else:
+                sql = self._ann_sql(embedding_column, select_sql, where_clause)
+            if boost_where:
+                sql = self._boosted_sql(embedding_column, select_sql, boost_where, sql)
+            return sql
+
+        # WHERE 텍스트는 필터 형태별로 고정이므로 (전략, 컬럼, SELECT, WHERE)가 같으면 같은 SQL
+        key = ("semantic", strategy, embedding_column, select_sql, where_clause, boost_where)
+        with conn.cursor() as cur:
+            self._execute(cur, key, f"semantic:{strategy}:{embedding_column}", build, params, custom_plan=True)
+            rows = SearchRecord.from_cursor(cur)
+        self.stats[strategy] += 1
+        return rows
+
+    def _execute(
+        self,
+        cur,
+        key: Hashable,
+        label: str,
+        build: Callable[[], str],
+        params: Dict[str, Any],
+        custom_plan: bool = False
+    ):
+        """컴파일된 SQL 캐시가 있으면 prepared statement로, 없으면 바로 실행"""
+        if self.sql_cache is None:
+            cur.execute(build(), params)
+        else:
+            self.sql_cache.execute(cur, self.sql_cache.get(key, label, build, custom_plan), params)
+
+    def _count_candidates(self, conn, embedding_column: str, where_clause: str, params: Dict[str, Any]) -> int:
+        """필터 후보 수 (exact_max_rows + 1에서 중단)"""
+        with conn.cursor() as cur:
+            self._execute(
+                cur,
+                ("count", embedding_column, where_clause),
+                f"count:{embedding_column}",
+                lambda: (
+                    f"SELECT count(*) FROM (SELECT 1 FROM {self.table_name} "
+                    f"WHERE {where_clause} AND {embedding_column} IS NOT NULL "
+                    f"LIMIT %(candidate_cap)s) candidates"
+                ),
+                {**params, "candidate_cap": self.exact_max_rows + 1}
+            )
+            return cur.fetchone()[0]
+
+    def _supports_iterative_scan(self, conn) -> bool:
+        """설치된 pgvector가 iterative scan을 지원하는지 (1회 확인 후 캐시)"""
+        if self._iterative_supported is None:
+            with conn.cursor() as cur:
+                cur.execute("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+                row = cur.fetchone()
+            version = _parse_version(row[0]) if row else ()
+            self._iterative_supported = version >= ITERATIVE_SCAN_MIN_VERSION
+            if not self._iterative_supported:
+                logger.info(f"[FILTERED_ANN] pgvector {row[0] if row else 'n/a'} has no iterative scan, "
+                            f"using ANN with exact completion")
+        return self._iterative_supported
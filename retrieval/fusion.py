@@ -0,0 +1,95 @@
+"""
+Cross-variant Rank Fusion
+여러 쿼리 변형(및 언어)의 검색 순위를 RRF로 합쳐 전역 예산만큼만 남김
+
+변형별 결과를 first-seen-wins로 합치면 변형 수에 비례해 문서가 늘고 순위 정보가 사라지므로,
+모든 (변형, 순위) 쌍을 한 번에 점수화(np.bincount)해 상위 budget개만 LLM 단계로 전달.
+"""
+
+from dataclasses import dataclass
+from typing import Hashable, List, Optional, Sequence, Set
+
+import numpy as np
+
+
+@dataclass
+class FusedDocument:
+    """융합 결과 한 건"""
+    key: Hashable
+    score: float           # 최고점을 1.0으로 정규화한 RRF 점수
+    variants: List[int]    # 이 문서를 찾은 변형 인덱스 (오름차순)
+    best_rank: int         # 변형들 중 가장 높은 순위 (1부터)
+
+
+def rrf_fuse(
+    rankings: Sequence[Sequence[Hashable]],
+    k: int = 60,
+    budget: Optional[int] = None,
+    priority: Optional[Set[Hashable]] = None,
+    weights: Optional[Sequence[float]] = None
+) -> List[FusedDocument]:
+    """
+    변형별 순위 목록을 RRF로 융합
+
+    Args:
+        rankings: 변형별 문서 키 목록 (순위 순)
+        k: RRF 파라미터
+        budget: 남길 최대 문서 수 (None 또는 0이면 전체)
+        priority: 점수와 무관하게 앞에 둘 문서 키 (예: entity 일치 문서)
+        weights: 변형별 가중치 (기본 1.0)
+
+    Returns:
+        우선 문서 -> RRF 점수 내림차순 -> 처음 등장 순서로 정렬된 결과
+    """
+    index = {}
+    doc_positions = []
+    variant_ids = []
+    ranks = []
+    for variant, keys in enumerate(rankings):
+        for rank, key in enumerate(keys, 1):
+            position = index.setdefault(key, len(index))
+            doc_positions.append(position)
+            variant_ids.append(variant)
+            ranks.append(rank)
+    if not index:
+        return []
+
+    doc_positions = np.asarray(doc_positions, dtype=np.int64)
+    variant_ids = np.asarray(variant_ids, dtype=np.int64)
+    ranks = np.asarray(ranks, dtype=np.float64)
+    variant_weights = np.ones(len(rankings)) if weights is None else np.asarray(weights, dtype=np.float64)
+
+    contributions = variant_weights[variant_ids] / (k + ranks)
+    scores = np.bincount(doc_positions, weights=contributions, minlength=len(index))
+    best_ranks = np.full(len(index), np.iinfo(np.int64).max)
+    np.minimum.at(best_ranks, doc_positions, ranks.astype(np.int64))
+
+    keys = list(index)
+    prioritized = np.zeros(len(index), dtype=bool)
+    if priority:
+        prioritized[[index[key] for key in priority if key in index]] = True
+
+    # lexsort는 마지막 키가 1순위: 우선 문서, 점수 내림차순, 처음 등장 순서
+    order = np.lexsort((np.arange(len(index)), -scores, ~prioritized))
+    if budget:
+        order = order[:budget]
+
+    # 선택된 문서의 변형 목록 (중복 히트 제거)
+    selected = np.zeros(len(index), dtype=bool)
+    selected[order] = True
+    variants = {}
+    for position, variant in zip(doc_positions[selected[doc_positions]], variant_ids[selected[doc_positions]]):
+        hits = variants.setdefault(int(position), [])
+        if not hits or hits[-1] != variant:
+            hits.append(int(variant))
+
+    max_score = float(scores.max()) or 1.0
+    return [
+        FusedDocument(
+            key=keys[position],
+            score=float(scores[position]) / max_score,
+            variants=variants[int(position)],
+            best_rank=int(best_ranks[position])
+        )
+        for position in order
+    ]
@@ -12,7 +12,17 @@ from dotenv import load_dotenv
 import spacy
 from psycopg_pool import ConnectionPool
 from ingest.embeddings import DualLanguageEmbeddings
+from ingest.vector_io import to_vector_array, vector_param
 from retrieval.search_filter import MVPSearchFilter
+from retrieval.compiled_sql import CompiledSQLCache
+from retrieval.tracing import log_detail, submit_in_context
+from retrieval.records import SCORE_FIELDS, SearchRecord
+from retrieval.result_cache import RetrievalResultCache, make_result_key
+from retrieval.snapshot import PAYLOAD_SQL
+from retrieval.vector_engine import VectorEngine
+from retrieval.filtered_ann import FilteredVectorSearch
+from retrieval.keyword_engine import KeywordAnalyzer, KeywordEngine
+from retrieval.query_analysis import QueryAnalysis, QueryAnalyzer, english_keywords_simple, optimal_keyword_count
 
 load_dotenv()
 
@@ -28,18 +38,46 @@ class HybridSearch:
             connection_pool: PostgreSQL 연결 풀
         """
         self.pool = connection_pool
-        self.kiwi = Kiwi()
+        # KIWI_NUM_WORKERS > 0이면 배치 토크나이즈를 GIL 밖의 워커 스레드로 병렬 처리
+        self.kiwi = Kiwi(num_workers=int(os.getenv("KIWI_NUM_WORKERS", "0")))
         
         # spaCy 모델은 lazy loading으로 처리 (비동기 컨텍스트에서 blocking call 방지)
         self.nlp = None
         self._nlp_loading_attempted = False
         
+        # 쿼리 분석 (키워드 + tsquery) 배치 계산 및 메모이즈
+        self.query_analyzer = QueryAnalyzer(kiwi=self.kiwi, nlp_provider=self._get_nlp)
+        
         # 마지막 검색 통계 저장
         self.last_search_stats = {}
             
         self.k = int(os.getenv("SEARCH_RRF_K", "60"))  # RRF 파라미터
         self.embeddings = DualLanguageEmbeddings()
         self.table_name = os.getenv("DB_TABLE_NAME", "mvp_ddu_documents")
+        
+        # 검색 SQL은 (모드, 컬럼, 필터 형태)별로 한 번만 만들고 prepared statement로 실행
+        self.sql_cache = CompiledSQLCache()
+        
+        # 필터가 있는 벡터 검색 (SEARCH_FILTERED_ANN: auto | iterative | exact | off)
+        self.filtered_search = FilteredVectorSearch(self.table_name, sql_cache=self.sql_cache)
+        
+        # 검색 결과 순위 캐시 (코퍼스 버전별, 히트 시 임베딩/검색 SQL 생략)
+        self.result_cache = None
+        if os.getenv("RETRIEVAL_CACHE_ENABLED", "true").lower() == "true":
+            self.result_cache = RetrievalResultCache(self.pool, self.table_name)
+        
+        # 시맨틱 검색 엔진: sql (pgvector) | numpy (인프로세스 스냅샷, 불가 시 SQL 폴백) | compare (SQL 결과 반환 + A/B 비교)
+        self.vector_engine_mode = os.getenv("SEARCH_VECTOR_ENGINE", "sql").lower()
+        self.vector_engine = None
+        if self.vector_engine_mode in ("numpy", "compare"):
+            self.vector_engine = VectorEngine(self.pool, self.table_name)
+        
+        # 키워드 검색 엔진: sql (to_tsquery + ts_rank) | bm25 (인프로세스 역색인, 불가 시 SQL 폴백)
+        self.keyword_engine_mode = os.getenv("SEARCH_KEYWORD_ENGINE", "sql").lower()
+        self.keyword_engine = None
+        if self.keyword_engine_mode == "bm25":
+            analyzer = KeywordAnalyzer(kiwi=self.kiwi, nlp_provider=self._get_nlp)
+            self.keyword_engine = KeywordEngine(self.pool, analyzer, self.table_name)
     
     def _get_optimal_keyword_count(self, query: str) -> int:
         """
@@ -51,14 +89,7 @@ class HybridSearch:
         Returns:
             최적 키워드 수
         """
-        query_length = len(query.split())  # 단어 수 기준
-        
-        if query_length <= 3:
-            return 2  # 짧은 쿼리는 2개
-        elif query_length <= 6:
-            return 3  # 중간 쿼리는 3개
-        else:
-            return 4  # 긴 쿼리는 4개
+        return optimal_keyword_count(query)
     
     def _check_pool_health(self) -> bool:
         """
@@ -140,6 +171,65 @@ class HybridSearch:
         )
         raise last_error
     
+    def _filter_sql(
+        self,
+        filter: MVPSearchFilter,
+        boost_filter: Optional[MVPSearchFilter] = None
+    ) -> Tuple[Tuple, str, Optional[str], Dict[str, Any]]:
+        """
+        필터 형태별로 캐시된 WHERE 절과 이번 검색의 파라미터
+        
+        Returns:
+            (형태 키, WHERE 절, boost WHERE 절 또는 None, 파라미터 딕셔너리)
+        """
+        shape = (filter.shape(), boost_filter.shape() if boost_filter is not None else None)
+        where_clause, boost_where = self.sql_cache.fragment(("where",) + shape, lambda: (
+            filter.to_sql_where()[0],
+            boost_filter.to_sql_where(param_prefix="boost_")[0] if boost_filter is not None else None
+        ))
+        params = filter.sql_params()
+        if boost_filter is not None:
+            # 파라미터 이름 충돌 방지를 위해 접두사 사용
+            params.update(boost_filter.sql_params(param_prefix="boost_"))
+        return shape, where_clause, boost_where, params
+    
+    def get_sql_stats(self) -> Dict[str, Any]:
+        """컴파일된 SQL 캐시 통계 (라벨별 실행 시간, 샘플링된 계획/실행 시간)"""
+        return self.sql_cache.get_stats()
+    
+    def filter_has_matches(
+        self,
+        filter: MVPSearchFilter,
+        boost_filter: Optional[MVPSearchFilter] = None
+    ) -> bool:
+        """
+        필터와 일치하는 (임베딩이 있는) 문서가 하나라도 있는지 확인
+        
+        EXISTS 프로브는 첫 행에서 멈추고 필터 인덱스를 사용하므로 검색 fan-out 전에
+        "필터가 아무것도 못 찾는" 경우를 저렴하게 걸러낼 수 있음.
+        
+        Args:
+            filter: 검색 필터
+            boost_filter: 우선 순위 필터 (search()와 같이 둘 중 하나라도 일치하면 True)
+        """
+        shape, where_clause, boost_where, params = self._filter_sql(filter, boost_filter)
+        branches = [where_clause] if boost_where is None else [where_clause, boost_where]
+        compiled = self.sql_cache.get(("preflight",) + shape, "preflight", lambda: "SELECT " + " OR ".join(
+            f"EXISTS (SELECT 1 FROM {self.table_name} WHERE {branch} "
+            f"AND (embedding_korean IS NOT NULL OR embedding_english IS NOT NULL))"
+            for branch in branches
+        ))
+        
+        def execute_probe(conn):
+            with conn.cursor() as cur:
+                self.sql_cache.execute(cur, compiled, params)
+                return bool(cur.fetchone()[0])
+        
+        matched = self._execute_with_retry(execute_probe, operation_name="filter_preflight")
+        logger.info(f"[HYBRID] Filter preflight: {'match' if matched else 'no match'}")
+        log_detail(logger, lambda: f"[HYBRID] Filter preflight WHERE: {where_clause}")
+        return matched
+    
     def search(
         self, 
         query: str, 
@@ -147,7 +237,8 @@ class HybridSearch:
         language: str = 'korean',
         top_k: int = None,
         semantic_weight: float = None,
-        keyword_weight: float = None
+        keyword_weight: float = None,
+        boost_filter: Optional[MVPSearchFilter] = None
     ) -> List[Dict[str, Any]]:
         """
         하이브리드 검색 실행
@@ -159,9 +250,11 @@ class HybridSearch:
             top_k: 반환할 최대 문서 수 (None이면 .env 기본값 사용)
             semantic_weight: 시맨틱 검색 가중치 (None이면 .env 기본값 사용)
             keyword_weight: 키워드 검색 가중치 (None이면 .env 기본값 사용)
+            boost_filter: 우선 순위 필터 (예: entity). 같은 SQL에서 이 필터의 상위 결과를 함께 가져와
+                          결과 앞쪽에 배치 (boosted=True). 필터별로 검색을 두 번 하는 것과 같은 순서 보장
             
         Returns:
-            검색 결과 리스트
+            검색 결과 리스트 (SQL 경로는 SearchRecord, 인프로세스 엔진은 dict; 둘 다 get/[] 지원)
         """
         from concurrent.futures import ThreadPoolExecutor
         
@@ -173,19 +266,32 @@ class HybridSearch:
         if keyword_weight is None:
             keyword_weight = float(os.getenv("SEARCH_DEFAULT_KEYWORD_WEIGHT", "0.5"))
         
-        # 키워드 추출 (통계용)
-        if language == 'korean':
-            extracted_keywords = self._extract_korean_keywords(query)
-        else:
-            extracted_keywords = self._extract_english_keywords(query)
+        # 결과 캐시: 같은 코퍼스 버전의 동일 검색이면 순위를 재사용하고 페이로드만 기본키로 조회
+        cache_key = cache_version = None
+        if self.result_cache is not None:
+            cache_version = self.result_cache.corpus_version()
+        if cache_version is not None:
+            cache_key = make_result_key(query, filter, language, top_k, semantic_weight, keyword_weight, boost_filter)
+            cached = self.result_cache.get(cache_key, cache_version)
+            if cached is not None:
+                records = self._hydrate_cached(cached["results"])
+                if records is not None:
+                    self.last_search_stats = {**cached["stats"], "cache_hit": True}
+                    logger.info(f"[HYBRID] Result cache hit: {len(records)} results "
+                                f"(hit rate: {self.result_cache.hit_rate():.1%})")
+                    return records
+        
+        # 쿼리 분석 1회 (통계와 키워드 검색이 공유, 배치로 미리 계산된 경우 메모 사용)
+        analysis = self.query_analyzer.analyze(query, language)
+        extracted_keywords = list(analysis.keywords)
         
         # ThreadPoolExecutor를 사용한 병렬 검색 실행
         with ThreadPoolExecutor(max_workers=2) as executor:
-            semantic_future = executor.submit(
-                self._semantic_search, query, filter, language, top_k * 2
+            semantic_future = submit_in_context(
+                executor, self._semantic_search, query, filter, language, top_k * 2, boost_filter
             )
-            keyword_future = executor.submit(
-                self._keyword_search, query, filter, language, top_k * 2
+            keyword_future = submit_in_context(
+                executor, self._keyword_search, query, filter, language, top_k * 2, boost_filter, analysis
             )
             
             # 결과 대기
@@ -193,13 +299,22 @@ class HybridSearch:
             keyword_results = keyword_future.result()
         
         # RRF 병합
-        merged_results = self._rrf_merge(
-            semantic_results, 
-            keyword_results, 
-            top_k,
-            semantic_weight,
-            keyword_weight
-        )
+        if boost_filter is not None:
+            merged_results = self._boosted_rrf_merge(
+                semantic_results,
+                keyword_results,
+                top_k,
+                semantic_weight,
+                keyword_weight
+            )
+        else:
+            merged_results = self._rrf_merge(
+                semantic_results, 
+                keyword_results, 
+                top_k,
+                semantic_weight,
+                keyword_weight
+            )
         
         # 검색 통계 저장
         self.last_search_stats = {
@@ -207,17 +322,54 @@ class HybridSearch:
             "keyword_count": len(keyword_results),
             "semantic_count": len(semantic_results),
             "total_merged": len(merged_results),
+            "boosted_count": sum(1 for doc in merged_results if doc.get("boosted")),
             "language": language
         }
         
+        if cache_key is not None:
+            self.result_cache.set(cache_key, cache_version, merged_results, self.last_search_stats)
+        
         return merged_results
     
+    def _hydrate_cached(self, entries: List[Dict[str, Any]]) -> Optional[List[SearchRecord]]:
+        """
+        캐시된 순위(id + 점수)에 페이로드를 채워 검색 결과로 복원
+        
+        Args:
+            entries: RetrievalResultCache에 저장된 순위 목록
+            
+        Returns:
+            순위 순서의 SearchRecord 리스트 (문서가 사라졌으면 None -> 다시 검색)
+        """
+        ids = [entry["id"] for entry in entries]
+        compiled = self.sql_cache.get(
+            ("hydrate",), "hydrate",
+            lambda: f"SELECT {PAYLOAD_SQL} FROM {self.table_name} WHERE id = ANY(%(ids)s)"
+        )
+        
+        def execute_fetch(conn):
+            with conn.cursor() as cur:
+                self.sql_cache.execute(cur, compiled, {"ids": ids})
+                return SearchRecord.from_cursor(cur)
+        
+        by_id = {record.id: record for record in self._execute_with_retry(execute_fetch, operation_name="result_cache_fetch")}
+        if len(by_id) != len(set(ids)):
+            return None
+        records = []
+        for entry in entries:
+            record = by_id[entry["id"]]
+            for name in SCORE_FIELDS:
+                record[name] = entry.get(name)
+            records.append(record)
+        return records
+    
     def _semantic_search(
         self, 
         query: str, 
         filter: MVPSearchFilter,
         language: str,
-        limit: int
+        limit: int,
+        boost_filter: Optional[MVPSearchFilter] = None
     ) -> List[Dict[str, Any]]:
         """
         벡터 유사도 검색
@@ -227,15 +379,21 @@ class HybridSearch:
             filter: 검색 필터
             language: 언어
             limit: 최대 결과 수
+            boost_filter: 우선 순위 필터 (해당 상위 결과가 boosted=True로 앞에 옴)
             
         Returns:
             검색 결과 리스트
         """
-        # 쿼리 임베딩 생성 (동기 버전 사용)
-        query_embedding = self.embeddings.embed_query_sync(query, language)
+        # 쿼리 임베딩 생성 (동기 버전 사용, float32 배열로 한 번만 변환)
+        query_embedding = to_vector_array(self.embeddings.embed_query_sync(query, language))
         
-        # 임베딩을 pgvector 형식 문자열로 변환
-        embedding_str = f"[{','.join(map(str, query_embedding))}]"
+        # 인프로세스 벡터 엔진 (스냅샷이 없거나 지원하지 않는 필터면 None -> SQL 경로)
+        engine_results = None
+        if self.vector_engine is not None and boost_filter is None:
+            engine_results = self.vector_engine.search(query_embedding, language, filter, limit)
+            if engine_results is not None and self.vector_engine_mode == "numpy":
+                logger.info(f"[HYBRID] Semantic search served by vector engine: {len(engine_results)} results")
+                return engine_results
         
         # 언어별 임베딩 컬럼 선택
         if language == 'korean':
@@ -243,64 +401,46 @@ class HybridSearch:
         else:
             embedding_column = 'embedding_english'
         
-        # SQL 쿼리 구성 (psycopg3용)
-        where_clause, filter_params = filter.to_sql_where()
+        # WHERE 절은 필터 형태별로 캐시, 파라미터만 새로 구성 (우선 순위 필터는 boost_ 접두사)
+        _, where_clause, boost_where, filter_params = self._filter_sql(filter, boost_filter)
+        params = {'limit': limit, **filter_params}
         
-        # 파라미터 딕셔너리 구성
-        params = {
-            'embedding': embedding_str,
-            'limit': limit
-        }
-        # 필터 파라미터 병합
-        params.update(filter_params)
-        
-        sql = f"""
-        SELECT 
+        select_sql = self.sql_cache.fragment(("semantic_select", embedding_column), lambda: f"""
             id, source, page, category, page_content,
             translation_text, contextualize_text, caption, entity,
             image_path, human_feedback,
-            1 - ({embedding_column} <=> %(embedding)s::vector) as similarity
-        FROM mvp_ddu_documents
-        WHERE {where_clause}
-            AND {embedding_column} IS NOT NULL
-        ORDER BY {embedding_column} <=> %(embedding)s::vector
-        LIMIT %(limit)s
-        """
+            1 - ({embedding_column} <=> %(embedding)s::vector) as similarity""")
         
-        # 디버깅을 위한 WHERE 절 로깅
-        logger.info(f"[HYBRID] Semantic search WHERE clause: {where_clause}")
-        logger.info(f"[HYBRID] Semantic filter params: {filter_params}")
+        # 디버깅을 위한 WHERE 절 로깅 (샘플된 요청 / 느린 요청만)
+        log_detail(logger, lambda: [
+            f"[HYBRID] Semantic search WHERE clause: {where_clause}",
+            f"[HYBRID] Semantic filter params: {filter_params}"
+        ])
         
         # Retry logic을 사용한 실행
         def execute_semantic(conn):
-            logger.info(f"[HYBRID] Executing semantic search with {len(params)} params")
-            with conn.cursor() as cur:
-                cur.execute(sql, params)
-                results = cur.fetchall()
-                # 컬럼명 가져오기
-                columns = [desc[0] for desc in cur.description]
-                # 딕셔너리 리스트로 변환
-                dict_results = [dict(zip(columns, row)) for row in results]
-                logger.info(f"[HYBRID] Semantic search returned {len(dict_results)} results")
-                
-                # 상위 3개 결과 상세 로깅
-                if dict_results:
-                    logger.info(f"[HYBRID] === Semantic Search Top Results ({language}) ===")
-                    for i, doc in enumerate(dict_results[:3]):
-                        content_preview = doc.get('page_content', '')[:200] if doc.get('page_content') else ""
-                        logger.info(f"[HYBRID]   [{i+1}] Similarity: {doc.get('similarity', 0):.4f}")
-                        logger.info(f"[HYBRID]       Source: {doc.get('source')}, Page: {doc.get('page')}, Category: {doc.get('category')}")
-                        logger.info(f"[HYBRID]       Content: {content_preview}...")
-                        if doc.get('human_feedback'):
-                            logger.info(f"[HYBRID]       Human Feedback: {doc.get('human_feedback')[:100]}...")
-                
-                return dict_results
+            # pgvector 어댑터가 있는 연결이면 float32 배열을 바이너리로 전송 (없으면 텍스트 리터럴)
+            params['embedding'] = vector_param(conn, query_embedding)
+            # 필터 선택도에 따라 ANN / iterative scan / exact 선택 (필터가 있어도 limit까지 채움)
+            records, strategy = self.filtered_search.search(
+                conn, embedding_column, select_sql, where_clause, params, limit, boost_where
+            )
+            logger.info(f"[HYBRID] Semantic search returned {len(records)} results ({strategy})")
+            
+            # 상위 3개 결과 상세 로깅 (미리보기는 출력할 때만 생성)
+            if records:
+                log_detail(logger, lambda: self._semantic_preview(records, language))
+            
+            return records
         
         results = self._execute_with_retry(
             execute_semantic,
             operation_name=f"semantic_search({language})"
         )
         
+        if engine_results is not None:
+            self.vector_engine.compare(results, engine_results)
+        
         return results
     
     def _keyword_search(
@@ -308,7 +448,9 @@ class HybridSearch:
         query: str, 
         filter: MVPSearchFilter,
         language: str,
-        limit: int
+        limit: int,
+        boost_filter: Optional[MVPSearchFilter] = None,
+        analysis: Optional[QueryAnalysis] = None
     ) -> List[Dict[str, Any]]:
         """
         키워드 전문 검색
@@ -318,62 +460,42 @@ class HybridSearch:
             filter: 검색 필터
             language: 언어
             limit: 최대 결과 수
+            boost_filter: 우선 순위 필터 (해당 상위 결과가 boosted=True로 앞에 옴)
+            analysis: 미리 계산한 쿼리 분석 (None이면 분석기에서 조회)
             
         Returns:
             검색 결과 리스트
         """
-        # psycopg3용 WHERE 절 생성
-        where_clause, filter_params = filter.to_sql_where()
-        
-        # 언어별 검색 쿼리 생성
-        if language == 'korean':
-            # Kiwi 토크나이저로 키워드 추출
-            keywords = self._extract_korean_keywords(query)
-            logger.info(f"[HYBRID] Korean keywords extracted ({len(keywords)}): {keywords}")
-            if not keywords:
-                logger.warning(f"[HYBRID] No Korean keywords extracted from: '{query}'")
-                return []
-            # 정교한 검색 전략: 키워드 수에 따라 AND/OR 조합
-            if len(keywords) <= 2:
-                # 2개 이하면 모두 AND (엄격한 매칭)
-                search_query = ' & '.join(keywords)
-                logger.info(f"[HYBRID] Korean search query (AND only): '{search_query}'")
-            else:
-                # 3개 이상이면 첫 2개는 AND, 나머지는 OR (유연한 매칭)
-                primary = ' & '.join(keywords[:2])
-                optional = ' | '.join(keywords[2:])
-                search_query = f"({primary}) | {optional}"
-                logger.info(f"[HYBRID] Korean search query (mixed AND/OR): '{search_query}'")
-            search_column = 'search_vector_korean'
-        else:
-            # 영어는 정교한 키워드 추출 사용 (동기)
-            keywords = self._extract_english_keywords(query)
-            logger.info(f"[HYBRID] English keywords extracted ({len(keywords)}): {keywords}")
-            if not keywords:
-                logger.warning(f"[HYBRID] No English keywords extracted from: '{query}'")
-                return []
-            # 정교한 검색 전략: 키워드 수에 따라 AND/OR 조합
-            if len(keywords) <= 2:
-                # 2개 이하면 모두 AND (엄격한 매칭)
-                search_query = ' & '.join(keywords)
-                logger.info(f"[HYBRID] English search query (AND only): '{search_query}'")
-            else:
-                # 3개 이상이면 첫 2개는 AND, 나머지는 OR (유연한 매칭)
-                primary = ' & '.join(keywords[:2])
-                optional = ' | '.join(keywords[2:])
-                search_query = f"({primary}) | {optional}"
-                logger.info(f"[HYBRID] English search query (mixed AND/OR): '{search_query}'")
-            search_column = 'search_vector_english'
+        # 인프로세스 BM25 엔진 (인덱스가 없거나 지원하지 않는 필터면 None -> SQL 경로)
+        if self.keyword_engine is not None and boost_filter is None:
+            engine_results = self.keyword_engine.search(query, filter, language, limit)
+            if engine_results is not None:
+                logger.info(f"[HYBRID] Keyword search served by BM25 engine: {len(engine_results)} results")
+                return engine_results
+        
+        # WHERE 절은 필터 형태별로 캐시 (우선 순위 필터 포함)
+        shape, where_clause, boost_where, filter_params = self._filter_sql(filter, boost_filter)
+        
+        # 키워드와 tsquery (키워드 수에 따라 AND/OR 조합)는 쿼리 분석 결과 사용
+        if analysis is None:
+            analysis = self.query_analyzer.analyze(query, language)
+        keywords = list(analysis.keywords)
+        search_query = analysis.tsquery
+        label = 'Korean' if language == 'korean' else 'English'
+        if not keywords:
+            logger.warning(f"[HYBRID] No {label} keywords extracted from: '{query}'")
+            return []
+        search_column = 'search_vector_korean' if language == 'korean' else 'search_vector_english'
         
         # 파라미터 딕셔너리 구성
         params = {
             'search_query': search_query,
-            'limit': limit
+            'limit': limit,
+            **filter_params
         }
-        # 필터 파라미터 병합
-        params.update(filter_params)
         
-        sql = f"""
+        def build_sql() -> str:
+            sql = f"""
         SELECT 
             id, source, page, category, page_content,
             translation_text, contextualize_text, caption, entity,
@@ -385,42 +507,46 @@ class HybridSearch:
         ORDER BY rank DESC
         LIMIT %(limit)s
         """
+            
+            # 우선 순위 필터: 같은 tsquery로 boost 조건의 상위 결과를 함께 조회해 앞에 배치
+            if boost_where is not None:
+                boost_sql = sql.replace(f"WHERE {where_clause}", f"WHERE {boost_where}", 1)
+                sql = f"""
+        SELECT * FROM (
+            SELECT *, true AS boosted FROM ({boost_sql}) boosted_rows
+            UNION ALL
+            SELECT *, false AS boosted FROM ({sql}) general_rows
+        ) ranked
+        ORDER BY boosted DESC, rank DESC, id
+        """
+            return sql
+        
+        compiled = self.sql_cache.get(("keyword", search_column) + shape, f"keyword:{search_column}", build_sql)
+        sql = compiled.sql
         
-        # 디버깅을 위한 상세 로깅
-        logger.info(f"[HYBRID] WHERE clause: {where_clause}")
-        logger.info(f"[HYBRID] Filter params: {filter_params}")
-        logger.info(f"[HYBRID] Search query for tsquery: '{search_query}'")
-        logger.info(f"[HYBRID] Search column: {search_column}")
-        logger.info(f"[HYBRID] SQL preview: {sql[:200]}...")
+        # 디버깅을 위한 상세 로깅 (샘플된 요청 / 느린 요청만)
+        log_detail(logger, lambda: [
+            f"[HYBRID] {label} keywords extracted ({len(keywords)}): {keywords}",
+            f"[HYBRID] WHERE clause: {where_clause}",
+            f"[HYBRID] Filter params: {filter_params}",
+            f"[HYBRID] Search query for tsquery: '{search_query}'",
+            f"[HYBRID] Search column: {search_column}",
+            f"[HYBRID] SQL preview: {sql[:200]}..."
+        ])
         
         # Retry logic을 사용한 실행
         def execute_keyword(conn):
-            logger.info(f"[HYBRID] Executing keyword search with {len(params)} params")
             with conn.cursor() as cur:
-                cur.execute(sql, params)
-                results = cur.fetchall()
-                # 컬럼명 가져오기
-                columns = [desc[0] for desc in cur.description]
-                # 딕셔너리 리스트로 변환
-                dict_results = [dict(zip(columns, row)) for row in results]
-                logger.info(f"[HYBRID] Keyword search returned {len(dict_results)} results")
+                self.sql_cache.execute(cur, compiled, params)
+                # 행 튜플을 그대로 쓰는 SearchRecord (행마다 dict를 만들지 않음)
+                records = SearchRecord.from_cursor(cur)
+                logger.info(f"[HYBRID] Keyword search returned {len(records)} results")
                 
-                # 상위 3개 결과 상세 로깅
-                if dict_results:
-                    logger.info(f"[HYBRID] === Keyword Search Top Results ({language}) ===")
-                    logger.info(f"[HYBRID]     Search keywords: {keywords}")
-                    logger.info(f"[HYBRID]     Search query: '{search_query}'")
-                    for i, doc in enumerate(dict_results[:3]):
-                        content_preview = doc.get('page_content', '')[:200] if doc.get('page_content') else ""
-                        logger.info(f"[HYBRID]   [{i+1}] Rank: {doc.get('rank', 0):.4f}")
-                        logger.info(f"[HYBRID]       Source: {doc.get('source')}, Page: {doc.get('page')}, Category: {doc.get('category')}")
-                        logger.info(f"[HYBRID]       Content: {content_preview}...")
-                        # 키워드 하이라이트
-                        for kw in keywords[:3]:
-                            if kw in content_preview:
-                                logger.info(f"[HYBRID]       ✓ Found keyword: '{kw}'")
+                # 상위 3개 결과 상세 로깅 (미리보기와 키워드 확인은 출력할 때만)
+                if records:
+                    log_detail(logger, lambda: self._keyword_preview(records, language, keywords, search_query))
                 
-                return dict_results
+                return records
         
         results = self._execute_with_retry(
             execute_keyword,
@@ -429,6 +555,38 @@ class HybridSearch:
         
         return results
     
+    @staticmethod
+    def _semantic_preview(records: List[Any], language: str) -> List[str]:
+        """시맨틱 검색 상위 3개 결과 로그 줄"""
+        lines = [f"[HYBRID] === Semantic Search Top Results ({language}) ==="]
+        for i, doc in enumerate(records[:3]):
+            content_preview = doc.get('page_content', '')[:200] if doc.get('page_content') else ""
+            lines.append(f"[HYBRID]   [{i+1}] Similarity: {doc.get('similarity', 0):.4f}")
+            lines.append(f"[HYBRID]       Source: {doc.get('source')}, Page: {doc.get('page')}, Category: {doc.get('category')}")
+            lines.append(f"[HYBRID]       Content: {content_preview}...")
+            if doc.get('human_feedback'):
+                lines.append(f"[HYBRID]       Human Feedback: {doc.get('human_feedback')[:100]}...")
+        return lines
+    
+    @staticmethod
+    def _keyword_preview(records: List[Any], language: str, keywords: List[str], search_query: str) -> List[str]:
+        """키워드 검색 상위 3개 결과 로그 줄 (키워드 하이라이트 포함)"""
+        lines = [
+            f"[HYBRID] === Keyword Search Top Results ({language}) ===",
+            f"[HYBRID]     Search keywords: {keywords}",
+            f"[HYBRID]     Search query: '{search_query}'"
+        ]
+        for i, doc in enumerate(records[:3]):
+            content_preview = doc.get('page_content', '')[:200] if doc.get('page_content') else ""
+            lines.append(f"[HYBRID]   [{i+1}] Rank: {doc.get('rank', 0):.4f}")
+            lines.append(f"[HYBRID]       Source: {doc.get('source')}, Page: {doc.get('page')}, Category: {doc.get('category')}")
+            lines.append(f"[HYBRID]       Content: {content_preview}...")
+            # 키워드 하이라이트
+            for kw in keywords[:3]:
+                if kw in content_preview:
+                    lines.append(f"[HYBRID]       ✓ Found keyword: '{kw}'")
+        return lines
+    
     def _extract_korean_keywords(self, text: str) -> List[str]:
         """
         Kiwi를 사용한 한국어 키워드 추출 (DB와 동일한 토크나이징)
@@ -439,55 +597,7 @@ class HybridSearch:
         Returns:
             키워드 리스트
         """
-        try:
-            result = self.kiwi.tokenize(text)
-            
-            # 균형잡힌 품사 세트 (명사, 중요 동사/형용사, 외래어)
-            # 제외: VX(보조용언), MM(관형사), MAG(부사), XR(어근) - 노이즈 방지
-            meaningful_pos = {'NNG', 'NNP', 'NNB', 'VV', 'VA', 'SL', 'SH', 'SN'}
-            keywords = []
-            
-            # Kiwi는 Token 객체의 리스트를 반환
-            for token in result:
-                # Token 객체에서 형태소 정보 추출
-                if hasattr(token, 'tag') and hasattr(token, 'form'):
-                    if token.tag in meaningful_pos:
-                        # 명사 및 중요 품사
-                        if token.tag.startswith('NN') or token.tag in {'SL', 'SH', 'SN'}:
-                            # 1글자 이상 (숫자, 영어 포함) 또는 2글자 이상 한글
-                            if len(token.form) > 1 or token.tag in {'SL', 'SH', 'SN', 'NNB'}:
-                                keywords.append((token.form, 1.0))  # 명사는 가중치 1.0
-                        elif token.tag.startswith(('VV', 'VA')):
-                            # 중요 동사/형용사 (2글자 이상)
-                            if len(token.form) >= 2:
-                                keywords.append((token.form, 0.7))  # 동사/형용사는 가중치 0.7
-            
-            # 중복 제거하면서 순서 유지 (가중치 고려)
-            seen = set()
-            unique_keywords = []
-            for keyword, weight in keywords:
-                if keyword not in seen:
-                    seen.add(keyword)
-                    unique_keywords.append(keyword)
-            
-            # 동적 키워드 수 결정 (쿼리 길이에 따라)
-            max_keywords = self._get_optimal_keyword_count(text)
-            limited_keywords = unique_keywords[:max_keywords]
-            logger.debug(f"[HYBRID] Korean keyword count: {max_keywords} (from {len(unique_keywords)} candidates)")
-            
-            # 키워드가 너무 적으면 원본 쿼리 사용
-            if len(limited_keywords) < 2:
-                # 공백으로 분리하고 불용어 제거
-                stop_words = {'의', '를', '을', '에', '와', '과', '로', '으로', '에서', '부터', '까지', '및', '또는'}
-                words = [w for w in text.split() if w not in stop_words and len(w) >= 2]
-                limited_keywords = words[:max_keywords]
-            
-            return limited_keywords
-            
-        except Exception as e:
-            print(f"Keyword extraction error: {e}")
-            # 오류 시 원본 텍스트의 공백 분리 사용
-            return text.split()
+        return list(self.query_analyzer.analyze(text, 'korean').keywords)
     
     def _ensure_spacy_loaded(self):
         """spaCy 모델을 동기적으로 로드 (한 번만 시도)"""
@@ -501,90 +611,22 @@ class HybridSearch:
                 logger.warning(f"[HYBRID] Failed to load spaCy model (sync): {e}. Will use simple extraction.")
                 self.nlp = None
     
+    def _get_nlp(self):
+        """spaCy 파이프라인 (로드 실패 시 None)"""
+        self._ensure_spacy_loaded()
+        return self.nlp
+    
     def _extract_english_keywords(self, text: str) -> List[str]:
         """
-        영어 키워드 추출 (spaCy를 사용한 지능적 품사 분석)
-        한국어 Kiwi와 동일한 수준의 정교함 제공
+        영어 키워드 추출 (spaCy를 사용한 지능적 품사 분석, 미로드 시 간단한 추출)
         
         Args:
             text: 입력 텍스트
             
         Returns:
-            키워드 리스트 (최대 3개)
+            키워드 리스트
         """
-        try:
-            # spaCy 모델 동기 로딩 시도
-            self._ensure_spacy_loaded()
-            
-            # spaCy 모델이 로드되지 않았으면 간단한 폴백 처리
-            if not self.nlp:
-                return self._extract_english_keywords_simple(text)
-            
-            # spaCy로 텍스트 처리
-            doc = self.nlp(text)
-            
-            # 키워드 후보 수집 (가중치 포함)
-            keywords = []
-            
-            # spaCy의 품사 태그 기반 추출
-            for token in doc:
-                # 불용어, 구두점, 공백 제외
-                if token.is_stop or token.is_punct or token.is_space:
-                    continue
-                
-                # 2글자 이상만 고려
-                if len(token.text) < 2:
-                    continue
-                
-                # 품사별 가중치 부여 (한국어와 동일한 전략)
-                weight = 0.0
-                if token.pos_ == "PROPN":  # 고유명사 최우선
-                    weight = 1.5
-                    keywords.append((token.text.lower(), weight))
-                elif token.pos_ == "NOUN":  # 일반 명사
-                    weight = 1.0
-                    keywords.append((token.text.lower(), weight))
-                elif token.pos_ in ["ADJ", "VERB"] and len(token.text) >= 3:  # 형용사, 동사는 3글자 이상
-                    weight = 0.7
-                    keywords.append((token.text.lower(), weight))
-            
-            # 복합 명사구 추출 (추가 보너스)
-            for chunk in doc.noun_chunks:
-                # 2-3 단어로 구성된 명사구만
-                chunk_text = chunk.text.lower()
-                chunk_words = chunk_text.split()
-                if 2 <= len(chunk_words) <= 3:
-                    # 단일 단어로 처리하지 말고 중요 단어만 추출
-                    for token in chunk:
-                        if token.pos_ in ["NOUN", "PROPN", "ADJ"] and not token.is_stop:
-                            if len(token.text) >= 2:
-                                keywords.append((token.text.lower(), 1.2))  # 명사구 내 단어는 보너스 가중치
-            
-            # 중복 제거하면서 가중치 최대값 유지
-            keyword_dict = {}
-            for keyword, weight in keywords:
-                if keyword not in keyword_dict or keyword_dict[keyword] < weight:
-                    keyword_dict[keyword] = weight
-            
-            # 가중치 기준으로 정렬
-            sorted_keywords = sorted(keyword_dict.items(), key=lambda x: x[1], reverse=True)
-            
-            # 동적 키워드 수 결정 (쿼리 길이에 따라)
-            max_keywords = self._get_optimal_keyword_count(text)
-            limited_keywords = [keyword for keyword, weight in sorted_keywords[:max_keywords]]
-            logger.debug(f"[HYBRID] English keyword count: {max_keywords} (from {len(sorted_keywords)} candidates)")
-            
-            # 키워드가 너무 적으면 대안 처리
-            if len(limited_keywords) < 2:
-                # spaCy가 제대로 추출 못했을 경우 폴백
-                return self._extract_english_keywords_simple(text)
-            
-            logger.info(f"[HYBRID] spaCy extracted keywords: {limited_keywords} from '{text}'")
-            return limited_keywords
-            
-        except Exception as e:
-            logger.warning(f"[HYBRID] spaCy keyword extraction error: {e}. Falling back to simple extraction.")
-            return self._extract_english_keywords_simple(text)
+        return list(self.query_analyzer.analyze(text, 'english').keywords)
     
     def _extract_english_keywords_simple(self, text: str) -> List[str]:
         """
@@ -594,53 +636,9 @@ class HybridSearch:
             text: 입력 텍스트
             
         Returns:
-            키워드 리스트 (최대 3개)
-        """
-        # 영어 불용어 목록
-        english_stop_words = {
-            'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from',
-            'has', 'he', 'in', 'is', 'it', 'its', 'of', 'on', 'that', 'the',
-            'to', 'was', 'will', 'with', 'this', 'these', 'they', 'we', 'you',
-            'have', 'had', 'what', 'when', 'where', 'who', 'which', 'why', 'how'
-        }
-        
-        # 공백으로 분리하고 소문자 변환
-        words = text.lower().split()
-        
-        # 키워드 후보 수집
-        keyword_candidates = []
-        
-        for word in words:
-            # 구두점 제거
-            clean_word = ''.join(c for c in word if c.isalnum())
-            
-            if not clean_word or clean_word in english_stop_words:
-                continue
-            
-            # 길이 기반 필터링 (2글자 이상)
-            if len(clean_word) >= 2:
-                # 대문자로 시작했던 단어는 고유명사일 가능성 (보너스)
-                score = len(clean_word) * (1.5 if word[0].isupper() else 1.0)
-                keyword_candidates.append((clean_word, score))
-        
-        # 점수별로 정렬
-        keyword_candidates.sort(key=lambda x: x[1], reverse=True)
-        
-        # 동적 키워드 수 결정 (쿼리 길이에 따라)
-        max_keywords = self._get_optimal_keyword_count(text)
-        
-        # 중복 제거하면서 동적 개수만큼 선택
-        seen = set()
-        limited_keywords = []
-        for keyword, score in keyword_candidates:
-            if keyword not in seen:
-                seen.add(keyword)
-                limited_keywords.append(keyword)
-                if len(limited_keywords) >= max_keywords:
-                    break
-        
-        logger.info(f"[HYBRID] Simple extraction keywords: {limited_keywords} from '{text}'")
-        return limited_keywords
+            키워드 리스트
+        """
+        return english_keywords_simple(text)
     
     def _rrf_merge(
         self,
@@ -706,6 +704,38 @@ class HybridSearch:
         
         return final_results
 
+    def _boosted_rrf_merge(
+        self,
+        semantic_results: List[Dict],
+        keyword_results: List[Dict],
+        top_k: int,
+        semantic_weight: float = 0.5,
+        keyword_weight: float = 0.5
+    ) -> List[Dict[str, Any]]:
+        """
+        우선 순위(boosted) 결과를 먼저, 나머지로 top_k까지 채우는 RRF 병합
+        
+        그룹별로 RRF 순위와 점수 정규화를 따로 계산하므로 필터별로 검색을 두 번 실행한 뒤
+        앞의 결과부터 이어붙이는 것과 같은 순서가 됨.
+        """
+        boosted = self._rrf_merge(
+            [doc for doc in semantic_results if doc.get('boosted')],
+            [doc for doc in keyword_results if doc.get('boosted')],
+            top_k,
+            semantic_weight,
+            keyword_weight
+        )
+        seen_ids = {doc['id'] for doc in boosted}
+        general = self._rrf_merge(
+            [doc for doc in semantic_results if not doc.get('boosted')],
+            [doc for doc in keyword_results if not doc.get('boosted')],
+            top_k,
+            semantic_weight,
+            keyword_weight
+        )
+        general = [doc for doc in general if doc['id'] not in seen_ids]
+        return boosted + general[:top_k - len(boosted)]
+
   # 사용하지 않음  
     # async def search_with_feedback(
     #     self, 
@@ -0,0 +1,343 @@
+"""
+In-process BM25 Keyword Engine
+to_tsquery + ts_rank(IDF 없음) 대신 역색인 + BM25 점수로 키워드 검색
+
+- 문서/쿼리 모두 같은 분석기 사용: Kiwi 형태소(한국어), spaCy 표제어(영어)
+- 색인 텍스트는 인제스트의 search_vector_korean/english와 동일 (ingest.search_text)
+- 포스팅은 CSR 배열로 저장하고 mmap으로 로드:
+    {language}_terms.json      # 용어 목록 (용어 id = 위치)
+    {language}_offsets.npy     # 용어별 포스팅 시작 위치 (int64, V+1)
+    {language}_rows.npy        # 포스팅 행 번호 (int32)
+    {language}_tf.npy          # 용어 빈도 (uint16)
+    {language}_doc_len.npy     # 문서 길이 (float32)
+- MVPSearchFilter는 벡터 엔진과 같은 비트셋(MetadataColumns)으로 적용
+"""
+
+import os
+import json
+import logging
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+from dotenv import load_dotenv
+
+from ingest.search_text import build_search_texts
+from retrieval.query_analysis import ENGLISH_STOP_WORDS, english_term_weight, korean_term_weight
+from retrieval.search_filter import MVPSearchFilter
+from retrieval.snapshot import (
+    PAYLOAD_FIELDS, PAYLOAD_SQL, MetadataColumns, PayloadStore, PayloadWriter, SnapshotEngine
+)
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+LANGUAGES = ("korean", "english")
+
+# 인덱스 빌드 시 형태소 분석 배치 크기
+ANALYZE_BATCH_SIZE = 256
+
+
+class KeywordAnalyzer:
+    """문서와 쿼리에 공통으로 쓰는 토큰 분석기"""
+
+    def __init__(self, kiwi: Any = None, nlp_provider: Optional[Callable[[], Any]] = None):
+        """
+        Args:
+            kiwi: 공유할 Kiwi 인스턴스 (None이면 필요할 때 생성)
+            nlp_provider: spaCy 파이프라인을 반환하는 함수 (None이면 en_core_web_sm 로드 시도)
+        """
+        self._kiwi = kiwi
+        self._nlp_provider = nlp_provider
+        self._nlp = None
+        self._nlp_resolved = False
+
+    @property
+    def kiwi(self):
+        if self._kiwi is None:
+            from kiwipiepy import Kiwi
+            self._kiwi = Kiwi()
+        return self._kiwi
+
+    @property
+    def nlp(self):
+        if not self._nlp_resolved:
+            self._nlp_resolved = True
+            try:
+                if self._nlp_provider is not None:
+                    self._nlp = self._nlp_provider()
+                else:
+                    import spacy
+                    self._nlp = spacy.load("en_core_web_sm")
+            except Exception as e:
+                logger.warning(f"[KEYWORD_ENGINE] spaCy unavailable ({e}), using simple English terms")
+                self._nlp = None
+        return self._nlp
+
+    @property
+    def english_mode(self) -> str:
+        """영어 분석 방식 (색인과 쿼리가 같은 방식이어야 함)"""
+        return "spacy" if self.nlp is not None else "simple"
+
+    # 품사 규칙은 쿼리 쪽 키워드 추출(query_analysis)과 공유
+
+    @staticmethod
+    def _korean_terms(tokens) -> List[str]:
+        return [token.form.lower() for token in tokens if korean_term_weight(token.tag, token.form) is not None]
+
+    @staticmethod
+    def _english_terms(doc) -> List[str]:
+        return [token.lemma_.lower() for token in doc if english_term_weight(token) is not None]
+
+    @staticmethod
+    def _simple_english_terms(text: str) -> List[str]:
+        terms = []
+        for word in text.lower().split():
+            clean = ''.join(c for c in word if c.isalnum())
+            if len(clean) >= 2 and clean not in ENGLISH_STOP_WORDS:
+                terms.append(clean)
+        return terms
+
+    def terms(self, text: str, language: str) -> List[str]:
+        """단일 텍스트 분석"""
+        return self.terms_batch([text], language)[0]
+
+    def terms_batch(self, texts: List[str], language: str) -> List[List[str]]:
+        """
+        배치 분석 (Kiwi 배치 토크나이즈, spaCy nlp.pipe)
+
+        Args:
+            texts: 텍스트 리스트
+            language: 'korean' 또는 'english'
+        """
+        if language == "korean":
+            return [self._korean_terms(tokens) for tokens in self.kiwi.tokenize(texts)]
+        if self.nlp is not None:
+            return [self._english_terms(doc) for doc in self.nlp.pipe(texts, batch_size=ANALYZE_BATCH_SIZE)]
+        return [self._simple_english_terms(text) for text in texts]
+
+
+class _PostingsBuilder:
+    """(용어, 행, tf) 튜플을 압축 배열로 누적 후 CSR로 변환"""
+
+    def __init__(self):
+        self.vocab: Dict[str, int] = {}
+        self.term_ids = array('i')
+        self.rows = array('i')
+        self.tfs = array('H')
+        self.doc_len = array('f')
+
+    def add(self, row: int, terms: List[str]):
+        self.doc_len.append(len(terms))
+        for term, tf in Counter(terms).items():
+            self.term_ids.append(self.vocab.setdefault(term, len(self.vocab)))
+            self.rows.append(row)
+            self.tfs.append(min(tf, 65535))
+
+    def save(self, directory: Path, language: str):
+        term_ids = np.frombuffer(self.term_ids, dtype=np.int32)
+        order = np.argsort(term_ids, kind="stable")  # 같은 용어 안에서는 행 순서 유지
+        counts = np.bincount(term_ids, minlength=len(self.vocab))
+        offsets = np.zeros(len(self.vocab) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+
+        np.save(directory / f"{language}_offsets.npy", offsets)
+        np.save(directory / f"{language}_rows.npy", np.frombuffer(self.rows, dtype=np.int32)[order])
+        np.save(directory / f"{language}_tf.npy", np.frombuffer(self.tfs, dtype=np.uint16)[order])
+        np.save(directory / f"{language}_doc_len.npy", np.frombuffer(self.doc_len, dtype=np.float32))
+        (directory / f"{language}_terms.json").write_text(json.dumps(list(self.vocab), ensure_ascii=False), encoding="utf-8")
+
+
+class BM25Snapshot:
+    """로드된 BM25 인덱스 (읽기 전용)"""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.meta = json.loads((self.directory / "meta.json").read_text(encoding="utf-8"))
+        self.columns = MetadataColumns.load(self.directory)
+        self.payloads = PayloadStore(self.directory)
+        self.rows = int(self.meta["rows"])
+
+        self.vocab: Dict[str, Dict[str, int]] = {}
+        self.postings: Dict[str, Dict[str, np.ndarray]] = {}
+        for language in LANGUAGES:
+            terms = json.loads((self.directory / f"{language}_terms.json").read_text(encoding="utf-8"))
+            self.vocab[language] = {term: i for i, term in enumerate(terms)}
+            arrays = {
+                name: np.load(self.directory / f"{language}_{name}.npy", mmap_mode="r")
+                for name in ("offsets", "rows", "tf", "doc_len")
+            }
+            # Lucene BM25 IDF: log(1 + (N - df + 0.5) / (df + 0.5))
+            df = np.diff(arrays["offsets"]).astype(np.float32)
+            arrays["idf"] = np.log1p((self.rows - df + 0.5) / (df + 0.5)).astype(np.float32)
+            self.postings[language] = arrays
+
+    @staticmethod
+    def build(conn, directory: Path, table_name: str, analyzer: KeywordAnalyzer):
+        """
+        테이블 행을 분석해 역색인 생성 (서버 사이드 커서로 스트리밍, 배치 형태소 분석)
+
+        Args:
+            conn: 트랜잭션 중인 psycopg 연결
+            directory: 출력 디렉토리
+            table_name: 문서 테이블
+            analyzer: 쿼리와 같은 분석기
+        """
+        columns = MetadataColumns()
+        payloads = PayloadWriter(directory)
+        builders = {language: _PostingsBuilder() for language in LANGUAGES}
+        pending: List[Dict[str, Any]] = []
+        rows = 0
+
+        def flush():
+            texts = [build_search_texts(row) for row in pending]
+            for index, language in enumerate(LANGUAGES):
+                analyzed = analyzer.terms_batch([t[index] for t in texts], language)
+                for offset, terms in enumerate(analyzed):
+                    builders[language].add(rows - len(pending) + offset, terms)
+            pending.clear()
+
+        with conn.cursor(name="keyword_engine_snapshot") as cur:
+            cur.itersize = 2000
+            cur.execute(f"SELECT {PAYLOAD_SQL} FROM {table_name} ORDER BY id")
+            for record in cur:
+                row = dict(zip(PAYLOAD_FIELDS, record))
+                columns.append(row)
+                payloads.append(row)
+                pending.append(row)
+                rows += 1
+                if len(pending) >= ANALYZE_BATCH_SIZE:
+                    flush()
+        if pending:
+            flush()
+
+        avgdl = {}
+        for language, builder in builders.items():
+            builder.save(directory, language)
+            avgdl[language] = float(np.mean(builder.doc_len)) if rows else 0.0
+        columns.save(directory)
+        payloads.close()
+        meta = {"rows": rows, "avgdl": avgdl, "english_analyzer": analyzer.english_mode}
+        (directory / "meta.json").write_text(json.dumps(meta), encoding="utf-8")
+
+    def search(
+        self,
+        terms: Iterable[str],
+        language: str,
+        filter: Optional[MVPSearchFilter],
+        limit: int,
+        k1: float,
+        b: float
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        BM25 top-k (쿼리 용어 OR 매칭)
+
+        Returns:
+            SQL 키워드 검색과 같은 형식의 결과 (rank = BM25 점수), 필터를 처리할 수 없으면 None
+        """
+        mask = self.columns.mask(filter)
+        if mask is None:
+            return None
+
+        postings = self.postings[language]
+        vocab = self.vocab[language]
+        avgdl = self.meta["avgdl"][language] or 1.0
+        scores = np.zeros(self.rows, dtype=np.float32)
+        for term in dict.fromkeys(terms):
+            term_id = vocab.get(term)
+            if term_id is None:
+                continue
+            start, end = postings["offsets"][term_id], postings["offsets"][term_id + 1]
+            rows = postings["rows"][start:end]
+            tf = postings["tf"][start:end].astype(np.float32)
+            norm = k1 * (1.0 - b + b * postings["doc_len"][rows] / avgdl)
+            scores[rows] += postings["idf"][term_id] * tf * (k1 + 1.0) / (tf + norm)
+
+        candidates = np.flatnonzero((scores > 0) & mask)
+        if candidates.size == 0 or limit <= 0:
+            return []
+        candidate_scores = scores[candidates]
+        k = min(limit, candidates.size)
+        top = np.argpartition(-candidate_scores, k - 1)[:k] if k < candidates.size else np.arange(candidates.size)
+        order = top[np.lexsort((self.columns.ids[candidates[top]], -candidate_scores[top]))]
+
+        results = []
+        for position in order:
+            row = self.payloads.get(int(candidates[position]))
+            row["rank"] = float(candidate_scores[position])
+            results.append(row)
+        return results
+
+    def close(self):
+        self.payloads.close()
+
+
+class KeywordEngine(SnapshotEngine):
+    """코퍼스 버전을 따라 갱신되는 인프로세스 BM25 키워드 검색 엔진"""
+
+    name = "keyword_engine"
+
+    def __init__(
+        self,
+        pool,
+        analyzer: Optional[KeywordAnalyzer] = None,
+        table_name: Optional[str] = None,
+        directory: Optional[str] = None,
+        refresh_seconds: Optional[float] = None
+    ):
+        """
+        초기화 (인자가 없으면 환경변수 사용)
+
+        Args:
+            pool: PostgreSQL 연결 풀
+            analyzer: 토큰 분석기 (HybridSearch의 Kiwi/spaCy 공유)
+            table_name: 문서 테이블 (DB_TABLE_NAME)
+            directory: 인덱스 디렉토리 (KEYWORD_ENGINE_DIR)
+            refresh_seconds: 코퍼스 버전 확인 주기 (KEYWORD_ENGINE_REFRESH_SEC)
+        """
+        super().__init__(
+            pool,
+            table_name or os.getenv("DB_TABLE_NAME", "mvp_ddu_documents"),
+            directory or os.getenv("KEYWORD_ENGINE_DIR", "data/cache/keyword_engine"),
+            refresh_seconds if refresh_seconds is not None else float(os.getenv("KEYWORD_ENGINE_REFRESH_SEC", "60"))
+        )
+        self.analyzer = analyzer or KeywordAnalyzer()
+        self.k1 = float(os.getenv("BM25_K1", "1.2"))
+        self.b = float(os.getenv("BM25_B", "0.75"))
+
+    def _build(self, conn, directory: Path):
+        BM25Snapshot.build(conn, directory, self.table_name, self.analyzer)
+
+    def _load(self, directory: Path) -> BM25Snapshot:
+        return BM25Snapshot(directory)
+
+    def search(
+        self,
+        query: str,
+        filter: Optional[MVPSearchFilter],
+        language: str,
+        limit: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        BM25 검색 (None이면 호출자가 SQL 경로 사용)
+
+        Args:
+            query: 검색 쿼리
+            filter: 검색 필터
+            language: 'korean' 또는 'english'
+            limit: 최대 결과 수
+        """
+        snapshot = self.snapshot()
+        results = None
+        if snapshot is not None and (
+            language == "korean" or snapshot.meta.get("english_analyzer") == self.analyzer.english_mode
+        ):
+            try:
+                terms = self.analyzer.terms(query, language)
+                results = snapshot.search(terms, language, filter, limit, self.k1, self.b)
+            except Exception as e:
+                logger.warning(f"[KEYWORD_ENGINE] Snapshot search failed, using SQL: {e}")
+        self.stats["served" if results is not None else "fallbacks"] += 1
+        return results
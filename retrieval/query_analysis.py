@@ -0,0 +1,353 @@
+"""
+Query Analysis Service
+검색 쿼리의 키워드/tsquery를 변형 전체에 대해 한 번에 계산하고 메모이즈
+
+- 한국어: Kiwi 배치 모드 (tokenize(iterable), num_workers 스레드로 GIL 밖에서 병렬 처리)
+- 영어: spaCy nlp.pipe (모든 영어 변형을 한 번에)
+- 선택: 프로세스 풀 (QUERY_ANALYSIS_PROCESSES > 0, 워커마다 Kiwi/spaCy 로드)
+- 정규화된 (쿼리, 언어) 기준 LRU 메모이즈 (QUERY_ANALYSIS_CACHE_SIZE)
+
+키워드 추출 규칙은 기존 HybridSearch._extract_*_keywords와 동일하며,
+HybridSearch는 분석 결과(keywords, tsquery)를 통계와 키워드 검색에 함께 사용.
+"""
+
+import os
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+# 균형잡힌 품사 세트 (명사, 중요 동사/형용사, 외래어)
+# 제외: VX(보조용언), MM(관형사), MAG(부사), XR(어근) - 노이즈 방지
+KOREAN_MEANINGFUL_POS = {'NNG', 'NNP', 'NNB', 'VV', 'VA', 'SL', 'SH', 'SN'}
+KOREAN_STOP_WORDS = {'의', '를', '을', '에', '와', '과', '로', '으로', '에서', '부터', '까지', '및', '또는'}
+ENGLISH_STOP_WORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from',
+    'has', 'he', 'in', 'is', 'it', 'its', 'of', 'on', 'that', 'the',
+    'to', 'was', 'will', 'with', 'this', 'these', 'they', 'we', 'you',
+    'have', 'had', 'what', 'when', 'where', 'who', 'which', 'why', 'how'
+}
+# 1글자도 키워드로 쓰는 태그 (외래어, 한자, 숫자)
+KOREAN_SYMBOL_TAGS = {'SL', 'SH', 'SN'}
+
+
+# 품사 규칙은 쿼리 키워드(여기)와 BM25 색인/쿼리 용어(keyword_engine)가 함께 사용
+
+def korean_term_weight(tag: str, form: str) -> Optional[float]:
+    """Kiwi 형태소의 키워드 가중치 (명사/외래어/숫자 1.0, 동사/형용사 0.7), 키워드가 아니면 None"""
+    if tag not in KOREAN_MEANINGFUL_POS:
+        return None
+    if tag.startswith('NN') or tag in KOREAN_SYMBOL_TAGS:
+        # 1글자 이상 (숫자, 영어 포함) 또는 2글자 이상 한글
+        return 1.0 if len(form) > 1 or tag in KOREAN_SYMBOL_TAGS or tag == 'NNB' else None
+    # 중요 동사/형용사 (2글자 이상)
+    return 0.7 if len(form) >= 2 else None
+
+
+def english_term_weight(token: Any) -> Optional[float]:
+    """spaCy 토큰의 키워드 가중치 (고유명사 1.5, 명사 1.0, 3글자 이상 형용사/동사 0.7), 키워드가 아니면 None"""
+    # 불용어, 구두점, 공백, 1글자 제외
+    if token.is_stop or token.is_punct or token.is_space or len(token.text) < 2:
+        return None
+    if token.pos_ == "PROPN":
+        return 1.5
+    if token.pos_ == "NOUN":
+        return 1.0
+    if token.pos_ in ("ADJ", "VERB") and len(token.text) >= 3:
+        return 0.7
+    return None
+
+
+@dataclass(frozen=True)
+class QueryAnalysis:
+    """쿼리 하나의 분석 결과 (재사용 가능)"""
+    query: str
+    language: str
+    keywords: Tuple[str, ...]
+    tsquery: str  # to_tsquery('simple', ...) 입력, 키워드가 없으면 ""
+
+
+def normalize_query(query: str) -> str:
+    """메모이즈 키용 정규화 (공백 정리)"""
+    return " ".join(query.split())
+
+
+def optimal_keyword_count(query: str) -> int:
+    """쿼리 길이(단어 수)에 따른 최적 키워드 수"""
+    query_length = len(query.split())
+    if query_length <= 3:
+        return 2  # 짧은 쿼리는 2개
+    elif query_length <= 6:
+        return 3  # 중간 쿼리는 3개
+    return 4  # 긴 쿼리는 4개
+
+
+def build_tsquery(keywords: Sequence[str]) -> str:
+    """
+    키워드 수에 따른 AND/OR 조합
+
+    - 2개 이하: 모두 AND (엄격한 매칭)
+    - 3개 이상: 첫 2개는 AND, 나머지는 OR (유연한 매칭)
+    """
+    if not keywords:
+        return ""
+    if len(keywords) <= 2:
+        return ' & '.join(keywords)
+    primary = ' & '.join(keywords[:2])
+    optional = ' | '.join(keywords[2:])
+    return f"({primary}) | {optional}"
+
+
+def korean_keywords(text: str, tokens) -> List[str]:
+    """Kiwi 토큰에서 한국어 키워드 추출 (DB와 동일한 토크나이징)"""
+    keywords = []
+    for token in tokens:
+        # Token 객체에서 형태소 정보 추출
+        if hasattr(token, 'tag') and hasattr(token, 'form'):
+            weight = korean_term_weight(token.tag, token.form)
+            if weight is not None:
+                keywords.append((token.form, weight))
+
+    # 중복 제거하면서 순서 유지
+    unique_keywords = list(dict.fromkeys(keyword for keyword, _ in keywords))
+
+    # 동적 키워드 수 결정 (쿼리 길이에 따라)
+    max_keywords = optimal_keyword_count(text)
+    limited_keywords = unique_keywords[:max_keywords]
+    logger.debug(f"[QUERY_ANALYSIS] Korean keyword count: {max_keywords} (from {len(unique_keywords)} candidates)")
+
+    # 키워드가 너무 적으면 원본 쿼리 사용 (공백 분리 + 불용어 제거)
+    if len(limited_keywords) < 2:
+        words = [w for w in text.split() if w not in KOREAN_STOP_WORDS and len(w) >= 2]
+        limited_keywords = words[:max_keywords]
+    return limited_keywords
+
+
+def english_keywords(text: str, doc) -> List[str]:
+    """spaCy Doc에서 영어 키워드 추출 (품사 가중치 + 명사구 보너스)"""
+    keywords = []
+    for token in doc:
+        weight = english_term_weight(token)
+        if weight is not None:
+            keywords.append((token.text.lower(), weight))
+
+    # 복합 명사구 (2-3 단어) 내 중요 단어는 보너스 가중치
+    for chunk in doc.noun_chunks:
+        if 2 <= len(chunk.text.split()) <= 3:
+            for token in chunk:
+                if token.pos_ in ["NOUN", "PROPN", "ADJ"] and not token.is_stop and len(token.text) >= 2:
+                    keywords.append((token.text.lower(), 1.2))
+
+    # 중복 제거하면서 가중치 최대값 유지
+    keyword_dict = {}
+    for keyword, weight in keywords:
+        if keyword not in keyword_dict or keyword_dict[keyword] < weight:
+            keyword_dict[keyword] = weight
+    sorted_keywords = sorted(keyword_dict.items(), key=lambda x: x[1], reverse=True)
+
+    max_keywords = optimal_keyword_count(text)
+    limited_keywords = [keyword for keyword, _ in sorted_keywords[:max_keywords]]
+    logger.debug(f"[QUERY_ANALYSIS] English keyword count: {max_keywords} (from {len(sorted_keywords)} candidates)")
+
+    # spaCy가 제대로 추출 못했을 경우 폴백
+    if len(limited_keywords) < 2:
+        return english_keywords_simple(text)
+    return limited_keywords
+
+
+def english_keywords_simple(text: str) -> List[str]:
+    """간단한 영어 키워드 추출 (spaCy 없이 폴백)"""
+    keyword_candidates = []
+    for word in text.lower().split():
+        # 구두점 제거
+        clean_word = ''.join(c for c in word if c.isalnum())
+        if not clean_word or clean_word in ENGLISH_STOP_WORDS:
+            continue
+        if len(clean_word) >= 2:
+            # 대문자로 시작했던 단어는 고유명사일 가능성 (보너스)
+            score = len(clean_word) * (1.5 if word[0].isupper() else 1.0)
+            keyword_candidates.append((clean_word, score))
+
+    keyword_candidates.sort(key=lambda x: x[1], reverse=True)
+    max_keywords = optimal_keyword_count(text)
+
+    # 중복 제거하면서 동적 개수만큼 선택
+    limited_keywords = []
+    for keyword, _ in keyword_candidates:
+        if keyword not in limited_keywords:
+            limited_keywords.append(keyword)
+            if len(limited_keywords) >= max_keywords:
+                break
+    return limited_keywords
+
+
+def extract_keywords_batch(
+    kiwi,
+    nlp,
+    items: Sequence[Tuple[str, str]]
+) -> List[List[str]]:
+    """
+    (텍스트, 언어) 목록의 키워드를 배치로 추출
+
+    Args:
+        kiwi: Kiwi 인스턴스 (num_workers 스레드로 배치 처리)
+        nlp: spaCy 파이프라인 (None이면 간단한 추출)
+        items: (텍스트, 'korean' | 'english') 목록
+
+    Returns:
+        items와 같은 순서의 키워드 목록
+    """
+    results: List[Optional[List[str]]] = [None] * len(items)
+    korean = [i for i, (_, language) in enumerate(items) if language == "korean"]
+    english = [i for i, (_, language) in enumerate(items) if language != "korean"]
+
+    if korean:
+        texts = [items[i][0] for i in korean]
+        try:
+            for i, tokens in zip(korean, kiwi.tokenize(texts)):
+                results[i] = korean_keywords(items[i][0], tokens)
+        except Exception as e:
+            logger.warning(f"[QUERY_ANALYSIS] Kiwi batch tokenize failed: {e}")
+            for i in korean:
+                if results[i] is None:
+                    # 오류 시 원본 텍스트의 공백 분리 사용
+                    results[i] = items[i][0].split()
+
+    if english:
+        texts = [items[i][0] for i in english]
+        if nlp is None:
+            for i in english:
+                results[i] = english_keywords_simple(items[i][0])
+        else:
+            try:
+                for i, doc in zip(english, nlp.pipe(texts)):
+                    results[i] = english_keywords(items[i][0], doc)
+            except Exception as e:
+                logger.warning(f"[QUERY_ANALYSIS] spaCy pipe failed: {e}. Falling back to simple extraction.")
+                for i in english:
+                    if results[i] is None:
+                        results[i] = english_keywords_simple(items[i][0])
+
+    return results
+
+
+# 프로세스 풀 워커 상태 (워커 프로세스마다 한 번 로드)
+_worker_kiwi = None
+_worker_nlp = None
+
+
+def _init_worker():
+    global _worker_kiwi, _worker_nlp
+    from kiwipiepy import Kiwi
+    _worker_kiwi = Kiwi()
+    try:
+        import spacy
+        _worker_nlp = spacy.load("en_core_web_sm")
+    except Exception:
+        _worker_nlp = None
+
+
+def _extract_in_worker(items: List[Tuple[str, str]]) -> List[List[str]]:
+    return extract_keywords_batch(_worker_kiwi, _worker_nlp, items)
+
+
+class QueryAnalyzer:
+    """쿼리 변형 전체를 한 번에 분석하고 결과를 메모이즈하는 서비스"""
+
+    def __init__(
+        self,
+        kiwi=None,
+        nlp_provider: Optional[Callable] = None,
+        cache_size: Optional[int] = None,
+        processes: Optional[int] = None
+    ):
+        """
+        초기화 (인자가 없으면 환경변수 사용)
+
+        Args:
+            kiwi: Kiwi 인스턴스 (없으면 KIWI_NUM_WORKERS로 생성)
+            nlp_provider: spaCy 파이프라인을 반환하는 함수 (lazy loading, 실패 시 None)
+            cache_size: 메모이즈 항목 수 (QUERY_ANALYSIS_CACHE_SIZE)
+            processes: 프로세스 풀 크기, 0이면 현재 프로세스에서 실행 (QUERY_ANALYSIS_PROCESSES)
+        """
+        if kiwi is None:
+            from kiwipiepy import Kiwi
+            kiwi = Kiwi(num_workers=int(os.getenv("KIWI_NUM_WORKERS", "0")))
+        self.kiwi = kiwi
+        self.nlp_provider = nlp_provider or (lambda: None)
+        self.cache_size = cache_size if cache_size is not None else int(
+            os.getenv("QUERY_ANALYSIS_CACHE_SIZE", "2048")
+        )
+        self.processes = processes if processes is not None else int(os.getenv("QUERY_ANALYSIS_PROCESSES", "0"))
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._cache: "OrderedDict[Tuple[str, str], QueryAnalysis]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "batches": 0}
+
+    def analyze(self, query: str, language: str) -> QueryAnalysis:
+        """쿼리 하나 분석 (메모이즈)"""
+        return self.analyze_batch([(query, language)])[0]
+
+    def analyze_batch(self, items: Sequence[Tuple[str, str]]) -> List[QueryAnalysis]:
+        """
+        (쿼리, 언어) 목록을 한 번에 분석
+
+        캐시에 없는 항목만 Kiwi 배치 / spaCy pipe로 계산 (중복 쿼리는 한 번만).
+
+        Returns:
+            items와 같은 순서의 QueryAnalysis 목록
+        """
+        keys = [(normalize_query(query), language) for query, language in items]
+        results: Dict[Tuple[str, str], QueryAnalysis] = {}
+        with self._lock:
+            for key in keys:
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    results[key] = cached
+        missing = [key for key in dict.fromkeys(keys) if key not in results]
+        self.stats["hits"] += len(keys) - sum(1 for key in keys if key in missing)
+        self.stats["misses"] += len(missing)
+
+        if missing:
+            self.stats["batches"] += 1
+            keyword_lists = self._extract(missing)
+            with self._lock:
+                for key, keywords in zip(missing, keyword_lists):
+                    analysis = QueryAnalysis(
+                        query=key[0], language=key[1], keywords=tuple(keywords), tsquery=build_tsquery(keywords)
+                    )
+                    results[key] = analysis
+                    self._cache[key] = analysis
+                    self._cache.move_to_end(key)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return [results[key] for key in keys]
+
+    def _extract(self, items: List[Tuple[str, str]]) -> List[List[str]]:
+        if self.processes > 0:
+            try:
+                return self._get_pool().submit(_extract_in_worker, items).result()
+            except Exception as e:
+                logger.warning(f"[QUERY_ANALYSIS] Process pool failed, analyzing in-process: {e}")
+        nlp = self.nlp_provider() if any(language != "korean" for _, language in items) else None
+        return extract_keywords_batch(self.kiwi, nlp, items)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.processes, initializer=_init_worker)
+            return self._pool
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,88 @@
+"""
+Search Result Records
+검색 결과 행을 dict / LangChain Document 대신 가벼운 레코드로 전달
+
+SQL 행마다 dict(zip(columns, row))와 15개 키 메타데이터의 Document를 만들면 대부분이
+중복 제거/융합/재순위화에서 버려짐. SearchRecord는 커서가 돌려준 행 튜플과 쿼리당 하나인
+컬럼 인덱스를 공유하고, 점수 필드만 슬롯으로 가지며 나머지 필드는 접근할 때 읽음.
+Document는 최종 문서 집합에 대해서만 만들면 됨.
+
+dict와 같은 get / [] / in 인터페이스를 제공하므로 엔진(dict 결과)과 섞어 사용할 수 있음.
+"""
+
+from typing import Any, Dict, Iterator, List, Mapping, Sequence
+
+# 행 값과 별도로 갱신되는 점수/병합 필드 (슬롯)
+SCORE_FIELDS = ("similarity", "rank", "rrf_score", "boosted", "search_types")
+
+_MISSING = object()
+
+
+class SearchRecord:
+    """검색 결과 한 행 (행 튜플 + 공유 컬럼 인덱스)"""
+
+    __slots__ = ("_columns", "_row", "id") + SCORE_FIELDS
+
+    def __init__(self, columns: Mapping[str, int], row: Sequence[Any]):
+        """
+        Args:
+            columns: 컬럼명 -> 행 위치 (쿼리당 하나를 모든 행이 공유)
+            row: 커서가 반환한 행 튜플
+        """
+        self._columns = columns
+        self._row = row
+        self.id = row[columns["id"]] if "id" in columns else None
+        for name in SCORE_FIELDS:
+            position = columns.get(name)
+            setattr(self, name, row[position] if position is not None else None)
+
+    @classmethod
+    def from_cursor(cls, cursor) -> List["SearchRecord"]:
+        """실행된 커서의 모든 행을 레코드로 변환"""
+        columns = {desc[0]: position for position, desc in enumerate(cursor.description)}
+        return [cls(columns, row) for row in cursor.fetchall()]
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "SearchRecord":
+        """dict 결과(인프로세스 엔진 등)를 레코드로 변환"""
+        return cls({name: position for position, name in enumerate(data)}, tuple(data.values()))
+
+    def get(self, name: str, default: Any = None) -> Any:
+        value = self._lookup(name)
+        return default if value is _MISSING else value
+
+    def _lookup(self, name: str) -> Any:
+        if name == "id":
+            return self.id
+        if name in SCORE_FIELDS:
+            value = getattr(self, name)
+            return _MISSING if value is None and name not in self._columns else value
+        position = self._columns.get(name)
+        return _MISSING if position is None else self._row[position]
+
+    def __getitem__(self, name: str) -> Any:
+        value = self._lookup(name)
+        if value is _MISSING:
+            raise KeyError(name)
+        return value
+
+    def __setitem__(self, name: str, value: Any):
+        # 행 값은 읽기 전용, 점수/병합 필드만 갱신
+        if name not in SCORE_FIELDS:
+            raise KeyError(f"SearchRecord field '{name}' is read-only")
+        setattr(self, name, value)
+
+    def __contains__(self, name: str) -> bool:
+        return self._lookup(name) is not _MISSING
+
+    def keys(self) -> Iterator[str]:
+        yield from self._columns
+        for name in SCORE_FIELDS:
+            if name not in self._columns and getattr(self, name) is not None:
+                yield name
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: self[name] for name in self.keys()}
+
+    def __repr__(self) -> str:
+        return f"SearchRecord(id={self.id!r}, similarity={self.similarity!r}, rank={self.rank!r}, rrf_score={self.rrf_score!r})"
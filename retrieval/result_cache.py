@@ -0,0 +1,343 @@
+"""
+Retrieval Result Cache
+HybridSearch.search의 최종 순위(id + 점수)를 캐시해 같은 검색이 반복될 때
+임베딩 API 호출과 시맨틱/키워드 SQL을 건너뜀 (사용자 간 공통 질문, CRAG 재시도)
+
+- 키: 정규화된 쿼리 + 직렬화된 필터(boost 포함) + 언어 + top_k + 가중치
+- 코퍼스 버전: mvp_corpus_version 카운터. 문서 테이블의 statement 트리거가 INSERT/UPDATE/DELETE/TRUNCATE마다
+  같은 트랜잭션에서 올림 (커밋과 동시에 보임, RETRIEVAL_CACHE_VERSION_CHECK_SEC마다 확인,
+  버전이 다르면 엔트리를 사용하지 않음)
+- 값: 순위 순서의 id와 점수 필드만 저장 (페이로드는 히트 시 기본키 조회 1회로 채움)
+- O(1) LRU + TTL 메모리 캐시, 선택적 SQLite 공유 저장소 (같은 호스트의 워커 프로세스 간 공유)
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from retrieval.query_analysis import normalize_query
+from retrieval.records import SCORE_FIELDS
+from retrieval.search_filter import MVPSearchFilter
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+CORPUS_VERSION_TABLE = "mvp_corpus_version"
+CORPUS_VERSION_FUNCTION = "mvp_bump_corpus_version"
+
+
+def make_result_key(
+    query: str,
+    filter: Optional[MVPSearchFilter],
+    language: str,
+    top_k: int,
+    semantic_weight: float,
+    keyword_weight: float,
+    boost_filter: Optional[MVPSearchFilter] = None
+) -> str:
+    """검색 결과 캐시 키 (코퍼스 버전 제외)"""
+    raw = json.dumps({
+        "query": normalize_query(query),
+        "filter": filter.to_dict() if filter is not None else {},
+        "boost": boost_filter.to_dict() if boost_filter is not None else None,
+        "language": language,
+        "top_k": top_k,
+        "weights": [round(semantic_weight, 6), round(keyword_weight, 6)]
+    }, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _create_version_table(cur):
+    cur.execute(f"""
+        CREATE TABLE IF NOT EXISTS {CORPUS_VERSION_TABLE} (
+            table_name TEXT PRIMARY KEY,
+            version BIGINT NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def ensure_corpus_version_trigger(conn, table_name: str) -> bool:
+    """
+    문서 테이블에 코퍼스 버전 트리거 설치 (없을 때만)
+
+    인제스트 외의 쓰기 경로(human_feedback UPDATE, FTS 재생성, 수동 DELETE 등)도 같은 트랜잭션에서
+    버전을 올리므로, 지연 집계되는 pg_stat_user_tables 없이 커밋 즉시 캐시가 무효화됨.
+
+    Returns:
+        새로 설치했으면 True
+    """
+    trigger_name = f"trg_{table_name}_corpus_version"
+    with conn.cursor() as cur:
+        _create_version_table(cur)
+        cur.execute(
+            "SELECT 1 FROM pg_trigger WHERE tgname = %s AND tgrelid = to_regclass(%s)",
+            (trigger_name, table_name)
+        )
+        if cur.fetchone():
+            conn.commit()
+            return False
+        cur.execute(f"""
+            CREATE OR REPLACE FUNCTION {CORPUS_VERSION_FUNCTION}() RETURNS trigger AS $$
+            BEGIN
+                INSERT INTO {CORPUS_VERSION_TABLE} (table_name, version) VALUES (TG_TABLE_NAME, 1)
+                ON CONFLICT (table_name) DO UPDATE SET version = {CORPUS_VERSION_TABLE}.version + 1,
+                    updated_at = CURRENT_TIMESTAMP;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+        cur.execute(f"""
+            CREATE TRIGGER {trigger_name}
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table_name}
+            FOR EACH STATEMENT EXECUTE FUNCTION {CORPUS_VERSION_FUNCTION}()
+        """)
+    conn.commit()
+    logger.info(f"[RESULT_CACHE] Installed corpus version trigger on {table_name}")
+    return True
+
+
+def bump_corpus_version(conn, table_name: str) -> int:
+    """
+    코퍼스 버전 카운터 증가 (트리거가 없는 쓰기나 수동 무효화용)
+
+    Returns:
+        새 버전 번호
+    """
+    with conn.cursor() as cur:
+        _create_version_table(cur)
+        cur.execute(
+            f"INSERT INTO {CORPUS_VERSION_TABLE} (table_name, version) VALUES (%s, 1) "
+            f"ON CONFLICT (table_name) DO UPDATE SET version = {CORPUS_VERSION_TABLE}.version + 1, "
+            f"updated_at = CURRENT_TIMESTAMP RETURNING version",
+            (table_name,)
+        )
+        version = cur.fetchone()[0]
+    conn.commit()
+    return version
+
+
+def read_corpus_version(conn, table_name: str) -> str:
+    """
+    현재 코퍼스 버전 (트리거/인제스트가 올리는 카운터)
+
+    카운터 테이블이 아직 없으면 0으로 취급.
+    """
+    with conn.cursor() as cur:
+        cur.execute("SELECT to_regclass(%s) IS NOT NULL", (CORPUS_VERSION_TABLE,))
+        counter = 0
+        if cur.fetchone()[0]:
+            cur.execute(f"SELECT version FROM {CORPUS_VERSION_TABLE} WHERE table_name = %s", (table_name,))
+            row = cur.fetchone()
+            counter = row[0] if row else 0
+    return str(counter)
+
+
+class RetrievalResultCache:
+    """코퍼스 버전별 검색 순위 캐시 (LRU + TTL, 선택적 SQLite 공유)"""
+
+    def __init__(
+        self,
+        pool,
+        table_name: str,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[int] = None,
+        path: Optional[str] = None,
+        version_check_seconds: Optional[float] = None
+    ):
+        """
+        초기화 (인자가 없으면 환경변수 사용)
+
+        Args:
+            pool: PostgreSQL 연결 풀 (코퍼스 버전 확인용)
+            table_name: 문서 테이블
+            max_entries: 최대 엔트리 수 (RETRIEVAL_CACHE_MAX_ENTRIES)
+            ttl_seconds: 엔트리 유효 시간 (RETRIEVAL_CACHE_TTL_SECONDS)
+            path: SQLite 경로 (RETRIEVAL_CACHE_PATH, 빈 문자열이면 메모리 전용)
+            version_check_seconds: 코퍼스 버전 확인 주기 (RETRIEVAL_CACHE_VERSION_CHECK_SEC)
+        """
+        self.pool = pool
+        self.table_name = table_name
+        self.max_entries = max_entries if max_entries is not None else int(
+            os.getenv("RETRIEVAL_CACHE_MAX_ENTRIES", "2048")
+        )
+        self.ttl = ttl_seconds if ttl_seconds is not None else int(
+            os.getenv("RETRIEVAL_CACHE_TTL_SECONDS", "600")
+        )
+        self.path = path if path is not None else os.getenv("RETRIEVAL_CACHE_PATH", "")
+        self.version_check_seconds = version_check_seconds if version_check_seconds is not None else float(
+            os.getenv("RETRIEVAL_CACHE_VERSION_CHECK_SEC", "10")
+        )
+
+        # (버전, 키) -> (저장 시각, 엔트리), 가장 최근 사용이 뒤쪽
+        self.cache: "OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version: Optional[str] = None
+        self._version_checked = float("-inf")
+
+        self.hits = 0
+        self.misses = 0
+        self.version_changes = 0
+        self._writes_since_evict = 0
+
+        self._conn: Optional[sqlite3.Connection] = None
+        if self.path:
+            self._connect()
+
+    def _connect(self):
+        """SQLite 연결 및 테이블 생성"""
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS retrieval_result_cache (
+                cache_key TEXT PRIMARY KEY,
+                version TEXT NOT NULL,
+                entry TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+
+    @property
+    def persistent(self) -> bool:
+        return self._conn is not None
+
+    def corpus_version(self) -> Optional[str]:
+        """
+        현재 코퍼스 버전 (확인 주기 안에서는 마지막 값 재사용)
+
+        Returns:
+            버전 문자열 (확인 실패 시 None -> 캐시 우회)
+        """
+        now = time.monotonic()
+        if now - self._version_checked < self.version_check_seconds:
+            return self._version
+        try:
+            with self.pool.connection() as conn:
+                version = read_corpus_version(conn, self.table_name)
+        except Exception as e:
+            logger.warning(f"[RESULT_CACHE] Corpus version check failed, bypassing cache: {e}")
+            return None
+        with self._lock:
+            if self._version is not None and version != self._version:
+                # 이전 버전 엔트리는 다시 쓰이지 않으므로 메모리에서 제거
+                self.version_changes += 1
+                self.cache.clear()
+                logger.info(f"[RESULT_CACHE] Corpus version changed {self._version} -> {version}, cache cleared")
+            self._version = version
+            self._version_checked = now
+        return version
+
+    @staticmethod
+    def compact(results: List[Any]) -> List[Dict[str, Any]]:
+        """검색 결과를 id + 점수 필드로 축약 (페이로드 제외)"""
+        compacted = []
+        for result in results:
+            item = {"id": result.get("id")}
+            for name in SCORE_FIELDS:
+                value = result.get(name)
+                if value is not None:
+                    item[name] = value
+            compacted.append(item)
+        return compacted
+
+    def get(self, key: str, version: str) -> Optional[Dict[str, Any]]:
+        """
+        캐시 조회 (메모리 -> SQLite 순)
+
+        Returns:
+            {"results": [{id, 점수 필드}], "stats": {...}} 또는 None
+        """
+        now = time.time()
+        with self._lock:
+            entry = self.cache.get((version, key))
+            if entry is not None:
+                if now - entry[0] < self.ttl:
+                    self.cache.move_to_end((version, key))
+                    self.hits += 1
+                    return entry[1]
+                del self.cache[(version, key)]
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT entry, created_at FROM retrieval_result_cache WHERE cache_key = ? AND version = ?",
+                    (key, version)
+                ).fetchone()
+                if row is not None and now - row[1] < self.ttl:
+                    cached = json.loads(row[0])
+                    self._conn.execute(
+                        "UPDATE retrieval_result_cache SET last_access = ? WHERE cache_key = ?", (now, key)
+                    )
+                    self._remember((version, key), row[1], cached)
+                    self.hits += 1
+                    return cached
+
+            self.misses += 1
+            return None
+
+    def _remember(self, cache_key: Tuple[str, str], created_at: float, entry: Dict[str, Any]):
+        """메모리 LRU에 저장 (lock 안에서 호출)"""
+        self.cache[cache_key] = (created_at, entry)
+        self.cache.move_to_end(cache_key)
+        while len(self.cache) > self.max_entries:
+            self.cache.popitem(last=False)
+
+    def set(self, key: str, version: str, results: List[Any], stats: Dict[str, Any]):
+        """검색 결과 순위 저장 (빈 결과는 저장하지 않음)"""
+        if not results:
+            return
+        entry = {"results": self.compact(results), "stats": stats}
+        now = time.time()
+        with self._lock:
+            self._remember((version, key), now, entry)
+            if self._conn is not None:
+                self._conn.execute(
+                    """
+                    INSERT OR REPLACE INTO retrieval_result_cache (cache_key, version, entry, created_at, last_access)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    (key, version, json.dumps(entry, ensure_ascii=False, default=str), now, now)
+                )
+                self._writes_since_evict += 1
+                if self._writes_since_evict >= 50:
+                    self._evict_persistent(now)
+
+    def _evict_persistent(self, now: float):
+        """SQLite 만료/초과 엔트리 제거 (lock 안에서 호출)"""
+        self._writes_since_evict = 0
+        self._conn.execute("DELETE FROM retrieval_result_cache WHERE created_at < ?", (now - self.ttl,))
+        self._conn.execute(
+            """
+            DELETE FROM retrieval_result_cache WHERE cache_key NOT IN (
+                SELECT cache_key FROM retrieval_result_cache ORDER BY last_access DESC LIMIT ?
+            )
+            """,
+            (self.max_entries,)
+        )
+
+    def hit_rate(self) -> float:
+        """캐시 히트율 계산"""
+        total = self.hits + self.misses
+        return self.hits / total if total > 0 else 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 통계"""
+        return {
+            "size": len(self.cache),
+            "hit_rate": f"{self.hit_rate():.1%}",
+            "hits": self.hits,
+            "misses": self.misses,
+            "version": self._version,
+            "version_changes": self.version_changes,
+            "persistent": self.persistent
+        }
@@ -3,6 +3,7 @@ MVP Search Filter Implementation
 Simplified to 5 core fields for efficient filtering
 """
 
+import re
 from typing import Optional, List, Dict, Any, Tuple
 from pydantic import BaseModel, Field
 
@@ -109,75 +110,99 @@ class MVPSearchFilter(BaseModel):
         
         return where_clause, params
     
-    def to_sql_where(self) -> Tuple[str, Dict[str, Any]]:
+    def _sql_terms(self) -> List[Tuple[str, str, Any, bool]]:
         """
-        SQL WHERE 절과 파라미터 생성
+        (파라미터 이름, 조건, 값, entity 조건 여부) 목록
         
-        Returns:
-            (WHERE 절 문자열, 파라미터 딕셔너리) 튜플
+        to_sql_where() / shape() / sql_params()가 같은 규칙을 공유하기 위한 내부 표현
         """
-        conditions = []
-        params = {}
+        terms = []
         
         # 카테고리 필터
         if self.categories:
-            conditions.append("category = ANY(%(categories)s)")
-            params['categories'] = self.categories
+            terms.append(("categories", "category = ANY(%(categories)s)", self.categories, False))
         
         # 페이지 필터
         if self.pages:
-            conditions.append("page = ANY(%(pages)s)")
-            params['pages'] = self.pages
+            terms.append(("pages", "page = ANY(%(pages)s)", self.pages, False))
         
         # 소스 필터
         if self.sources:
-            conditions.append("source = ANY(%(sources)s)")
-            params['sources'] = self.sources
+            terms.append(("sources", "source = ANY(%(sources)s)", self.sources, False))
         
         # 캡션 검색 (부분 일치)
         if self.caption:
-            conditions.append("caption ILIKE %(caption)s")
-            params['caption'] = f"%{self.caption}%"
+            terms.append(("caption", "caption ILIKE %(caption)s", f"%{self.caption}%", False))
         
         # Entity JSONB 필터
         if self.entity:
-            entity_conditions = []
-            
             # type 필드 검색
             if 'type' in self.entity:
-                entity_conditions.append("entity->>'type' = %(entity_type)s")
-                params['entity_type'] = self.entity['type']
+                terms.append(("entity_type", "entity->>'type' = %(entity_type)s", self.entity['type'], True))
             
             # title 필드 검색 (부분 일치)
             if 'title' in self.entity:
-                entity_conditions.append("entity->>'title' ILIKE %(entity_title)s")
-                params['entity_title'] = f"%{self.entity['title']}%"
+                terms.append(("entity_title", "entity->>'title' ILIKE %(entity_title)s",
+                              f"%{self.entity['title']}%", True))
             
             # keywords 배열 검색
             if 'keywords' in self.entity:
                 if isinstance(self.entity['keywords'], list):
                     # 배열의 각 키워드 중 하나라도 포함
-                    entity_conditions.append("entity->'keywords' ?| %(entity_keywords)s")
-                    params['entity_keywords'] = self.entity['keywords']
+                    terms.append(("entity_keywords", "entity->'keywords' ?| %(entity_keywords)s",
+                                  self.entity['keywords'], True))
                 elif isinstance(self.entity['keywords'], str):
                     # 단일 키워드 검색
-                    entity_conditions.append("entity->'keywords' ? %(entity_keyword)s")
-                    params['entity_keyword'] = self.entity['keywords']
+                    terms.append(("entity_keyword", "entity->'keywords' ? %(entity_keyword)s",
+                                  self.entity['keywords'], True))
             
             # details 필드 검색 (부분 일치)
             if 'details' in self.entity:
-                entity_conditions.append("entity->>'details' ILIKE %(entity_details)s")
-                params['entity_details'] = f"%{self.entity['details']}%"
-            
-            # 모든 entity 관련 조건을 AND로 결합
-            if entity_conditions:
-                conditions.append(f"({' AND '.join(entity_conditions)})")
+                terms.append(("entity_details", "entity->>'details' ILIKE %(entity_details)s",
+                              f"%{self.entity['details']}%", True))
+        
+        return terms
+    
+    def to_sql_where(self, param_prefix: str = "") -> Tuple[str, Dict[str, Any]]:
+        """
+        SQL WHERE 절과 파라미터 생성
+        
+        Args:
+            param_prefix: 파라미터 이름 접두사 (한 쿼리에 두 필터를 함께 쓸 때 이름 충돌 방지)
+        
+        Returns:
+            (WHERE 절 문자열, 파라미터 딕셔너리) 튜플
+        """
+        terms = self._sql_terms()
+        conditions = [condition for _, condition, _, is_entity in terms if not is_entity]
+        params = {name: value for name, _, value, _ in terms}
+        
+        # 모든 entity 관련 조건을 AND로 결합
+        entity_conditions = [condition for _, condition, _, is_entity in terms if is_entity]
+        if entity_conditions:
+            conditions.append(f"({' AND '.join(entity_conditions)})")
         
         # WHERE 절 생성
         where_clause = " AND ".join(conditions) if conditions else "1=1"
         
+        if param_prefix:
+            where_clause = re.sub(r"%\((\w+)\)s", lambda m: f"%({param_prefix}{m.group(1)})s", where_clause)
+            params = {f"{param_prefix}{key}": value for key, value in params.items()}
+        
         return where_clause, params
     
+    def shape(self) -> Tuple[str, ...]:
+        """
+        필터 형태 (값을 제외한 조건 종류)
+        
+        형태가 같으면 to_sql_where()의 WHERE 텍스트가 같으므로 컴파일된 SQL 캐시 키로 사용
+        """
+        return tuple(name for name, _, _, _ in self._sql_terms())
+    
+    def sql_params(self, param_prefix: str = "") -> Dict[str, Any]:
+        """to_sql_where()와 같은 파라미터 (WHERE 텍스트 생성 없이)"""
+        return {f"{param_prefix}{name}": value for name, _, value, _ in self._sql_terms()}
+    
     def is_empty(self) -> bool:
         """필터가 비어있는지 확인"""
         return not any([
@@ -0,0 +1,350 @@
+"""
+Search Snapshots
+인프로세스 검색 엔진이 공유하는 디스크 스냅샷 유틸리티
+
+- SnapshotStore: 버전별 스냅샷 디렉토리를 원자적으로 게시 (CURRENT 포인터)
+- MetadataColumns: 필터 컬럼(category/source/page/entity type) 코드 배열과 비트셋
+- PayloadWriter/PayloadStore: 결과 행(SQL 검색과 같은 컬럼)을 JSONL + 오프셋으로 저장, mmap 조회
+- SnapshotEngine: 버전 확인, 백그라운드 재빌드, 스냅샷 교체를 담당하는 기반 클래스
+  (코퍼스 버전은 결과 캐시와 같은 트리거 카운터 read_corpus_version 사용)
+"""
+
+import os
+import abc
+import json
+import mmap
+import time
+import shutil
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from retrieval.result_cache import read_corpus_version
+from retrieval.search_filter import MVPSearchFilter
+
+logger = logging.getLogger(__name__)
+
+# SQL 검색 결과와 동일한 컬럼 (점수 컬럼 제외)
+PAYLOAD_FIELDS = (
+    "id", "source", "page", "category", "page_content",
+    "translation_text", "contextualize_text", "caption", "entity",
+    "image_path", "human_feedback"
+)
+PAYLOAD_SQL = ", ".join(PAYLOAD_FIELDS)
+
+# 비트셋으로 미리 계산하는 범주형 필터 컬럼
+FILTER_COLUMNS = ("category", "source", "entity_type")
+PAGE_NULL = np.iinfo(np.int32).min
+CURRENT_FILENAME = "CURRENT"
+
+
+def _entity_type(entity: Any) -> Optional[str]:
+    """entity->>'type'과 같은 값 (JSON 문자열로 저장된 entity도 처리)"""
+    if isinstance(entity, str):
+        try:
+            entity = json.loads(entity)
+        except ValueError:
+            return None
+    if isinstance(entity, dict) and entity.get("type") is not None:
+        return str(entity["type"])
+    return None
+
+
+class SnapshotStore:
+    """버전별 스냅샷 디렉토리 관리 (빌드는 임시 디렉토리에서 하고 완료 후 교체)"""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    def current(self) -> Optional[Tuple[str, Path]]:
+        """게시된 스냅샷 (버전, 경로)"""
+        pointer = self.directory / CURRENT_FILENAME
+        try:
+            data = json.loads(pointer.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        path = self.directory / data.get("name", "")
+        return (data.get("version"), path) if path.is_dir() else None
+
+    def publish(self, version: str, build: Callable[[Path], None]) -> Path:
+        """
+        스냅샷 빌드 후 원자적으로 게시하고 이전 스냅샷 정리
+
+        Args:
+            version: 코퍼스 버전
+            build: 임시 디렉토리에 스냅샷 파일을 쓰는 함수
+
+        Returns:
+            게시된 스냅샷 경로
+        """
+        name = hashlib.sha1(version.encode("utf-8")).hexdigest()[:16]
+        tmp_dir = self.directory / f".tmp-{name}-{os.getpid()}-{threading.get_ident()}"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+        try:
+            build(tmp_dir)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        final_dir = self.directory / name
+        shutil.rmtree(final_dir, ignore_errors=True)
+        os.replace(tmp_dir, final_dir)
+
+        pointer = self.directory / CURRENT_FILENAME
+        tmp_pointer = self.directory / (CURRENT_FILENAME + ".tmp")
+        tmp_pointer.write_text(json.dumps({"version": version, "name": name}), encoding="utf-8")
+        os.replace(tmp_pointer, pointer)
+
+        # 이전 스냅샷 정리 (이미 mmap된 파일은 unlink 후에도 열린 동안 유효)
+        for child in self.directory.iterdir():
+            if child.is_dir() and child.name != name and not child.name.startswith(".tmp-"):
+                shutil.rmtree(child, ignore_errors=True)
+        return final_dir
+
+
+class MetadataColumns:
+    """행 순서대로 정렬된 필터 컬럼과 값별 비트셋"""
+
+    def __init__(self):
+        self._ids: List[int] = []
+        self._pages: List[int] = []
+        self._codes: Dict[str, List[int]] = {column: [] for column in FILTER_COLUMNS}
+        self._vocab: Dict[str, Dict[str, int]] = {column: {} for column in FILTER_COLUMNS}
+
+        # load() 이후 사용
+        self.ids: Optional[np.ndarray] = None
+        self.pages: Optional[np.ndarray] = None
+        self.bitsets: Dict[str, Dict[str, np.ndarray]] = {}
+
+    def append(self, row: Dict[str, Any]):
+        """빌드 중 행 1건 추가 (row는 PAYLOAD_FIELDS 딕셔너리)"""
+        self._ids.append(int(row["id"]))
+        self._pages.append(PAGE_NULL if row.get("page") is None else int(row["page"]))
+        values = {
+            "category": row.get("category"),
+            "source": row.get("source"),
+            "entity_type": _entity_type(row.get("entity"))
+        }
+        for column, value in values.items():
+            if value is None:
+                self._codes[column].append(-1)
+                continue
+            vocab = self._vocab[column]
+            self._codes[column].append(vocab.setdefault(value, len(vocab)))
+
+    def save(self, directory: Path):
+        np.save(directory / "ids.npy", np.asarray(self._ids, dtype=np.int64))
+        np.save(directory / "pages.npy", np.asarray(self._pages, dtype=np.int32))
+        for column in FILTER_COLUMNS:
+            np.save(directory / f"{column}.npy", np.asarray(self._codes[column], dtype=np.int32))
+        vocab = {column: list(self._vocab[column]) for column in FILTER_COLUMNS}
+        (directory / "columns.json").write_text(json.dumps(vocab, ensure_ascii=False), encoding="utf-8")
+
+    @classmethod
+    def load(cls, directory: Path) -> "MetadataColumns":
+        columns = cls()
+        columns.ids = np.load(directory / "ids.npy")
+        columns.pages = np.load(directory / "pages.npy")
+        vocab = json.loads((directory / "columns.json").read_text(encoding="utf-8"))
+        for column in FILTER_COLUMNS:
+            codes = np.load(directory / f"{column}.npy")
+            columns.bitsets[column] = {value: codes == code for code, value in enumerate(vocab[column])}
+        return columns
+
+    def __len__(self) -> int:
+        return 0 if self.ids is None else len(self.ids)
+
+    def _any_of(self, column: str, values: List[Any]) -> np.ndarray:
+        mask = np.zeros(len(self), dtype=bool)
+        bitsets = self.bitsets[column]
+        for value in values:
+            bitset = bitsets.get(str(value))
+            if bitset is not None:
+                mask |= bitset
+        return mask
+
+    def mask(self, filter: Optional[MVPSearchFilter]) -> Optional[np.ndarray]:
+        """
+        필터를 행 마스크로 변환 (SQL WHERE와 같은 의미)
+
+        Returns:
+            bool 마스크, 비트셋으로 표현할 수 없는 조건(caption, entity title/keywords/details)이면 None
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if filter is None:
+            return mask
+        if filter.caption:
+            return None
+        if filter.categories:
+            mask &= self._any_of("category", filter.categories)
+        if filter.sources:
+            mask &= self._any_of("source", filter.sources)
+        if filter.pages:
+            mask &= np.isin(self.pages, np.asarray([int(p) for p in filter.pages], dtype=np.int32))
+        if filter.entity:
+            if set(filter.entity) - {"type"}:
+                return None
+            mask &= self._any_of("entity_type", [filter.entity["type"]])
+        return mask
+
+
+class PayloadWriter:
+    """결과 행을 JSONL로 쓰고 행별 바이트 오프셋 기록"""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self._file = open(directory / "rows.jsonl", "wb")
+        self._offsets = [0]
+
+    def append(self, row: Dict[str, Any]):
+        line = json.dumps({field: row.get(field) for field in PAYLOAD_FIELDS}, ensure_ascii=False, default=str)
+        data = line.encode("utf-8") + b"\n"
+        self._file.write(data)
+        self._offsets.append(self._offsets[-1] + len(data))
+
+    def close(self):
+        self._file.close()
+        np.save(self.directory / "row_offsets.npy", np.asarray(self._offsets, dtype=np.int64))
+
+
+class PayloadStore:
+    """mmap된 JSONL에서 행 단위로 결과 딕셔너리 복원"""
+
+    def __init__(self, directory: Path):
+        self.offsets = np.load(directory / "row_offsets.npy")
+        self._file = open(directory / "rows.jsonl", "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.offsets[-1] > 0 else None
+
+    def get(self, row: int) -> Dict[str, Any]:
+        start, end = int(self.offsets[row]), int(self.offsets[row + 1])
+        return json.loads(self._mmap[start:end])
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
+
+
+class SnapshotEngine(abc.ABC):
+    """
+    코퍼스 버전을 따라가는 스냅샷 기반 검색 엔진의 기반 클래스
+
+    서브클래스는 _build(conn, directory)와 _load(directory)를 구현.
+    스냅샷이 없거나 코퍼스 버전과 다르면 snapshot()이 None을 반환하므로
+    호출자는 SQL 경로로 폴백 (재빌드는 백그라운드 스레드에서 진행)
+
+    교체된 이전 스냅샷은 닫지 않음: HybridSearch 스레드 풀의 진행 중인 검색이 아직 참조할 수 있으므로
+    마지막 참조가 사라질 때 GC가 mmap/파일을 해제
+    """
+
+    name = "snapshot"
+
+    def __init__(self, pool, table_name: str, directory: str, refresh_seconds: float):
+        """
+        Args:
+            pool: PostgreSQL 연결 풀
+            table_name: 문서 테이블
+            directory: 스냅샷 디렉토리
+            refresh_seconds: 코퍼스 버전 확인 주기
+        """
+        self.pool = pool
+        self.table_name = table_name
+        self.store = SnapshotStore(directory)
+        self.refresh_seconds = refresh_seconds
+
+        self._snapshot = None
+        self._snapshot_version: Optional[str] = None
+        self._latest_version: Optional[str] = None
+        self._last_check = float("-inf")
+        self._check_lock = threading.Lock()
+        self._build_thread: Optional[threading.Thread] = None
+        self.stats = {"loads": 0, "builds": 0, "build_errors": 0, "served": 0, "fallbacks": 0}
+
+    @abc.abstractmethod
+    def _build(self, conn, directory: Path):
+        """conn(REPEATABLE READ 트랜잭션)에서 읽어 directory에 스냅샷 파일 작성"""
+
+    @abc.abstractmethod
+    def _load(self, directory: Path):
+        """게시된 스냅샷 디렉토리를 검색 객체로 로드"""
+
+    def snapshot(self):
+        """현재 코퍼스 버전과 일치하는 스냅샷 (없으면 None)"""
+        self._maybe_refresh()
+        if self._snapshot is not None and self._snapshot_version == self._latest_version:
+            return self._snapshot
+        return None
+
+    def _maybe_refresh(self):
+        now = time.monotonic()
+        if now - self._last_check < self.refresh_seconds:
+            return
+        if not self._check_lock.acquire(blocking=False):
+            return
+        try:
+            self._last_check = now
+            with self.pool.connection() as conn:
+                version = read_corpus_version(conn, self.table_name)
+            self._latest_version = version
+            if self._snapshot_version == version:
+                return
+
+            current = self.store.current()
+            if current and current[0] == version:
+                self._swap(self._load(current[1]), version)
+                logger.info(f"[{self.name.upper()}] Loaded snapshot {current[1].name} (version {version})")
+                return
+            self._start_build()
+        except Exception as e:
+            logger.warning(f"[{self.name.upper()}] Snapshot refresh failed: {e}")
+        finally:
+            self._check_lock.release()
+
+    def _swap(self, snapshot, version: str):
+        # 이전 스냅샷은 참조가 남아 있는 동안 유지 (진행 중인 검색이 끝나면 GC가 해제)
+        self._snapshot, self._snapshot_version = snapshot, version
+        self._latest_version = version
+        self.stats["loads"] += 1
+
+    def _start_build(self):
+        if self._build_thread is not None and self._build_thread.is_alive():
+            return
+        self._build_thread = threading.Thread(target=self._build_and_load, name=f"{self.name}-build", daemon=True)
+        self._build_thread.start()
+
+    def build_now(self) -> Path:
+        """동기 빌드 후 로드 (스크립트/테스트용)"""
+        return self._build_and_load(raise_errors=True)
+
+    def _build_and_load(self, raise_errors: bool = False) -> Optional[Path]:
+        start = time.time()
+        try:
+            with self.pool.connection() as conn:
+                # 버전과 데이터를 같은 스냅샷에서 읽음
+                conn.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+                version = read_corpus_version(conn, self.table_name)
+                path = self.store.publish(version, lambda directory: self._build(conn, directory))
+                conn.rollback()
+            self._swap(self._load(path), version)
+            self.stats["builds"] += 1
+            logger.info(f"[{self.name.upper()}] Built snapshot {path.name} in {time.time() - start:.2f}s")
+            return path
+        except Exception as e:
+            self.stats["build_errors"] += 1
+            logger.error(f"[{self.name.upper()}] Snapshot build failed: {e}")
+            if raise_errors:
+                raise
+            return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "snapshot_version": self._snapshot_version,
+            "latest_version": self._latest_version,
+            "building": bool(self._build_thread and self._build_thread.is_alive())
+        }
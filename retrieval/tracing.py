@@ -0,0 +1,192 @@
+"""
+Request Tracing for Hot-Path Logs
+검색 경로(HybridSearch, RetrievalNode)의 상세 로그 비용을 요청 단위로 제어
+
+- trace id: 요청마다 짧은 id를 contextvars에 저장, TraceIdFilter가 모든 로그 레코드에 %(trace_id)s로 추가
+  (스레드 풀에는 submit_in_context()로 컨텍스트를 복사해 fan-out 태스크 로그도 같은 id)
+- 상세 로그 (WHERE 절, 파라미터, SQL, 상위 결과 미리보기): log_detail()에 문자열 대신 생성 함수를 넘김
+    LOG_SEARCH_DETAIL=sampled : LOG_DETAIL_SAMPLE_RATE 비율의 요청만 즉시 출력,
+                                나머지는 생성 함수만 보관했다가 LOG_SLOW_REQUEST_MS보다 느린 요청이면 종료 시 출력
+    LOG_SEARCH_DETAIL=all     : 항상 출력 (기존 동작)
+    LOG_SEARCH_DETAIL=off     : 출력하지 않음
+  샘플되지 않은 빠른 요청에서는 미리보기 문자열을 만들지 않음
+"""
+
+import os
+import uuid
+import time
+import random
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Callable, Iterable, List, Optional, Tuple, Union
+
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+DETAIL_MODES = ("sampled", "all", "off")
+
+# 느린 요청에서 출력하기 위해 보관하는 상세 로그 최대 개수 (요청당)
+MAX_DEFERRED_DETAILS = 200
+
+DetailBuilder = Callable[[], Union[str, Iterable[str]]]
+
+_current_trace: "contextvars.ContextVar[Optional[RequestTrace]]" = contextvars.ContextVar("request_trace", default=None)
+
+
+class TraceSettings:
+    """상세 로그 설정 (환경변수, 테스트에서는 configure()로 변경)"""
+
+    def __init__(self):
+        self.mode = os.getenv("LOG_SEARCH_DETAIL", "sampled").lower()
+        if self.mode not in DETAIL_MODES:
+            logger.warning(f"[TRACE] Unknown LOG_SEARCH_DETAIL '{self.mode}', using sampled")
+            self.mode = "sampled"
+        self.sample_rate = float(os.getenv("LOG_DETAIL_SAMPLE_RATE", "0.05"))
+        self.slow_ms = float(os.getenv("LOG_SLOW_REQUEST_MS", "2000"))
+
+
+settings = TraceSettings()
+
+
+def configure(mode: Optional[str] = None, sample_rate: Optional[float] = None, slow_ms: Optional[float] = None):
+    """상세 로그 설정 변경 (None인 항목은 유지)"""
+    if mode is not None:
+        settings.mode = mode
+    if sample_rate is not None:
+        settings.sample_rate = sample_rate
+    if slow_ms is not None:
+        settings.slow_ms = slow_ms
+
+
+class RequestTrace:
+    """요청 단위 trace (id, 샘플 여부, 느린 요청용 지연 상세 로그)"""
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: Optional[str] = None,
+        sampled: Optional[bool] = None,
+        collect: bool = True
+    ):
+        self.name = name
+        self.collect = collect
+        self.trace_id = trace_id or uuid.uuid4().hex[:8]
+        self.sampled = sampled if sampled is not None else random.random() < settings.sample_rate
+        self.started = time.perf_counter()
+        self._deferred: List[Tuple[logging.Logger, int, DetailBuilder]] = []
+        self._dropped = 0
+        self._lock = threading.Lock()
+
+    @property
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def defer(self, target: logging.Logger, level: int, build: DetailBuilder):
+        """상세 로그 생성 함수 보관 (느린 요청일 때만 finish()에서 실행)"""
+        if not self.collect:
+            return
+        with self._lock:
+            if len(self._deferred) < MAX_DEFERRED_DETAILS:
+                self._deferred.append((target, level, build))
+            else:
+                self._dropped += 1
+
+    def finish(self):
+        """요청 종료: 느린 요청이면 보관한 상세 로그 출력"""
+        elapsed = self.elapsed_ms
+        with self._lock:
+            deferred, self._deferred = self._deferred, []
+        if not deferred or elapsed < settings.slow_ms:
+            return
+        logger.info(f"[TRACE] Slow {self.name} ({elapsed:.0f}ms >= {settings.slow_ms:.0f}ms), "
+                    f"emitting {len(deferred)} deferred detail logs"
+                    + (f" ({self._dropped} dropped)" if self._dropped else ""))
+        for target, level, build in deferred:
+            _emit(target, level, build)
+
+
+def current_trace() -> Optional[RequestTrace]:
+    return _current_trace.get()
+
+
+def current_trace_id() -> str:
+    trace = _current_trace.get()
+    return trace.trace_id if trace is not None else "-"
+
+
+@contextmanager
+def request_trace(
+    name: str = "request",
+    sampled: Optional[bool] = None,
+    collect: bool = True,
+    trace_id: Optional[str] = None
+):
+    """
+    요청 trace 범위
+
+    바깥 trace가 있으면 trace id와 샘플 여부를 물려받고, 느린 요청 판단과 지연 상세 로그는
+    이 범위 기준 (예: 워크플로우 trace 안의 retrieval 범위).
+
+    Args:
+        name: 범위 이름 (느린 요청 로그에 표시)
+        sampled: 상세 로그 즉시 출력 여부 (None이면 바깥 trace 또는 LOG_DETAIL_SAMPLE_RATE)
+        collect: 샘플되지 않은 상세 로그를 느린 요청용으로 보관할지 (LLM 호출이 포함된
+                 워크플로우 전체 범위처럼 항상 느린 범위는 False)
+        trace_id: 바깥 trace가 없을 때 사용할 id (예: LangGraph 실행 설정에서 만든 id, None이면 새로 생성)
+    """
+    parent = _current_trace.get()
+    if parent is not None:
+        trace = RequestTrace(name, parent.trace_id, parent.sampled if sampled is None else sampled, collect)
+    else:
+        trace = RequestTrace(name, trace_id, sampled=sampled, collect=collect)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+        trace.finish()
+
+
+def submit_in_context(executor, fn: Callable, *args, **kwargs):
+    """현재 trace 컨텍스트를 유지한 채 스레드 풀에 제출"""
+    return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+def _emit(target: logging.Logger, level: int, build: DetailBuilder):
+    try:
+        lines = build()
+    except Exception as e:
+        target.debug(f"[TRACE] Detail log builder failed: {e}")
+        return
+    for line in ([lines] if isinstance(lines, str) else lines):
+        target.log(level, line)
+
+
+def log_detail(target: logging.Logger, build: DetailBuilder, level: int = logging.INFO):
+    """
+    비용이 큰 상세 로그 (생성 함수는 출력할 때만 호출)
+
+    Args:
+        target: 출력할 로거
+        build: 로그 한 줄(str) 또는 여러 줄(Iterable[str])을 만드는 함수
+        level: 로그 레벨
+    """
+    if settings.mode == "off" or not target.isEnabledFor(level):
+        return
+    trace = _current_trace.get()
+    if settings.mode == "all" or (trace is not None and trace.sampled):
+        _emit(target, level, build)
+    elif trace is not None:
+        trace.defer(target, level, build)
+
+
+class TraceIdFilter(logging.Filter):
+    """로그 레코드에 현재 trace id 추가 (포맷의 %(trace_id)s)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.trace_id = current_trace_id()
+        return True
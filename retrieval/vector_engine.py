@@ -0,0 +1,241 @@
+"""
+In-process Vector Engine
+pgvector 왕복 대신 메모리 매핑된 float32 행렬에서 정확한 코사인 검색
+
+스냅샷 구성 (retrieval.snapshot.SnapshotStore 디렉토리):
+    embedding_korean.npy / embedding_english.npy   # 정규화된 (rows, dim) float32, mmap
+    present_korean.npy / present_english.npy       # 임베딩 존재 여부 (IS NOT NULL)
+    ids.npy, pages.npy, category.npy, ...          # 필터 컬럼 (MetadataColumns)
+    rows.jsonl + row_offsets.npy                   # SQL 경로와 같은 결과 행
+
+결과 행과 similarity(1 - cosine distance)는 SQL 경로와 같은 형식이므로
+SEARCH_VECTOR_ENGINE=compare로 두 경로를 A/B 비교할 수 있음.
+(SQL 경로는 IVFFlat 근사 검색이므로 차이는 주로 인덱스 재현율에서 발생)
+"""
+
+import os
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from dotenv import load_dotenv
+
+from ingest.vector_io import has_vector_adapter
+from retrieval.search_filter import MVPSearchFilter
+from retrieval.snapshot import (
+    PAYLOAD_FIELDS, PAYLOAD_SQL, MetadataColumns, PayloadStore, PayloadWriter, SnapshotEngine
+)
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+LANGUAGE_COLUMNS = {"korean": "embedding_korean", "english": "embedding_english"}
+
+# 후보 행이 전체의 이 비율 미만이면 후보 행만 읽어 계산 (그 이상은 전체 matmul 후 마스킹)
+SUBSET_SCAN_RATIO = 0.25
+
+
+class VectorSnapshot:
+    """로드된 벡터 스냅샷 (읽기 전용)"""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.meta = json.loads((self.directory / "meta.json").read_text(encoding="utf-8"))
+        self.columns = MetadataColumns.load(self.directory)
+        self.payloads = PayloadStore(self.directory)
+        self.matrices: Dict[str, np.ndarray] = {}
+        self.present: Dict[str, np.ndarray] = {}
+        for language, column in LANGUAGE_COLUMNS.items():
+            if self.meta["dims"].get(language):
+                self.matrices[language] = np.load(self.directory / f"{column}.npy", mmap_mode="r")
+                self.present[language] = np.load(self.directory / f"present_{language}.npy")
+
+    @staticmethod
+    def build(conn, directory: Path, table_name: str):
+        """
+        테이블을 스냅샷 파일로 내보내기 (서버 사이드 커서로 스트리밍)
+
+        Args:
+            conn: 트랜잭션 중인 psycopg 연결 (REPEATABLE READ 권장)
+            directory: 출력 디렉토리
+            table_name: 문서 테이블
+        """
+        with conn.cursor() as cur:
+            cur.execute(
+                f"SELECT count(*), max(vector_dims(embedding_korean)), max(vector_dims(embedding_english)) "
+                f"FROM {table_name}"
+            )
+            rows, dim_korean, dim_english = cur.fetchone()
+        dims = {"korean": dim_korean or 0, "english": dim_english or 0}
+
+        matrices = {
+            language: np.lib.format.open_memmap(
+                directory / f"{LANGUAGE_COLUMNS[language]}.npy", mode="w+", dtype=np.float32, shape=(rows, dim)
+            )
+            for language, dim in dims.items() if dim
+        }
+        present = {language: np.zeros(rows, dtype=bool) for language in matrices}
+        columns = MetadataColumns()
+        payloads = PayloadWriter(directory)
+
+        # pgvector 어댑터가 있으면 바이너리 커서로 벡터를 np.ndarray(float32)로 직접 로드,
+        # 없으면 real[] 텍스트 배열로 변환해 읽음
+        binary = has_vector_adapter(conn)
+        vector_sql = "embedding_korean, embedding_english" if binary else "embedding_korean::real[], embedding_english::real[]"
+        with conn.cursor(name="vector_engine_snapshot", binary=binary) as cur:
+            cur.itersize = 2000
+            cur.execute(
+                f"SELECT {PAYLOAD_SQL}, {vector_sql} "
+                f"FROM {table_name} ORDER BY id"
+            )
+            for i, record in enumerate(cur):
+                if i >= rows:
+                    break
+                row = dict(zip(PAYLOAD_FIELDS, record))
+                columns.append(row)
+                payloads.append(row)
+                for language, embedding in zip(("korean", "english"), record[len(PAYLOAD_FIELDS):]):
+                    if embedding is None or language not in matrices:
+                        continue
+                    vector = np.asarray(embedding, dtype=np.float32)
+                    norm = np.linalg.norm(vector)
+                    if norm > 0:
+                        matrices[language][i] = vector / norm
+                        present[language][i] = True
+
+        for language, matrix in matrices.items():
+            matrix.flush()
+            np.save(directory / f"present_{language}.npy", present[language])
+        columns.save(directory)
+        payloads.close()
+        (directory / "meta.json").write_text(json.dumps({"rows": rows, "dims": dims}), encoding="utf-8")
+
+    def search(
+        self,
+        query_embedding: List[float],
+        language: str,
+        filter: Optional[MVPSearchFilter],
+        limit: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        정확한 코사인 top-k (matmul + argpartition)
+
+        Returns:
+            SQL 경로와 같은 형식의 결과 (similarity 포함), 처리할 수 없으면 None
+        """
+        matrix = self.matrices.get(language)
+        if matrix is None or matrix.shape[1] != len(query_embedding):
+            return None
+        mask = self.columns.mask(filter)
+        if mask is None:
+            return None
+
+        candidates = np.flatnonzero(mask & self.present[language])
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if candidates.size == 0 or norm == 0 or limit <= 0:
+            return []
+        query /= norm
+
+        if candidates.size < SUBSET_SCAN_RATIO * matrix.shape[0]:
+            scores = matrix[candidates] @ query
+        else:
+            scores = (matrix @ query)[candidates]
+
+        k = min(limit, candidates.size)
+        top = np.argpartition(-scores, k - 1)[:k] if k < candidates.size else np.arange(candidates.size)
+        # 점수 내림차순, 동점은 id 오름차순
+        order = top[np.lexsort((self.columns.ids[candidates[top]], -scores[top]))]
+
+        results = []
+        for position in order:
+            row = self.payloads.get(int(candidates[position]))
+            row["similarity"] = float(scores[position])
+            results.append(row)
+        return results
+
+    def close(self):
+        self.payloads.close()
+
+
+class VectorEngine(SnapshotEngine):
+    """코퍼스 버전을 따라 갱신되는 인프로세스 벡터 검색 엔진"""
+
+    name = "vector_engine"
+
+    def __init__(
+        self,
+        pool,
+        table_name: Optional[str] = None,
+        directory: Optional[str] = None,
+        refresh_seconds: Optional[float] = None
+    ):
+        """
+        초기화 (인자가 없으면 환경변수 사용)
+
+        Args:
+            pool: PostgreSQL 연결 풀
+            table_name: 문서 테이블 (DB_TABLE_NAME)
+            directory: 스냅샷 디렉토리 (VECTOR_ENGINE_DIR)
+            refresh_seconds: 코퍼스 버전 확인 주기 (VECTOR_ENGINE_REFRESH_SEC)
+        """
+        super().__init__(
+            pool,
+            table_name or os.getenv("DB_TABLE_NAME", "mvp_ddu_documents"),
+            directory or os.getenv("VECTOR_ENGINE_DIR", "data/cache/vector_engine"),
+            refresh_seconds if refresh_seconds is not None else float(os.getenv("VECTOR_ENGINE_REFRESH_SEC", "60"))
+        )
+        self.stats.update({"comparisons": 0, "compare_overlap_sum": 0.0, "compare_max_score_diff": 0.0})
+
+    def _build(self, conn, directory: Path):
+        VectorSnapshot.build(conn, directory, self.table_name)
+
+    def _load(self, directory: Path) -> VectorSnapshot:
+        return VectorSnapshot(directory)
+
+    def search(
+        self,
+        query_embedding: List[float],
+        language: str,
+        filter: Optional[MVPSearchFilter],
+        limit: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        스냅샷 검색 (None이면 호출자가 SQL 경로 사용)
+
+        Args:
+            query_embedding: 쿼리 임베딩
+            language: 'korean' 또는 'english'
+            filter: 검색 필터
+            limit: 최대 결과 수
+        """
+        snapshot = self.snapshot()
+        results = None
+        if snapshot is not None:
+            try:
+                results = snapshot.search(query_embedding, language, filter, limit)
+            except Exception as e:
+                logger.warning(f"[VECTOR_ENGINE] Snapshot search failed, using SQL: {e}")
+        self.stats["served" if results is not None else "fallbacks"] += 1
+        return results
+
+    def compare(self, sql_results: List[Dict[str, Any]], engine_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        SQL 경로와 엔진 결과 비교 (A/B)
+
+        Returns:
+            id 겹침 비율, 공통 문서의 최대 점수 차이
+        """
+        sql_scores = {row["id"]: row.get("similarity", 0.0) for row in sql_results}
+        engine_scores = {row["id"]: row["similarity"] for row in engine_results}
+        common = sql_scores.keys() & engine_scores.keys()
+        overlap = len(common) / max(len(sql_scores), len(engine_scores), 1)
+        max_diff = max((abs(float(sql_scores[i]) - engine_scores[i]) for i in common), default=0.0)
+
+        self.stats["comparisons"] += 1
+        self.stats["compare_overlap_sum"] += overlap
+        self.stats["compare_max_score_diff"] = max(self.stats["compare_max_score_diff"], max_diff)
+        logger.info(f"[VECTOR_ENGINE] A/B overlap={overlap:.2f}, max score diff={max_diff:.6f}")
+        return {"overlap": overlap, "max_score_diff": max_diff}
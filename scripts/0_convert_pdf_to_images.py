@@ -12,7 +12,7 @@ import argparse
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from ingest.pdf_to_image import PDFImageExtractor
+from ingest.pdf_to_image import PDFImageExtractor, DEFAULT_VARIANTS, VARIANT_FORMATS
 
 
 def main():
@@ -50,6 +50,34 @@ def main():
         choices=["png", "jpg", "jpeg"],
         help="Output image format (default: png)"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Render processes (default: 1, 0 = all CPU cores)"
+    )
+    parser.add_argument(
+        "--variants",
+        action="store_true",
+        help="Also write thumbnail (240px) and medium (960px) display variants"
+    )
+    parser.add_argument(
+        "--variant-format",
+        default="webp",
+        choices=list(VARIANT_FORMATS),
+        help="Variant image format (default: webp)"
+    )
+    parser.add_argument(
+        "--variant-quality",
+        type=int,
+        default=80,
+        help="Variant compression quality 1-100 (default: 80)"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-render pages even if the manifest says they are up to date"
+    )
     
     args = parser.parse_args()
     
@@ -62,7 +90,11 @@ def main():
     extractor = PDFImageExtractor(
         output_dir=args.output_dir,
         dpi=args.dpi,
-        image_format=args.format
+        image_format=args.format,
+        workers=args.workers,
+        variants=DEFAULT_VARIANTS if args.variants else None,
+        variant_format=args.variant_format,
+        variant_quality=args.variant_quality
     )
     
     print(f"📄 Converting PDF: {args.pdf_path}")
@@ -77,7 +109,8 @@ def main():
         results = extractor.convert_pdf_to_images(
             args.pdf_path,
             start_page=args.start_page,
-            end_page=args.end_page
+            end_page=args.end_page,
+            force=args.force
         )
         
         print(f"\n✅ Successfully extracted {len(results)} pages:")
@@ -118,6 +151,9 @@ if __name__ == "__main__":
   python scripts/convert_pdf_to_images.py data/sample.pdf --dpi 200
   --start-page 1 --end-page 5
 
+  # 멀티코어 렌더링 (변경 없는 페이지는 manifest 기준으로 건너뜀)
+  python scripts/convert_pdf_to_images.py data/sample.pdf --workers 0
+
   # Python 코드에서 사용
   from ingest import PDFImageExtractor
   extractor = PDFImageExtractor(output_dir="data/images", dpi=150)
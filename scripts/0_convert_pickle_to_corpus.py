@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Convert a DDU pickle file to the sharded JSONL corpus format
+Usage: python scripts/0_convert_pickle_to_corpus.py <pickle_path> [--output-dir <dir>]
+
+The ingest and transplant scripts accept the resulting directory in place of
+the pickle and stream it batch by batch instead of unpickling everything.
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from ingest.corpus import convert_pickle_to_corpus, default_corpus_path
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert a DDU pickle file to a sharded JSONL corpus"
+    )
+    parser.add_argument(
+        "pickle_path",
+        help="Path to the DDU documents pickle"
+    )
+    parser.add_argument(
+        "--output-dir",
+        help="Corpus directory (default: <pickle>.corpus next to the pickle)"
+    )
+    parser.add_argument(
+        "--shard-size",
+        type=int,
+        help="Rows per shard (default: INGEST_CORPUS_SHARD_SIZE or 5000)"
+    )
+
+    args = parser.parse_args()
+
+    if not Path(args.pickle_path).exists():
+        print(f"Error: Pickle file not found: {args.pickle_path}")
+        sys.exit(1)
+
+    output_dir = args.output_dir or str(default_corpus_path(args.pickle_path))
+    print(f"Converting: {args.pickle_path}")
+    print(f"Output directory: {output_dir}")
+
+    start = time.time()
+    try:
+        manifest = convert_pickle_to_corpus(args.pickle_path, output_dir, shard_size=args.shard_size)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    stats = manifest["statistics"]
+    print(f"\nWrote {manifest['rows']} rows in {len(manifest['shards'])} shard(s) "
+          f"({time.time() - start:.2f}s)")
+    if manifest["skipped"]:
+        print(f"Skipped {manifest['skipped']} unsupported elements")
+    print(f"Valid documents: {stats['total_documents']}")
+    print(f"Categories: {stats['categories']}")
+    print(f"Page range: {stats['page_range']['min']} - {stats['page_range']['max']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,9 @@ Usage:
     # 커스텀 파일 지정
     uv run python scripts/transplant_ddokddak_entity.py --ddokddak-json <path> --ddu-pickle <path>
     
+    # JSONL 샤드 코퍼스 입력 (배치 단위 스트리밍, 결과도 코퍼스로 저장)
+    uv run python scripts/transplant_ddokddak_entity.py --ddu-pickle data/merged_ddu_documents.corpus
+    
 Example:
     # 기본 실행
     uv run python scripts/transplant_ddokddak_entity.py
@@ -27,6 +30,7 @@ DEFAULT_DDOKDDAK_JSON = "data/ddokddak_디지털정부혁신_추진계획_TEST3P
 DEFAULT_DDU_PICKLE = "data/merged_ddu_documents.pkl"
 DEFAULT_OUTPUT_PICKLE = "data/transplanted_ddu_documents.pkl"
 DEFAULT_OUTPUT_JSON = "data/transplanted_ddu_documents.json"  # JSON 출력 경로
+DEFAULT_OUTPUT_CORPUS = ""  # 코퍼스 출력 경로 (비우면 코퍼스 입력일 때 <output-pickle>.corpus)
 
 # 이식 대상 카테고리 설정
 ALLOWED_CATEGORIES = ['paragraph', 'heading1', 'heading2', 'heading3']
@@ -48,8 +52,14 @@ from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from collections import defaultdict
+from itertools import islice
 from dotenv import load_dotenv
 
+# 프로젝트 루트 경로 추가
+sys.path.append(str(Path(__file__).parent.parent))
+
+from ingest.corpus import CorpusReader, CorpusWriter, default_corpus_path, is_corpus
+
 # .env 파일 로드
 load_dotenv()
 
@@ -58,6 +68,7 @@ DDOKDDAK_JSON = os.getenv("TRANSPLANT_DDOKDDAK_JSON", DEFAULT_DDOKDDAK_JSON)
 DDU_PICKLE = os.getenv("TRANSPLANT_DDU_PICKLE", DEFAULT_DDU_PICKLE)
 OUTPUT_PICKLE = os.getenv("TRANSPLANT_OUTPUT_PICKLE", DEFAULT_OUTPUT_PICKLE)
 OUTPUT_JSON = os.getenv("TRANSPLANT_OUTPUT_JSON", DEFAULT_OUTPUT_JSON)
+OUTPUT_CORPUS = os.getenv("TRANSPLANT_OUTPUT_CORPUS", DEFAULT_OUTPUT_CORPUS)
 DRY_RUN = os.getenv("TRANSPLANT_DRY_RUN", str(DEFAULT_DRY_RUN)).lower() == "true"
 VERBOSE = os.getenv("TRANSPLANT_VERBOSE", str(DEFAULT_VERBOSE)).lower() == "true"
 SAVE_JSON = os.getenv("TRANSPLANT_SAVE_JSON", str(DEFAULT_SAVE_JSON)).lower() == "true"
@@ -81,7 +92,8 @@ class DdokddakEntityTransplanter:
         
         Args:
             ddokddak_json_path: DDokDDak JSON 파일 경로
-            ddu_pickle_path: DDU documents pickle 파일 경로
+            ddu_pickle_path: DDU documents pickle 파일 또는 코퍼스 디렉토리 경로
+                (코퍼스는 메모리에 올리지 않고 필요할 때마다 스트리밍)
         
         Raises:
             FileNotFoundError: 파일이 존재하지 않을 때
@@ -101,9 +113,21 @@ class DdokddakEntityTransplanter:
         print(f"📄 Loading DDokDDak: {Path(ddokddak_json_path).name}")
         self.ddokddak_data = self._load_and_validate_ddokddak(ddokddak_json_path)
         
-        print(f"📦 Loading DDU documents: {Path(ddu_pickle_path).name}")
-        self.ddu_documents = self._load_ddu_pickle(ddu_pickle_path)
-        print(f"   Total DDU documents: {len(self.ddu_documents)}")
+        self.ddu_path = ddu_pickle_path
+        self.corpus: Optional[CorpusReader] = None
+        self.ddu_documents: Optional[List[Document]] = None
+        if is_corpus(ddu_pickle_path):
+            print(f"📦 Opening DDU corpus: {Path(ddu_pickle_path).name}")
+            self.corpus = CorpusReader(ddu_pickle_path)
+            if not self.corpus.validate():
+                raise ValueError(f"Invalid DDU corpus: {ddu_pickle_path}")
+            print(f"   Total DDU documents: {self.corpus.rows}")
+        else:
+            print(f"📦 Loading DDU documents: {Path(ddu_pickle_path).name}")
+            self.ddu_documents = self._load_ddu_pickle(ddu_pickle_path)
+            print(f"   Total DDU documents: {len(self.ddu_documents)}")
+        
+        self.new_entity: Optional[Dict[str, Any]] = None
         
         # 통계 초기화
         self.transplant_stats = {
@@ -185,6 +209,32 @@ class DdokddakEntityTransplanter:
         
         return documents
     
+    def _iter_documents(self, batch_size: int = 1000):
+        """DDU 문서 순회 (코퍼스는 배치 단위로 읽음)"""
+        if self.corpus is None:
+            yield from self.ddu_documents
+            return
+        for batch in self.corpus.iter_raw(batch_size):
+            for doc in batch:
+                # 코퍼스에는 dict 형식 요소도 있을 수 있음 (metadata가 있는 Document만 대상)
+                if hasattr(doc, 'metadata'):
+                    yield doc
+    
+    def _is_match(self, ddu: Document) -> bool:
+        """DDokDDak source_file/source_page와 일치하는 문서인지 확인"""
+        source_file = self.ddokddak_data['metadata']['source_file']
+        source_page = self.ddokddak_data['metadata']['source_page']
+        
+        ddu_source = ddu.metadata.get('source', '')
+        
+        # 정확한 매칭 (파일명에 data/ prefix가 있을 수 있음)
+        source_match = (
+            ddu_source == source_file or 
+            ddu_source == f"data/{source_file}" or
+            ddu_source.endswith(f"/{source_file}")
+        )
+        return source_match and ddu.metadata.get('page') == source_page
+    
     def _print_metadata_info(self):
         """DDokDDak 메타데이터 정보 출력"""
         print(f"\n📋 DDokDDak Metadata:")
@@ -215,29 +265,15 @@ class DdokddakEntityTransplanter:
         print(f"   Target file: {source_file}")
         print(f"   Target page: {source_page}")
         
-        matches = []
-        
-        # 각 DDU 문서 확인
-        for ddu in self.ddu_documents:
-            ddu_source = ddu.metadata.get('source', '')
-            ddu_page = ddu.metadata.get('page')
-            
-            # 정확한 매칭 (파일명에 data/ prefix가 있을 수 있음)
-            source_match = (
-                ddu_source == source_file or 
-                ddu_source == f"data/{source_file}" or
-                ddu_source.endswith(f"/{source_file}")
-            )
-            
-            if source_match and ddu_page == source_page:
-                matches.append(ddu)
+        # 각 DDU 문서 확인 (코퍼스 입력이면 매칭 문서만 메모리에 유지)
+        matches = [ddu for ddu in self._iter_documents() if self._is_match(ddu)]
         
         # 매칭 실패시 에러
         if not matches:
             # 디버깅을 위해 첫 5개 문서의 source 출력
             print("\n❌ No matching documents found!")
             print("\nFirst 5 DDU document sources for debugging:")
-            for i, ddu in enumerate(self.ddu_documents[:5]):
+            for i, ddu in enumerate(islice(self._iter_documents(), 5)):
                 print(f"   {i+1}. source: {ddu.metadata.get('source')}, page: {ddu.metadata.get('page')}")
             
             raise ValueError(
@@ -282,6 +318,24 @@ class DdokddakEntityTransplanter:
             "raw_output": ddokddak_result.get("raw_output", "")  # 길이 제한 없음
         }
     
+    def _apply_entity(self, ddu_doc: Document, new_entity: Dict[str, Any]) -> bool:
+        """
+        허용된 카테고리 문서에 entity 이식
+        
+        Returns:
+            이식 여부
+        """
+        if ddu_doc.metadata.get('category', 'unknown') not in self.ALLOWED_CATEGORIES:
+            return False
+        
+        # 기존 entity 백업 (있는 경우)
+        if 'entity' in ddu_doc.metadata and ddu_doc.metadata['entity']:
+            ddu_doc.metadata['original_entity'] = ddu_doc.metadata['entity']
+        
+        # Entity 이식
+        ddu_doc.metadata['entity'] = new_entity
+        return True
+    
     def transplant_entities(self) -> Dict[str, Any]:
         """
         메인 이식 실행
@@ -299,6 +353,7 @@ class DdokddakEntityTransplanter:
             
             # 2. Entity 변환
             new_entity = self.transform_entity(self.ddokddak_data['result'])
+            self.new_entity = new_entity
             print(f"\n📝 Entity prepared for transplant")
             print(f"   Type: {new_entity['type']}")
             print(f"   Title: {new_entity['title'][:50]}...")
@@ -311,14 +366,7 @@ class DdokddakEntityTransplanter:
                 doc_id = ddu_doc.metadata.get('id', f'doc_{i}')
                 
                 # 허용된 카테고리만 처리
-                if category in self.ALLOWED_CATEGORIES:
-                    # 기존 entity 백업 (있는 경우)
-                    if 'entity' in ddu_doc.metadata and ddu_doc.metadata['entity']:
-                        ddu_doc.metadata['original_entity'] = ddu_doc.metadata['entity']
-                    
-                    # Entity 이식
-                    ddu_doc.metadata['entity'] = new_entity
-                    
+                if self._apply_entity(ddu_doc, new_entity):
                     # 통계 업데이트
                     self.transplant_stats['success'] += 1
                     self.transplant_stats['by_category'][category] += 1
@@ -336,17 +384,35 @@ class DdokddakEntityTransplanter:
         
         return self.transplant_stats
     
-    def save_results(self, output_path: str, save_json: bool = False, json_path: str = None):
+    def save_results(
+        self,
+        output_path: str,
+        save_json: bool = False,
+        json_path: str = None,
+        corpus_path: str = None
+    ):
         """
         결과 저장 (pickle 및 선택적으로 JSON)
         
+        코퍼스 입력이면 pickle 대신 코퍼스로 스트리밍 저장
+        
         Args:
             output_path: 출력 pickle 파일 경로
             save_json: JSON도 저장할지 여부
             json_path: JSON 파일 경로 (None이면 output_path 기반으로 생성)
+            corpus_path: 출력 코퍼스 디렉토리 (None이면 코퍼스 입력일 때 <output_path>.corpus)
         """
         print(f"\n💾 Saving results...")
         
+        if self.corpus is not None:
+            if save_json and json_path is None:
+                json_path = str(Path(output_path).with_suffix('.json'))
+            self._save_corpus_results(
+                corpus_path or str(default_corpus_path(output_path)),
+                json_path if save_json else None
+            )
+            return
+        
         # Pickle 저장
         # 백업 생성
         if os.path.exists(output_path):
@@ -391,6 +457,52 @@ class DdokddakEntityTransplanter:
             # JSON 파일 크기
             json_size = os.path.getsize(json_path) / (1024 * 1024)  # MB
             print(f"   📊 JSON size: {json_size:.2f} MB")
+        
+        # 코퍼스도 요청된 경우
+        if corpus_path:
+            with CorpusWriter(corpus_path) as writer:
+                writer.write_many(self.ddu_documents)
+            print(f"   ✅ Saved corpus to: {Path(corpus_path).name} ({writer.rows} rows)")
+    
+    def _save_corpus_results(self, corpus_path: str, json_path: Optional[str] = None):
+        """
+        코퍼스 입력을 다시 스트리밍하며 이식 결과를 새 코퍼스(및 JSON)로 저장
+        
+        Args:
+            corpus_path: 출력 코퍼스 디렉토리 (입력 코퍼스와 달라야 함)
+            json_path: JSON 파일 경로 (None이면 저장하지 않음)
+        """
+        if Path(corpus_path).resolve() == Path(self.ddu_path).resolve():
+            raise ValueError(f"Output corpus must differ from the input corpus: {corpus_path}")
+        
+        json_file = open(json_path, 'w', encoding='utf-8') if json_path else None
+        try:
+            if json_file:
+                json_file.write("[\n")
+            
+            with CorpusWriter(corpus_path) as writer:
+                for i, raw_batch in enumerate(self.corpus.iter_raw(1000)):
+                    for j, doc in enumerate(raw_batch):
+                        if hasattr(doc, 'metadata') and self.new_entity and self._is_match(doc):
+                            self._apply_entity(doc, self.new_entity)
+                        writer.write(doc)
+                        
+                        if json_file:
+                            if i or j:
+                                json_file.write(",\n")
+                            payload = {"page_content": doc.page_content, "metadata": doc.metadata} if hasattr(doc, 'metadata') else doc
+                            json_file.write(json.dumps(payload, ensure_ascii=False, indent=2, default=str))
+            
+            if json_file:
+                json_file.write("\n]\n")
+        finally:
+            if json_file:
+                json_file.close()
+        
+        print(f"   ✅ Saved corpus to: {Path(corpus_path).name} ({writer.rows} rows)")
+        if json_path:
+            json_size = os.path.getsize(json_path) / (1024 * 1024)  # MB
+            print(f"   ✅ Saved JSON to: {Path(json_path).name} ({json_size:.2f} MB)")
     
     def generate_report(self):
         """이식 결과 보고서 출력"""
@@ -426,6 +538,7 @@ def main():
   TRANSPLANT_DDU_PICKLE     - DDU pickle 파일 경로
   TRANSPLANT_OUTPUT_PICKLE  - 출력 pickle 파일 경로
   TRANSPLANT_OUTPUT_JSON    - 출력 JSON 파일 경로
+  TRANSPLANT_OUTPUT_CORPUS  - 출력 코퍼스 디렉토리 (코퍼스 입력 시 기본 <output-pickle>.corpus)
   TRANSPLANT_DRY_RUN       - 검증만 수행 (true/false)
   TRANSPLANT_VERBOSE       - 상세 출력 (true/false)
   TRANSPLANT_SAVE_JSON     - JSON도 함께 저장 (true/false)
@@ -458,7 +571,7 @@ Examples:
     parser.add_argument(
         '--ddu-pickle',
         default=DDU_PICKLE,
-        help=f'DDU documents pickle 파일 경로 (default: {DDU_PICKLE})'
+        help=f'DDU documents pickle 파일 또는 코퍼스 디렉토리 경로 (default: {DDU_PICKLE})'
     )
     parser.add_argument(
         '--output-pickle',
@@ -470,6 +583,11 @@ Examples:
         default=OUTPUT_JSON,
         help=f'출력 JSON 파일 경로 (default: {OUTPUT_JSON})'
     )
+    parser.add_argument(
+        '--output-corpus',
+        default=OUTPUT_CORPUS or None,
+        help='출력 코퍼스 디렉토리 (pickle 입력이면 지정 시 추가 저장, 코퍼스 입력이면 기본 <output-pickle>.corpus)'
+    )
     parser.add_argument(
         '--save-json',
         action='store_true',
@@ -504,6 +622,7 @@ Examples:
         print(f"   DDU Pickle: {args.ddu_pickle}")
         print(f"   Output Pickle: {args.output_pickle}")
         print(f"   Output JSON: {args.output_json}")
+        print(f"   Output Corpus: {args.output_corpus}")
         print(f"   Save JSON: {args.save_json}")
         print(f"   Dry Run: {args.dry_run}")
         print(f"   Verbose: {args.verbose}")
@@ -524,7 +643,8 @@ Examples:
             transplanter.save_results(
                 args.output_pickle,
                 save_json=args.save_json,
-                json_path=args.output_json
+                json_path=args.output_json,
+                corpus_path=args.output_corpus
             )
         else:
             print("\n⚠️  Dry-run mode: Results not saved")
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Filter Index Migration for MVP RAG System
+Usage: python scripts/1_phase1_migrate_indexes.py [--concurrently] [--verify-only] [--dry-run]
+
+Creates the indexes backing MVPSearchFilter predicates on an existing table
+and verifies with EXPLAIN that no filter shape still needs a sequential scan.
+Exits with status 1 if any shape fails verification.
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# 프로젝트 루트 경로 추가
+sys.path.append(str(Path(__file__).parent.parent))
+
+from ingest.database import DatabaseManager
+from ingest.indexes import migration_statements
+
+
+def print_report(report: dict) -> bool:
+    """형태별 검증 결과 출력, 모두 통과하면 True"""
+    for shape, result in report.items():
+        if result["ok"]:
+            print(f"✅ {shape:<16} {', '.join(result['indexes'])}")
+        else:
+            print(f"❌ {shape:<16} {result['where']}")
+            for seq_scan in result["seq_scans"]:
+                print(f"     {seq_scan}")
+    return all(result["ok"] for result in report.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Create and verify indexes for MVPSearchFilter predicates"
+    )
+    parser.add_argument(
+        "--concurrently",
+        action="store_true",
+        help="Use CREATE INDEX CONCURRENTLY (no write lock on a live table)"
+    )
+    parser.add_argument(
+        "--verify-only",
+        action="store_true",
+        help="Only run the EXPLAIN verification"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print the migration SQL without connecting"
+    )
+
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager()
+
+    if args.dry_run:
+        for statement in migration_statements(db_manager.table_name, args.concurrently):
+            print(f"{statement};")
+        return
+
+    print("=" * 60)
+    print("MVP RAG System - Filter Index Migration")
+    print("=" * 60)
+
+    try:
+        db_manager.initialize()
+
+        if not args.verify_only:
+            print("\n📌 Creating filter indexes...")
+            created = db_manager.create_filter_indexes(concurrently=args.concurrently)
+            print(f"✅ Created: {', '.join(created) if created else 'none (already present)'}")
+
+        print("\n📌 Verifying filter shapes (EXPLAIN, enable_seqscan=off)...")
+        ok = print_report(db_manager.verify_filter_indexes())
+    finally:
+        db_manager.close()
+
+    if not ok:
+        print("\n❌ Some filter shapes still require a sequential scan")
+        sys.exit(1)
+    print("\n✅ All filter shapes are index-backed")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 """
 Document Ingestion Script for MVP RAG System
-Pickle 파일에서 문서를 로드하고 데이터베이스에 저장
+Pickle 파일 또는 JSONL 샤드 코퍼스에서 문서를 로드하고 데이터베이스에 저장
+(코퍼스는 배치 단위로 스트리밍, 변환: scripts/0_convert_pickle_to_corpus.py)
 """
 
 import os
@@ -10,59 +11,46 @@ from pathlib import Path
 from dotenv import load_dotenv
 from tqdm import tqdm
 import time
+import math
+from itertools import islice
 
 # 프로젝트 루트 경로 추가
 sys.path.append(str(Path(__file__).parent.parent))
 
 from ingest.database import DatabaseManager
-from ingest.loader import DDUPickleLoader
+from ingest.corpus import open_corpus
 from ingest.embeddings import DualLanguageEmbeddings
 from ingest.models import DDUDocument
+from ingest.search_text import build_search_texts
+from ingest.vector_io import vector_param
 
 # .env 파일 로드
 load_dotenv()
 
 
-def extract_entity_text(entity_dict: dict) -> str:
+def build_search_snapshots(pool):
     """
-    Entity 딕셔너리에서 검색 가능한 텍스트 추출
+    인제스트 직후 인프로세스 검색 엔진 스냅샷 빌드
+    (SEARCH_KEYWORD_ENGINE=bm25, SEARCH_VECTOR_ENGINE=numpy|compare일 때만, 첫 검색에서의 빌드 대기를 없앰)
     
     Args:
-        entity_dict: Entity 정보를 담은 딕셔너리
-        
-    Returns:
-        검색용 텍스트 문자열
+        pool: PostgreSQL 연결 풀
     """
-    if not entity_dict:
-        return ""
-    
-    text_parts = []
-    
-    # title 추출
-    if entity_dict.get("title"):
-        text_parts.append(str(entity_dict["title"]))
-    
-    # details 추출
-    if entity_dict.get("details"):
-        text_parts.append(str(entity_dict["details"]))
-    
-    # keywords 리스트 추출
-    if entity_dict.get("keywords"):
-        keywords = entity_dict["keywords"]
-        if isinstance(keywords, list):
-            text_parts.extend([str(k) for k in keywords if k])
-        elif isinstance(keywords, str):
-            text_parts.append(keywords)
-    
-    # hypothetical_questions 리스트 추출
-    if entity_dict.get("hypothetical_questions"):
-        questions = entity_dict["hypothetical_questions"]
-        if isinstance(questions, list):
-            text_parts.extend([str(q) for q in questions if q])
-        elif isinstance(questions, str):
-            text_parts.append(questions)
-    
-    return " ".join(text_parts)
+    engines = []
+    if os.getenv("SEARCH_KEYWORD_ENGINE", "sql").lower() == "bm25":
+        from retrieval.keyword_engine import KeywordEngine
+        engines.append(("BM25 keyword index", KeywordEngine(pool)))
+    if os.getenv("SEARCH_VECTOR_ENGINE", "sql").lower() in ("numpy", "compare"):
+        from retrieval.vector_engine import VectorEngine
+        engines.append(("Vector snapshot", VectorEngine(pool)))
+    
+    for label, engine in engines:
+        print(f"\n📌 Building {label}...")
+        try:
+            path = engine.build_now()
+            print(f"✅ {label} ready: {path}")
+        except Exception as e:
+            print(f"⚠️  {label} build failed (searches fall back to SQL): {e}")
 
 
 def ingest_documents(pickle_path: str, batch_size: int = 10):
@@ -70,23 +58,21 @@ def ingest_documents(pickle_path: str, batch_size: int = 10):
     DDU 문서 인제스트
     
     Args:
-        pickle_path: Pickle 파일 경로
+        pickle_path: Pickle 파일 또는 코퍼스 디렉토리 경로
         batch_size: 배치 크기
     """
     print("=" * 60)
     print("MVP RAG System - Document Ingestion")
     print("=" * 60)
     
-    # Pickle 파일 검증
-    print(f"\n📁 Loading pickle file: {pickle_path}")
-    if not DDUPickleLoader.validate_pickle_file(pickle_path):
-        print("❌ Invalid pickle file format")
+    # 입력 검증 (pickle은 여기서 1회만 unpickle, 코퍼스는 manifest만 확인)
+    print(f"\n📁 Loading documents: {pickle_path}")
+    loader = open_corpus(pickle_path)
+    if not loader.validate():
+        print("❌ Invalid pickle file or corpus format")
         return
     
-    # 로더 초기화
-    loader = DDUPickleLoader(pickle_path)
-    
-    # 통계 출력
+    # 통계 출력 (코퍼스는 manifest의 컬럼 통계 사용)
     print("\n📊 Document Statistics:")
     stats = loader.get_statistics()
     print(f"  - Total Documents: {stats['total_documents']}")
@@ -102,14 +88,11 @@ def ingest_documents(pickle_path: str, batch_size: int = 10):
         print("Ingestion cancelled")
         return
     
-    # 문서 로드
-    print("\n📌 Loading documents...")
-    documents = loader.load_documents()
-    print(f"✅ Loaded {len(documents)} documents")
-    
     # 데이터베이스 매니저 초기화
     db_manager = DatabaseManager()
     db_manager.initialize()
+    # 기존 테이블에도 코퍼스 버전 트리거 설치 (이후 모든 쓰기가 검색 결과 캐시를 무효화)
+    db_manager.ensure_corpus_version_trigger()
     
     # 임베딩 생성기 초기화
     embeddings = DualLanguageEmbeddings()
@@ -121,10 +104,9 @@ def ingest_documents(pickle_path: str, batch_size: int = 10):
     success_count = 0
     error_count = 0
     
-    # tqdm으로 진행 상황 표시
-    for i in tqdm(range(0, len(documents), batch_size), desc="Ingesting"):
-        batch = documents[i:i+batch_size]
-        
+    # tqdm으로 진행 상황 표시 (문서는 배치 단위로 스트리밍)
+    total_batches = math.ceil(stats['total_documents'] / batch_size)
+    for batch in tqdm(loader.iter_documents(batch_size), total=total_batches, desc="Ingesting"):
         for doc in batch:
             try:
                 # 문서를 딕셔너리로 변환
@@ -138,17 +120,14 @@ def ingest_documents(pickle_path: str, batch_size: int = 10):
                 if doc_dict.get("entity") is not None:
                     entity_json = json.dumps(doc_dict.get("entity"), ensure_ascii=False)
                 
-                # 벡터를 문자열로 변환 (pgvector 형식)
-                korean_emb_str = None
-                if korean_emb:
-                    korean_emb_str = f"[{','.join(map(str, korean_emb))}]"
-                
-                english_emb_str = None  
-                if english_emb:
-                    english_emb_str = f"[{','.join(map(str, english_emb))}]"
+                # 전문 검색 텍스트 (entity와 human_feedback 포함)
+                search_korean, search_english = build_search_texts(doc_dict)
                 
                 # DB 저장 (psycopg3 패턴 사용)
                 with db_manager.pool.connection() as conn:
+                    # 벡터는 float32 배열로 바이너리 전송 (pgvector 어댑터가 없는 연결은 텍스트 리터럴)
+                    korean_emb_param = vector_param(conn, korean_emb or None)
+                    english_emb_param = vector_param(conn, english_emb or None)
                     with conn.cursor() as cur:
                         cur.execute("""
                             INSERT INTO mvp_ddu_documents (
@@ -175,18 +154,10 @@ def ingest_documents(pickle_path: str, batch_size: int = 10):
                             "entity": entity_json,  # JSON 문자열로 변환된 entity
                             "image_path": doc_dict.get("image_path"),
                             "human_feedback": doc_dict.get("human_feedback", ""),
-                            "embedding_korean": korean_emb_str,  # 문자열로 변환된 벡터
-                            "embedding_english": english_emb_str,  # 문자열로 변환된 벡터
-                            # 한국어 검색 텍스트 (entity와 human_feedback 포함)
-                            "search_korean": (doc_dict.get("contextualize_text", "") + " " + 
-                                            doc_dict.get("page_content", "") + " " +
-                                            doc_dict.get("caption", "") + " " +
-                                            extract_entity_text(doc_dict.get("entity", {})) + " " +
-                                            doc_dict.get("human_feedback", "")),
-                            # 영어 검색 텍스트 (entity와 human_feedback 포함)
-                            "search_english": (doc_dict.get("translation_text", "") + " " +
-                                             extract_entity_text(doc_dict.get("entity", {})) + " " +
-                                             doc_dict.get("human_feedback", ""))
+                            "embedding_korean": korean_emb_param,
+                            "embedding_english": english_emb_param,
+                            "search_korean": search_korean,
+                            "search_english": search_english
                         })
                     conn.commit()
                 
@@ -207,7 +178,8 @@ def ingest_documents(pickle_path: str, batch_size: int = 10):
     if error_count > 0:
         print(f"❌ Failed: {error_count} documents")
     print(f"⏱️  Total time: {elapsed_time:.2f} seconds")
-    print(f"📈 Average: {elapsed_time/len(documents):.3f} seconds per document")
+    processed = success_count + error_count
+    print(f"📈 Average: {elapsed_time/max(processed, 1):.3f} seconds per document")
     
     # DB 통계 확인
     print("\n📊 Final Database Statistics:")
@@ -216,6 +188,14 @@ def ingest_documents(pickle_path: str, batch_size: int = 10):
     for category, count in list(stats['categories'].items())[:5]:
         print(f"  - {category}: {count} docs")
     
+    # 코퍼스 버전 증가 (검색 결과 캐시 무효화)
+    if success_count > 0:
+        version = db_manager.bump_corpus_version()
+        print(f"\n🔖 Corpus version: {version}")
+    
+    # 인프로세스 검색 엔진 스냅샷 빌드 (설정된 경우)
+    build_search_snapshots(db_manager.pool)
+    
     # 연결 종료
     db_manager.close()
     print("\n✅ Ingestion completed successfully!")
@@ -226,18 +206,20 @@ def test_ingestion(pickle_path: str, limit: int = 5):
     소수의 문서로 인제스트 테스트
     
     Args:
-        pickle_path: Pickle 파일 경로
+        pickle_path: Pickle 파일 또는 코퍼스 디렉토리 경로
         limit: 테스트할 문서 수
     """
     print(f"\n🧪 Test Mode: Ingesting first {limit} documents")
     
-    # 로더 초기화
-    loader = DDUPickleLoader(pickle_path)
-    documents = loader.load_documents()[:limit]
+    # 로더 초기화 (앞쪽 배치만 읽음)
+    loader = open_corpus(pickle_path)
+    documents = list(islice((doc for batch in loader.iter_documents(limit) for doc in batch), limit))
     
     # 데이터베이스 매니저 초기화
     db_manager = DatabaseManager()
     db_manager.initialize()
+    # 기존 테이블에도 코퍼스 버전 트리거 설치 (이후 모든 쓰기가 검색 결과 캐시를 무효화)
+    db_manager.ensure_corpus_version_trigger()
     
     # 임베딩 생성기 초기화
     embeddings = DualLanguageEmbeddings()
@@ -278,9 +260,9 @@ def main():
         if use_default.lower() != 'n':
             pickle_path = default_pickle
         else:
-            pickle_path = input("Enter pickle file path: ")
+            pickle_path = input("Enter pickle file or corpus directory path: ")
     else:
-        pickle_path = input("Enter pickle file path: ")
+        pickle_path = input("Enter pickle file or corpus directory path: ")
     
     # 파일 존재 확인
     if not os.path.exists(pickle_path):
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Vector Tier Benchmark for MVP RAG System
+Usage: python scripts/benchmark_vector_tiers.py [--language korean] [--queries 50] [--k 10]
+                                                [--tiers full,halfvec,binary,matryoshka]
+                                                [--factor 4] [--probes 10] [--create-indexes] [--dry-run]
+
+Compares shortlist tiers (SEARCH_VECTOR_TIER) against exact full-vector search.
+Stored embeddings sampled from the table are used as queries; for each tier it
+reports recall@k against the exact top-k, p50/p95 latency, the index size, and
+whether 10x that index would still fit in shared_buffers.
+"""
+
+import sys
+import time
+import argparse
+import statistics
+from pathlib import Path
+
+# 프로젝트 루트 경로 추가
+sys.path.append(str(Path(__file__).parent.parent))
+
+from ingest.database import DatabaseManager
+from ingest.vector_io import vector_param
+from ingest.vector_tiers import FULL_INDEXES, TIER_NAMES, get_tier, tier_index_sizes, tier_migration_statements
+from retrieval.filtered_ann import FilteredVectorSearch
+
+MB = 1024 * 1024
+
+
+def sample_queries(conn, table_name: str, column: str, count: int) -> list:
+    """저장된 임베딩을 쿼리로 샘플링"""
+    with conn.cursor() as cur:
+        cur.execute(
+            f"SELECT {column}::real[] FROM {table_name} WHERE {column} IS NOT NULL ORDER BY random() LIMIT %s",
+            (count,)
+        )
+        queries = [row[0] for row in cur.fetchall()]
+    conn.rollback()
+    return queries
+
+
+def exact_top_k(conn, table_name: str, column: str, params: dict) -> list:
+    """정답 top-k (MATERIALIZED CTE로 ANN 인덱스 우회)"""
+    with conn.cursor() as cur:
+        cur.execute(
+            f"""
+            WITH candidates AS MATERIALIZED (
+                SELECT id, {column} <=> %(embedding)s::vector AS distance
+                FROM {table_name}
+                WHERE {column} IS NOT NULL
+            )
+            SELECT id FROM candidates ORDER BY distance, id LIMIT %(limit)s
+            """,
+            params
+        )
+        ids = [row[0] for row in cur.fetchall()]
+    conn.rollback()
+    return ids
+
+
+def run_tier(conn, searcher: FilteredVectorSearch, column: str, params: dict, k: int, probes: int):
+    """티어 검색 1회 (지연 시간 ms, 결과 id 목록)"""
+    select_sql = f"id, 1 - ({column} <=> %(embedding)s::vector) as similarity"
+    start = time.perf_counter()
+    if probes > 0:
+        with conn.cursor() as cur:
+            cur.execute(f"SET LOCAL ivfflat.probes = {int(probes)}")
+    rows, _ = searcher.search(conn, column, select_sql, "1=1", params, k)
+    elapsed = (time.perf_counter() - start) * 1000
+    conn.rollback()
+    return elapsed, [row["id"] for row in rows]
+
+
+def percentile(values: list, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark recall@k and latency of vector shortlist tiers")
+    parser.add_argument("--language", choices=["korean", "english"], default="korean")
+    parser.add_argument("--queries", type=int, default=50, help="Number of sampled query embeddings")
+    parser.add_argument("--k", type=int, default=10, help="Top-k for recall@k")
+    parser.add_argument("--tiers", default=",".join(TIER_NAMES), help="Comma-separated tiers to compare")
+    parser.add_argument("--factor", type=int, default=None, help="Shortlist factor (SEARCH_TIER_SHORTLIST_FACTOR)")
+    parser.add_argument("--probes", type=int, default=0, help="ivfflat.probes (0 keeps the server default)")
+    parser.add_argument("--create-indexes", action="store_true", help="Create missing tier indexes first")
+    parser.add_argument("--concurrently", action="store_true", help="Use CREATE INDEX CONCURRENTLY")
+    parser.add_argument("--dry-run", action="store_true", help="Print the tier index SQL without connecting")
+
+    args = parser.parse_args()
+    tiers = [name.strip().lower() for name in args.tiers.split(",") if name.strip()]
+    for name in tiers:
+        get_tier(name)  # 알 수 없는 티어면 ValueError
+
+    db_manager = DatabaseManager()
+    column = f"embedding_{args.language}"
+
+    if args.dry_run:
+        for statement in tier_migration_statements(tiers, db_manager.table_name, args.concurrently):
+            print(f"{statement};")
+        return
+
+    print("=" * 72)
+    print(f"MVP RAG System - Vector Tier Benchmark ({column}, recall@{args.k})")
+    print("=" * 72)
+
+    try:
+        db_manager.initialize()
+        if args.create_indexes:
+            print("\n📌 Creating tier indexes...")
+            created = db_manager.create_vector_tier_indexes(tiers, concurrently=args.concurrently)
+            print(f"✅ Created: {', '.join(created) if created else 'none (already present)'}")
+
+        with db_manager.pool.connection() as conn:
+            queries = sample_queries(conn, db_manager.table_name, column, args.queries)
+            if not queries:
+                print(f"❌ No {column} values to sample")
+                sys.exit(1)
+            sizes = tier_index_sizes(conn, db_manager.table_name)
+            conn.rollback()
+
+            truths = []
+            for embedding in queries:
+                params = {"embedding": vector_param(conn, embedding), "limit": args.k}
+                truths.append((params, set(exact_top_k(conn, db_manager.table_name, column, params))))
+
+            report = []
+            for name in tiers:
+                searcher = FilteredVectorSearch(db_manager.table_name, mode="off", tier=name,
+                                                shortlist_factor=args.factor)
+                run_tier(conn, searcher, column, truths[0][0], args.k, args.probes)  # 워밍업
+                latencies, recalls = [], []
+                for params, truth in truths:
+                    elapsed, ids = run_tier(conn, searcher, column, params, args.k, args.probes)
+                    latencies.append(elapsed)
+                    recalls.append(len(truth.intersection(ids)) / len(truth) if truth else 1.0)
+                tier = get_tier(name)
+                index_name = FULL_INDEXES[column] if tier is None else tier.index_name(column)
+                report.append((name, statistics.mean(recalls), percentile(latencies, 0.5),
+                               percentile(latencies, 0.95), sizes.get(index_name)))
+    finally:
+        db_manager.close()
+
+    shared_buffers = sizes["shared_buffers"]
+    print(f"\n{len(queries)} queries, shared_buffers {shared_buffers / MB:.0f} MB\n")
+    print(f"{'tier':<12}{'recall@' + str(args.k):>10}{'p50 ms':>10}{'p95 ms':>10}{'index MB':>11}{'10x MB':>10}  10x fits")
+    for name, recall, p50, p95, size in report:
+        if size is None:
+            print(f"{name:<12}{recall:>10.3f}{p50:>10.1f}{p95:>10.1f}{'missing':>11}{'-':>10}  -")
+            continue
+        fits = "✅" if size * 10 <= shared_buffers else "❌"
+        print(f"{name:<12}{recall:>10.3f}{p50:>10.1f}{p95:>10.1f}{size / MB:>11.1f}{size * 10 / MB:>10.1f}  {fits}")
+    print("\n(missing = no index for this tier; the shortlist falls back to a sequential scan, "
+          "run with --create-indexes)")
+
+
+if __name__ == "__main__":
+    main()
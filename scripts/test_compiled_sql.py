@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Test script for the compiled SQL cache
+필터 형태가 같으면 SQL을 한 번만 만들고 prepare=True로 실행하는지, 계획/실행 시간 지표를 모으는지 검증 (DB 호출 없음)
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from retrieval.compiled_sql import CompiledSQLCache
+from retrieval.hybrid_search import HybridSearch
+from retrieval.query_analysis import QueryAnalysis
+from retrieval.search_filter import MVPSearchFilter
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.description = [("id",), ("rank",)]
+        self._rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    @property
+    def connection(self):
+        return self.conn
+
+    def execute(self, sql, params=None, prepare=None):
+        self.conn.executed.append((sql, params, prepare))
+        if sql.startswith("EXPLAIN") and self.conn.explain_error:
+            raise RuntimeError(self.conn.explain_error)
+        if sql.startswith("EXPLAIN"):
+            self._rows = [([{"Planning Time": 0.8, "Execution Time": 2.0}],)]
+        else:
+            self._rows = [(1, 0.5), (2, 0.25)]
+
+    def fetchone(self):
+        return self._rows[0]
+
+    def fetchall(self):
+        return self._rows
+
+
+class FakeSavepoint:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.executed.append(("SAVEPOINT", None, None))
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        self.conn.executed.append(("ROLLBACK TO SAVEPOINT" if exc_type else "RELEASE SAVEPOINT", None, None))
+        return False
+
+
+class FakeConnection:
+    def __init__(self, explain_error=None):
+        self.executed = []
+        self.explain_error = explain_error
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def transaction(self):
+        return FakeSavepoint(self)
+
+
+def test_filter_shape():
+    a = MVPSearchFilter(categories=["table"], entity={"type": "똑딱이", "keywords": ["연비"]})
+    b = MVPSearchFilter(categories=["figure", "table"], entity={"type": "문서", "keywords": ["성능", "엔진"]})
+    assert a.shape() == b.shape() == ("categories", "entity_type", "entity_keywords")
+    assert a.to_sql_where()[0] == b.to_sql_where()[0]
+    # 단일 키워드와 키워드 목록은 다른 연산자 -> 다른 형태
+    assert MVPSearchFilter(entity={"keywords": "연비"}).shape() != MVPSearchFilter(entity={"keywords": ["연비"]}).shape()
+    assert MVPSearchFilter().shape() == () and MVPSearchFilter().to_sql_where() == ("1=1", {})
+    for flt in (a, MVPSearchFilter(pages=[1], sources=["a.pdf"], caption="오일", entity={"title": "t", "details": "d"})):
+        assert flt.sql_params() == flt.to_sql_where()[1]
+        assert flt.sql_params("boost_") == flt.to_sql_where(param_prefix="boost_")[1]
+    print("✅ Filter shape determines the WHERE text; sql_params matches to_sql_where")
+
+
+def test_cache_builds_once_and_prepares():
+    cache = CompiledSQLCache(prepare=True, plan_sample_every=2)
+    conn = FakeConnection()
+    builds = []
+
+    def build():
+        builds.append(1)
+        return "SELECT id, rank FROM docs WHERE category = ANY(%(categories)s)"
+
+    for _ in range(3):
+        compiled = cache.get(("keyword", "search_vector_korean", ("categories",)), "keyword:search_vector_korean", build)
+        with conn.cursor() as cur:
+            cache.execute(cur, compiled, {"categories": ["table"]})
+    assert len(builds) == 1 and cache.hits == 2
+    executions = [entry for entry in conn.executed if entry[0].startswith("SELECT")]
+    assert len(executions) == 3 and all(prepare is True for _, _, prepare in executions)
+    # 0번째, 2번째 실행 전에 EXPLAIN 샘플
+    stats = cache.get_stats()["queries"]["keyword:search_vector_korean"]
+    assert stats["executions"] == 3 and stats["plan_samples"] == 2
+    assert stats["avg_planning_ms"] == 0.8 and stats["avg_execution_ms"] == 2.0
+    print("✅ SQL is built once, executed with prepare=True, plan time sampled")
+
+
+def test_plan_sample_failure_keeps_transaction_usable():
+    cache = CompiledSQLCache(prepare=True, plan_sample_every=1)
+    conn = FakeConnection(explain_error="canceling statement due to statement timeout")
+    compiled = cache.get(("keyword", "search_vector_korean", ()), "keyword:search_vector_korean", lambda: "SELECT 1")
+    with conn.cursor() as cur:
+        cache.execute(cur, compiled, {})
+    statements = [sql for sql, _, _ in conn.executed]
+    # EXPLAIN은 savepoint 안에서 실패하고 롤백된 뒤 실제 쿼리 실행
+    assert statements[0] == "SAVEPOINT" and statements[1].startswith("EXPLAIN")
+    assert statements[2:] == ["ROLLBACK TO SAVEPOINT", "SELECT 1"]
+    assert compiled.executions == 1 and compiled.plan_samples == 0
+    print("✅ A failed plan sample is rolled back to a savepoint")
+
+
+def test_semantic_statements_force_custom_plans():
+    cache = CompiledSQLCache(prepare=True, plan_sample_every=0)
+    conn = FakeConnection()
+    ann = cache.get(("semantic", "ann"), "semantic:ann:embedding_korean", lambda: "SELECT 1", custom_plan=True)
+    keyword = cache.get(("keyword",), "keyword:search_vector_korean", lambda: "SELECT 2")
+    with conn.cursor() as cur:
+        cache.execute(cur, ann, {})
+        cache.execute(cur, keyword, {})
+    assert [sql for sql, _, _ in conn.executed] == [
+        "SET LOCAL plan_cache_mode = force_custom_plan", "SELECT 1", "SELECT 2"
+    ]
+    assert CompiledSQLCache(max_entries=0).max_entries == 0
+    print("✅ Vector search statements never switch to a generic plan")
+
+
+def test_keyword_search_reuses_compiled_sql():
+    hybrid = HybridSearch.__new__(HybridSearch)
+    hybrid.table_name = "mvp_ddu_documents"
+    hybrid.keyword_engine = None
+    hybrid.sql_cache = CompiledSQLCache(prepare=True, plan_sample_every=0)
+    conn = FakeConnection()
+    hybrid._execute_with_retry = lambda operation, **kwargs: operation(conn)
+    analysis = QueryAnalysis("엔진오일", "korean", ("엔진오일",), "엔진오일")
+
+    hybrid._keyword_search("엔진오일", MVPSearchFilter(sources=["a.pdf"]), "korean", 10, analysis=analysis)
+    hybrid._keyword_search("엔진오일", MVPSearchFilter(sources=["b.pdf"]), "korean", 10, analysis=analysis)
+    hybrid._keyword_search("엔진오일", MVPSearchFilter(sources=["b.pdf"]), "korean", 10,
+                           boost_filter=MVPSearchFilter(entity={"type": "똑딱이"}), analysis=analysis)
+
+    (sql_a, params_a, _), (sql_b, params_b, _), (sql_c, params_c, _) = conn.executed
+    assert sql_a is sql_b and params_a["sources"] == ["a.pdf"] and params_b["sources"] == ["b.pdf"]
+    assert sql_c != sql_a and "boosted_rows" in sql_c and params_c["boost_entity_type"] == "똑딱이"
+    stats = hybrid.get_sql_stats()["queries"]["keyword:search_vector_korean"]
+    assert stats["shapes"] == 2 and stats["executions"] == 3 and stats["avg_planning_ms"] is None
+    print("✅ Keyword searches with the same filter shape share one compiled statement")
+
+
+if __name__ == "__main__":
+    test_filter_shape()
+    test_cache_builds_once_and_prepares()
+    test_plan_sample_failure_keeps_transaction_usable()
+    test_semantic_statements_force_custom_plans()
+    test_keyword_search_reuses_compiled_sql()
+    print("\n✅ All compiled SQL tests passed")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test script for ContextPacker
+토큰 예산 기반 문서 패킹 동작 검증 (LLM 호출 없음)
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from langchain_core.documents import Document
+from workflow.context_packer import ContextPacker
+
+
+def make_docs():
+    """점수가 다른 테스트 문서 생성"""
+    return [
+        Document(page_content="엔진 오일 점검 방법 " * 50, metadata={"id": 1, "score": 0.4, "page": 1}),
+        Document(page_content="타이어 공기압 기준 " * 50, metadata={"id": 2, "score": 0.9, "page": 2}),
+        Document(page_content="브레이크 패드 교체 " * 50, metadata={"id": 3, "score": 0.7, "page": 3}),
+    ]
+
+
+def test_everything_fits():
+    """예산이 충분하면 모든 문서가 원래 순서대로 포함"""
+    packer = ContextPacker(token_budget=100000, per_doc_overhead=10, min_tail_tokens=10)
+    packed, stats = packer.pack(make_docs())
+    assert [d.metadata["id"] for d in packed] == [1, 2, 3]
+    assert stats["dropped"] == 0 and not stats["truncated"]
+    print("✅ All documents fit in budget")
+
+
+def test_tail_truncation_keeps_rank_order():
+    """예산 초과 시 앞쪽(랭크가 높은) 문서 우선, tail 하나만 잘림"""
+    packer = ContextPacker(per_doc_overhead=10, min_tail_tokens=5, token_budget=10**6)
+    docs = make_docs()
+    cost = packer.document_tokens(docs[0]) + 10
+    packer.token_budget = cost + 40
+
+    packed, stats = packer.pack(docs)
+    ids = [d.metadata["id"] for d in packed]
+    assert ids == [1, 2], ids
+    assert packed[1].metadata.get("truncated") is True
+    assert packer.document_tokens(packed[1]) <= 30
+    assert "truncated" not in packed[0].metadata
+    assert stats["dropped"] == 1 and stats["truncated"]
+    print(f"✅ Tail truncation: {stats}")
+
+
+def test_list_order_wins_over_score():
+    """퓨전/재순위 순서가 변형별 정규화 score보다 우선"""
+    docs = [
+        Document(page_content="재순위 1위 문서 " * 40, metadata={"id": 10, "score": 0.3, "fusion_score": 0.05}),
+        Document(page_content="엔티티 부스트 문서 " * 40, metadata={"id": 11, "score": 0.5, "fusion_score": 0.04}),
+        Document(page_content="다른 변형의 1위 " * 40, metadata={"id": 12, "score": 1.0, "fusion_score": 0.01}),
+    ]
+    packer = ContextPacker(per_doc_overhead=10, min_tail_tokens=10**6, token_budget=10**6)
+    packer.token_budget = packer.document_tokens(docs[0]) + packer.document_tokens(docs[1]) + 20
+    packed, stats = packer.pack(docs)
+    assert [d.metadata["id"] for d in packed] == [10, 11], [d.metadata["id"] for d in packed]
+    assert stats["dropped"] == 1
+    print("✅ Packing follows the fused/reranked list order, not metadata score")
+
+
+def test_token_cache():
+    """문서 id 기준 토큰 수 캐싱"""
+    packer = ContextPacker(token_budget=1000)
+    doc = make_docs()[0]
+    first = packer.document_tokens(doc)
+    assert packer._token_cache[f"id:1:{len(doc.page_content)}"] == first
+    assert packer.document_tokens(doc) == first
+    print("✅ Token counts cached per document id")
+
+
+def test_token_cache_bounded():
+    """토큰 수 캐시는 최대 항목 수를 넘으면 가장 오래 사용하지 않은 문서 제거"""
+    packer = ContextPacker(token_budget=1000, cache_size=2)
+    docs = make_docs()
+    packer.document_tokens(docs[0])
+    packer.document_tokens(docs[1])
+    packer.document_tokens(docs[0])  # docs[0]을 최근 사용으로
+    packer.document_tokens(docs[2])  # docs[1]이 제거되어야 함
+    keys = [f"id:{d.metadata['id']}:{len(d.page_content)}" for d in docs]
+    assert list(packer._token_cache) == [keys[0], keys[2]]
+    print("✅ Token cache bounded with LRU eviction")
+
+
+if __name__ == "__main__":
+    test_everything_fits()
+    test_tail_truncation_keeps_rank_order()
+    test_list_order_wins_over_score()
+    test_token_cache()
+    test_token_cache_bounded()
+    print("\n✅ All context packer tests passed")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test script for the sharded JSONL corpus
+pickle -> 코퍼스 변환, manifest 통계와 pickle 로더 통계 일치, 배치 스트리밍, 로더 캐시 검증 (DB 호출 없음)
+"""
+
+import sys
+import json
+import pickle
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from langchain_core.documents import Document
+from ingest.loader import DDUPickleLoader
+from ingest.corpus import CorpusReader, convert_pickle_to_corpus, open_corpus, is_corpus
+
+
+def sample_documents():
+    """Document/dict 혼합, 필수 필드 누락 문서 포함"""
+    docs = []
+    for i in range(7):
+        docs.append(Document(
+            page_content=f"본문 {i}",
+            metadata={
+                "source": "data/manual.pdf",
+                "page": i + 1,
+                "category": "paragraph" if i % 2 else "table",
+                "translation_text": f"text {i}" if i % 3 == 0 else None,
+                "entity": json.dumps({"type": "table", "title": f"표 {i}"}) if i % 2 == 0 else None
+            }
+        ))
+    docs.append({"source": "data/other.pdf", "page": 3, "category": "heading1", "page_content": "제목", "caption": "캡션"})
+    docs.append(Document(page_content="누락", metadata={"page": 9}))  # source/category 없음
+    return docs
+
+
+def write_pickle(tmp_dir: str) -> str:
+    path = str(Path(tmp_dir) / "docs.pkl")
+    with open(path, "wb") as f:
+        pickle.dump(sample_documents(), f)
+    return path
+
+
+def test_statistics_match_pickle_loader():
+    """manifest 통계가 pickle 로더 통계와 동일 (문서 로드 없이)"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pickle_path = write_pickle(tmp_dir)
+        manifest = convert_pickle_to_corpus(pickle_path, shard_size=3)
+
+        corpus_dir = Path(tmp_dir) / "docs.corpus"
+        assert is_corpus(corpus_dir)
+        assert manifest["rows"] == 9 and len(manifest["shards"]) == 3
+
+        reader = CorpusReader(corpus_dir)
+        assert reader.validate()
+        assert reader.get_statistics() == DDUPickleLoader(pickle_path).get_statistics()
+        assert reader.get_statistics()["entity_types"] == {"table": 4}
+        assert reader.columns["source"] == 8
+    print("✅ Manifest statistics match the pickle loader")
+
+
+def test_streaming_batches():
+    """배치 단위로 읽고 변환 결과는 pickle 로더와 동일"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pickle_path = write_pickle(tmp_dir)
+        convert_pickle_to_corpus(pickle_path, shard_size=4)
+        reader = open_corpus(Path(tmp_dir) / "docs.corpus")
+
+        raw_sizes = [len(b) for b in reader.iter_records(batch_size=2)]
+        assert raw_sizes == [2, 2, 2, 2, 1]
+
+        streamed = [doc for batch in reader.iter_documents(batch_size=2) for doc in batch]
+        loaded = DDUPickleLoader(pickle_path).load_documents()
+        assert [d.model_dump() for d in streamed] == [d.model_dump() for d in loaded]
+
+        first = next(reader.iter_raw(batch_size=1))[0]
+        assert isinstance(first, Document) and first.metadata["page"] == 1
+    print("✅ Batches stream with the same conversion as the pickle loader")
+
+
+def test_pickle_loader_unpickles_once():
+    """validate/통계/로드가 한 번의 unpickle을 공유"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pickle_path = write_pickle(tmp_dir)
+        loader = open_corpus(pickle_path)
+        assert isinstance(loader, DDUPickleLoader)
+
+        with patch("ingest.loader.pickle.load", wraps=pickle.load) as load:
+            assert loader.validate()
+            stats = loader.get_statistics()
+            batches = list(loader.iter_documents(batch_size=5))
+        assert load.call_count == 1
+        assert stats["total_documents"] == sum(len(b) for b in batches) == 8
+    print("✅ Pickle loader unpickles once")
+
+
+if __name__ == "__main__":
+    test_statistics_match_pickle_loader()
+    test_streaming_batches()
+    test_pickle_loader_unpickles_once()
+    print("\n✅ All corpus format tests passed")
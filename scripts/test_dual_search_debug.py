@@ -33,12 +33,13 @@ def test_dual_search():
     query = "똑딱이 문서의 정의"
     
     # Call dual_search_strategy directly
-    results = retrieval._dual_search_strategy(
+    records = retrieval._dual_search_strategy(
         query=query,
         filter_dict=filter_dict,
         language='korean',
         top_k=10
     )
+    results = [retrieval._convert_to_document(record) for record in records]
     
     print(f"\nTotal results: {len(results)}")
     
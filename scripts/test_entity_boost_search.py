@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test script for single-pass entity boost search
+boost 병합이 entity/일반 이중 검색과 같은 순서를 유지하는지, 파라미터 접두사와 SQL 구성 검증 (DB 호출 없음)
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from retrieval.search_filter import MVPSearchFilter
+from retrieval.filtered_ann import FilteredVectorSearch
+from retrieval.hybrid_search import HybridSearch
+
+
+def make_hybrid():
+    """DB/모델 초기화 없이 병합 로직만 사용"""
+    hybrid = HybridSearch.__new__(HybridSearch)
+    hybrid.k = 60
+    return hybrid
+
+
+def rows(ids, boosted):
+    return [{"id": i, "boosted": boosted} for i in ids]
+
+
+def test_param_prefix():
+    """boost 필터 파라미터는 일반 필터와 이름이 겹치지 않음"""
+    flt = MVPSearchFilter(categories=["table"], entity={"type": "똑딱이", "keywords": ["연비"]})
+    where, params = flt.to_sql_where(param_prefix="boost_")
+    assert "%(boost_categories)s" in where and "%(boost_entity_type)s" in where
+    assert "%(categories)s" not in where
+    assert set(params) == {"boost_categories", "boost_entity_type", "boost_entity_keywords"}
+    assert MVPSearchFilter(categories=["table"]).to_sql_where()[1] == {"categories": ["table"]}
+    print("✅ Boost filter parameters are prefixed")
+
+
+def test_boosted_merge_matches_dual_search():
+    """entity 그룹을 먼저, 일반 그룹으로 top_k까지 (중복 제거)"""
+    hybrid = make_hybrid()
+    semantic = rows([5, 7, 9], True) + rows([1, 5, 2, 3], False)
+    keyword = rows([7, 5], True) + rows([2, 4, 7], False)
+
+    merged = hybrid._boosted_rrf_merge(semantic, keyword, top_k=6)
+    ids = [doc["id"] for doc in merged]
+
+    # 이중 검색: entity 결과 전체 -> 일반 결과(중복 제외)
+    dual_entity = [d["id"] for d in make_hybrid()._rrf_merge(rows([5, 7, 9], True), rows([7, 5], True), 6)]
+    dual_general = [d["id"] for d in make_hybrid()._rrf_merge(rows([1, 5, 2, 3], False), rows([2, 4, 7], False), 6)]
+    expected = (dual_entity + [i for i in dual_general if i not in dual_entity])[:6]
+
+    assert ids == expected, (ids, expected)
+    assert set(ids[:3]) == {5, 7, 9}
+    assert all(doc["boosted"] for doc in merged[:3]) and not any(doc["boosted"] for doc in merged[3:])
+    assert len(ids) == len(set(ids))
+    print("✅ Entity matches stay first with the same order as the dual search")
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.description = [("id",), ("similarity",), ("boosted",)]
+        self._result = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.conn.executed.append((sql, params))
+        if "count(*)" in sql:
+            self._result = [(3,)]
+        else:
+            self._result = [(10, 0.9, True), (11, 0.8, True), (1, 0.95, False), (2, 0.7, False), (3, 0.6, False)]
+
+    def fetchone(self):
+        return self._result[0]
+
+    def fetchall(self):
+        return self._result
+
+
+class FakeConnection:
+    def __init__(self):
+        self.executed = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+
+def test_semantic_boost_is_one_query():
+    """boost 조건과 일반 조건을 한 SQL로 조회 (boosted 행은 exact, 일반 행 수로만 보완 여부 판단)"""
+    search = FilteredVectorSearch("mvp_ddu_documents", mode="auto", exact_max_rows=100)
+    conn = FakeConnection()
+    params = {"embedding": "[0.1]", "limit": 3, "sources": ["a.pdf"], "boost_entity_type": "똑딱이"}
+    result, strategy = search.search(
+        conn, "embedding_korean", "id, 1 - (embedding_korean <=> %(embedding)s::vector) as similarity",
+        "source = ANY(%(sources)s)", params, 3, boost_where="(entity->>'type' = %(boost_entity_type)s)"
+    )
+    queries = [sql for sql, _ in conn.executed if "count(*)" not in sql]
+    assert len(queries) == 1
+    assert "boosted_rows AS MATERIALIZED" in queries[0] and "UNION ALL" in queries[0]
+    assert strategy == "exact" and len(result) == 5
+    print("✅ Semantic boost search runs as a single query")
+
+
+if __name__ == "__main__":
+    test_param_prefix()
+    test_boosted_merge_matches_dual_search()
+    test_semantic_boost_is_one_query()
+    print("\n✅ All entity boost search tests passed")
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test script for the filter index pack
+마이그레이션 SQL 구성, EXPLAIN 플랜의 Seq Scan 탐지, 필터 조건별 인덱스 커버리지 검증 (DB 호출 없음)
+"""
+
+import re
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from ingest.indexes import (
+    FILTER_INDEXES, FILTER_SHAPES, ensure_filter_indexes, find_seq_scans, migration_statements
+)
+
+TABLE = "mvp_ddu_documents"
+
+# setup_database()가 이미 만드는 단일 컬럼 인덱스
+BASE_INDEXED_COLUMNS = {"category", "page", "source"}
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self._result = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.conn.executed.append((sql, self.conn.autocommit))
+        if "pg_indexes" in sql:
+            self._result = [(name,) for name in self.conn.existing]
+        elif "indisvalid" in sql:
+            self._result = [(name,) for name in self.conn.invalid]
+        else:
+            self._result = []
+
+    def fetchall(self):
+        return self._result
+
+
+class FakeConnection:
+    def __init__(self, existing=(), invalid=()):
+        self.existing = list(existing)
+        self.invalid = list(invalid)
+        self.autocommit = False
+        self.executed = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        pass
+
+
+def test_migration_statements():
+    """확장 -> 인덱스 -> ANALYZE 순서, CONCURRENTLY 옵션 반영"""
+    statements = migration_statements(TABLE)
+    assert statements[0] == "CREATE EXTENSION IF NOT EXISTS pg_trgm"
+    assert statements[-1] == f"ANALYZE {TABLE}"
+    assert len(statements) == len(FILTER_INDEXES) + 2
+    assert all("CONCURRENTLY" not in s for s in statements)
+
+    concurrent = migration_statements(TABLE, concurrently=True)
+    assert all(s.startswith("CREATE INDEX CONCURRENTLY IF NOT EXISTS") for s in concurrent[1:-1])
+    # ?| / ? 연산자를 지원하는 jsonb_ops (jsonb_path_ops 아님)
+    keywords = next(s for s in statements if "idx_entity_keywords" in s)
+    assert "jsonb_path_ops" not in keywords
+    print("✅ Migration statements are ordered and honor CONCURRENTLY")
+
+
+def test_find_seq_scans():
+    """중첩 플랜에서 대상 테이블의 Seq Scan만 탐지"""
+    seq_plan = [{"Plan": {"Node Type": "Limit", "Plans": [
+        {"Node Type": "Seq Scan", "Relation Name": TABLE, "Filter": "(caption ~~* '%엔진%'::text)"}
+    ]}}]
+    assert len(find_seq_scans(seq_plan, TABLE)) == 1
+    assert find_seq_scans(seq_plan, "other_table") == []
+
+    bitmap_plan = [{"Plan": {"Node Type": "Bitmap Heap Scan", "Relation Name": TABLE, "Plans": [
+        {"Node Type": "Bitmap Index Scan", "Index Name": "idx_caption_trgm"}
+    ]}}]
+    index_plan = [{"Plan": {"Node Type": "Index Scan", "Relation Name": TABLE, "Index Name": "idx_entity_type"}}]
+    assert find_seq_scans(bitmap_plan, TABLE) == []
+    assert find_seq_scans(index_plan, TABLE) == []
+    print("✅ Seq Scan detection walks nested plans")
+
+
+def test_every_filter_predicate_is_covered():
+    """FILTER_SHAPES의 모든 조건이 인덱스로 커버됨"""
+    definitions = " ".join(spec.definition for spec in FILTER_INDEXES)
+    for shape, search_filter in FILTER_SHAPES.items():
+        where_clause, _ = search_filter.to_sql_where()
+        for predicate in re.split(r"\s+AND\s+", where_clause.strip("()")):
+            predicate = predicate.strip("() ")
+            column = re.match(r"(\w+(?:->>?'\w+')?)", predicate).group(1)
+            if column in BASE_INDEXED_COLUMNS:
+                continue
+            assert column in definitions, (shape, predicate)
+    print("✅ Every filter predicate has a backing index")
+
+
+def test_ensure_filter_indexes():
+    """autocommit으로 실행, INVALID 인덱스 재생성, 새로 만든 인덱스만 반환"""
+    conn = FakeConnection(existing=["idx_entity_type", "idx_caption_trgm"], invalid=["idx_caption_trgm"])
+    created = ensure_filter_indexes(conn, TABLE, concurrently=True)
+
+    assert "idx_entity_type" not in created
+    assert "idx_caption_trgm" in created and "idx_source_page" in created
+    assert conn.autocommit is False  # 원래 값 복원
+    ddl = [(sql, autocommit) for sql, autocommit in conn.executed if sql.startswith(("CREATE", "DROP", "ANALYZE"))]
+    assert ddl[0][0] == "DROP INDEX CONCURRENTLY IF EXISTS idx_caption_trgm"
+    assert all(autocommit for _, autocommit in ddl)
+    print("✅ Index creation runs outside a transaction and rebuilds invalid indexes")
+
+
+if __name__ == "__main__":
+    test_migration_statements()
+    test_find_seq_scans()
+    test_every_filter_predicate_is_covered()
+    test_ensure_filter_indexes()
+    print("\n✅ All filter index tests passed")
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test script for the retrieval filter preflight
+일치 문서가 없는 필터를 검색 전에 완화하는지, 일치하면 그대로 두는지 검증 (DB 호출 없음)
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from workflow.nodes.retrieval import RetrievalNode, ENTITY_CATEGORIES
+
+
+class FakeHybridSearch:
+    """(source, page, category, entity type) 행 집합에 대한 EXISTS 프로브 흉내"""
+
+    ROWS = [
+        ("manual.pdf", 1, "paragraph", None),
+        ("manual.pdf", 2, "table", "똑딱이"),
+        ("guide.pdf", 5, "figure", None),
+    ]
+
+    def __init__(self):
+        self.probes = 0
+
+    @classmethod
+    def _matches(cls, flt):
+        for source, page, category, entity_type in cls.ROWS:
+            if flt.sources and source not in flt.sources:
+                continue
+            if flt.pages and page not in flt.pages:
+                continue
+            if flt.categories and category not in flt.categories:
+                continue
+            if flt.entity and flt.entity.get("type") != entity_type:
+                continue
+            return True
+        return False
+
+    def filter_has_matches(self, filter, boost_filter=None):
+        self.probes += 1
+        return self._matches(filter) or (boost_filter is not None and self._matches(boost_filter))
+
+
+def make_node():
+    node = RetrievalNode.__new__(RetrievalNode)
+    node.hybrid_search = FakeHybridSearch()
+    node.filter_preflight = True
+    return node
+
+
+def test_matching_filter_is_kept():
+    node = make_node()
+    filter_dict = {"sources": ["manual.pdf"], "pages": [2], "categories": None}
+    assert node._preflight_filter(filter_dict) == (filter_dict, [])
+    assert node.hybrid_search.probes == 1
+    print("✅ Matching filters are kept after a single probe")
+
+
+def test_empty_filter_is_relaxed_before_search():
+    """없는 페이지 -> pages 제거, source는 유지"""
+    node = make_node()
+    relaxed, keys = node._preflight_filter({"sources": ["manual.pdf"], "pages": [99]})
+    assert relaxed == {"sources": ["manual.pdf"]} and keys == ["pages"]
+
+    relaxed, keys = node._preflight_filter({"sources": ["없는문서.pdf"], "categories": ["table"]})
+    assert relaxed == {"categories": ["table"]} and keys == ["sources"]
+
+    # 각 조건은 일치하지만 조합이 비는 경우 -> 완화 순서(pages 먼저)
+    relaxed, keys = node._preflight_filter({"sources": ["guide.pdf"], "pages": [1]})
+    assert relaxed == {"sources": ["guide.pdf"]} and keys == ["pages"]
+
+    relaxed, keys = node._preflight_filter({"sources": ["없는문서.pdf"]})
+    assert relaxed is None and keys == ["sources"]
+    print("✅ Filters without matches are relaxed before the fan-out")
+
+
+def test_entity_filter_probe_uses_search_shape():
+    """entity 필터는 검색과 같이 일반 필터 OR (entity + ENTITY_CATEGORIES)로 확인"""
+    node = make_node()
+    general, entity = node._split_filter({"categories": ["paragraph"], "entity": {"type": "똑딱이"}})
+    assert general == {"categories": ["paragraph"]}
+    assert entity["categories"] == ENTITY_CATEGORIES and entity["entity"] == {"type": "똑딱이"}
+
+    # 일반 필터(figure)는 guide.pdf에서만 일치하지만 entity 쪽(manual.pdf table)은 일치
+    filter_dict = {"sources": ["manual.pdf"], "categories": ["figure"], "entity": {"type": "똑딱이"}}
+    assert node._preflight_filter(filter_dict) == (filter_dict, [])
+    print("✅ Entity filters are probed with the same shape as the search")
+
+
+def test_probe_failure_keeps_filter():
+    node = make_node()
+
+    def broken(*args, **kwargs):
+        raise ConnectionError("pool closed")
+
+    node.hybrid_search.filter_has_matches = broken
+    filter_dict = {"pages": [1]}
+    assert node._preflight_filter(filter_dict) == (filter_dict, [])
+    print("✅ Probe failures keep the original filter")
+
+
+if __name__ == "__main__":
+    test_matching_filter_is_kept()
+    test_empty_filter_is_relaxed_before_search()
+    test_entity_filter_probe_uses_search_shape()
+    test_probe_failure_keeps_filter()
+    print("\n✅ All filter preflight tests passed")
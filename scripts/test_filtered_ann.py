@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Test script for filtered vector search
+필터 후보 수에 따른 전략 선택(exact / iterative / exact 보완)과 SQL 구성 검증 (DB 호출 없음)
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from retrieval.filtered_ann import FilteredVectorSearch
+
+SELECT_SQL = "id, source, 1 - (embedding_korean <=> %(embedding)s::vector) as similarity"
+
+
+class FakeCursor:
+    """후보 수, pgvector 버전, ANN/exact 결과를 흉내내는 커서"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self._result = []
+        self.description = [("id",), ("source",), ("similarity",)]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.conn.executed.append(sql)
+        if "count(*)" in sql:
+            self._result = [(min(self.conn.candidates, params["candidate_cap"]),)]
+        elif "pg_extension" in sql:
+            self._result = [(self.conn.pgvector_version,)]
+        elif "MATERIALIZED" in sql:
+            self._result = [(i, "a.pdf", 1.0 - i / 100) for i in range(min(self.conn.candidates, params["limit"]))]
+        elif sql.strip().startswith("SELECT"):
+            # ANN + post-filter: 필터에 걸러져 일부만 반환, relaxed_order라 순서가 섞임
+            rows = [(i, "a.pdf", 1.0 - i / 100) for i in range(self.conn.ann_rows)]
+            self._result = list(reversed(rows))
+        else:
+            self._result = []
+
+    def fetchone(self):
+        return self._result[0]
+
+    def fetchall(self):
+        return self._result
+
+
+class FakeConnection:
+    def __init__(self, candidates, ann_rows, pgvector_version="0.8.0"):
+        self.candidates = candidates
+        self.ann_rows = ann_rows
+        self.pgvector_version = pgvector_version
+        self.executed = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+
+def run(search, conn, where="source = ANY(%(sources)s)", limit=20):
+    params = {"embedding": "[0.1]", "limit": limit, "sources": ["a.pdf"]}
+    return search.search(conn, "embedding_korean", SELECT_SQL, where, params, limit)
+
+
+def test_unfiltered_uses_ann():
+    search = FilteredVectorSearch("mvp_ddu_documents", mode="auto", exact_max_rows=100)
+    conn = FakeConnection(candidates=10000, ann_rows=20)
+    rows, strategy = run(search, conn, where="1=1")
+    assert strategy == "ann" and len(rows) == 20
+    assert not any("count(*)" in sql for sql in conn.executed)
+    print("✅ Unfiltered queries keep the plain ANN path")
+
+
+def test_selective_filter_uses_exact():
+    """후보가 적으면 exact (ANN 인덱스를 거치지 않아 post-filter로 줄지 않음)"""
+    search = FilteredVectorSearch("mvp_ddu_documents", mode="auto", exact_max_rows=100)
+    conn = FakeConnection(candidates=40, ann_rows=3)
+    rows, strategy = run(search, conn)
+    assert strategy == "exact" and len(rows) == 20
+    assert "ORDER BY similarity DESC, id" in conn.executed[-1]
+    print("✅ Selective filters use exact search over the candidates")
+
+
+def test_broad_filter_uses_iterative_scan():
+    """후보가 많으면 iterative scan, relaxed_order 결과는 재정렬"""
+    search = FilteredVectorSearch("mvp_ddu_documents", mode="auto", exact_max_rows=100, max_probes=50)
+    conn = FakeConnection(candidates=5000, ann_rows=20)
+    rows, strategy = run(search, conn)
+    assert strategy == "iterative" and len(rows) == 20
+    assert "SET LOCAL ivfflat.iterative_scan = relaxed_order" in conn.executed
+    assert "SET LOCAL ivfflat.max_probes = 50" in conn.executed
+    assert [r["similarity"] for r in rows] == sorted((r["similarity"] for r in rows), reverse=True)
+    print("✅ Broad filters use iterative index scans")
+
+
+def test_short_results_are_completed():
+    """iterative scan(또는 구버전 pgvector의 ANN)이 limit을 못 채우면 exact로 보완"""
+    for version in ("0.8.0", "0.7.4"):
+        search = FilteredVectorSearch("mvp_ddu_documents", mode="auto", exact_max_rows=100)
+        conn = FakeConnection(candidates=5000, ann_rows=4, pgvector_version=version)
+        rows, strategy = run(search, conn)
+        assert strategy == "exact" and len(rows) == 20, version
+        assert search.stats["exact_fallbacks"] == 1
+        if version == "0.7.4":
+            assert not any("iterative_scan" in sql for sql in conn.executed)
+    print("✅ Short filtered results are completed without an unfiltered retry")
+
+
+def test_iterative_mode_counts_before_fallback():
+    """iterative 모드도 부족할 때 후보 수를 세고, 이미 전부 반환했으면 exact로 다시 검색하지 않음"""
+    search = FilteredVectorSearch("mvp_ddu_documents", mode="iterative", exact_max_rows=100)
+    conn = FakeConnection(candidates=4, ann_rows=4)
+    rows, strategy = run(search, conn)
+    assert strategy == "iterative" and len(rows) == 4 and search.stats["exact_fallbacks"] == 0
+    count_sql = [sql for sql in conn.executed if "count(*)" in sql]
+    assert len(count_sql) == 1 and "LIMIT %(candidate_cap)s" in count_sql[0]
+
+    conn = FakeConnection(candidates=5000, ann_rows=4)
+    rows, strategy = run(search, conn)
+    assert strategy == "exact" and len(rows) == 20 and search.stats["exact_fallbacks"] == 1
+    print("✅ Iterative mode counts candidates before the exact fallback")
+
+
+if __name__ == "__main__":
+    test_unfiltered_uses_ann()
+    test_selective_filter_uses_exact()
+    test_broad_filter_uses_iterative_scan()
+    test_short_results_are_completed()
+    test_iterative_mode_counts_before_fallback()
+    print("\n✅ All filtered vector search tests passed")
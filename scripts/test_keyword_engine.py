@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Test script for the in-process BM25 keyword engine
+역색인 BM25 점수가 참조 구현과 일치하는지, IDF 반영, 필터 비트셋, mmap 포스팅 검증 (DB 호출 없음)
+"""
+
+import sys
+import math
+import tempfile
+from collections import Counter
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+from ingest.search_text import build_search_texts
+from retrieval.search_filter import MVPSearchFilter
+from retrieval.keyword_engine import KeywordAnalyzer, KeywordEngine
+
+FIELDS = ("id", "source", "page", "category", "page_content", "translation_text", "contextualize_text",
+          "caption", "entity", "image_path", "human_feedback")
+
+
+class FakeCursor:
+    """BM25Snapshot.build / read_corpus_version이 사용하는 쿼리만 흉내내는 커서"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.itersize = 0
+        self._result = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        if "to_regclass" in sql:
+            self._result = [(True,)]
+        elif "mvp_corpus_version" in sql:
+            self._result = [(len(self.rows),)]
+        else:
+            self._result = [tuple(r.get(f) for f in FIELDS) for r in self.rows]
+
+    def fetchone(self):
+        return self._result[0]
+
+    def __iter__(self):
+        return iter(self._result)
+
+
+class FakePool:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def connection(self):
+        rows = self.rows
+
+        class _Conn:
+            def cursor(self, name=None):
+                return FakeCursor(rows)
+
+            def execute(self, sql):
+                pass
+
+            def rollback(self):
+                pass
+
+        class _Ctx:
+            def __enter__(self):
+                return _Conn()
+
+            def __exit__(self, *exc):
+                return False
+
+        return _Ctx()
+
+
+ROWS = [
+    {"id": 1, "source": "a.pdf", "page": 1, "category": "paragraph", "page_content": "엔진오일 교체 주기 안내",
+     "translation_text": "Engine oil replacement interval", "human_feedback": ""},
+    {"id": 2, "source": "a.pdf", "page": 2, "category": "paragraph", "page_content": "타이어 공기압 점검 안내",
+     "translation_text": "Tire pressure check", "human_feedback": ""},
+    {"id": 3, "source": "a.pdf", "page": 3, "category": "table", "page_content": "엔진 사양 안내",
+     "translation_text": "Engine specifications", "entity": {"type": "table", "title": "엔진 사양"}, "human_feedback": ""},
+    {"id": 4, "source": "b.pdf", "page": 1, "category": "paragraph", "page_content": "안내 안내 안내",
+     "translation_text": "General notice", "human_feedback": ""},
+]
+
+
+def reference_bm25(analyzer, rows, query, language, k1=1.2, b=0.75):
+    """순수 파이썬 BM25 (같은 분석기 기준)"""
+    index = 0 if language == "korean" else 1
+    docs = [Counter(analyzer.terms(build_search_texts(r)[index], language)) for r in rows]
+    lengths = [sum(d.values()) for d in docs]
+    avgdl = sum(lengths) / len(lengths)
+    scores = {}
+    for term in dict.fromkeys(analyzer.terms(query, language)):
+        df = sum(1 for d in docs if term in d)
+        idf = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+        for r, d, dl in zip(rows, docs, lengths):
+            if term in d:
+                tf = d[term]
+                scores[r["id"]] = scores.get(r["id"], 0.0) + idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * dl / avgdl))
+    return sorted(scores.items(), key=lambda s: (-s[1], s[0]))
+
+
+def make_engine(tmp_dir):
+    engine = KeywordEngine(FakePool(ROWS), KeywordAnalyzer(), "mvp_ddu_documents", tmp_dir, refresh_seconds=3600)
+    engine.build_now()
+    return engine
+
+
+def test_scores_match_reference():
+    """BM25 점수/순서가 참조 구현과 일치하고 흔한 용어(안내)는 IDF가 낮음"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = make_engine(tmp_dir)
+        for query, language in (("엔진오일 교체 안내", "korean"), ("engine oil interval", "english")):
+            results = engine.search(query, None, language, 10)
+            expected = reference_bm25(engine.analyzer, ROWS, query, language)
+            assert [r["id"] for r in results] == [e[0] for e in expected], (query, results)
+            for r, (_, score) in zip(results, expected):
+                assert abs(r["rank"] - score) < 1e-4
+            assert results[0]["id"] == 1
+        # 모든 문서에 있는 용어만으로는 낮은 점수
+        common = engine.search("안내", None, "korean", 10)
+        rare = engine.search("타이어", None, "korean", 10)
+        assert rare[0]["rank"] > common[0]["rank"]
+    print("✅ BM25 scores match the reference implementation")
+
+
+def test_filters_and_fallback():
+    """카테고리/엔티티 타입 필터는 비트셋, 텍스트 필터는 None (SQL 경로)"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = make_engine(tmp_dir)
+        tables = engine.search("엔진 안내", MVPSearchFilter(categories=["table"]), "korean", 10)
+        assert [r["id"] for r in tables] == [3]
+        typed = engine.search("엔진", MVPSearchFilter(entity={"type": "table"}, sources=["a.pdf"]), "korean", 10)
+        assert [r["id"] for r in typed] == [3]
+        assert engine.search("엔진", MVPSearchFilter(caption="엔진"), "korean", 10) is None
+        assert engine.search("없는단어", None, "korean", 10) == []
+    print("✅ Filters use bitsets, text filters fall back to SQL")
+
+
+def test_postings_are_memory_mapped():
+    """포스팅 배열은 mmap으로 로드"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = make_engine(tmp_dir)
+        snapshot = engine.snapshot()
+        postings = snapshot.postings["korean"]
+        assert isinstance(postings["rows"], np.memmap) and postings["rows"].dtype == np.int32
+        assert postings["offsets"][-1] == len(postings["rows"])
+    print("✅ Postings are compact memory-mapped arrays")
+
+
+if __name__ == "__main__":
+    test_scores_match_reference()
+    test_filters_and_fallback()
+    test_postings_are_memory_mapped()
+    print("\n✅ All keyword engine tests passed")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test script for LLMResponseCache
+결정적 LLM 응답 캐시의 저장/복원, TTL, eviction, replay 모드 검증 (LLM 호출 없음)
+"""
+
+import sys
+import time
+import tempfile
+from pathlib import Path
+from typing import List
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from pydantic import BaseModel, Field
+from langchain_core.prompts import ChatPromptTemplate
+from workflow.llm_cache import LLMResponseCache, LLMCacheMiss
+
+
+class Classification(BaseModel):
+    """테스트용 출력 스키마"""
+    type: str = Field(description="분류 결과")
+    confidence: float = Field(description="신뢰도")
+    tags: List[str] = Field(default_factory=list)
+
+
+PROMPT = ChatPromptTemplate.from_messages([
+    ("system", "Classify the query."),
+    ("human", "Query: {query}")
+])
+
+
+def make_cache(tmp_dir, **kwargs):
+    return LLMResponseCache(path=str(Path(tmp_dir) / "cache.sqlite"), **kwargs)
+
+
+def test_roundtrip_returns_pydantic():
+    """저장한 결과가 동일한 Pydantic 객체로 복원"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = make_cache(tmp_dir, mode="readwrite", ttl_seconds=60)
+        key = cache.make_key("gpt-4o-mini", PROMPT, {"query": "엔진 오일"}, Classification)
+
+        assert cache.get(key, Classification) is None
+        cache.put(key, "gpt-4o-mini", Classification(type="rag_required", confidence=0.9, tags=["engine"]))
+
+        restored = cache.get(key, Classification)
+        assert isinstance(restored, Classification)
+        assert restored.type == "rag_required" and restored.tags == ["engine"]
+        assert cache.get_stats()["hits"] == 1
+        print("✅ Cached result restored as Pydantic object")
+
+
+def test_key_depends_on_template_and_input():
+    """템플릿/입력/모델이 다르면 키가 달라짐"""
+    other_prompt = ChatPromptTemplate.from_messages([("human", "Query: {query}")])
+    base = LLMResponseCache.make_key("gpt-4o-mini", PROMPT, {"query": "a"}, Classification)
+    assert base != LLMResponseCache.make_key("gpt-4o-mini", PROMPT, {"query": "b"}, Classification)
+    assert base != LLMResponseCache.make_key("gpt-4o", PROMPT, {"query": "a"}, Classification)
+    assert base != LLMResponseCache.make_key("gpt-4o-mini", other_prompt, {"query": "a"}, Classification)
+    print("✅ Cache key covers model, template, input")
+
+
+def test_ttl_and_eviction():
+    """TTL 만료 및 최대 엔트리 수 초과 시 LRU eviction"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = make_cache(tmp_dir, mode="readwrite", ttl_seconds=1, max_entries=5)
+        key = cache.make_key("m", PROMPT, {"query": "ttl"}, Classification)
+        cache.put(key, "m", Classification(type="simple", confidence=1.0))
+        time.sleep(1.2)
+        assert cache.get(key, Classification) is None
+
+        cache.ttl_seconds = 0
+        for i in range(12):
+            k = cache.make_key("m", PROMPT, {"query": f"q{i}"}, Classification)
+            cache.put(k, "m", Classification(type="simple", confidence=1.0))
+        assert cache.get_stats()["entries"] <= 5
+        print("✅ TTL expiry and size-bounded eviction")
+
+
+def test_replay_and_bypass_modes():
+    """replay 모드는 미스 시 예외, off 모드는 항상 우회"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        writer = make_cache(tmp_dir, mode="readwrite")
+        key = writer.make_key("m", PROMPT, {"query": "recorded"}, Classification)
+        writer.put(key, "m", Classification(type="simple", confidence=0.8))
+
+        replay = make_cache(tmp_dir, mode="replay")
+        assert replay.get(key, Classification).confidence == 0.8
+        try:
+            replay.get(replay.make_key("m", PROMPT, {"query": "new"}, Classification), Classification)
+            raise AssertionError("replay miss should raise")
+        except LLMCacheMiss:
+            pass
+
+        bypass = make_cache(tmp_dir, mode="off")
+        assert bypass.get(key, Classification) is None
+        print("✅ Replay and bypass modes")
+
+
+if __name__ == "__main__":
+    test_roundtrip_returns_pydantic()
+    test_key_depends_on_template_and_input()
+    test_ttl_and_eviction()
+    test_replay_and_bypass_modes()
+    print("\n✅ All LLM cache tests passed")
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Test script for PageImageService
+인용된 페이지 지연 렌더링, 캐시 히트, 용량 제한 LRU eviction, 원본 PDF 변경 감지 검증 (임시 PDF 사용)
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import fitz
+from ingest.pdf_to_image import DEFAULT_VARIANTS, PDFImageExtractor
+from workflow.page_images import PageImageService
+from workflow.nodes.synthesis import PageImageInfo
+
+
+def make_pdf(path: Path, pages: int = 5):
+    doc = fitz.open()
+    for i in range(pages):
+        doc.new_page().insert_text((72, 72), f"Page {i + 1}")
+    doc.save(str(path))
+    doc.close()
+
+
+def make_service(tmp_dir: Path, **kwargs) -> PageImageService:
+    kwargs.setdefault("variant_widths", {})
+    return PageImageService(
+        cache_dir=str(tmp_dir / "cache"),
+        prerendered_dir=str(tmp_dir / "prerendered"),
+        pdf_dir=str(tmp_dir),
+        dpi=40,
+        **kwargs
+    )
+
+
+def test_render_on_first_use_then_hit():
+    """처음 조회 시 렌더링, 이후 캐시 히트"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        make_pdf(tmp_dir / "manual.pdf")
+        service = make_service(tmp_dir)
+
+        # source 경로가 달라도 PDF 디렉토리에서 찾음
+        path = service.resolve("data/manual.pdf", 2)
+        assert path and Path(path).is_file()
+        assert service.resolve("data/manual.pdf", 2) == path
+        stats = service.get_stats()
+        assert stats["renders"] == 1 and stats["hits"] == 1
+
+        assert service.resolve("data/manual.pdf", 99) is None
+        assert service.resolve("data/unknown.pdf", 1) is None
+        print("✅ Render on first use, then cache hit")
+
+
+def test_prerendered_images_preferred():
+    """사전 렌더링 이미지가 있으면 렌더링하지 않음"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        (tmp_dir / "prerendered").mkdir()
+        prerendered = tmp_dir / "prerendered" / "manual-page-1.png"
+        prerendered.write_bytes(b"png")
+        service = make_service(tmp_dir)
+        assert service.resolve("data/manual.pdf", 1) == str(prerendered)
+        assert service.get_stats()["renders"] == 0
+        print("✅ Pre-rendered images preferred")
+
+
+def test_prerendered_variants_preferred():
+    """사전 렌더링 스크립트가 만든 변형을 같은 파일명 규칙으로 찾아 사용"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        make_pdf(tmp_dir / "manual.pdf", pages=2)
+        extractor = PDFImageExtractor(
+            output_dir=str(tmp_dir / "prerendered"), dpi=40, variants=DEFAULT_VARIANTS, use_manifest=False
+        )
+        pages = extractor.convert_pdf_to_images(str(tmp_dir / "manual.pdf"))
+
+        service = make_service(tmp_dir, variant_widths={v.name: v.max_width for v in DEFAULT_VARIANTS})
+        resolved = service.resolve_page("data/manual.pdf", 1)
+        assert resolved["path"] == pages[0]["image_path"]
+        assert {name: v["path"] for name, v in resolved["variants"].items()} == {
+            name: v["path"] for name, v in pages[0]["variants"].items()
+        }
+        stats = service.get_stats()
+        assert stats["renders"] == 0 and stats["entries"] == 0
+        print("✅ Pre-rendered variants preferred")
+
+
+def test_size_bounded_lru():
+    """용량 초과 시 가장 오래 사용하지 않은 이미지 제거"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        make_pdf(tmp_dir / "manual.pdf")
+        probe = make_service(tmp_dir)
+        one_page = Path(probe.resolve("manual.pdf", 1)).stat().st_size
+
+        service = make_service(tmp_dir, max_bytes=int(one_page * 2.5))
+        service.resolve("manual.pdf", 2)
+        service.resolve("manual.pdf", 1)  # page 1을 최근 사용으로
+        service.resolve("manual.pdf", 3)  # page 2가 제거되어야 함
+
+        version = service.source_version(tmp_dir / "manual.pdf")
+        assert service.cache_path("manual.pdf", 1, version).is_file()
+        assert not service.cache_path("manual.pdf", 2, version).is_file()
+        assert service.cache_path("manual.pdf", 3, version).is_file()
+        assert service.get_stats()["bytes"] <= service.max_bytes
+        print("✅ Size-bounded LRU eviction")
+
+
+def test_changed_pdf_rerenders():
+    """원본 PDF가 바뀌면 이전 캐시 대신 다시 렌더링"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        pdf_path = tmp_dir / "manual.pdf"
+        make_pdf(pdf_path, pages=2)
+        service = make_service(tmp_dir, variant_widths={"thumbnail": 120})
+        first = service.resolve_page("manual.pdf", 1)
+
+        make_pdf(pdf_path, pages=3)  # 같은 이름으로 교체 (크기/mtime 변경)
+        second = service.resolve_page("manual.pdf", 1)
+        assert second["path"] != first["path"]
+        assert second["variants"]["thumbnail"]["path"] != first["variants"]["thumbnail"]["path"]
+        assert service.get_stats()["renders"] == 2
+        assert service.resolve_page("manual.pdf", 1)["path"] == second["path"]
+        print("✅ Changed source PDF invalidates cached renders")
+
+
+def test_variants_with_dimensions():
+    """썸네일/중간 크기 변형 생성 및 PageImageInfo 변환"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        make_pdf(tmp_dir / "manual.pdf")
+        service = make_service(
+            tmp_dir, variant_widths={"thumbnail": 120, "medium": 300}, variant_format="jpeg", variant_quality=70
+        )
+        resolved = service.resolve_page("manual.pdf", 1)
+        thumbnail = resolved["variants"]["thumbnail"]
+        medium = resolved["variants"]["medium"]
+        assert thumbnail["width"] == 120 and medium["width"] == 300
+        assert thumbnail["path"].endswith(".jpg") and Path(thumbnail["path"]).is_file()
+        assert Path(thumbnail["path"]).stat().st_size < Path(resolved["path"]).stat().st_size
+
+        # 새 인스턴스에서도 파일 헤더로 크기 복원 (재렌더링 없음)
+        reloaded = make_service(
+            tmp_dir, variant_widths={"thumbnail": 120, "medium": 300}, variant_format="jpeg", variant_quality=70
+        )
+        again = reloaded.resolve_page("manual.pdf", 1)
+        assert reloaded.get_stats()["renders"] == 0
+        assert again["variants"]["thumbnail"]["height"] == thumbnail["height"]
+
+        info = PageImageInfo(
+            path=resolved["path"], page=1, source="manual.pdf",
+            width=resolved["width"], height=resolved["height"],
+            thumbnail=thumbnail, medium=medium
+        )
+        assert info.thumbnail.width == 120
+        print(f"✅ Variants rendered (thumbnail {thumbnail['width']}x{thumbnail['height']}, medium {medium['width']}x{medium['height']})")
+
+
+if __name__ == "__main__":
+    test_render_on_first_use_then_hit()
+    test_prerendered_images_preferred()
+    test_prerendered_variants_preferred()
+    test_size_bounded_lru()
+    test_changed_pdf_rerenders()
+    test_variants_with_dimensions()
+    print("\n✅ All page image service tests passed")
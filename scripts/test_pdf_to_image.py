@@ -209,6 +209,57 @@ def test_batch_conversion():
         return False
 
 
+def test_parallel_resume():
+    """Test process-pool rendering and manifest-based skip/resume"""
+    print("\n" + "="*60)
+    print("TEST: Parallel Rendering and Resume")
+    print("="*60)
+    
+    import fitz
+    import tempfile
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # 10페이지짜리 임시 PDF 생성
+        pdf_path = Path(tmp_dir) / "resume_test.pdf"
+        doc = fitz.open()
+        for i in range(10):
+            doc.new_page().insert_text((72, 72), f"Page {i + 1}")
+        doc.save(str(pdf_path))
+        doc.close()
+        
+        output_dir = Path(tmp_dir) / "images"
+        extractor = PDFImageExtractor(output_dir=str(output_dir), dpi=50, workers=2)
+        results = extractor.convert_pdf_to_images(str(pdf_path))
+        if [r["page_number"] for r in results] != list(range(1, 11)):
+            print(f"❌ Unexpected pages: {[r['page_number'] for r in results]}")
+            return False
+        print(f"✅ Rendered {len(results)} pages with 2 workers")
+        
+        # 중단 시뮬레이션: 일부 이미지 삭제 후 재실행하면 삭제된 페이지만 렌더링
+        first_mtime = Path(results[0]["image_path"]).stat().st_mtime_ns
+        for r in results[5:]:
+            os.remove(r["image_path"])
+        resumed = PDFImageExtractor(output_dir=str(output_dir), dpi=50, workers=2)
+        plan = resumed._plan(str(pdf_path))
+        if plan.pending != list(range(5, 10)):
+            print(f"❌ Expected pages 6-10 pending, got {[p + 1 for p in plan.pending]}")
+            return False
+        results = resumed.convert_pdf_to_images(str(pdf_path))
+        if len(results) != 10 or Path(results[0]["image_path"]).stat().st_mtime_ns != first_mtime:
+            print("❌ Resume re-rendered up-to-date pages")
+            return False
+        print("✅ Resume rendered only missing pages")
+        
+        # DPI가 바뀌면 전체 재렌더링
+        changed = PDFImageExtractor(output_dir=str(output_dir), dpi=60, workers=1)
+        if len(changed._plan(str(pdf_path)).pending) != 10:
+            print("❌ DPI change did not invalidate manifest")
+            return False
+        print("✅ DPI change invalidates manifest")
+    
+    return True
+
+
 def main():
     """Run all tests"""
     print("\n" + "🔧 "*20)
@@ -234,7 +285,8 @@ def main():
         ("Single PDF Conversion", test_single_pdf_conversion),
         ("Page Range Extraction", test_page_range_extraction),
         ("Single Page Extraction", test_single_page_extraction),
-        ("Batch Conversion", test_batch_conversion)
+        ("Batch Conversion", test_batch_conversion),
+        ("Parallel Rendering and Resume", test_parallel_resume)
     ]
     
     results = []
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test script for batched query analysis
+쿼리 변형 배치 분석(Kiwi 배치 / spaCy pipe)이 개별 분석과 같은 키워드/tsquery를 만들고 메모이즈되는지 검증
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from kiwipiepy import Kiwi
+
+from retrieval.query_analysis import QueryAnalyzer, build_tsquery, korean_keywords
+
+VARIANTS = [
+    ("엔진오일 교체 주기는 얼마인가요?", "korean"),
+    ("타이어 공기압 점검 방법", "korean"),
+    ("How do I check the engine oil level?", "english"),
+    ("디지털정부 혁신 추진 계획의 주요 내용을 설명해 주세요", "korean"),
+]
+
+
+def test_build_tsquery():
+    assert build_tsquery([]) == ""
+    assert build_tsquery(["엔진오일"]) == "엔진오일"
+    assert build_tsquery(["엔진오일", "교체"]) == "엔진오일 & 교체"
+    assert build_tsquery(["a", "b", "c", "d"]) == "(a & b) | c | d"
+    print("✅ tsquery combines first two keywords with AND, the rest with OR")
+
+
+def test_batch_matches_single():
+    kiwi = Kiwi()
+    batched = QueryAnalyzer(kiwi=kiwi, cache_size=16).analyze_batch(VARIANTS)
+    for (query, language), analysis in zip(VARIANTS, batched):
+        single = QueryAnalyzer(kiwi=kiwi, cache_size=16).analyze(query, language)
+        assert analysis == single, (analysis, single)
+        assert analysis.tsquery == build_tsquery(analysis.keywords)
+        if language == "korean":
+            assert list(analysis.keywords) == korean_keywords(query, kiwi.tokenize(query))
+    # spaCy가 없으면 간단한 영어 추출
+    assert batched[2].keywords and all(keyword.islower() for keyword in batched[2].keywords)
+    print(f"✅ Batch analysis matches per-query analysis ({[a.tsquery for a in batched]})")
+
+
+def test_memoization():
+    calls = []
+
+    class CountingKiwi:
+        def __init__(self):
+            self.kiwi = Kiwi()
+
+        def tokenize(self, texts):
+            calls.append(list(texts))
+            return self.kiwi.tokenize(texts)
+
+    analyzer = QueryAnalyzer(kiwi=CountingKiwi(), cache_size=2)
+    analyzer.analyze_batch([("엔진오일 교체", "korean"), ("엔진오일  교체 ", "korean"), ("타이어 점검", "korean")])
+    assert calls == [["엔진오일 교체", "타이어 점검"]]  # 정규화 후 중복은 한 번만 분석
+    analyzer.analyze("엔진오일 교체", "korean")
+    assert len(calls) == 1 and analyzer.stats["hits"] == 1
+    # LRU: 용량 2에서 새 쿼리가 들어오면 가장 오래 사용하지 않은 항목 제거
+    analyzer.analyze("브레이크 패드", "korean")
+    analyzer.analyze("타이어 점검", "korean")
+    assert len(calls) == 3 and len(analyzer._cache) == 2
+    print("✅ Analyses are memoized per normalized query with LRU eviction")
+
+
+def test_kiwi_failure_falls_back():
+    class BrokenKiwi:
+        def tokenize(self, texts):
+            raise RuntimeError("tokenizer unavailable")
+
+    analysis = QueryAnalyzer(kiwi=BrokenKiwi()).analyze("엔진오일 교체 주기", "korean")
+    assert analysis.keywords == ("엔진오일", "교체", "주기")
+    print("✅ Kiwi failure falls back to whitespace keywords")
+
+
+if __name__ == "__main__":
+    test_build_tsquery()
+    test_batch_matches_single()
+    test_memoization()
+    test_kiwi_failure_falls_back()
+    print("\n✅ All query analysis tests passed")
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test script for cross-variant rank fusion
+벡터화된 RRF 융합이 순수 파이썬 RRF와 같은 순서/점수인지, 예산/우선 문서/출처 기록 검증
+"""
+
+import sys
+import random
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from retrieval.fusion import rrf_fuse
+
+
+def reference_rrf(rankings, k=60):
+    """순수 파이썬 RRF (동점은 처음 등장 순서)"""
+    scores, first_seen = {}, {}
+    for keys in rankings:
+        for rank, key in enumerate(keys, 1):
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+            first_seen.setdefault(key, len(first_seen))
+    return sorted(scores, key=lambda key: (-scores[key], first_seen[key])), scores
+
+
+def test_matches_reference():
+    rng = random.Random(3)
+    rankings = [rng.sample(range(40), 10) for _ in range(5)]
+    fused = rrf_fuse(rankings, k=60)
+    expected, scores = reference_rrf(rankings)
+    assert [item.key for item in fused] == expected
+    top = scores[expected[0]]
+    for item in fused:
+        assert abs(item.score - scores[item.key] / top) < 1e-12
+    print("✅ Vectorized RRF matches the reference implementation")
+
+
+def test_consensus_beats_single_hit():
+    """여러 변형에서 찾은 문서가 한 변형의 1위보다 앞섬"""
+    rankings = [["a", "shared"], ["b", "shared"], ["c", "shared"]]
+    fused = rrf_fuse(rankings)
+    assert fused[0].key == "shared"
+    assert fused[0].variants == [0, 1, 2] and fused[0].best_rank == 2
+    print("✅ Documents found by several variants rank first")
+
+
+def test_budget_and_priority():
+    """예산만큼만 남기고, 우선 문서(entity 일치)는 점수와 무관하게 앞에 둠"""
+    rankings = [[1, 2, 3, 4, 5], [2, 1, 6, 7, 8], [9, 2, 1]]
+    fused = rrf_fuse(rankings, budget=4, priority={8})
+    keys = [item.key for item in fused]
+    assert len(keys) == 4 and keys[0] == 8
+    assert keys[1:3] == [2, 1]
+    assert fused[0].variants == [1]
+    assert rrf_fuse([], budget=3) == [] and rrf_fuse([[], []]) == []
+    print("✅ Fusion honors the global budget and priority documents")
+
+
+if __name__ == "__main__":
+    test_matches_reference()
+    test_consensus_beats_single_hit()
+    test_budget_and_priority()
+    print("\n✅ All rank fusion tests passed")
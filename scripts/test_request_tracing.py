@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test script for hot-path log controls
+샘플되지 않은 빠른 요청은 상세 로그를 만들지 않고, 느린 요청은 종료 시 출력하며,
+trace id가 스레드 풀 태스크와 큐 핸들러 레코드까지 전달되는지 검증
+"""
+
+import sys
+import time
+import queue
+import logging
+import logging.handlers
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from retrieval import tracing
+from retrieval.tracing import TraceIdFilter, configure, current_trace_id, log_detail, request_trace, submit_in_context
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def make_logger(name: str):
+    log = logging.getLogger(name)
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    handler = ListHandler()
+    log.handlers = [handler]
+    return log, handler
+
+
+def test_unsampled_fast_request_builds_nothing():
+    configure(mode="sampled", sample_rate=0.0, slow_ms=10000)
+    log, handler = make_logger("test.trace.fast")
+    built = []
+    with request_trace("retrieval"):
+        log_detail(log, lambda: built.append(1) or "preview")
+    assert not built and not handler.records
+    # 요청 밖 (스크립트 직접 호출)도 샘플 모드에서는 출력하지 않음
+    log_detail(log, lambda: built.append(1) or "preview")
+    assert not built
+    print("✅ Unsampled fast requests never build preview strings")
+
+
+def test_sampled_and_slow_requests_emit():
+    log, handler = make_logger("test.trace.slow")
+    configure(mode="sampled", sample_rate=0.0, slow_ms=10000)
+    with request_trace("retrieval", sampled=True):
+        log_detail(log, lambda: ["line 1", "line 2"])
+    assert [r.getMessage() for r in handler.records] == ["line 1", "line 2"]
+
+    handler.records.clear()
+    configure(slow_ms=0)
+    with request_trace("retrieval"):
+        log_detail(log, lambda: "deferred preview")
+        assert not handler.records  # 요청 중에는 출력하지 않음
+        time.sleep(0.001)
+    assert [r.getMessage() for r in handler.records] == ["deferred preview"]
+
+    # 워크플로우 전체 범위(collect=False)는 보관하지 않음
+    handler.records.clear()
+    with request_trace("workflow", collect=False):
+        log_detail(log, lambda: "dropped")
+    assert not handler.records
+
+    configure(mode="all")
+    log_detail(log, lambda: "always")
+    assert handler.records[-1].getMessage() == "always"
+    configure(mode="sampled", slow_ms=2000)
+    print("✅ Sampled requests log immediately, slow requests after the fact")
+
+
+def test_trace_id_propagates_to_threads_and_queue():
+    log, _ = make_logger("test.trace.queue")
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(TraceIdFilter())
+    sink = ListHandler()
+    listener = logging.handlers.QueueListener(log_queue, sink)
+    log.handlers = [queue_handler]
+    listener.start()
+    try:
+        with request_trace("workflow", collect=False) as outer:
+            with request_trace("retrieval") as inner:
+                assert inner.trace_id == outer.trace_id
+                with ThreadPoolExecutor(max_workers=2) as executor:
+                    ids = [f.result() for f in [submit_in_context(executor, current_trace_id) for _ in range(3)]]
+                    submit_in_context(executor, log.info, "from worker").result()
+            assert set(ids) == {outer.trace_id}
+        assert current_trace_id() == "-"
+    finally:
+        listener.stop()
+    assert sink.records[0].getMessage() == "from worker" and sink.records[0].trace_id == outer.trace_id
+    print("✅ Trace id reaches pool tasks and queued file-handler records")
+
+
+if __name__ == "__main__":
+    test_unsampled_fast_request_builds_nothing()
+    test_sampled_and_slow_requests_emit()
+    test_trace_id_propagates_to_threads_and_queue()
+    print(f"\n✅ All request tracing tests passed (detail mode: {tracing.settings.mode})")
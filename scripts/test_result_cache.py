@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Test script for the retrieval result cache
+같은 (쿼리, 필터, 언어, 가중치) 검색이 코퍼스 버전이 같을 때 순위 계산 없이 재사용되는지 검증 (DB 호출 없음)
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from retrieval.compiled_sql import CompiledSQLCache
+from retrieval.hybrid_search import HybridSearch
+from retrieval.query_analysis import QueryAnalysis
+from retrieval.records import SearchRecord
+from retrieval.result_cache import RetrievalResultCache, ensure_corpus_version_trigger, make_result_key
+from retrieval.search_filter import MVPSearchFilter
+
+PAYLOAD = ("id", "source", "page", "category", "page_content", "translation_text",
+           "contextualize_text", "caption", "entity", "image_path", "human_feedback")
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self.description = [(name,) for name in PAYLOAD]
+        self._rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.db.queries.append(sql)
+        if "pg_trigger" in sql:
+            self._rows = [(1,)] if self.db.triggers else [None]
+        elif "to_regclass" in sql:
+            self._rows = [(True,)]
+        elif "CREATE TRIGGER" in sql:
+            self.db.triggers.append(sql)
+        elif "mvp_corpus_version" in sql:
+            self._rows = [(self.db.version,)]
+        else:
+            self._rows = [(i, "a.pdf", i, "paragraph", f"doc {i}") + (None,) * 6
+                          for i in params["ids"] if i in self.db.ids]
+
+    def fetchone(self):
+        return self._rows[0]
+
+    def fetchall(self):
+        return self._rows
+
+
+class FakeDatabase:
+    """문서 테이블 + 코퍼스 버전 역할 (pool.connection() 호환)"""
+
+    def __init__(self):
+        self.version = 1
+        self.triggers = []
+        self.ids = {1, 2, 3}
+        self.queries = []
+
+    def connection(self):
+        db = self
+
+        class _Ctx:
+            def __enter__(self):
+                return db
+
+            def __exit__(self, *exc):
+                return False
+
+        return _Ctx()
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        pass
+
+
+def test_key_normalization():
+    base = make_result_key("엔진오일 교체", MVPSearchFilter(categories=["table"]), "korean", 10, 0.5, 0.5)
+    assert base == make_result_key("  엔진오일   교체 ", MVPSearchFilter(categories=["table"]), "korean", 10, 0.5, 0.5)
+    assert base != make_result_key("엔진오일 교체", MVPSearchFilter(), "korean", 10, 0.5, 0.5)
+    assert base != make_result_key("엔진오일 교체", MVPSearchFilter(categories=["table"]), "english", 10, 0.5, 0.5)
+    assert base != make_result_key("엔진오일 교체", MVPSearchFilter(categories=["table"]), "korean", 10, 0.7, 0.3)
+    assert base != make_result_key("엔진오일 교체", MVPSearchFilter(), "korean", 10, 0.5, 0.5,
+                                   boost_filter=MVPSearchFilter(categories=["table"]))
+    print("✅ Keys cover normalized query, filter, language, weights and boost filter")
+
+
+def test_lru_version_and_shared_storage():
+    db = FakeDatabase()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = str(Path(tmp_dir) / "results.sqlite")
+        cache = RetrievalResultCache(db, "mvp_ddu_documents", max_entries=2, path=path, version_check_seconds=0)
+        version = cache.corpus_version()
+        assert version == "1"
+        results = [{"id": 1, "rrf_score": 1.0, "search_types": ["semantic"], "page_content": "x"}]
+        for key in ("a", "b", "c"):
+            cache.set(key, version, results, {"language": "korean"})
+        assert len(cache.cache) == 2 and ("1", "a") not in cache.cache  # LRU 제거
+        # 메모리에서 빠져도 SQLite 공유 저장소에서 복원 (다른 워커 프로세스 역할)
+        other = RetrievalResultCache(db, "mvp_ddu_documents", path=path, version_check_seconds=0)
+        entry = other.get("a", version)
+        assert entry["results"] == [{"id": 1, "rrf_score": 1.0, "search_types": ["semantic"]}]  # 페이로드 제외
+        # 인제스트가 버전을 올리면 이전 엔트리는 사용하지 않음
+        db.version += 1
+        new_version = cache.corpus_version()
+        assert new_version != version and not cache.cache and cache.get("b", new_version) is None
+        assert cache.get_stats()["version_changes"] == 1 and other.hit_rate() == 1.0
+    assert RetrievalResultCache(db, "mvp_ddu_documents", max_entries=0).max_entries == 0
+    print("✅ LRU eviction, shared SQLite storage and corpus-version invalidation")
+
+
+def test_version_trigger_covers_every_write():
+    db = FakeDatabase()
+    assert ensure_corpus_version_trigger(db, "mvp_ddu_documents") is True
+    (ddl,) = db.triggers
+    assert "AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON mvp_ddu_documents" in ddl
+    assert "FOR EACH STATEMENT" in ddl
+    # 이미 설치되어 있으면 다시 만들지 않음
+    assert ensure_corpus_version_trigger(db, "mvp_ddu_documents") is False and len(db.triggers) == 1
+    assert not any("pg_stat_user_tables" in sql for sql in db.queries)
+    print("✅ A statement trigger bumps the corpus version on every write path")
+
+
+def make_hybrid(db):
+    hybrid = HybridSearch.__new__(HybridSearch)
+    hybrid.k = 60
+    hybrid.pool = db
+    hybrid.table_name = "mvp_ddu_documents"
+    hybrid.sql_cache = CompiledSQLCache(prepare=False)
+    hybrid.result_cache = RetrievalResultCache(db, hybrid.table_name, version_check_seconds=0)
+    hybrid._execute_with_retry = lambda operation, **kwargs: operation(db)
+
+    class Analyzer:
+        def analyze(self, query, language):
+            return QueryAnalysis(query, language, ("엔진오일",), "엔진오일")
+
+    hybrid.query_analyzer = Analyzer()
+    calls = []
+
+    def semantic(query, filter, language, limit, boost_filter=None):
+        calls.append("semantic")
+        return [SearchRecord.from_dict({"id": 2, "similarity": 0.9}), SearchRecord.from_dict({"id": 1, "similarity": 0.8})]
+
+    def keyword(query, filter, language, limit, boost_filter=None, analysis=None):
+        calls.append("keyword")
+        return [SearchRecord.from_dict({"id": 1, "rank": 0.4})]
+
+    hybrid._semantic_search = semantic
+    hybrid._keyword_search = keyword
+    return hybrid, calls
+
+
+def test_hybrid_search_skips_ranking_on_hit():
+    db = FakeDatabase()
+    hybrid, calls = make_hybrid(db)
+    first = hybrid.search("엔진오일 교체", MVPSearchFilter(), "korean", top_k=5,
+                          semantic_weight=0.5, keyword_weight=0.5)
+    assert calls == ["semantic", "keyword"] or calls == ["keyword", "semantic"]
+    second = hybrid.search("엔진오일  교체", MVPSearchFilter(), "korean", top_k=5,
+                           semantic_weight=0.5, keyword_weight=0.5)
+    assert len(calls) == 2  # 임베딩/검색 SQL 생략
+    assert [r["id"] for r in second] == [r["id"] for r in first] == [1, 2]
+    assert second[0]["rrf_score"] == first[0]["rrf_score"] and second[0]["page_content"] == "doc 1"
+    assert hybrid.last_search_stats["cache_hit"] and hybrid.last_search_stats["extracted_keywords"] == ["엔진오일"]
+
+    # 캐시된 문서가 삭제되었으면 다시 검색
+    db.ids.discard(2)
+    hybrid.search("엔진오일 교체", MVPSearchFilter(), "korean", top_k=5, semantic_weight=0.5, keyword_weight=0.5)
+    assert len(calls) == 4
+    print(f"✅ Repeated searches reuse cached rankings (hit rate {hybrid.result_cache.hit_rate():.0%})")
+
+
+if __name__ == "__main__":
+    test_key_normalization()
+    test_lru_version_and_shared_storage()
+    test_version_trigger_covers_every_write()
+    test_hybrid_search_skips_ranking_on_hit()
+    print("\n✅ All result cache tests passed")
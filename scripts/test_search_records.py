@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test script for compact search result records
+SearchRecord가 dict 인터페이스를 유지하면서 행 튜플/컬럼 인덱스를 공유하는지, 병합 경로 호환성 검증
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from retrieval.records import SearchRecord
+from retrieval.hybrid_search import HybridSearch
+
+COLUMNS = ("id", "source", "page", "category", "page_content", "similarity")
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.description = [(name,) for name in COLUMNS]
+        self._rows = rows
+
+    def fetchall(self):
+        return self._rows
+
+
+def make_records():
+    rows = [
+        (1, "a.pdf", 1, "paragraph", "엔진오일 교체", 0.91),
+        (2, "a.pdf", 2, "table", "타이어 공기압", 0.85),
+    ]
+    return SearchRecord.from_cursor(FakeCursor(rows))
+
+
+def test_dict_interface():
+    first, second = make_records()
+    assert first["id"] == 1 and first.get("source") == "a.pdf"
+    assert first.get("caption") is None and first.get("caption", "") == ""
+    assert "page_content" in first and "caption" not in first and "rrf_score" not in first
+    assert first.similarity == 0.91
+    # 컬럼 인덱스는 쿼리의 모든 행이 공유
+    assert first._columns is second._columns
+    try:
+        first["page"] = 5
+        raise AssertionError("row fields must be read-only")
+    except KeyError:
+        pass
+    first["rrf_score"] = 1.0
+    assert "rrf_score" in first and first.to_dict()["rrf_score"] == 1.0
+    assert not hasattr(first, "__dict__")
+    print("✅ SearchRecord behaves like a read-only result dict with score slots")
+
+
+def test_rrf_merge_accepts_records_and_dicts():
+    """SQL 경로(레코드)와 인프로세스 엔진(dict) 결과를 함께 병합"""
+    hybrid = HybridSearch.__new__(HybridSearch)
+    hybrid.k = 60
+    semantic = make_records()
+    keyword = [{"id": 2, "source": "a.pdf", "rank": 0.3}, {"id": 3, "source": "b.pdf", "rank": 0.1}]
+    merged = hybrid._rrf_merge(semantic, keyword, top_k=3)
+    assert [doc["id"] for doc in merged] == [2, 1, 3]
+    assert isinstance(merged[0], SearchRecord)
+    assert sorted(merged[0]["search_types"]) == ["keyword", "semantic"]
+    assert merged[0]["rrf_score"] == 1.0
+    print("✅ RRF merge works on records and engine dicts")
+
+
+if __name__ == "__main__":
+    test_dict_interface()
+    test_rrf_merge_accepts_records_and_dicts()
+    print("\n✅ All search record tests passed")
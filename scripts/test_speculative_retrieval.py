@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+선행 검색의 재사용 조건(쿼리 일치, 필터 없음), 폐기, 실패 시 폴백, 컴파일된 그래프의 요청 trace id 공유 검증 (DB/LLM 호출 없음)
+선행 검색의 재사용 조건(쿼리 일치, 필터 없음), 폐기, 실패 시 폴백 검증 (DB/LLM 호출 없음)
+"""
+
+import sys
+import time
+import logging
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from retrieval import tracing
+from retrieval.tracing import current_trace_id, log_detail, request_trace
+from workflow.speculative import SpeculativeRetrieval, normalize_query
+
+
+class FakeRetrievalNode:
+    """RetrievalNode의 선행 검색 인터페이스만 흉내내는 테스트 노드"""
+
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.default_top_k = 3
+        self.delay = delay
+        self.fail = fail
+        self.search_calls = 0
+        self.hybrid_search = SimpleNamespace(last_search_stats={"total_results": 3})
+        self._lock = threading.Lock()
+
+    def _initialize(self):
+        pass
+
+    def _detect_language(self, query):
+        return SimpleNamespace(language="korean", confidence=1.0)
+
+    def _bilingual_search(self, query, filter_dict, primary_language, top_k):
+        with self._lock:
+            self.search_calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("db down")
+        return [f"{query}-doc{i}" for i in range(top_k)]
+
+
+def test_reuse_on_matching_unfiltered_query():
+    """같은 쿼리(정규화 기준)이고 필터가 없으면 재사용"""
+    node = FakeRetrievalNode(delay=0.1)
+    spec = SpeculativeRetrieval(node, wait_seconds=2, ttl_seconds=60)
+    assert spec.start("  엔진오일   교체 주기 ")
+    assert not spec.start("엔진오일 교체 주기")  # 중복 시작 무시
+
+    result, stats = spec.take("엔진오일 교체 주기", {"categories": None})
+    assert len(result) == 3
+    assert stats["detected_language"] == "korean" and stats["speculative"]
+    assert node.search_calls == 1
+    assert normalize_query("A  b ") == "a b"
+    spec.shutdown()
+    print("✅ Matching unfiltered query reuses pre-search")
+
+
+def test_no_reuse_with_filter_or_other_query():
+    """필터가 있거나 다른 쿼리면 재사용하지 않음"""
+    node = FakeRetrievalNode()
+    spec = SpeculativeRetrieval(node, wait_seconds=2, ttl_seconds=60)
+    spec.start("브레이크 점검")
+    assert spec.take("브레이크 점검", {"categories": ["table"]}) is None
+    assert spec.take("타이어 공기압") is None
+    assert spec.take("브레이크 점검") is not None
+    spec.shutdown()
+    print("✅ Filtered or different queries are not reused")
+
+
+def test_discard_and_failure_fallback():
+    """direct_response 폐기, 검색 실패 시 None 반환 (일반 검색으로 폴백)"""
+    node = FakeRetrievalNode()
+    spec = SpeculativeRetrieval(node, wait_seconds=2, ttl_seconds=60)
+    spec.start("안녕하세요")
+    spec.discard("안녕하세요")
+    assert spec.take("안녕하세요") is None
+    assert spec.get_stats()["discarded"] == 1
+    spec.shutdown()
+
+    failing = SpeculativeRetrieval(FakeRetrievalNode(fail=True), wait_seconds=2, ttl_seconds=60)
+    failing.start("시트 조절")
+    assert failing.take("시트 조절") is None
+    assert failing.get_stats()["failed"] == 1
+    failing.shutdown()
+    print("✅ Discard and failure fallback")
+
+
+def test_wait_timeout_and_ttl():
+    """대기 시간 초과, TTL 만료 시 재사용하지 않음"""
+    slow = SpeculativeRetrieval(FakeRetrievalNode(delay=0.5), wait_seconds=0.05, ttl_seconds=60)
+    slow.start("느린 검색")
+    assert slow.take("느린 검색") is None
+    slow.shutdown()
+
+    expiring = SpeculativeRetrieval(FakeRetrievalNode(), wait_seconds=1, ttl_seconds=0.1)
+    expiring.start("만료 검색")
+    time.sleep(0.2)
+    assert expiring.take("만료 검색") is None
+    expiring.shutdown()
+    print("✅ Wait timeout and TTL expiry")
+
+
+def test_pre_search_details_outlive_caller_trace():
+    """호출한 trace가 먼저 끝나도 선행 검색의 지연 상세 로그는 자체 trace 종료 시 출력"""
+    emitted = []
+
+    class Collector(logging.Handler):
+        def emit(self, record):
+            emitted.append((record.getMessage(), current_trace_id()))
+
+    log = logging.getLogger("test.speculative.detail")
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    log.handlers = [Collector()]
+
+    node = FakeRetrievalNode(delay=0.1)
+    original = node._bilingual_search
+
+    def search_with_detail(**kwargs):
+        log_detail(log, lambda: "pre-search detail")
+        return original(**kwargs)
+
+    node._bilingual_search = search_with_detail
+    tracing.configure(mode="sampled", sample_rate=0.0, slow_ms=0)
+    spec = SpeculativeRetrieval(node, wait_seconds=2, ttl_seconds=60)
+    try:
+        with request_trace("retrieval") as caller:
+            spec.start("엔진오일 교체 주기")
+        assert spec.take("엔진오일 교체 주기") is not None
+    finally:
+        spec.shutdown()
+        tracing.configure(slow_ms=2000)
+    assert emitted == [("pre-search detail", caller.trace_id)]
+    print("✅ Pre-search detail logs use their own trace scope")
+
+
+def test_compiled_app_shares_trace_id():
+    """LangGraph 서버처럼 컴파일된 그래프를 직접 실행해도 노드/선행 검색/retrieval 로그가 같은 trace id"""
+    from workflow.graph import MVPWorkflowGraph
+
+    seen = {}
+    node = FakeRetrievalNode()
+    original = node._bilingual_search
+
+    def search_with_trace(**kwargs):
+        seen["speculative"] = current_trace_id()
+        return original(**kwargs)
+
+    node._bilingual_search = search_with_trace
+
+    def recording(name, update):
+        def invoke(state):
+            seen[name] = current_trace_id()
+            if name == "retrieval":
+                with request_trace("retrieval"):
+                    seen["retrieval_scope"] = current_trace_id()
+            return update
+        return SimpleNamespace(invoke=invoke)
+
+    graph = MVPWorkflowGraph.__new__(MVPWorkflowGraph)
+    graph.enable_routing = False
+    graph.use_tavily = False
+    graph.speculative = SpeculativeRetrieval(node, wait_seconds=2, ttl_seconds=60)
+    graph.planning_node = recording("planning", {"subtasks": [{"query": "q", "status": "pending"}]})
+    graph.subtask_executor = recording("subtask_executor", {})
+    graph.retrieval_node = recording("retrieval", {"workflow_status": "completed"})
+    graph.synthesis_node = recording("synthesis", {})
+    graph.hallucination_check = recording("hallucination_check", {"hallucination_check": {"is_valid": True}})
+    graph.answer_grader = recording("answer_grader", {"answer_grade": {"is_valid": True}})
+    app = graph._build_graph().compile()
+    try:
+        app.invoke({"query": "엔진오일 교체 주기"}, config={"configurable": {"thread_id": "t1", "run_id": "run-1"}})
+        assert graph.speculative.take("엔진오일 교체 주기") is not None
+    finally:
+        graph.speculative.shutdown()
+
+    assert set(seen) >= {"planning", "speculative", "retrieval", "retrieval_scope", "synthesis", "answer_grader"}
+    assert set(seen.values()) == {MVPWorkflowGraph._config_trace_id({"configurable": {"run_id": "run-1"}})}, seen
+    assert current_trace_id() == "-"
+    print(f"✅ Compiled app shares one trace id across nodes ({seen['planning']})")
+
+
+if __name__ == "__main__":
+    test_reuse_on_matching_unfiltered_query()
+    test_no_reuse_with_filter_or_other_query()
+    test_discard_and_failure_fallback()
+    test_wait_timeout_and_ttl()
+    test_pre_search_details_outlive_caller_trace()
+    test_compiled_app_shares_trace_id()
+    print("\n✅ All speculative retrieval tests passed")
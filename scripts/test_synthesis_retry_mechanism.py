@@ -1,7 +1,7 @@
 #!/usr/bin/env python
 """
-Synthesis Node Retry Mechanism 테스트
-OpenAI API 서버 에러 시뮬레이션 및 exponential backoff 검증
+Synthesis Node Retry Mechanism 테스트 (공용 LLM 게이트웨이)
+OpenAI API 서버 에러 시뮬레이션, exponential backoff 및 hedged request 검증
 """
 
 import sys
@@ -13,7 +13,7 @@ from unittest.mock import Mock, patch
 # Add project root to path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from workflow.nodes.synthesis import SynthesisNode
+from workflow.llm_gateway import LLMGateway
 from langchain_core.documents import Document
 
 # 로깅 설정
@@ -55,14 +55,14 @@ def test_retry_mechanism_success():
     print("🔄 Retry Mechanism Success Test")
     print("="*60)
     
-    synthesis_node = SynthesisNode()
+    gateway = LLMGateway(max_retries=3, backoff_base=1.0, hedge_after_ms=0)
     mock_llm = MockStructuredLLM(fail_attempts=2)  # 2번 실패 후 성공
     messages = ["test message"]
     
     start_time = time.time()
     
     try:
-        result = synthesis_node._invoke_with_retry(mock_llm, messages, max_retries=3)
+        result = gateway.invoke(mock_llm, messages, node="SYNTHESIS")
         end_time = time.time()
         
         print(f"✅ Success after {mock_llm.attempt_count} attempts")
@@ -87,14 +87,14 @@ def test_retry_mechanism_failure():
     print("❌ Retry Mechanism Failure Test")
     print("="*60)
     
-    synthesis_node = SynthesisNode()
+    gateway = LLMGateway(max_retries=3, backoff_base=1.0, hedge_after_ms=0)
     mock_llm = MockStructuredLLM(fail_attempts=5)  # 5번 계속 실패
     messages = ["test message"]
     
     start_time = time.time()
     
     try:
-        result = synthesis_node._invoke_with_retry(mock_llm, messages, max_retries=3)
+        result = gateway.invoke(mock_llm, messages, node="SYNTHESIS")
         print("❌ Should have failed but didn't")
         return False
         
@@ -119,7 +119,7 @@ def test_non_server_error():
     print("⚡ Non-Server Error Test")
     print("="*60)
     
-    synthesis_node = SynthesisNode()
+    gateway = LLMGateway(max_retries=3, backoff_base=1.0, hedge_after_ms=0)
     
     # Non-server error를 발생시키는 Mock
     class NonServerErrorLLM:
@@ -136,7 +136,7 @@ def test_non_server_error():
     start_time = time.time()
     
     try:
-        result = synthesis_node._invoke_with_retry(mock_llm, messages, max_retries=3)
+        result = gateway.invoke(mock_llm, messages, node="SYNTHESIS")
         print("❌ Should have failed immediately but didn't")
         return False
         
@@ -161,7 +161,7 @@ def test_exponential_backoff_timing():
     print("⏰ Exponential Backoff Timing Test")
     print("="*60)
     
-    synthesis_node = SynthesisNode()
+    gateway = LLMGateway(max_retries=3, backoff_base=1.0, hedge_after_ms=0)
     
     # 타이밍 측정을 위한 Mock
     class TimingMockLLM:
@@ -192,7 +192,7 @@ def test_exponential_backoff_timing():
     start_time = time.time()
     
     try:
-        result = synthesis_node._invoke_with_retry(mock_llm, messages, max_retries=3)
+        result = gateway.invoke(mock_llm, messages, node="SYNTHESIS")
         
         # 타이밍 분석
         if len(mock_llm.attempt_times) >= 3:
@@ -213,9 +213,44 @@ def test_exponential_backoff_timing():
         return False
 
 
+def test_hedged_request():
+    """느린 첫 요청을 hedged request가 대체하는지 검증"""
+    print("\n" + "="*60)
+    print("🏁 Hedged Request Test")
+    print("="*60)
+    
+    gateway = LLMGateway(max_retries=0, hedge_after_ms=200)
+    
+    class SlowFirstLLM:
+        def __init__(self):
+            self.attempt_count = 0
+        
+        def invoke(self, messages):
+            self.attempt_count += 1
+            if self.attempt_count == 1:
+                time.sleep(2.0)  # 첫 요청은 꼬리 지연
+                return "slow"
+            return "fast"
+    
+    mock_llm = SlowFirstLLM()
+    start_time = time.time()
+    result = gateway.invoke(mock_llm, ["test message"], node="SYNTHESIS")
+    elapsed = time.time() - start_time
+    
+    metrics = gateway.get_metrics()["SYNTHESIS"]
+    print(f"⏱️ Total time: {elapsed:.2f} seconds, result: {result}")
+    print(f"📊 Metrics: hedges={metrics['hedges']}, hedge_wins={metrics['hedge_wins']}")
+    
+    assert result == "fast", "Hedged request should win"
+    assert elapsed < 1.5, f"Hedged call should finish early, took {elapsed:.2f}s"
+    assert metrics["hedges"] == 1 and metrics["hedge_wins"] == 1
+    print("✅ All assertions passed!")
+    return True
+
+
 def main():
     """모든 테스트 실행"""
-    print("🔧 Synthesis Node Exponential Backoff Retry Tests")
+    print("🔧 LLM Gateway Exponential Backoff Retry Tests")
     print("=" * 60)
     
     tests = [
@@ -223,6 +258,7 @@ def main():
         ("Failure after max retries", test_retry_mechanism_failure), 
         ("Non-server error immediate fail", test_non_server_error),
         ("Exponential backoff timing", test_exponential_backoff_timing),
+        ("Hedged request", test_hedged_request),
     ]
     
     results = []
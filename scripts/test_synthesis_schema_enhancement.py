@@ -123,7 +123,7 @@ def test_synthesis_with_new_fields():
     
     # Generate answer
     print("\n⚙️  Generating synthesis...")
-    result = synthesis_node._generate_answer_with_fallback(query, test_docs)
+    result = synthesis_node._generate_answer(query, test_docs)
     
     # Check results
     print("\n" + "-"*60)
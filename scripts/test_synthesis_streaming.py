@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test script for synthesis streaming helpers
+답변 토큰 필터가 구분자 이후의 구조화 필드 블록을 숨기는지,
+토큰 전송 후 실패하면 재생성하지 않고 오류로 보고하는지 검증
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from workflow.streaming import (
+    AnswerTokenFilter,
+    PartialStreamError,
+    SYNTHESIS_META_DELIMITER,
+    SYNTHESIS_STREAM_TAG,
+    is_synthesis_stream_chunk
+)
+from workflow.nodes.synthesis import SynthesisNode
+
+
+def stream_through(chunks):
+    """청크 리스트를 필터에 통과시킨 결과"""
+    token_filter = AnswerTokenFilter()
+    output = "".join(token_filter.feed(c) for c in chunks)
+    return output + token_filter.flush()
+
+
+def test_delimiter_in_single_chunk():
+    """한 청크 안에 구분자가 있는 경우"""
+    text = "엔진 오일은 [1] 참조.\n" + SYNTHESIS_META_DELIMITER + '\n{"confidence": 0.9}'
+    assert stream_through([text]) == "엔진 오일은 [1] 참조.\n"
+    print("✅ Delimiter in a single chunk")
+
+
+def test_delimiter_split_across_chunks():
+    """구분자가 여러 청크로 나뉘어 도착하는 경우"""
+    text = "답변 본문입니다 [2]\n" + SYNTHESIS_META_DELIMITER + '{"confidence": 0.8}'
+    for size in (1, 2, 3, 5, 7):
+        chunks = [text[i:i + size] for i in range(0, len(text), size)]
+        assert stream_through(chunks) == "답변 본문입니다 [2]\n", size
+    print("✅ Delimiter split across chunks")
+
+
+def test_no_delimiter_passes_everything():
+    """구분자가 없으면 모든 텍스트 통과 (보류된 '<' 포함)"""
+    assert stream_through(["값은 5 <", "< 10 입니다"]) == "값은 5 << 10 입니다"
+    print("✅ Text without delimiter passes through")
+
+
+def test_metadata_filter():
+    """synthesis 스트리밍 LLM 토큰만 선택"""
+    assert is_synthesis_stream_chunk({"langgraph_node": "synthesis", "tags": [SYNTHESIS_STREAM_TAG]})
+    assert not is_synthesis_stream_chunk({"langgraph_node": "synthesis", "tags": []})
+    assert not is_synthesis_stream_chunk({"langgraph_node": "planning", "tags": [SYNTHESIS_STREAM_TAG]})
+    assert not is_synthesis_stream_chunk(None)
+    print("✅ Metadata filter selects synthesis stream tokens")
+
+
+class FailingStreamGateway:
+    """fail_after개 청크를 보낸 뒤 스트림이 끊기는 게이트웨이"""
+
+    def __init__(self, fail_after: int):
+        self.fail_after = fail_after
+        self.structured_calls = 0
+
+    def stream(self, runnable, messages, node="LLM"):
+        for i in range(self.fail_after):
+            yield SimpleNamespace(content=f"답변 {i} ")
+        raise ConnectionError("stream interrupted")
+
+    def invoke_structured(self, schema, messages, temperature=0, node="LLM"):
+        self.structured_calls += 1
+        return "regenerated"
+
+
+def make_streaming_node(gateway) -> SynthesisNode:
+    node = SynthesisNode.__new__(SynthesisNode)
+    node.gateway = gateway
+    node.temperature = 0.1
+    node.streaming_enabled = True
+    node.stream_llm = None
+    node.streaming_format_instruction = ""
+    return node
+
+
+def test_fallback_only_before_tokens():
+    """토큰 전송 전 실패는 구조화 출력으로 재생성, 전송 후 실패는 오류 보고"""
+    gateway = FailingStreamGateway(fail_after=0)
+    assert make_streaming_node(gateway)._run_synthesis([]) == "regenerated"
+    assert gateway.structured_calls == 1
+
+    gateway = FailingStreamGateway(fail_after=2)
+    try:
+        make_streaming_node(gateway)._run_synthesis([])
+        raise AssertionError("expected PartialStreamError")
+    except PartialStreamError as e:
+        assert "2 chunks" in str(e) and isinstance(e.__cause__, ConnectionError)
+    assert gateway.structured_calls == 0
+    print("✅ Regenerates only when no tokens were sent")
+
+
+if __name__ == "__main__":
+    test_delimiter_in_single_chunk()
+    test_delimiter_split_across_chunks()
+    test_no_delimiter_passes_everything()
+    test_metadata_filter()
+    test_fallback_only_before_tokens()
+    print("\n✅ All synthesis streaming tests passed")
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Test script for the in-process vector engine
+스냅샷 검색 결과가 SQL 경로(정확 코사인 + WHERE 필터)와 일치하는지, 코퍼스 버전 변경 시 재빌드 검증 (DB 호출 없음)
+"""
+
+import sys
+import math
+import random
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from retrieval.search_filter import MVPSearchFilter
+from retrieval.snapshot import SnapshotEngine
+from retrieval.vector_engine import VectorEngine
+
+DIM = 8
+
+
+class FakeCursor:
+    """VectorSnapshot.build / read_corpus_version이 사용하는 쿼리만 흉내내는 커서"""
+
+    def __init__(self, table, binary=False):
+        self.table = table
+        self.binary = binary
+        self.itersize = 0
+        self._result = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        rows = self.table.rows
+        if "vector_dims" in sql:
+            self._result = [(len(rows), DIM, DIM)]
+        elif "to_regclass" in sql:
+            self._result = [(True,)]
+        elif "mvp_corpus_version" in sql:
+            self._result = [(self.table.changes,)]
+        else:
+            self.table.snapshot_reads.append((self.binary, "::real[]" in sql))
+            # 바이너리 커서 + pgvector 어댑터면 vector 컬럼이 float32 배열로 로드됨
+            load = (lambda e: None if e is None else np.asarray(e, dtype=np.float32)) if self.binary else (lambda e: e)
+            self._result = [
+                tuple(r.get(f) for f in ("id", "source", "page", "category", "page_content",
+                                         "translation_text", "contextualize_text", "caption", "entity",
+                                         "image_path", "human_feedback"))
+                + (load(r["embedding_korean"]), load(r["embedding_english"]))
+                for r in sorted(rows, key=lambda r: r["id"])
+            ]
+
+    def fetchone(self):
+        return self._result[0]
+
+    def __iter__(self):
+        return iter(self._result)
+
+
+class FakeAdapters:
+    def __init__(self):
+        self.types = {"vector": object()}
+
+
+class FakeConnection:
+    def __init__(self, table):
+        self.table = table
+        if table.vector_adapter:
+            self.adapters = FakeAdapters()
+
+    def cursor(self, name=None, binary=False):
+        return FakeCursor(self.table, binary)
+
+    def execute(self, sql):
+        pass
+
+    def rollback(self):
+        pass
+
+
+class FakePool:
+    """mvp_ddu_documents 테이블 역할"""
+
+    def __init__(self, rows, vector_adapter=False):
+        self.rows = rows
+        self.changes = len(rows)
+        self.vector_adapter = vector_adapter
+        self.snapshot_reads = []
+
+    def connection(self):
+        pool = self
+
+        class _Ctx:
+            def __enter__(self):
+                return FakeConnection(pool)
+
+            def __exit__(self, *exc):
+                return False
+
+        return _Ctx()
+
+
+def make_rows(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(1, n + 1):
+        rows.append({
+            "id": i,
+            "source": "data/manual.pdf" if i % 3 else "data/other.pdf",
+            "page": i % 5 + 1,
+            "category": ["paragraph", "table", "figure"][i % 3],
+            "page_content": f"doc {i}",
+            "entity": {"type": "table", "title": f"t{i}"} if i % 4 == 0 else None,
+            "human_feedback": "",
+            "embedding_korean": None if i % 11 == 0 else [rng.uniform(-1, 1) for _ in range(DIM)],
+            "embedding_english": [rng.uniform(-1, 1) for _ in range(DIM)],
+        })
+    return rows
+
+
+def reference_search(rows, query, language, flt, limit):
+    """SQL 경로와 같은 의미의 정확 검색 (순수 파이썬)"""
+    def cosine(a, b):
+        return sum(x * y for x, y in zip(a, b)) / (math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b)))
+
+    hits = []
+    for r in rows:
+        emb = r[f"embedding_{language}"]
+        if emb is None:
+            continue
+        if flt.categories and r["category"] not in flt.categories:
+            continue
+        if flt.pages and r["page"] not in flt.pages:
+            continue
+        if flt.sources and r["source"] not in flt.sources:
+            continue
+        if flt.entity and (r["entity"] or {}).get("type") != flt.entity["type"]:
+            continue
+        hits.append((cosine(emb, query), r["id"]))
+    hits.sort(key=lambda h: (-h[0], h[1]))
+    return hits[:limit]
+
+
+def test_parity_with_sql_semantics():
+    """필터 조합별로 id 순서와 similarity가 정확 검색과 일치"""
+    rows = make_rows(200)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = VectorEngine(FakePool(rows), "mvp_ddu_documents", tmp_dir, refresh_seconds=3600)
+        engine.build_now()
+
+        rng = random.Random(1)
+        filters = [
+            MVPSearchFilter(),
+            MVPSearchFilter(categories=["table"]),
+            MVPSearchFilter(pages=[1, 2], sources=["data/manual.pdf"]),
+            MVPSearchFilter(entity={"type": "table"}),
+            MVPSearchFilter(categories=["없는카테고리"]),
+        ]
+        for flt in filters:
+            for language in ("korean", "english"):
+                query = [rng.uniform(-1, 1) for _ in range(DIM)]
+                results = engine.search(query, language, flt, 10)
+                expected = reference_search(rows, query, language, flt, 10)
+                assert [r["id"] for r in results] == [h[1] for h in expected], flt
+                for r, (score, _) in zip(results, expected):
+                    assert abs(r["similarity"] - score) < 1e-5
+                    assert set(r) >= {"source", "page", "category", "entity", "similarity"}
+        print("✅ Results match exact SQL semantics")
+
+
+def test_binary_vector_snapshot():
+    """pgvector 어댑터가 있으면 바이너리 커서로 벡터를 배열로 읽고 결과는 텍스트 경로와 동일"""
+    rows = make_rows(50)
+    query = [0.3] * DIM
+    results = {}
+    for vector_adapter in (False, True):
+        pool = FakePool(rows, vector_adapter=vector_adapter)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            engine = VectorEngine(pool, "mvp_ddu_documents", tmp_dir, refresh_seconds=3600)
+            engine.build_now()
+            results[vector_adapter] = [(r["id"], r["similarity"]) for r in engine.search(query, "korean", None, 5)]
+        assert pool.snapshot_reads == [(vector_adapter, not vector_adapter)]
+    assert [i for i, _ in results[True]] == [i for i, _ in results[False]]
+    assert all(abs(a - b) < 1e-6 for (_, a), (_, b) in zip(results[True], results[False]))
+    print("✅ Snapshot reads vectors in binary when the pgvector adapter is registered")
+
+
+def test_unsupported_filter_falls_back():
+    """caption/entity 텍스트 필터는 None (SQL 경로 사용)"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = VectorEngine(FakePool(make_rows(20)), "mvp_ddu_documents", tmp_dir, refresh_seconds=3600)
+        engine.build_now()
+        query = [0.1] * DIM
+        assert engine.search(query, "korean", MVPSearchFilter(caption="엔진"), 5) is None
+        assert engine.search(query, "korean", MVPSearchFilter(entity={"title": "t4"}), 5) is None
+        assert engine.search(query, "korean", None, 5) is not None
+        assert engine.get_stats()["fallbacks"] == 2
+    print("✅ Unsupported filters fall back to SQL")
+
+
+def test_refresh_on_corpus_version_change():
+    """코퍼스 버전이 바뀌면 재빌드 전까지 None, 재빌드 후 새 행 포함"""
+    rows = make_rows(30)
+    pool = FakePool(rows)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = VectorEngine(pool, "mvp_ddu_documents", tmp_dir, refresh_seconds=0)
+        engine.build_now()
+        query = [1.0] + [0.0] * (DIM - 1)
+
+        rows.append({**make_rows(1, seed=99)[0], "id": 31, "embedding_korean": query, "embedding_english": query})
+        pool.changes += 1
+
+        assert engine.search(query, "korean", None, 3) is None  # 오래된 스냅샷은 사용하지 않음
+        engine._build_thread.join(timeout=10)
+        results = engine.search(query, "korean", None, 3)
+        assert results[0]["id"] == 31 and abs(results[0]["similarity"] - 1.0) < 1e-6
+
+        # 재시작(새 엔진)은 게시된 스냅샷을 그대로 로드
+        reloaded = VectorEngine(pool, "mvp_ddu_documents", tmp_dir, refresh_seconds=0)
+        assert reloaded.search(query, "korean", None, 1)[0]["id"] == 31
+        assert reloaded.get_stats()["builds"] == 0
+    print("✅ Snapshot refreshes on corpus version change")
+
+
+def test_swap_keeps_in_flight_snapshot_readable():
+    """재빌드로 교체돼도 진행 중인 검색이 잡고 있는 이전 스냅샷은 읽을 수 있고, 검색 오류는 SQL로 폴백"""
+    rows = make_rows(30)
+    pool = FakePool(rows)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = VectorEngine(pool, "mvp_ddu_documents", tmp_dir, refresh_seconds=3600)
+        engine.build_now()
+        in_flight = engine.snapshot()
+        pool.changes += 1
+        engine.build_now()
+        assert engine.snapshot() is not in_flight
+        query = [0.2] * DIM
+        assert len(in_flight.search(query, "korean", None, 3)) == 3  # mmap이 닫히지 않음
+
+        def broken(*args, **kwargs):
+            raise ValueError("mmap closed or invalid")
+
+        engine.snapshot().search = broken
+        assert engine.search(query, "korean", None, 3) is None
+        assert engine.get_stats()["fallbacks"] == 1
+
+    try:
+        SnapshotEngine(pool, "mvp_ddu_documents", tmp_dir, refresh_seconds=0)
+        assert False, "abstract base instantiated"
+    except TypeError:
+        pass
+    print("✅ Replaced snapshots stay readable and search errors fall back to SQL")
+
+
+if __name__ == "__main__":
+    test_parity_with_sql_semantics()
+    test_binary_vector_snapshot()
+    test_unsupported_filter_falls_back()
+    test_refresh_on_corpus_version_change()
+    test_swap_keeps_in_flight_snapshot_readable()
+    print("\n✅ All vector engine tests passed")
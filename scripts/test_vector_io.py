@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Test script for binary pgvector transport
+pgvector 어댑터가 등록된 연결에서는 float32 배열, 없으면 기존 텍스트 리터럴을 파라미터로 쓰는지 검증 (DB 호출 없음)
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from ingest.vector_io import format_vector, has_vector_adapter, to_vector_array, vector_param
+
+
+class FakeAdapters:
+    def __init__(self, types):
+        self.types = types
+
+
+class FakeConnection:
+    def __init__(self, registered: bool):
+        self.adapters = FakeAdapters({"vector": object()} if registered else {})
+
+
+def test_text_literal_fallback():
+    conn = FakeConnection(registered=False)
+    assert not has_vector_adapter(conn) and not has_vector_adapter(object())
+    embedding = [0.1, -0.25, 3.0]
+    # 어댑터가 없으면 기존 pgvector 텍스트 리터럴과 동일
+    assert vector_param(conn, embedding) == f"[{','.join(map(str, embedding))}]" == format_vector(embedding)
+    assert vector_param(conn, None) is None
+    print("✅ Connections without the pgvector adapter keep the text literal")
+
+
+def test_binary_float32_param():
+    conn = FakeConnection(registered=True)
+    assert has_vector_adapter(conn)
+    value = vector_param(conn, [0.1, -0.25, 3.0])
+    assert isinstance(value, np.ndarray) and value.dtype == np.float32
+    assert np.allclose(value, [0.1, -0.25, 3.0])
+    # 이미 float32 배열이면 복사하지 않음 (쿼리 임베딩은 검색당 한 번만 변환)
+    query_embedding = to_vector_array(np.random.rand(1536))
+    assert vector_param(conn, query_embedding) is query_embedding
+    print("✅ Registered connections get float32 arrays for binary transport")
+
+
+if __name__ == "__main__":
+    test_text_literal_fallback()
+    test_binary_float32_param()
+    print("\n✅ All vector transport tests passed")
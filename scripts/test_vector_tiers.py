@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test script for vector shortlist tiers
+티어 인덱스 DDL과 shortlist 정렬 키가 일치하는지, ANN 경로가 shortlist + 전체 벡터 재점수화로
+바뀌고 exact 경로는 그대로인지 검증 (DB 호출 없음)
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from ingest.vector_tiers import build_tiers, get_tier, tier_migration_statements
+from retrieval.filtered_ann import FilteredVectorSearch
+
+SELECT_SQL = "id, 1 - (embedding_korean <=> %(embedding)s::vector) as similarity"
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.description = [("id",), ("similarity",)]
+        self._result = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.conn.executed.append(sql)
+        if "count(*)" in sql:
+            self._result = [(self.conn.candidates,)]
+        elif "pg_extension" in sql:
+            self._result = [("0.8.0",)]
+        else:
+            self._result = [(i, 1.0 - i / 100) for i in range(params["limit"])]
+
+    def fetchone(self):
+        return self._result[0]
+
+    def fetchall(self):
+        return self._result
+
+
+class FakeConnection:
+    def __init__(self, candidates=100000):
+        self.candidates = candidates
+        self.executed = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+
+def test_index_matches_order_key():
+    tiers = build_tiers(dimensions=1536, matryoshka_dims=256)
+    assert set(tiers) == {"halfvec", "binary", "matryoshka"} and get_tier("full") is None
+    for tier in tiers.values():
+        ddl = tier.ddl("mvp_ddu_documents", "embedding_korean")
+        # 플래너는 ORDER BY 좌변이 인덱스 표현식과 같을 때만 표현식 인덱스를 사용
+        assert f"(({tier.key_sql('embedding_korean')}) {tier.opclass})" in ddl
+        assert tier.order_sql("embedding_korean").startswith(tier.key_sql("embedding_korean"))
+    assert tiers["binary"].key_sql("embedding_korean") == "(binary_quantize(embedding_korean)::bit(1536))"
+    assert tiers["matryoshka"].query == "subvector(%(embedding)s::vector, 1, 256)::vector(256)"
+    assert tiers["binary"].size_ratio == 1 / 32
+
+    statements = tier_migration_statements(["full", "binary"], "mvp_ddu_documents", concurrently=True)
+    assert statements[0].startswith("CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_embedding_korean_binary")
+    assert len(statements) == 3 and statements[-1] == "ANALYZE mvp_ddu_documents"
+    try:
+        get_tier("pq")
+        assert False, "unknown tier accepted"
+    except ValueError:
+        pass
+    print("✅ Tier index DDL matches the shortlist ORDER BY expression")
+
+
+def test_shortlist_rescoring_sql():
+    search = FilteredVectorSearch("mvp_ddu_documents", mode="auto", exact_max_rows=100,
+                                  tier="binary", shortlist_factor=5)
+    conn = FakeConnection()
+    params = {"embedding": "[0.1]", "limit": 10}
+    rows, strategy = search.search(conn, "embedding_korean", SELECT_SQL, "1=1", params, 10)
+    sql = conn.executed[-1]
+    assert strategy == "ann" and len(rows) == 10
+    assert "binary_quantize(embedding_korean)::bit(1536)) <~> binary_quantize(%(embedding)s::vector)" in sql
+    assert "LIMIT %(limit)s * 5" in sql
+    # 최종 순위는 shortlist에 조인한 CTE 안에서 계산한 전체 벡터 유사도 (전체 벡터 인덱스 사용 불가)
+    assert "JOIN shortlist USING (id)" in sql and "scored AS MATERIALIZED" in sql
+    assert "ORDER BY similarity DESC, id" in sql and "<=> %(embedding)s::vector, id" not in sql
+    print("✅ ANN path shortlists on the tier index and re-scores on full vectors")
+
+
+def test_exact_and_default_paths_unchanged():
+    search = FilteredVectorSearch("mvp_ddu_documents", mode="auto", exact_max_rows=100, tier="halfvec")
+    conn = FakeConnection(candidates=30)
+    params = {"embedding": "[0.1]", "limit": 10, "sources": ["a.pdf"]}
+    _, strategy = search.search(conn, "embedding_korean", SELECT_SQL, "source = ANY(%(sources)s)", params, 10)
+    assert strategy == "exact" and "shortlist" not in conn.executed[-1]
+
+    default = FilteredVectorSearch("mvp_ddu_documents", mode="auto", tier="full")
+    conn = FakeConnection()
+    default.search(conn, "embedding_korean", SELECT_SQL, "1=1", params, 10)
+    assert default.tier is None and "shortlist" not in conn.executed[-1]
+
+    unknown = FilteredVectorSearch("mvp_ddu_documents", tier="pq")
+    assert unknown.tier is None
+    print("✅ Exact search and the full tier keep their original SQL")
+
+
+if __name__ == "__main__":
+    test_index_matches_order_key()
+    test_shortlist_rescoring_sql()
+    test_exact_and_default_paths_unchanged()
+    print("\n✅ All vector tier tests passed")
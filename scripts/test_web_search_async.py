@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Test script for async web search clients
+httpx MockTransport로 Google 페이지 병렬 요청, Tavily 동시 검색, 에러 처리 검증 (API 호출 없음)
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+from pathlib import Path
+
+import httpx
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("GOOGLE_API_KEY", "test-key")
+os.environ.setdefault("GOOGLE_SEARCH_ENGINE_ID", "test-cx")
+os.environ.setdefault("TAVILY_API_KEY", "test-key")
+# 도구 생성 시 SQLite 캐시 파일이 만들어지지 않도록 메모리 전용 캐시 사용
+os.environ.setdefault("WEB_SEARCH_CACHE_PATH", "")
+
+from workflow.tools.http_client import SearchHTTPClient
+from workflow.tools.search_cache import WebSearchCache, QuotaManager
+from workflow.tools.google_search import GoogleSearchTool
+from workflow.tools.tavily_search import TavilySearchTool
+
+
+class ConcurrencyProbe:
+    """동시에 처리 중인 요청 수를 기록하는 비동기 핸들러"""
+
+    def __init__(self, respond, delay: float = 0.1):
+        self.respond = respond
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.requests = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        self.requests.append(request)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        return self.respond(request)
+
+
+def isolate(tool, handler, provider: str, daily_limit: int = 0):
+    """공유 캐시/HTTP 클라이언트 대신 테스트 전용 인스턴스 사용"""
+    tool.http = SearchHTTPClient(max_concurrency=4, transport=httpx.MockTransport(handler))
+    tool.cache = WebSearchCache(max_entries=10, ttl_seconds=60, path="")
+    tool.quota_manager = QuotaManager(daily_limit=daily_limit, provider=provider)
+    return tool
+
+
+def google_page(request: httpx.Request) -> httpx.Response:
+    start = int(request.url.params["start"])
+    num = int(request.url.params["num"])
+    items = [{"title": f"result {start + i}", "link": f"https://example.com/{start + i}", "snippet": "..."} for i in range(num)]
+    return httpx.Response(200, json={"items": items})
+
+
+def test_google_parallel_pages():
+    """Google advanced 검색은 페이지를 병렬로 요청"""
+    probe = ConcurrencyProbe(google_page)
+    tool = isolate(GoogleSearchTool(max_results=20), probe, "google", daily_limit=100)
+    tool._page_plan = lambda depth: [(1, 10), (11, 10)]
+
+    docs = asyncio.run(tool.search("병렬 페이지", "advanced"))
+    assert len(docs) == 20
+    assert probe.peak == 2, f"pages should be fetched concurrently (peak={probe.peak})"
+    assert tool.quota_manager.queries_today == 2
+    print("✅ Google pages fetched in parallel")
+
+
+def test_google_keeps_successful_pages():
+    """한 페이지가 실패해도 나머지 페이지 결과 유지 (이미 쿼터를 쓴 요청을 버리지 않음)"""
+    def flaky_page(request):
+        if request.url.params["start"] == "11":
+            return httpx.Response(500, text="backend error")
+        return google_page(request)
+
+    tool = isolate(GoogleSearchTool(max_results=20), flaky_page, "google", daily_limit=100)
+    tool._page_plan = lambda depth: [(1, 10), (11, 10)]
+    docs = asyncio.run(tool.search("부분 실패", "advanced"))
+    assert len(docs) == 10 and docs[0].metadata["title"] == "result 1"
+    assert tool.quota_manager.queries_today == 1
+
+    failing = isolate(GoogleSearchTool(max_results=20), lambda r: httpx.Response(500, text="down"), "google", daily_limit=100)
+    failing._page_plan = lambda depth: [(1, 10), (11, 10)]
+    assert asyncio.run(failing.search("전체 실패", "advanced")) == []
+    print("✅ Google keeps successful pages when one page fails")
+
+
+def test_tavily_concurrent_queries():
+    """서로 다른 Tavily 검색이 직렬화되지 않음"""
+    def respond(request):
+        body = json.loads(request.content)
+        assert request.headers["Authorization"] == "Bearer test-key"
+        return httpx.Response(200, json={"results": [{"title": body["query"], "url": "https://t.example", "content": "c", "score": 0.9}]})
+
+    probe = ConcurrencyProbe(respond, delay=0.2)
+    tool = isolate(TavilySearchTool(max_results=3), probe, "tavily")
+
+    async def run():
+        return await asyncio.gather(*(tool.search(f"query {i}") for i in range(4)))
+
+    started = time.time()
+    results = asyncio.run(run())
+    elapsed = time.time() - started
+    assert all(len(r) == 1 for r in results)
+    assert probe.peak == 4 and elapsed < 0.6, f"searches were serialized ({elapsed:.2f}s)"
+    print(f"✅ Tavily searches run concurrently ({elapsed:.2f}s for 4)")
+
+
+def test_errors_return_empty_and_sync_api():
+    """HTTP 에러는 빈 결과, search_sync도 같은 클라이언트 사용"""
+    tool = isolate(TavilySearchTool(max_results=3), lambda r: httpx.Response(429, json={}), "tavily")
+    assert tool.search_sync("rate limited") == []
+    assert asyncio.run(tool.search("rate limited")) == []
+
+    google = isolate(GoogleSearchTool(max_results=3), google_page, "google", daily_limit=100)
+    assert len(google.search_sync("동기 검색")) == 3
+    print("✅ Error handling and sync API")
+
+
+if __name__ == "__main__":
+    test_google_parallel_pages()
+    test_google_keeps_successful_pages()
+    test_tavily_concurrent_queries()
+    test_errors_return_empty_and_sync_api()
+    print("\n✅ All async web search tests passed")
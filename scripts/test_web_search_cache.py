@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Test script for WebSearchCache
+웹 검색 캐시의 LRU/TTL, SQLite 영속화, 쿼터 영속화, singleflight 검증 (API 호출 없음)
+"""
+
+import os
+import sys
+import time
+import tempfile
+import threading
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# 전역 캐시가 SQLite 파일을 만들지 않도록 메모리 전용 캐시 사용
+os.environ.setdefault("WEB_SEARCH_CACHE_PATH", "")
+
+from langchain_core.documents import Document
+from workflow.tools.search_cache import WebSearchCache, QuotaManager, make_search_key
+
+
+def docs(n: int, tag: str = "r"):
+    return [Document(page_content=f"{tag}{i}", metadata={"search_rank": i + 1}) for i in range(n)]
+
+
+def test_lru_and_ttl():
+    """최대 크기 초과 시 가장 오래 사용하지 않은 항목 제거, TTL 만료"""
+    cache = WebSearchCache(max_entries=2, ttl_seconds=1, path="")
+    cache.set("a", docs(1))
+    cache.set("b", docs(1))
+    assert cache.get("a") is not None  # a를 최근 사용으로
+    cache.set("c", docs(1))
+    assert cache.get("b") is None and cache.get("a") is not None
+
+    time.sleep(1.1)
+    assert cache.get("a") is None
+    assert make_search_key("google", "  Hello   World ", "basic", 3) == make_search_key("google", "hello world", "basic", 3)
+    print("✅ LRU eviction and TTL expiry")
+
+
+def test_persistence_and_quota():
+    """재시작(새 인스턴스) 후에도 결과와 쿼터 사용량 유지"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = str(Path(tmp_dir) / "web.sqlite")
+        first = WebSearchCache(max_entries=10, ttl_seconds=60, path=path)
+        first.set("k", docs(2, "persist"))
+        quota = QuotaManager(daily_limit=3, provider="google", store=first)
+        quota.increment("q1")
+        quota.increment("q2")
+
+        second = WebSearchCache(max_entries=10, ttl_seconds=60, path=path)
+        restored = second.get("k")
+        assert [d.page_content for d in restored] == ["persist0", "persist1"]
+        assert restored[0].metadata["search_rank"] == 1
+
+        reloaded = QuotaManager(daily_limit=3, provider="google", store=second)
+        assert reloaded.queries_today == 2 and reloaded.remaining() == 1
+        reloaded.increment("q3")
+        assert not reloaded.can_query()
+        assert QuotaManager(daily_limit=0, provider="tavily", store=second).can_query()
+    print("✅ Results and quota survive restart")
+
+
+def test_quota_shared_across_managers():
+    """도구 인스턴스마다 만든 관리자도 같은 저장소의 사용량을 합산하고 다시 읽음"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for path in ("", str(Path(tmp_dir) / "web.sqlite")):
+            store = WebSearchCache(max_entries=10, ttl_seconds=60, path=path)
+            graph_tool = QuotaManager(daily_limit=3, provider="google", store=store)
+            direct_tool = QuotaManager(daily_limit=3, provider="google", store=store)
+            graph_tool.increment("q1")
+            direct_tool.increment("q2")
+            graph_tool.increment("q3")
+            # 마지막 저장이 덮어쓰지 않고 3회 모두 집계, 어느 관리자도 한도를 넘기지 않음
+            assert store.load_quota("google", graph_tool.last_reset.isoformat()) == 3
+            assert not direct_tool.can_query() and direct_tool.remaining() == 0
+            assert QuotaManager(daily_limit=3, provider="tavily", store=store).remaining() == 3
+
+            threads = [threading.Thread(target=direct_tool.increment) for _ in range(20)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            assert graph_tool.remaining() == 0 and store.load_quota("google", graph_tool.last_reset.isoformat()) == 23
+    print("✅ Quota usage is shared across manager instances")
+
+
+def test_singleflight_coalescing():
+    """동시에 들어온 동일 쿼리는 업스트림 1회 호출"""
+    cache = WebSearchCache(max_entries=10, ttl_seconds=60, path="")
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.2)
+        return docs(3)
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_fetch("same", fetch)))
+        for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert all(len(r) == 3 for r in results)
+    assert cache.get_stats()["coalesced"] >= 1
+
+    # 빈 결과(에러)는 캐시하지 않음
+    cache.get_or_fetch("empty", lambda: [])
+    assert cache.get("empty") is None
+    print("✅ Singleflight coalescing")
+
+
+if __name__ == "__main__":
+    test_lru_and_ttl()
+    test_persistence_and_quota()
+    test_quota_shared_across_managers()
+    test_singleflight_coalescing()
+    print("\n✅ All web search cache tests passed")
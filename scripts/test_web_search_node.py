@@ -3,6 +3,7 @@
 Test script for Web Search Tool node
 """
 
+import os
 import sys
 import asyncio
 from pathlib import Path
@@ -10,6 +11,9 @@ from pathlib import Path
 # 프로젝트 경로 추가
 sys.path.append(str(Path(__file__).parent.parent))
 
+# 도구 생성 시 SQLite 캐시 파일이 만들어지지 않도록 메모리 전용 캐시 사용
+os.environ.setdefault("WEB_SEARCH_CACHE_PATH", "")
+
 from workflow.tools.tavily_search import TavilySearchTool
 
 
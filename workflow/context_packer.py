@@ -0,0 +1,175 @@
+"""
+Context Packer
+Synthesis 프롬프트에 들어갈 문서를 토큰 예산 안에 맞춰 선별하는 모듈
+
+- tiktoken으로 문서별 토큰 수 계산 (문서 id 기준 LRU 캐싱, 최대 항목 수 제한)
+- 검색 노드가 정한 순서(퓨전/재순위 반영)대로 예산이 찰 때까지 포함
+- 예산을 넘는 경우 마지막(tail) 문서 하나만 잘라서 포함
+"""
+
+import os
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from langchain_core.documents import Document
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+class ContextPacker:
+    """토큰 예산 기반 컨텍스트 패커"""
+
+    def __init__(
+        self,
+        token_budget: Optional[int] = None,
+        model: Optional[str] = None,
+        per_doc_overhead: Optional[int] = None,
+        min_tail_tokens: Optional[int] = None,
+        cache_size: Optional[int] = None
+    ):
+        """
+        초기화
+
+        Args:
+            token_budget: 문서 컨텍스트 전체 토큰 예산
+            model: 토크나이저 선택용 모델명
+            per_doc_overhead: 문서당 포맷팅(출처/페이지/엔티티 등) 오버헤드 토큰
+            min_tail_tokens: tail 문서를 잘라 넣을 최소 토큰 수 (이보다 작으면 제외)
+            cache_size: 토큰 수 캐시 최대 항목 수 (SYNTHESIS_TOKEN_CACHE_SIZE)
+        """
+        self.token_budget = token_budget or int(os.getenv("SYNTHESIS_CONTEXT_TOKEN_BUDGET", "12000"))
+        self.per_doc_overhead = per_doc_overhead if per_doc_overhead is not None else int(
+            os.getenv("SYNTHESIS_DOC_OVERHEAD_TOKENS", "120")
+        )
+        self.min_tail_tokens = min_tail_tokens if min_tail_tokens is not None else int(
+            os.getenv("SYNTHESIS_MIN_TAIL_TOKENS", "200")
+        )
+        self.model = model or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+        self._encoding = self._load_encoding(self.model)
+
+        # 문서 id -> 토큰 수 LRU 캐시 (가장 최근 사용이 뒤쪽)
+        self.cache_size = cache_size if cache_size is not None else int(
+            os.getenv("SYNTHESIS_TOKEN_CACHE_SIZE", "4096")
+        )
+        self._token_cache: "OrderedDict[str, int]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    @staticmethod
+    def _load_encoding(model: str):
+        """모델에 맞는 tiktoken 인코딩 로드 (실패 시 None)"""
+        if not TIKTOKEN_AVAILABLE:
+            logger.warning("[CONTEXT_PACKER] tiktoken not installed, using character-based estimate")
+            return None
+        try:
+            try:
+                return tiktoken.encoding_for_model(model)
+            except KeyError:
+                return tiktoken.get_encoding("o200k_base")
+        except Exception as e:
+            # 인코딩 파일을 내려받지 못하는 환경 (오프라인 등)
+            logger.warning(f"[CONTEXT_PACKER] Failed to load tiktoken encoding, using character-based estimate: {e}")
+            return None
+
+    def _cache_key(self, doc: Document) -> str:
+        """문서 캐시 키 (id가 없으면 내용 해시, 잘린 문서 구분을 위해 길이 포함)"""
+        doc_id = doc.metadata.get("id") if doc.metadata else None
+        if doc_id is not None:
+            return f"id:{doc_id}:{len(doc.page_content)}"
+        return "sha1:" + hashlib.sha1(doc.page_content.encode("utf-8")).hexdigest()
+
+    def count_tokens(self, text: str) -> int:
+        """텍스트 토큰 수 계산"""
+        if not text:
+            return 0
+        if self._encoding is not None:
+            return len(self._encoding.encode(text))
+        # 한국어 비중이 높으므로 보수적으로 2글자당 1토큰으로 추정
+        return len(text) // 2 + 1
+
+    def document_tokens(self, doc: Document) -> int:
+        """문서 본문 토큰 수 (캐시 사용)"""
+        key = self._cache_key(doc)
+        with self._cache_lock:
+            cached = self._token_cache.get(key)
+            if cached is not None:
+                self._token_cache.move_to_end(key)
+                return cached
+        cached = self.count_tokens(doc.page_content)
+        with self._cache_lock:
+            self._token_cache[key] = cached
+            self._token_cache.move_to_end(key)
+            while len(self._token_cache) > self.cache_size:
+                self._token_cache.popitem(last=False)
+        return cached
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """텍스트를 max_tokens 이하로 자름"""
+        if max_tokens <= 0:
+            return ""
+        if self._encoding is not None:
+            tokens = self._encoding.encode(text)
+            if len(tokens) <= max_tokens:
+                return text
+            return self._encoding.decode(tokens[:max_tokens])
+        # 추정식(len // 2 + 1)으로도 max_tokens를 넘지 않도록 자름
+        return text[:max_tokens * 2 - 1]
+
+    def pack(self, documents: List[Document]) -> Tuple[List[Document], Dict[str, Any]]:
+        """
+        토큰 예산 안에 들어가는 문서 선택
+
+        입력 순서대로 전체 포함하고, 예산을 넘는 첫 문서만 남은 예산만큼 잘라
+        포함한다. 입력 리스트는 검색 노드에서 이미 퓨전/재순위가 끝난 순서이므로
+        메타데이터 점수(변형별로 정규화된 score 등)로 다시 정렬하지 않는다.
+
+        Args:
+            documents: Document 리스트 (랭크 순)
+
+        Returns:
+            (선택된 문서 리스트, 패킹 통계) 튜플
+        """
+        if not documents:
+            return [], {"budget": self.token_budget, "used_tokens": 0, "included": 0, "dropped": 0, "truncated": False}
+
+        remaining = self.token_budget
+        packed: List[Document] = []
+        truncated = False
+
+        for doc in documents:
+            cost = self.document_tokens(doc) + self.per_doc_overhead
+            if cost <= remaining:
+                packed.append(doc)
+                remaining -= cost
+                continue
+
+            # 예산 초과 - tail 문서만 잘라서 포함하고 종료
+            tail_budget = remaining - self.per_doc_overhead
+            if tail_budget >= self.min_tail_tokens:
+                packed.append(Document(
+                    page_content=self.truncate(doc.page_content, tail_budget),
+                    metadata={**doc.metadata, "truncated": True}
+                ))
+                remaining -= tail_budget + self.per_doc_overhead
+                truncated = True
+            break
+
+        stats = {
+            "budget": self.token_budget,
+            "used_tokens": self.token_budget - remaining,
+            "included": len(packed),
+            "dropped": len(documents) - len(packed),
+            "truncated": truncated
+        }
+        logger.info(
+            f"[CONTEXT_PACKER] Packed {stats['included']}/{len(documents)} docs "
+            f"({stats['used_tokens']}/{self.token_budget} tokens, tail truncated: {truncated})"
+        )
+        return packed, stats
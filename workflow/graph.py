@@ -4,7 +4,11 @@ LangGraph 기반 P-E-O 패턴 워크플로우
 """
 
 import os
+import queue
+import hashlib
+import atexit
 import logging
+import logging.handlers
 from typing import Dict, Any, List, Optional
 from pathlib import Path
 from datetime import datetime
@@ -13,8 +17,11 @@ from langgraph.checkpoint.sqlite import SqliteSaver
 from langgraph.errors import GraphRecursionError
 from langchain_core.documents import Document
 from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableConfig
 from dotenv import load_dotenv
 
+from retrieval.tracing import TraceIdFilter, current_trace, request_trace
+
 load_dotenv()
 
 # 환경변수 읽기 (단 2개만!)
@@ -24,12 +31,16 @@ log_file_path = os.getenv('LOG_FILE_PATH', '')  # 비어있으면 파일 로깅
 # 핸들러 리스트
 handlers = []
 
+# 모든 레코드에 요청 trace id 추가 (%(trace_id)s, 요청 밖이면 '-')
+trace_filter = TraceIdFilter()
+
 # 1. 콘솔 핸들러 (항상 활성화)
 console_handler = logging.StreamHandler()
 console_handler.setFormatter(logging.Formatter(
-    '%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+    '%(asctime)s [%(levelname)s] [%(trace_id)s] %(name)s: %(message)s',
     datefmt='%H:%M:%S'
 ))
+console_handler.addFilter(trace_filter)
 handlers.append(console_handler)
 
 # 2. 파일 핸들러 (LOG_FILE_PATH가 설정된 경우만)
@@ -46,9 +57,17 @@ if log_file_path:
     
     file_handler = logging.FileHandler(actual_path, encoding='utf-8')
     file_handler.setFormatter(logging.Formatter(
-        '%(asctime)s [%(levelname)-8s] %(name)-40s %(filename)s:%(lineno)d - %(message)s'
+        '%(asctime)s [%(levelname)-8s] [%(trace_id)s] %(name)-40s %(filename)s:%(lineno)d - %(message)s'
     ))
-    handlers.append(file_handler)
+    
+    # 요청 스레드는 큐에 넣기만 하고 디스크 쓰기는 리스너 스레드에서 (trace id는 큐에 넣을 때 기록)
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(trace_filter)
+    file_listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+    file_listener.start()
+    atexit.register(file_listener.stop)  # 종료 시 남은 레코드 기록
+    handlers.append(queue_handler)
 
 # 로깅 설정
 logging.basicConfig(
@@ -77,6 +96,8 @@ from workflow.nodes.synthesis import SynthesisNode
 from workflow.nodes.hallucination import HallucinationCheckNode
 from workflow.nodes.answer_grader import AnswerGraderNode
 from workflow.tools import create_search_tool
+from workflow.streaming import AnswerTokenFilter, is_synthesis_stream_chunk
+from workflow.speculative import SpeculativeRetrieval
 
 # 새로운 노드들 import (Query Routing 활성화시)
 try:
@@ -119,6 +140,13 @@ class MVPWorkflowGraph:
         self.hallucination_check = HallucinationCheckNode()
         self.answer_grader = AnswerGraderNode()
         
+        # 선행 검색 (라우팅/플래닝과 겹쳐서 원본 쿼리 검색)
+        self.speculative = None
+        if os.getenv("ENABLE_SPECULATIVE_RETRIEVAL", "false").lower() == "true":
+            self.speculative = SpeculativeRetrieval(self.retrieval_node)
+            self.retrieval_node.speculative = self.speculative
+            logger.info("Speculative retrieval enabled")
+        
         # 웹 검색 도구 초기화 (선택적 - Google 또는 Tavily)
         try:
             # Factory 패턴으로 검색 도구 생성 (Google 또는 Tavily)
@@ -158,6 +186,63 @@ class MVPWorkflowGraph:
         # with_config를 사용하여 recursion limit 적용
         self.app = compiled_graph.with_config(recursion_limit=recursion_limit)
     
+    @staticmethod
+    def _extract_query(state: MVPWorkflowState) -> str:
+        """state.query 또는 마지막 사용자 메시지에서 쿼리 텍스트 추출"""
+        query = state.get("query")
+        if isinstance(query, str) and query.strip():
+            return query
+        for msg in reversed(state.get("messages", []) or []):
+            msg_type = msg.get("type") if isinstance(msg, dict) else getattr(msg, "type", None)
+            content = msg.get("content") if isinstance(msg, dict) else getattr(msg, "content", None)
+            if msg_type == "human" and isinstance(content, str):
+                return content
+        return ""
+    
+    @staticmethod
+    def _config_trace_id(config: Optional[Dict[str, Any]]) -> Optional[str]:
+        """LangGraph 실행 설정의 run_id (없으면 thread_id)로 만든 요청 trace id (없으면 None)"""
+        config = config or {}
+        configurable = config.get("configurable") or {}
+        metadata = config.get("metadata") or {}
+        key = (configurable.get("run_id") or metadata.get("run_id")
+               or configurable.get("thread_id") or metadata.get("thread_id"))
+        if not key:
+            return None
+        return hashlib.sha1(str(key).encode("utf-8")).hexdigest()[:8]
+    
+    def _traced(self, fn):
+        """
+        노드/조건 함수 래퍼 - 요청 trace 범위 안에서 실행
+        
+        run()/arun()은 자체 workflow trace를 열지만, LangGraph 서버(api_graph.py)는 컴파일된
+        그래프를 직접 실행하므로 실행 설정의 run_id에서 같은 trace id를 만들어 노드마다 연다.
+        선행 검색과 retrieval 범위는 이 trace id를 물려받는다.
+        """
+        def traced(state: MVPWorkflowState, config: RunnableConfig):
+            if current_trace() is not None:
+                return fn(state)
+            with request_trace("workflow", collect=False, trace_id=self._config_trace_id(config)):
+                return fn(state)
+        
+        return traced
+    
+    def _with_speculation(self, node_fn):
+        """엔트리 노드 래퍼 - 노드 실행 전에 원본 쿼리 선행 검색 시작"""
+        if self.speculative is None:
+            return node_fn
+        
+        def entry(state: MVPWorkflowState) -> Dict[str, Any]:
+            query = self._extract_query(state)
+            if query:
+                try:
+                    self.speculative.start(query)
+                except Exception as e:
+                    logger.warning(f"[SPECULATIVE] Failed to start pre-search: {e}")
+            return node_fn(state)
+        
+        return entry
+    
     def _build_graph(self) -> StateGraph:
         """워크플로우 그래프 구성"""
         
@@ -167,8 +252,8 @@ class MVPWorkflowGraph:
         # === Query Routing이 활성화된 경우 ===
         if self.enable_routing:
             # 새로운 노드들 추가
-            workflow.add_node("query_router", self.query_router.invoke)
-            workflow.add_node("direct_response", self.direct_response.invoke)
+            workflow.add_node("query_router", self._traced(self._with_speculation(self.query_router.invoke)))
+            workflow.add_node("direct_response", self._traced(self.direct_response.invoke))
             # context_enhancement node removed
             
             # 엔트리포인트를 query_router로 설정
@@ -181,6 +266,9 @@ class MVPWorkflowGraph:
                 
                 if query_type == "simple":
                     logger.info(f"[ROUTING] Simple query → DirectResponse")
+                    # 검색이 필요 없으므로 선행 검색 결과 폐기
+                    if self.speculative is not None:
+                        self.speculative.discard(self._extract_query(state))
                     return "direct_response"
                 else:  # rag_required
                     logger.info(f"[ROUTING] RAG required → Planning")
@@ -188,7 +276,7 @@ class MVPWorkflowGraph:
             
             workflow.add_conditional_edges(
                 "query_router",
-                route_query,
+                self._traced(route_query),
                 {
                     "direct_response": "direct_response",
                     "planning": "planning"
@@ -204,16 +292,18 @@ class MVPWorkflowGraph:
             workflow.set_entry_point("planning")
         
         # === 기존 노드들 추가 (공통) ===
-        workflow.add_node("planning", self.planning_node.invoke)
-        workflow.add_node("subtask_executor", self.subtask_executor.invoke)
-        workflow.add_node("retrieval", self.retrieval_node.invoke)
-        workflow.add_node("synthesis", self.synthesis_node.invoke)
-        workflow.add_node("hallucination_check", self.hallucination_check.invoke)
-        workflow.add_node("answer_grader", self.answer_grader.invoke)
+        # 라우팅이 비활성화되면 planning이 엔트리 노드이므로 여기서 선행 검색 시작
+        planning_fn = self.planning_node.invoke if self.enable_routing else self._with_speculation(self.planning_node.invoke)
+        workflow.add_node("planning", self._traced(planning_fn))
+        workflow.add_node("subtask_executor", self._traced(self.subtask_executor.invoke))
+        workflow.add_node("retrieval", self._traced(self.retrieval_node.invoke))
+        workflow.add_node("synthesis", self._traced(self.synthesis_node.invoke))
+        workflow.add_node("hallucination_check", self._traced(self.hallucination_check.invoke))
+        workflow.add_node("answer_grader", self._traced(self.answer_grader.invoke))
         
         # Tavily 검색 노드 (선택적)
         if self.use_tavily:
-            workflow.add_node("web_search", self._web_search_node_sync)
+            workflow.add_node("web_search", self._traced(self._web_search_node_sync))
         
         # === 엣지 정의 (기존 플로우는 동일) ===
         
@@ -223,7 +313,7 @@ class MVPWorkflowGraph:
         # Subtask Executor → Retrieval 또는 완료
         workflow.add_conditional_edges(
             "subtask_executor",
-            self._should_continue_subtasks,
+            self._traced(self._should_continue_subtasks),
             {
                 "continue": "retrieval",
                 "complete": "synthesis",
@@ -235,7 +325,7 @@ class MVPWorkflowGraph:
         if self.use_tavily:
             workflow.add_conditional_edges(
                 "retrieval",
-                self._should_web_search,
+                self._traced(self._should_web_search),
                 {
                     "search": "web_search",
                     "continue": "subtask_executor"
@@ -253,7 +343,7 @@ class MVPWorkflowGraph:
         # Hallucination Check → Answer Grader 또는 재시도
         workflow.add_conditional_edges(
             "hallucination_check",
-            self._check_hallucination,
+            self._traced(self._check_hallucination),
             {
                 "valid": "answer_grader",
                 "retry": "synthesis",
@@ -264,7 +354,7 @@ class MVPWorkflowGraph:
         # Answer Grader → 완료 또는 재시도
         workflow.add_conditional_edges(
             "answer_grader",
-            self._check_answer_quality,
+            self._traced(self._check_answer_quality),
             {
                 "accept": END,
                 "retry": "synthesis",
@@ -551,10 +641,11 @@ class MVPWorkflowGraph:
             "subtasks": []
         }
         
-        # 그래프 실행 with error handling
+        # 그래프 실행 with error handling (요청 로그는 같은 trace id로 묶임)
         try:
-            async for event in self.app.astream(initial_state, config=config):
-                pass  # 스트리밍 처리 (필요시)
+            with request_trace("workflow", collect=False):
+                async for event in self.app.astream(initial_state, config=config):
+                    pass  # 스트리밍 처리 (필요시)
             
             # 최종 상태 반환
             return event
@@ -594,9 +685,10 @@ class MVPWorkflowGraph:
             "subtasks": []
         }
         
-        # 그래프 실행 with error handling
+        # 그래프 실행 with error handling (요청 로그는 같은 trace id로 묶임)
         try:
-            final_state = self.app.invoke(initial_state, config=config)
+            with request_trace("workflow", collect=False):
+                final_state = self.app.invoke(initial_state, config=config)
             return final_state
         except GraphRecursionError as e:
             print(f"⚠️  워크플로우가 recursion limit에 도달했습니다: {str(e)}")
@@ -611,7 +703,8 @@ class MVPWorkflowGraph:
     def stream(
         self,
         query: str,
-        config: Optional[Dict[str, Any]] = None
+        config: Optional[Dict[str, Any]] = None,
+        stream_mode: Optional[Any] = None
     ):
         """
         스트리밍 실행
@@ -619,9 +712,10 @@ class MVPWorkflowGraph:
         Args:
             query: 사용자 쿼리
             config: 실행 설정
+            stream_mode: LangGraph stream_mode ("updates", "values", "messages" 또는 리스트)
             
         Yields:
-            중간 상태들
+            중간 상태들 (stream_mode에 따른 이벤트)
         """
         initial_state = {
             "query": query,
@@ -635,9 +729,56 @@ class MVPWorkflowGraph:
         }
         
         # 스트리밍으로 그래프 실행
-        for event in self.app.stream(initial_state, config=config):
+        stream_kwargs = {"stream_mode": stream_mode} if stream_mode else {}
+        for event in self.app.stream(initial_state, config=config, **stream_kwargs):
             yield event
     
+    def stream_answer(
+        self,
+        query: str,
+        config: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Synthesis 답변 토큰 스트리밍 (SYNTHESIS_STREAMING=true 필요)
+        
+        LangGraph messages 스트림에서 synthesis 노드의 답변 토큰만 골라 내보낸다.
+        trailing 구조화 필드 블록은 제외되며, 재시도로 답변이 다시 생성되면
+        None을 한 번 내보내 소비자가 이전 출력을 지울 수 있게 한다.
+        
+        Args:
+            query: 사용자 쿼리
+            config: 실행 설정
+            
+        Yields:
+            답변 텍스트 조각 (새 답변 시작 시 None)
+        """
+        token_filter = None
+        current_run = None
+        
+        for message_chunk, metadata in self.stream(query, config=config, stream_mode="messages"):
+            if not is_synthesis_stream_chunk(metadata):
+                continue
+            
+            # 새로운 LLM 호출 (재시도 또는 다음 서브태스크) 감지
+            run_id = getattr(message_chunk, "id", None)
+            if token_filter is None or run_id != current_run:
+                if token_filter is not None:
+                    tail = token_filter.flush()
+                    if tail:
+                        yield tail
+                    yield None
+                token_filter = AnswerTokenFilter()
+                current_run = run_id
+            
+            text = token_filter.feed(message_chunk.content or "")
+            if text:
+                yield text
+        
+        if token_filter is not None:
+            tail = token_filter.flush()
+            if tail:
+                yield tail
+    
     def get_graph_image(self, output_path: str = "workflow_graph.png"):
         """
         워크플로우 그래프 시각화
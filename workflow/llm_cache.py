@@ -0,0 +1,244 @@
+"""
+LLM Response Cache
+temperature=0 구조화 출력 호출을 위한 영속 응답 캐시 (SQLite)
+
+- 키: 모델 + 프롬프트 템플릿 해시 + 렌더링 입력 해시 + 출력 스키마
+- TTL, 최대 엔트리 수 기반 eviction (마지막 접근 시각 순)
+- 모드: readwrite(기본) / off(우회) / replay(캐시만 사용, 네트워크 호출 없음)
+- 캐시 히트 시 동일한 Pydantic 객체로 복원
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Type
+from pydantic import BaseModel
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+CACHE_MODES = ("readwrite", "off", "replay")
+
+
+class LLMCacheMiss(LookupError):
+    """replay 모드에서 캐시에 없는 호출이 발생한 경우"""
+
+
+def prompt_template_hash(prompt: Any) -> str:
+    """
+    프롬프트 템플릿 해시 (렌더링 전 템플릿 문자열 기준)
+
+    Args:
+        prompt: ChatPromptTemplate 또는 문자열
+
+    Returns:
+        sha256 hex digest
+    """
+    if isinstance(prompt, str):
+        raw = prompt
+    else:
+        parts = []
+        for message in getattr(prompt, "messages", []):
+            inner = getattr(message, "prompt", None)
+            template = getattr(inner, "template", None)
+            parts.append([type(message).__name__, template if template is not None else repr(message)])
+        raw = json.dumps(parts, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def input_hash(inputs: Dict[str, Any]) -> str:
+    """렌더링 입력 값 해시"""
+    raw = json.dumps(inputs, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def schema_fingerprint(schema: Type[BaseModel]) -> str:
+    """출력 스키마 식별자 (스키마가 바뀌면 캐시 무효화)"""
+    raw = json.dumps(schema.model_json_schema(), ensure_ascii=False, sort_keys=True)
+    return f"{schema.__name__}:{hashlib.sha256(raw.encode('utf-8')).hexdigest()[:16]}"
+
+
+class LLMResponseCache:
+    """SQLite 기반 결정적 LLM 응답 캐시"""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        mode: Optional[str] = None,
+        ttl_seconds: Optional[int] = None,
+        max_entries: Optional[int] = None
+    ):
+        """
+        초기화 (인자가 없으면 환경변수 사용)
+
+        Args:
+            path: SQLite 파일 경로 (LLM_CACHE_PATH)
+            mode: readwrite / off / replay (LLM_CACHE_MODE)
+            ttl_seconds: 엔트리 유효 시간 (LLM_CACHE_TTL_SECONDS, 0이면 만료 없음)
+            max_entries: 최대 엔트리 수 (LLM_CACHE_MAX_ENTRIES)
+        """
+        self.path = path or os.getenv("LLM_CACHE_PATH", "data/cache/llm_cache.sqlite")
+        self.mode = (mode or os.getenv("LLM_CACHE_MODE", "readwrite")).lower()
+        if self.mode not in CACHE_MODES:
+            raise ValueError(f"Invalid LLM_CACHE_MODE '{self.mode}', expected one of {CACHE_MODES}")
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else int(
+            os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600))
+        )
+        self.max_entries = max_entries if max_entries is not None else int(
+            os.getenv("LLM_CACHE_MAX_ENTRIES", "50000")
+        )
+
+        self.hits = 0
+        self.misses = 0
+        self._writes_since_evict = 0
+        self._evict_interval = max(1, min(100, self.max_entries // 10))
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        if self.mode != "off":
+            self._connect()
+
+    def _connect(self):
+        """SQLite 연결 및 테이블 생성"""
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_response_cache (
+                cache_key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                schema TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_response_cache (last_access)"
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    @staticmethod
+    def make_key(
+        model: str,
+        prompt: Any,
+        inputs: Dict[str, Any],
+        schema: Type[BaseModel],
+        method: Optional[str] = None
+    ) -> str:
+        """캐시 키 생성"""
+        parts = [model, prompt_template_hash(prompt), input_hash(inputs), schema_fingerprint(schema), method or ""]
+        return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+    def get(self, key: str, schema: Type[BaseModel]) -> Optional[BaseModel]:
+        """
+        캐시 조회
+
+        Returns:
+            schema 인스턴스 (없거나 만료되었으면 None, replay 모드에서는 LLMCacheMiss)
+        """
+        if not self.enabled:
+            return None
+
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_response_cache WHERE cache_key = ?", (key,)
+            ).fetchone()
+
+            # replay 모드에서는 TTL 무시 (기록된 결정 재현)
+            expired = (
+                row is not None and self.mode != "replay"
+                and self.ttl_seconds > 0 and now - row[1] > self.ttl_seconds
+            )
+            if row is None or expired:
+                self.misses += 1
+                if expired:
+                    self._conn.execute("DELETE FROM llm_response_cache WHERE cache_key = ?", (key,))
+                if self.mode == "replay":
+                    raise LLMCacheMiss(f"No recorded response for {schema.__name__} (key={key[:12]})")
+                return None
+
+            self._conn.execute(
+                "UPDATE llm_response_cache SET last_access = ? WHERE cache_key = ?", (now, key)
+            )
+            self.hits += 1
+
+        try:
+            return schema.model_validate_json(row[0])
+        except ValueError as e:
+            logger.warning(f"[LLM_CACHE] Failed to restore cached {schema.__name__}: {e}")
+            return None
+
+    def put(self, key: str, model: str, result: BaseModel):
+        """캐시 저장 (replay 모드에서는 기록하지 않음)"""
+        if self.mode != "readwrite":
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO llm_response_cache
+                    (cache_key, model, schema, response, created_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (key, model, type(result).__name__, result.model_dump_json(), now, now)
+            )
+            self._writes_since_evict += 1
+            if self._writes_since_evict >= self._evict_interval:
+                self._evict()
+
+    def _evict(self):
+        """만료 엔트리 삭제 및 최대 크기 초과분 제거 (lock 안에서 호출)"""
+        self._writes_since_evict = 0
+        if self.ttl_seconds > 0:
+            self._conn.execute(
+                "DELETE FROM llm_response_cache WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            )
+        count = self._conn.execute("SELECT COUNT(*) FROM llm_response_cache").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                """
+                DELETE FROM llm_response_cache WHERE cache_key IN (
+                    SELECT cache_key FROM llm_response_cache ORDER BY last_access ASC LIMIT ?
+                )
+                """,
+                (overflow,)
+            )
+            logger.info(f"[LLM_CACHE] Evicted {overflow} least recently used entries")
+
+    def clear(self):
+        """전체 캐시 삭제"""
+        if self._conn is not None:
+            with self._lock:
+                self._conn.execute("DELETE FROM llm_response_cache")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 통계"""
+        total = self.hits + self.misses
+        entries = 0
+        if self._conn is not None:
+            with self._lock:
+                entries = self._conn.execute("SELECT COUNT(*) FROM llm_response_cache").fetchone()[0]
+        return {
+            "mode": self.mode,
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
@@ -0,0 +1,554 @@
+"""
+LLM Gateway
+모든 노드가 공유하는 LLM 호출 게이트웨이
+
+- 모델별 동시 호출 수 제한 + 분당 토큰(TPM) 제한
+- exponential backoff + jitter 재시도 (429/5xx/timeout, Retry-After 존중)
+- 선택적 hedged request (지연 꼬리 감소용 중복 요청)
+- 스키마별 structured-output runnable 캐싱
+- 호출별 지연시간/토큰 메트릭
+"""
+
+import os
+import time
+import random
+import logging
+import threading
+import contextvars
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type
+from langchain_openai import ChatOpenAI
+from pydantic import BaseModel
+from dotenv import load_dotenv
+from workflow.llm_cache import LLMResponseCache
+
+load_dotenv()
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+# 재시도 대상 HTTP 상태 코드
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+# 재시도 대상 에러 메시지 (상태 코드가 없는 경우)
+RETRYABLE_ERROR_PHRASES = (
+    "rate limit",
+    "server had an error",
+    "internal server error",
+    "service unavailable",
+    "timeout",
+    "timed out",
+    "connection error",
+    "temporarily unavailable",
+    "overloaded",
+)
+
+
+def estimate_tokens(messages: Any) -> int:
+    """
+    프롬프트 토큰 수 대략 추정 (rate limiter 예약용)
+
+    Args:
+        messages: 메시지 리스트, 문자열 또는 dict 입력
+
+    Returns:
+        추정 토큰 수
+    """
+    if isinstance(messages, str):
+        return len(messages) // 3 + 1
+    if isinstance(messages, dict):
+        return sum(len(str(v)) for v in messages.values()) // 3 + 1
+    total = 0
+    for msg in messages or []:
+        content = getattr(msg, "content", msg)
+        total += len(str(content)) // 3 + 4
+    return total + 1
+
+
+class ModelRateLimiter:
+    """모델 단위 동시성 + 토큰 버킷 제한"""
+
+    def __init__(self, max_concurrency: int, tokens_per_minute: int):
+        """
+        초기화
+
+        Args:
+            max_concurrency: 동시 호출 최대 수
+            tokens_per_minute: 분당 토큰 한도 (0이면 비활성화)
+        """
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self.tokens_per_minute = tokens_per_minute
+        self._capacity = float(tokens_per_minute)
+        self._available = float(tokens_per_minute)
+        self._refill_per_sec = tokens_per_minute / 60.0
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._available = min(self._capacity, self._available + (now - self._last_refill) * self._refill_per_sec)
+        self._last_refill = now
+
+    def _reserve_tokens(self, tokens: int) -> float:
+        """토큰 예약 (대기 시간 반환, 0이면 예약 성공)"""
+        if not self.tokens_per_minute:
+            return 0.0
+        with self._lock:
+            self._refill()
+            # 버킷보다 큰 요청은 버킷이 가득 찼을 때 통과시킨다
+            needed = min(float(tokens), self._capacity)
+            if self._available >= needed:
+                self._available -= needed
+                return 0.0
+            return (needed - self._available) / self._refill_per_sec
+
+    def settle(self, reserved: int, actual: int):
+        """실제 사용량으로 예약 토큰 보정"""
+        if not self.tokens_per_minute or actual <= 0:
+            return
+        with self._lock:
+            self._refill()
+            self._available = min(self._capacity, self._available + reserved - actual)
+
+    @contextmanager
+    def acquire(self, tokens: int):
+        """동시성 슬롯과 토큰 예약 획득"""
+        while True:
+            wait_time = self._reserve_tokens(tokens)
+            if wait_time <= 0:
+                break
+            time.sleep(min(wait_time, 1.0))
+        with self._semaphore:
+            yield
+
+
+class LLMGateway:
+    """노드 공용 LLM 게이트웨이"""
+
+    def __init__(
+        self,
+        default_model: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        backoff_base: Optional[float] = None,
+        backoff_max: Optional[float] = None,
+        hedge_after_ms: Optional[int] = None
+    ):
+        """
+        초기화 (인자가 없으면 환경변수 사용)
+
+        Args:
+            default_model: 기본 모델명
+            max_concurrency: 모델별 동시 호출 수 (LLM_MAX_CONCURRENCY)
+            tokens_per_minute: 모델별 분당 토큰 한도 (LLM_TOKENS_PER_MINUTE, 0=무제한)
+            max_retries: 최대 재시도 횟수 (LLM_MAX_RETRIES)
+            backoff_base: backoff 기본 대기 초 (LLM_BACKOFF_BASE)
+            backoff_max: backoff 최대 대기 초 (LLM_BACKOFF_MAX)
+            hedge_after_ms: 이 시간 안에 응답이 없으면 중복 요청 (LLM_HEDGE_AFTER_MS, 0=비활성화)
+        """
+        self.default_model = default_model or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+        self.max_concurrency = max_concurrency or int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+        self.tokens_per_minute = tokens_per_minute if tokens_per_minute is not None else int(
+            os.getenv("LLM_TOKENS_PER_MINUTE", "0")
+        )
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("LLM_MAX_RETRIES", "3"))
+        self.backoff_base = backoff_base if backoff_base is not None else float(os.getenv("LLM_BACKOFF_BASE", "1.0"))
+        self.backoff_max = backoff_max if backoff_max is not None else float(os.getenv("LLM_BACKOFF_MAX", "30"))
+        self.hedge_after_ms = hedge_after_ms if hedge_after_ms is not None else int(
+            os.getenv("LLM_HEDGE_AFTER_MS", "0")
+        )
+
+        self._lock = threading.Lock()
+        self._limiters: Dict[str, ModelRateLimiter] = {}
+        self._chat_models: Dict[Tuple, ChatOpenAI] = {}
+        self._structured: Dict[Tuple, Any] = {}
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        self._response_cache: Optional[LLMResponseCache] = None
+
+        # 메트릭 (node 단위)
+        self._metrics: Dict[str, Dict[str, Any]] = defaultdict(lambda: {
+            "calls": 0,
+            "errors": 0,
+            "retries": 0,
+            "hedges": 0,
+            "hedge_wins": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "latencies_ms": deque(maxlen=1000)
+        })
+
+    # ------------------------------------------------------------------
+    # Runnable 생성 / 캐싱
+    # ------------------------------------------------------------------
+
+    def chat_model(self, temperature: float = 0.0, model: Optional[str] = None, **kwargs) -> ChatOpenAI:
+        """
+        ChatOpenAI 인스턴스 (모델/temperature/옵션 조합별 캐싱)
+
+        재시도는 게이트웨이가 담당하므로 클라이언트 자체 재시도는 끈다.
+        """
+        model = model or self.default_model
+        key = (model, temperature, tuple(sorted(kwargs.items())))
+        with self._lock:
+            llm = self._chat_models.get(key)
+            if llm is None:
+                llm = ChatOpenAI(
+                    model=model,
+                    temperature=temperature,
+                    openai_api_key=os.getenv("OPENAI_API_KEY"),
+                    max_retries=0,
+                    **kwargs
+                )
+                self._chat_models[key] = llm
+        return llm
+
+    def structured(
+        self,
+        schema: Type[BaseModel],
+        temperature: float = 0.0,
+        model: Optional[str] = None,
+        method: Optional[str] = None
+    ):
+        """
+        스키마별 structured-output runnable (캐싱, include_raw로 토큰 사용량 수집)
+        """
+        model = model or self.default_model
+        key = (schema, model, temperature, method)
+        with self._lock:
+            runnable = self._structured.get(key)
+        if runnable is None:
+            llm = self.chat_model(temperature=temperature, model=model)
+            kwargs = {"include_raw": True}
+            if method:
+                kwargs["method"] = method
+            runnable = llm.with_structured_output(schema, **kwargs)
+            with self._lock:
+                self._structured[key] = runnable
+        return runnable
+
+    def limiter(self, model: Optional[str] = None) -> ModelRateLimiter:
+        """모델별 rate limiter"""
+        model = model or self.default_model
+        with self._lock:
+            limiter = self._limiters.get(model)
+            if limiter is None:
+                limiter = ModelRateLimiter(self.max_concurrency, self.tokens_per_minute)
+                self._limiters[model] = limiter
+        return limiter
+
+    # ------------------------------------------------------------------
+    # 호출
+    # ------------------------------------------------------------------
+
+    def invoke_structured(
+        self,
+        schema: Type[BaseModel],
+        messages: Any,
+        temperature: float = 0.0,
+        node: str = "LLM",
+        model: Optional[str] = None,
+        method: Optional[str] = None,
+        hedge: Optional[bool] = None
+    ) -> BaseModel:
+        """
+        structured-output 호출
+
+        Args:
+            schema: 출력 Pydantic 스키마
+            messages: 프롬프트 메시지
+            temperature: temperature
+            node: 메트릭/로그용 노드 이름
+            model: 모델명 (기본: OPENAI_MODEL)
+            method: with_structured_output method (예: "function_calling")
+            hedge: hedged request 사용 여부 (None이면 게이트웨이 설정)
+
+        Returns:
+            schema 인스턴스
+        """
+        runnable = self.structured(schema, temperature=temperature, model=model, method=method)
+        result = self.invoke(runnable, messages, node=node, model=model, hedge=hedge)
+        if isinstance(result, dict) and "parsed" in result:
+            if result.get("parsing_error") is not None:
+                raise result["parsing_error"]
+            if result.get("parsed") is None:
+                raise ValueError(f"Structured output parsing returned no result for {schema.__name__}")
+            return result["parsed"]
+        return result
+
+    @property
+    def response_cache(self) -> LLMResponseCache:
+        """temperature=0 호출용 영속 응답 캐시 (지연 생성)"""
+        if self._response_cache is None:
+            with self._lock:
+                if self._response_cache is None:
+                    self._response_cache = LLMResponseCache()
+        return self._response_cache
+
+    def invoke_structured_cached(
+        self,
+        schema: Type[BaseModel],
+        prompt: Any,
+        inputs: Dict[str, Any],
+        temperature: float = 0.0,
+        node: str = "LLM",
+        model: Optional[str] = None,
+        method: Optional[str] = None,
+        hedge: Optional[bool] = None
+    ) -> BaseModel:
+        """
+        결정적(temperature=0) structured-output 호출 - 영속 캐시 사용
+
+        캐시 키는 모델, 프롬프트 템플릿, 렌더링 입력, 출력 스키마로 구성된다.
+        temperature가 0이 아니면 캐시 없이 바로 호출한다.
+
+        Args:
+            schema: 출력 Pydantic 스키마
+            prompt: ChatPromptTemplate (format_messages 지원) 또는 문자열 프롬프트
+            inputs: 템플릿 입력 값
+            temperature: temperature
+            node: 메트릭/로그용 노드 이름
+            model: 모델명
+            method: with_structured_output method
+            hedge: hedged request 사용 여부
+
+        Returns:
+            schema 인스턴스
+        """
+        messages = prompt if isinstance(prompt, str) else prompt.format_messages(**inputs)
+        cache = self.response_cache
+        if temperature != 0 or not cache.enabled:
+            return self.invoke_structured(
+                schema, messages, temperature=temperature, node=node, model=model, method=method, hedge=hedge
+            )
+
+        model = model or self.default_model
+        key = cache.make_key(model, prompt, inputs, schema, method)
+        cached = cache.get(key, schema)
+        if cached is not None:
+            with self._lock:
+                stats = self._metrics[node]
+                stats["cache_hits"] = stats.get("cache_hits", 0) + 1
+            logger.debug(f"[LLM_GATEWAY] {node} cache hit ({schema.__name__})")
+            return cached
+
+        result = self.invoke_structured(
+            schema, messages, temperature=temperature, node=node, model=model, method=method, hedge=hedge
+        )
+        cache.put(key, model, result)
+        return result
+
+    def invoke(
+        self,
+        runnable: Any,
+        messages: Any,
+        node: str = "LLM",
+        model: Optional[str] = None,
+        hedge: Optional[bool] = None
+    ) -> Any:
+        """
+        rate limit + 재시도 + (선택적) hedging을 적용한 호출
+
+        Args:
+            runnable: invoke()를 가진 LLM/Runnable
+            messages: 입력
+            node: 메트릭/로그용 노드 이름
+            model: rate limit 단위 모델명
+            hedge: hedged request 사용 여부
+
+        Returns:
+            runnable.invoke 결과
+        """
+        model = model or getattr(runnable, "model_name", None) or self.default_model
+        use_hedge = self.hedge_after_ms > 0 if hedge is None else (hedge and self.hedge_after_ms > 0)
+
+        for attempt in range(self.max_retries + 1):
+            start = time.perf_counter()
+            try:
+                if use_hedge:
+                    result = self._invoke_hedged(runnable, messages, model, node)
+                else:
+                    result = self._invoke_once(runnable, messages, model)
+                latency_ms = (time.perf_counter() - start) * 1000
+                self._record_success(node, result, latency_ms)
+                return result
+
+            except Exception as e:
+                retryable = self._is_retryable(e)
+                if attempt == self.max_retries or not retryable:
+                    with self._lock:
+                        self._metrics[node]["errors"] += 1
+                    if retryable:
+                        logger.error(f"[LLM_GATEWAY] {node} failed after {attempt + 1} attempts: {str(e)}")
+                    else:
+                        logger.error(f"[LLM_GATEWAY] {node} non-retryable error: {str(e)}")
+                    raise
+
+                wait_time = self._backoff(attempt, e)
+                with self._lock:
+                    self._metrics[node]["retries"] += 1
+                logger.warning(
+                    f"[LLM_GATEWAY] {node} retryable error (attempt {attempt + 1}/{self.max_retries + 1}): "
+                    f"{str(e)[:200]} - retrying in {wait_time:.2f}s"
+                )
+                time.sleep(wait_time)
+
+    def stream(self, runnable: Any, messages: Any, node: str = "LLM", model: Optional[str] = None) -> Iterator[Any]:
+        """
+        스트리밍 호출 (rate limit 적용, 토큰이 나간 뒤에는 재시도하지 않음)
+        """
+        model = model or self.default_model
+        limiter = self.limiter(model)
+        reserved = estimate_tokens(messages)
+        start = time.perf_counter()
+        last_chunk = None
+        try:
+            with limiter.acquire(reserved):
+                for chunk in runnable.stream(messages):
+                    last_chunk = chunk
+                    yield chunk
+        except Exception:
+            with self._lock:
+                self._metrics[node]["errors"] += 1
+            raise
+        self._record_success(node, last_chunk, (time.perf_counter() - start) * 1000)
+
+    def _invoke_once(self, runnable: Any, messages: Any, model: str) -> Any:
+        """rate limiter 안에서 단일 호출"""
+        limiter = self.limiter(model)
+        reserved = estimate_tokens(messages)
+        with limiter.acquire(reserved):
+            result = runnable.invoke(messages)
+        usage = self._usage(result)
+        if usage:
+            limiter.settle(reserved, usage[0] + usage[1])
+        return result
+
+    def _invoke_hedged(self, runnable: Any, messages: Any, model: str, node: str) -> Any:
+        """
+        hedged request: hedge_after_ms 안에 응답이 없으면 동일 요청을 한 번 더 보내고
+        먼저 성공한 결과 사용 (늦은 요청은 결과만 버림)
+        """
+        executor = self._get_hedge_executor()
+        # LangGraph/LangChain 콜백 컨텍스트 유지를 위해 contextvars 복사
+        primary = executor.submit(contextvars.copy_context().run, self._invoke_once, runnable, messages, model)
+        done, _ = wait([primary], timeout=self.hedge_after_ms / 1000.0)
+        if done:
+            return primary.result()
+
+        with self._lock:
+            self._metrics[node]["hedges"] += 1
+        logger.info(f"[LLM_GATEWAY] {node} no response after {self.hedge_after_ms}ms - sending hedged request")
+        secondary = executor.submit(contextvars.copy_context().run, self._invoke_once, runnable, messages, model)
+
+        pending = {primary, secondary}
+        last_error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is secondary:
+                        with self._lock:
+                            self._metrics[node]["hedge_wins"] += 1
+                    return future.result()
+                last_error = future.exception()
+        raise last_error
+
+    def _get_hedge_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency * 2,
+                    thread_name_prefix="llm-hedge"
+                )
+        return self._hedge_executor
+
+    # ------------------------------------------------------------------
+    # 재시도 / 메트릭 헬퍼
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        """재시도 가능한 에러인지 확인 (429, 5xx, timeout, 연결 에러)"""
+        status = getattr(error, "status_code", None)
+        if status is None:
+            response = getattr(error, "response", None)
+            status = getattr(response, "status_code", None)
+        if status is not None:
+            return status in RETRYABLE_STATUS_CODES
+        error_msg = f"{type(error).__name__} {error}".lower()
+        return any(phrase in error_msg for phrase in RETRYABLE_ERROR_PHRASES)
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        """대기 시간 계산 (Retry-After 헤더 우선, 없으면 exponential + full jitter)"""
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None) or {}
+        retry_after = headers.get("retry-after") if hasattr(headers, "get") else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max) + random.uniform(0, 0.5)
+            except ValueError:
+                pass
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+    @staticmethod
+    def _usage(result: Any) -> Optional[Tuple[int, int]]:
+        """결과에서 (prompt_tokens, completion_tokens) 추출"""
+        message = result.get("raw") if isinstance(result, dict) else result
+        usage = getattr(message, "usage_metadata", None)
+        if not isinstance(usage, dict):
+            return None
+        return usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+
+    def _record_success(self, node: str, result: Any, latency_ms: float):
+        usage = self._usage(result)
+        with self._lock:
+            stats = self._metrics[node]
+            stats["calls"] += 1
+            stats["latencies_ms"].append(latency_ms)
+            if usage:
+                stats["prompt_tokens"] += usage[0]
+                stats["completion_tokens"] += usage[1]
+        logger.debug(
+            f"[LLM_GATEWAY] {node} call completed in {latency_ms:.0f}ms"
+            + (f" (tokens in/out: {usage[0]}/{usage[1]})" if usage else "")
+        )
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        노드별 호출 메트릭 조회
+
+        Returns:
+            {node: {calls, errors, retries, hedges, hedge_wins, prompt_tokens,
+                    completion_tokens, avg_ms, p50_ms, p95_ms}}
+        """
+        with self._lock:
+            snapshot = {node: dict(stats, latencies_ms=list(stats["latencies_ms"]))
+                        for node, stats in self._metrics.items()}
+
+        metrics = {}
+        for node, stats in snapshot.items():
+            latencies: List[float] = sorted(stats.pop("latencies_ms"))
+            if latencies:
+                stats["avg_ms"] = sum(latencies) / len(latencies)
+                stats["p50_ms"] = latencies[len(latencies) // 2]
+                stats["p95_ms"] = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            metrics[node] = stats
+        return metrics
+
+
+_gateway: Optional[LLMGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_llm_gateway() -> LLMGateway:
+    """프로세스 공용 LLMGateway 싱글톤"""
+    global _gateway
+    if _gateway is None:
+        with _gateway_lock:
+            if _gateway is None:
+                _gateway = LLMGateway()
+    return _gateway
@@ -6,7 +6,7 @@ Answer Grader Node (CRAG)
 import os
 import logging
 from typing import Dict, Any, List
-from langchain_openai import ChatOpenAI
+from workflow.llm_gateway import get_llm_gateway
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.documents import Document
 from langchain_core.messages import AIMessage
@@ -40,12 +40,9 @@ class AnswerGraderNode:
     
     def __init__(self):
         """초기화"""
-        # ChatOpenAI 인스턴스 직접 생성
-        self.llm = ChatOpenAI(
-            model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
-            temperature=0,  # 일관된 평가를 위해 temperature 0
-            openai_api_key=os.getenv("OPENAI_API_KEY")
-        )
+        # 공용 LLM 게이트웨이 (rate limit / 재시도 / 메트릭)
+        self.gateway = get_llm_gateway()
+        self.llm = self.gateway.chat_model(temperature=0)  # 일관된 평가를 위해 temperature 0
         
         # 답변 평가 임계값 (.env에서 읽기)
         self.threshold = float(os.getenv("CRAG_ANSWER_GRADE_THRESHOLD", "0.6"))
@@ -231,16 +228,15 @@ Identify strengths, weaknesses, and specific improvements needed.""")
             documents_summary = self._summarize_documents(documents)
             
             # LLM을 사용한 답변 평가
-            structured_llm = self.llm.with_structured_output(
-                AnswerGradeResult
-            )
-            
-            grade_result = structured_llm.invoke(
+            grade_result = self.gateway.invoke_structured(
+                AnswerGradeResult,
                 self.grading_prompt.format_messages(
                     query=query,
                     answer=answer_to_grade,
                     documents_summary=documents_summary
-                )
+                ),
+                temperature=0,
+                node="ANSWER_GRADER"
             )
             
             # 전체 점수 계산 (가중 평균)
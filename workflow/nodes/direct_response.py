@@ -11,7 +11,7 @@ from typing import Dict, Any, List, Optional
 from pydantic import BaseModel, Field
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
 from langchain_core.documents import Document
-from langchain_openai import ChatOpenAI
+from workflow.llm_gateway import get_llm_gateway
 from dotenv import load_dotenv
 from workflow.nodes.subtask_executor import MetadataHelper
 
@@ -49,12 +49,9 @@ class DirectResponseNode:
     
     def __init__(self):
         """초기화"""
-        # ChatOpenAI 인스턴스 직접 생성
-        self.llm = ChatOpenAI(
-            model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
-            temperature=0.7,  # 자연스러운 대화를 위해 약간 높임
-            openai_api_key=os.getenv("OPENAI_API_KEY")
-        )
+        # 공용 LLM 게이트웨이 (rate limit / 재시도 / 메트릭)
+        self.gateway = get_llm_gateway()
+        self.llm = self.gateway.chat_model(temperature=0.7)  # 자연스러운 대화를 위해 약간 높임
         
         # MetadataHelper 추가 (DB 정보 조회용)
         self.metadata_helper = MetadataHelper()
@@ -182,8 +179,6 @@ Content: {content}
             full_search_text = "\n".join(search_texts)
             
             # LLM에게 구조화된 분석 요청
-            analyzer_llm = self.llm.with_structured_output(SearchResultAnalysis)
-            
             analysis_prompt = f"""Analyze these web search results for the query: "{query}"
 
 Search Results:
@@ -202,7 +197,9 @@ Analyze the search results and provide:
 Provide detailed reasoning for your decision."""
             
             logger.info(f"[DIRECT_RESPONSE] Analyzing search results with LLM")
-            analysis = analyzer_llm.invoke(analysis_prompt)
+            analysis = self.gateway.invoke_structured(
+                SearchResultAnalysis, analysis_prompt, temperature=0.7, node="DIRECT_RESPONSE"
+            )
             
             logger.info(f"[DIRECT_RESPONSE] Analysis complete - Time sensitive: {analysis.is_time_sensitive}, Override: {analysis.should_override_base_knowledge}")
             return analysis
@@ -294,7 +291,7 @@ Provide detailed reasoning for your decision."""
             logger.info(f"[DIRECT_RESPONSE] Invoking LLM with{'out' if not self.web_search_enabled else ''} web search capability")
             
             # LLM 호출하여 응답 생성
-            response = llm_to_use.invoke(conversation_messages)
+            response = self.gateway.invoke(llm_to_use, conversation_messages, node="DIRECT_RESPONSE")
             
             # Tool call 확인
             has_tool_calls = hasattr(response, 'tool_calls') and response.tool_calls
@@ -390,7 +387,9 @@ Remember to respond in the same language as the query."""
                                     ))
                                 
                                 # 최종 응답 생성 (CoT 기반)
-                                final_response = self.llm.invoke(conversation_messages)
+                                final_response = self.gateway.invoke(
+                                    self.llm, conversation_messages, node="DIRECT_RESPONSE"
+                                )
                             else:
                                 logger.warning(f"[DIRECT_RESPONSE] No web search results found")
                                 final_response = response
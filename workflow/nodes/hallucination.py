@@ -6,7 +6,7 @@ Hallucination Check Node (CRAG)
 import os
 import logging
 from typing import Dict, Any, List
-from langchain_openai import ChatOpenAI
+from workflow.llm_gateway import get_llm_gateway
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.documents import Document
 from langchain_core.messages import AIMessage
@@ -36,12 +36,9 @@ class HallucinationCheckNode:
     
     def __init__(self):
         """초기화"""
-        # ChatOpenAI 인스턴스 직접 생성
-        self.llm = ChatOpenAI(
-            model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
-            temperature=0,  # 일관된 평가를 위해 temperature 0
-            openai_api_key=os.getenv("OPENAI_API_KEY")
-        )
+        # 공용 LLM 게이트웨이 (rate limit / 재시도 / 메트릭)
+        self.gateway = get_llm_gateway()
+        self.llm = self.gateway.chat_model(temperature=0)  # 일관된 평가를 위해 temperature 0
         
         # 환각 체크 임계값 (.env에서 읽기)
         self.threshold = float(os.getenv("CRAG_HALLUCINATION_THRESHOLD", "0.7"))
@@ -323,16 +320,15 @@ Document {idx}:
             formatted_docs = self._format_documents_for_checking(documents)
             
             # LLM을 사용한 환각 체크
-            structured_llm = self.llm.with_structured_output(
-                HallucinationCheckResult
-            )
-            
-            check_result = structured_llm.invoke(
+            check_result = self.gateway.invoke_structured(
+                HallucinationCheckResult,
                 self.hallucination_check_prompt.format_messages(
                     query=query,
                     answer=answer_to_check,
                     documents=formatted_docs
-                )
+                ),
+                temperature=0,
+                node="HALLUCINATION"
             )
             
             # 재시도 필요 여부 결정
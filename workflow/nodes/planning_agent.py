@@ -6,7 +6,7 @@ Planning Agent Node
 import os
 import logging
 from typing import Dict, Any, List
-from langchain_openai import ChatOpenAI
+from workflow.llm_gateway import get_llm_gateway
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import AIMessage
 from pydantic import BaseModel, Field
@@ -41,12 +41,9 @@ class PlanningAgentNode:
     
     def __init__(self):
         """초기화"""
-        # ChatOpenAI 인스턴스 직접 생성
-        self.llm = ChatOpenAI(
-            model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
-            temperature=0,
-            openai_api_key=os.getenv("OPENAI_API_KEY")
-        )
+        # 공용 LLM 게이트웨이 (rate limit / 재시도 / 메트릭)
+        self.gateway = get_llm_gateway()
+        self.llm = self.gateway.chat_model(temperature=0)
         
         # 최대 서브태스크 수를 환경변수에서 읽기
         self.max_subtasks = int(os.getenv("LANGGRAPH_PLANNING_MAX_SUBTASKS", "5"))
@@ -132,21 +129,16 @@ Create an execution plan with subtasks.""")
             # LLM을 사용하여 쿼리 분석 및 서브태스크 생성 (structured output 사용)
             logger.debug(f"[PLANNING] Creating structured LLM with max_subtasks={self.max_subtasks}")
             try:
-                structured_llm = self.llm.with_structured_output(
-                    ExecutionPlan
-                )
-                
                 logger.info(f"[PLANNING] Generating execution plan...")
-                formatted_messages = self.planning_prompt.format_messages(
-                    query=query,
-                    max_subtasks=self.max_subtasks
-                )
+                planning_inputs = {"query": query, "max_subtasks": self.max_subtasks}
                 
                 # 디버깅: 프롬프트 내용 로깅
                 logger.debug(f"[PLANNING] Input query: '{query}'")
-                logger.debug(f"[PLANNING] Formatted prompt (last 500 chars): ...{str(formatted_messages)[-500:]}")
                 
-                plan = structured_llm.invoke(formatted_messages)
+                # 반복 질문은 영속 캐시에서 동일한 계획 재사용 (temperature=0)
+                plan = self.gateway.invoke_structured_cached(
+                    ExecutionPlan, self.planning_prompt, planning_inputs, temperature=0, node="PLANNING"
+                )
             except Exception as e:
                 logger.error(f"[PLANNING] Failed to generate execution plan: {e}")
                 raise ValueError(f"Planning failed: {e}")
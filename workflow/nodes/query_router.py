@@ -7,7 +7,7 @@ import os
 import logging
 from typing import Dict, Any, List, Optional
 from langchain_core.messages import AIMessage, HumanMessage
-from langchain_openai import ChatOpenAI
+from workflow.llm_gateway import get_llm_gateway
 from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel, Field
 from typing import Literal
@@ -37,12 +37,9 @@ class QueryRouterNode:
     
     def __init__(self):
         """초기화"""
-        # ChatOpenAI 인스턴스 직접 생성
-        self.llm = ChatOpenAI(
-            model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
-            temperature=0,
-            openai_api_key=os.getenv("OPENAI_API_KEY")
-        )
+        # 공용 LLM 게이트웨이 (rate limit / 재시도 / 메트릭)
+        self.gateway = get_llm_gateway()
+        self.llm = self.gateway.chat_model(temperature=0)
         
         # DB 연결 설정
         self.connection_string = (
@@ -290,16 +287,17 @@ Classify this query.""")
             
             # LLM으로 분류 (structured output 사용)
             try:
-                structured_llm = self.llm.with_structured_output(
-                    QueryClassification
-                )
-                classification = structured_llm.invoke(
-                    self.classification_prompt.format_messages(
-                        query=query,
-                        recent_messages=recent_context,
-                        rag_examples=", ".join(self.rag_examples) if self.rag_examples else "차량 관련 정보",
-                        document_topics=", ".join(self.document_topics[:5]) if self.document_topics else "차량 매뉴얼 정보"
-                    )
+                classification = self.gateway.invoke_structured_cached(
+                    QueryClassification,
+                    self.classification_prompt,
+                    {
+                        "query": query,
+                        "recent_messages": recent_context,
+                        "rag_examples": ", ".join(self.rag_examples) if self.rag_examples else "차량 관련 정보",
+                        "document_topics": ", ".join(self.document_topics[:5]) if self.document_topics else "차량 매뉴얼 정보"
+                    },
+                    temperature=0,
+                    node="QUERY_ROUTER"
                 )
             except Exception as e:
                 logger.error(f"[QUERY_ROUTER] Failed to classify query: {e}")
@@ -6,11 +6,12 @@ Phase 1의 하이브리드 검색 시스템과 연동하여 문서를 검색하
 
 import os
 import logging
+import threading
 from typing import Dict, Any, List, Optional
 from concurrent.futures import ThreadPoolExecutor
 from langchain_core.documents import Document
 from langchain_core.messages import AIMessage
-from langchain_openai import ChatOpenAI
+from workflow.llm_gateway import get_llm_gateway
 from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
@@ -21,12 +22,21 @@ from workflow.state import MVPWorkflowState, SearchResult
 from ingest.database import DatabaseManager
 from retrieval.hybrid_search import HybridSearch
 from retrieval.search_filter import MVPSearchFilter
+from retrieval.fusion import rrf_fuse
+from retrieval.records import SearchRecord
+from retrieval.tracing import log_detail, request_trace, submit_in_context
 
 load_dotenv()
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
 
+# Entity가 있을 수 있는 모든 카테고리 (image/table + 똑딱이가 있는 text 카테고리)
+ENTITY_CATEGORIES = ["figure", "table", "paragraph", "heading1", "heading2", "heading3"]
+
+# 필터가 어떤 문서와도 일치하지 않을 때 제거하는 순서 (구체적인 조건부터, source는 마지막)
+FILTER_RELAX_ORDER = ["pages", "caption", "entity", "categories", "sources"]
+
 
 class LanguageDetection(BaseModel):
     """언어 감지 결과"""
@@ -53,13 +63,14 @@ class RetrievalNode:
         self.db_manager = None
         self.hybrid_search = None
         self.initialized = False
+        self._init_lock = threading.Lock()
         
-        # LLM for language detection
-        self.llm = ChatOpenAI(
-            model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
-            temperature=0,
-            openai_api_key=os.getenv("OPENAI_API_KEY")
-        )
+        # 선행 검색 (graph에서 ENABLE_SPECULATIVE_RETRIEVAL일 때 설정)
+        self.speculative = None
+        
+        # LLM for language detection / rerank (공용 게이트웨이)
+        self.gateway = get_llm_gateway()
+        self.llm = self.gateway.chat_model(temperature=0)
         
         # 언어 감지 프롬프트
         self.language_detection_prompt = ChatPromptTemplate.from_messages([
@@ -82,15 +93,25 @@ Examples:
         # 환경변수에서 설정 읽기
         self.default_top_k = int(os.getenv("SEARCH_DEFAULT_TOP_K", "10"))
         self.max_results = int(os.getenv("SEARCH_MAX_RESULTS", "20"))
+        # Entity 필터 검색 방식: boost (일반 검색 1회 + entity 조건 우선 배치) | dual (entity/일반 검색 2회)
+        self.entity_search_mode = os.getenv("RETRIEVAL_ENTITY_SEARCH", "boost").lower()
+        # 검색 전 필터 일치 여부 확인 (일치 문서가 없으면 fan-out 전에 필터 완화)
+        self.filter_preflight = os.getenv("RETRIEVAL_FILTER_PREFLIGHT", "true").lower() == "true"
+        # 변형 간 RRF 융합 후 LLM 단계로 넘길 최대 문서 수 (0이면 제한 없음)
+        self.fusion_budget = int(os.getenv("RETRIEVAL_FUSION_BUDGET", str(self.max_results)))
+        self.fusion_k = int(os.getenv("SEARCH_RRF_K", "60"))
         
     
     def _initialize(self):
-        """동기 초기화 (한 번만 실행)"""
-        if not self.initialized:
-            self.db_manager = DatabaseManager()
-            self.db_manager.initialize()
-            self.hybrid_search = HybridSearch(self.db_manager.pool)
-            self.initialized = True
+        """동기 초기화 (한 번만 실행, 선행 검색 스레드와 동시 호출 가능)"""
+        if self.initialized:
+            return
+        with self._init_lock:
+            if not self.initialized:
+                self.db_manager = DatabaseManager()
+                self.db_manager.initialize()
+                self.hybrid_search = HybridSearch(self.db_manager.pool)
+                self.initialized = True
     
     def _detect_language(self, query: str) -> LanguageDetection:
         """
@@ -102,12 +123,12 @@ Examples:
         Returns:
             언어 감지 결과
         """
-        structured_llm = self.llm.with_structured_output(
-            LanguageDetection
-        )
-        
-        result = structured_llm.invoke(
-            self.language_detection_prompt.format_messages(query=query)
+        result = self.gateway.invoke_structured_cached(
+            LanguageDetection,
+            self.language_detection_prompt,
+            {"query": query},
+            temperature=0,
+            node="LANGUAGE_DETECTION"
         )
         
         return result
@@ -118,7 +139,7 @@ Examples:
         filter_dict: Optional[Dict],
         language: str = 'korean',
         top_k: int = 10
-    ) -> List[Document]:
+    ) -> List[SearchRecord]:
         """
         이중 검색 전략 실행
         
@@ -127,6 +148,9 @@ Examples:
         3. Entity 필터가 있으면 image/table만 추가 검색
         4. 결과 병합 (중복 제거)
         
+        RETRIEVAL_ENTITY_SEARCH=boost(기본)이면 일반 필터 검색 1회에 entity 조건을 boost 필터로 전달해
+        같은 SQL에서 entity 일치 문서를 앞에 배치 (순서는 dual과 동일, 임베딩/SQL 호출은 절반)
+        
         Args:
             query: 검색 쿼리
             filter_dict: 필터 딕셔너리
@@ -134,30 +158,36 @@ Examples:
             top_k: 반환할 문서 수
             
         Returns:
-            검색된 문서들
+            검색 결과 레코드 (Document 변환은 융합/예산 적용 후 최종 문서에만)
         """
-        all_documents = []
+        all_results = []
         seen_ids = set()
         
         # Entity 필터 분리 (원본 dict 변조 방지)
-        entity_filter = None
-        general_filter_dict = {}
-        
-        if filter_dict:
-            entity_filter = filter_dict.get("entity", None)  # pop() 대신 get() 사용 (원본 보존)
-            # entity를 제외한 나머지 필터만 복사
-            general_filter_dict = {k: v for k, v in filter_dict.items() if k != "entity"}
+        general_filter_dict, entity_filter_dict = self._split_filter(filter_dict)
         
         # Entity 필터가 있으면 entity 검색을 우선적으로 수행
-        if entity_filter:
+        if entity_filter_dict:
             # 1. Entity 필터로 먼저 검색 (우선순위 높음)
-            entity_filter_dict = general_filter_dict.copy()
-            entity_filter_dict["entity"] = entity_filter
-            # Entity가 있을 수 있는 모든 카테고리 포함 (image/table + 똑딱이가 있는 text 카테고리)
-            entity_filter_dict["categories"] = ["figure", "table", "paragraph", "heading1", "heading2", "heading3"]
-            
             entity_search_filter = MVPSearchFilter(**entity_filter_dict)
             
+            if self.entity_search_mode != "dual":
+                # 단일 패스: 일반 필터로 한 번 검색하면서 entity 조건의 상위 결과를 같은 SQL에서 우선 배치
+                general_filter = MVPSearchFilter(**general_filter_dict) if general_filter_dict else MVPSearchFilter()
+                results = self.hybrid_search.search(
+                    query=query,
+                    filter=general_filter,
+                    language=language,
+                    top_k=top_k,
+                    boost_filter=entity_search_filter
+                )
+                for result in results:
+                    doc_id = result.get("id")
+                    if doc_id and doc_id not in seen_ids:
+                        seen_ids.add(doc_id)
+                        all_results.append(result)
+                return all_results[:top_k]
+            
             entity_results = self.hybrid_search.search(
                 query=query,
                 filter=entity_search_filter,
@@ -165,22 +195,23 @@ Examples:
                 top_k=top_k  # 전체 top_k 사용 (우선순위)
             )
             
-            # Entity 검색 결과를 먼저 추가
+            # Entity 검색 결과를 먼저 추가 (융합 시 우선 배치되도록 boosted 표시)
             for result in entity_results:
                 doc_id = result.get("id")
                 if doc_id and doc_id not in seen_ids:
                     seen_ids.add(doc_id)
-                    all_documents.append(self._convert_to_document(result))
+                    result["boosted"] = True
+                    all_results.append(result)
             
             # 2. 일반 필터로 보충 검색 (Entity 없이) - 부족한 경우에만
-            if len(all_documents) < top_k:
+            if len(all_results) < top_k:
                 general_filter = MVPSearchFilter(**general_filter_dict) if general_filter_dict else MVPSearchFilter()
                 
                 general_results = self.hybrid_search.search(
                     query=query,
                     filter=general_filter,
                     language=language,
-                    top_k=top_k - len(all_documents)  # 부족한 만큼만
+                    top_k=top_k - len(all_results)  # 부족한 만큼만
                 )
                 
                 # 일반 검색 결과 추가 (중복 제거)
@@ -188,7 +219,7 @@ Examples:
                     doc_id = result.get("id")
                     if doc_id and doc_id not in seen_ids:
                         seen_ids.add(doc_id)
-                        all_documents.append(self._convert_to_document(result))
+                        all_results.append(result)
         else:
             # Entity 필터가 없으면 일반 검색만 수행
             general_filter = MVPSearchFilter(**general_filter_dict) if general_filter_dict else MVPSearchFilter()
@@ -200,14 +231,119 @@ Examples:
                 top_k=top_k
             )
             
-            # 결과를 Document로 변환
+            # 결과 추가 (중복 제거)
             for result in general_results:
                 doc_id = result.get("id")
                 if doc_id and doc_id not in seen_ids:
                     seen_ids.add(doc_id)
-                    all_documents.append(self._convert_to_document(result))
+                    all_results.append(result)
+        
+        return all_results[:top_k]  # 최대 top_k개만 반환
+    
+    def _split_filter(self, filter_dict: Optional[Dict]) -> tuple:
+        """
+        필터를 일반 필터와 entity 필터로 분리
+        
+        Returns:
+            (entity를 제외한 일반 필터 dict, entity 필터 dict 또는 None)
+            entity 필터는 일반 필터 + entity + ENTITY_CATEGORIES
+        """
+        if not filter_dict:
+            return {}, None
+        # pop() 대신 컴프리헨션 사용 (원본 보존)
+        general_filter_dict = {k: v for k, v in filter_dict.items() if k != "entity"}
+        entity_filter = filter_dict.get("entity", None)
+        if not entity_filter:
+            return general_filter_dict, None
+        entity_filter_dict = general_filter_dict.copy()
+        entity_filter_dict["entity"] = entity_filter
+        entity_filter_dict["categories"] = list(ENTITY_CATEGORIES)
+        return general_filter_dict, entity_filter_dict
+    
+    def _preflight_filter(self, filter_dict: Optional[Dict]) -> tuple:
+        """
+        검색 전 필터 일치 여부 확인 (fan-out 전에 완화)
+        
+        필터와 일치하는 문서가 없으면 EXISTS 프로브로 원인을 찾아 제거 (필터 인덱스를 타므로
+        임베딩/검색보다 훨씬 저렴):
+        1. 단독으로도 일치하는 문서가 없는 조건 제거 (예: 존재하지 않는 source)
+        2. 조건 조합이 문제면 FILTER_RELAX_ORDER 순서로 하나씩 제거
+        
+        Args:
+            filter_dict: 필터 딕셔너리
+            
+        Returns:
+            (사용할 필터 dict 또는 None, 제거된 필터 키 목록)
+        """
+        if not filter_dict or not self.filter_preflight:
+            return filter_dict, []
+        
+        def has_matches(candidate: Dict) -> bool:
+            general_filter_dict, entity_filter_dict = self._split_filter(candidate)
+            return self.hybrid_search.filter_has_matches(
+                MVPSearchFilter(**general_filter_dict),
+                MVPSearchFilter(**entity_filter_dict) if entity_filter_dict else None
+            )
         
-        return all_documents[:top_k]  # 최대 top_k개만 반환
+        current = {k: v for k, v in filter_dict.items() if v}
+        relaxed = []
+        try:
+            if not current or has_matches(current):
+                return filter_dict, []
+            
+            order = [k for k in FILTER_RELAX_ORDER if k in current] + [k for k in current if k not in FILTER_RELAX_ORDER]
+            for key in order:
+                if len(current) > 1 and not has_matches({key: current[key]}):
+                    current.pop(key)
+                    relaxed.append(key)
+            
+            while current and not has_matches(current):
+                key = next(k for k in order if k in current)
+                current.pop(key)
+                relaxed.append(key)
+        except Exception as e:
+            # 프로브 실패 시 원래 필터 유지 (검색 후 재시도 경로가 안전망)
+            logger.warning(f"[RETRIEVAL] Filter preflight failed, keeping original filter: {str(e)}")
+            return filter_dict, []
+        
+        return (current or None), relaxed
+    
+    def _analyze_variants(self, query_variations: List[str], fallback_language: str) -> List[str]:
+        """
+        쿼리 변형 전체의 언어 감지와 키워드 분석을 fan-out 전에 한 번에 수행
+        
+        언어 감지는 병렬(캐시된 LLM 호출)로, 키워드 추출은 Kiwi 배치 / spaCy pipe로 한 번에 계산해
+        검색 태스크마다 형태소 분석을 반복하지 않도록 함.
+        
+        Args:
+            query_variations: 쿼리 변형 목록
+            fallback_language: 감지 실패 시 사용할 언어 (원본 쿼리 기준)
+            
+        Returns:
+            변형별 감지 언어 목록
+        """
+        def detect(query_variant: str) -> str:
+            try:
+                detection = self._detect_language(query_variant)
+                logger.info(f"[RETRIEVAL] Variant language: {detection.language} (confidence: {detection.confidence:.2f}) for query: '{query_variant[:50]}...'")
+                return detection.language
+            except Exception as e:
+                logger.warning(f"[RETRIEVAL] Language detection failed, using {fallback_language}: {str(e)}")
+                return fallback_language
+        
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [submit_in_context(executor, detect, query_variant) for query_variant in query_variations]
+            languages = [future.result() for future in futures]
+        
+        analyzer = getattr(self.hybrid_search, "query_analyzer", None)
+        if analyzer is not None:
+            try:
+                analyzer.analyze_batch(list(zip(query_variations, languages)))
+                logger.debug(f"[RETRIEVAL] Query analysis warmed for {len(query_variations)} variants: {analyzer.stats}")
+            except Exception as e:
+                # 배치 분석 실패 시 검색 태스크에서 개별 분석
+                logger.warning(f"[RETRIEVAL] Batch query analysis failed: {str(e)}")
+        return languages
     
     def _bilingual_search(
         self,
@@ -215,7 +351,7 @@ Examples:
         filter_dict: Optional[Dict],
         primary_language: str,
         top_k: int = 10
-    ) -> List[Document]:
+    ) -> List[SearchRecord]:
         """
         단일 언어 검색 (감지된 언어로만 검색)
         
@@ -244,12 +380,12 @@ Examples:
         
         return results
     
-    def _convert_to_document(self, result: Dict) -> Document:
+    def _convert_to_document(self, result: SearchRecord) -> Document:
         """
-        검색 결과를 LangChain Document로 변환
+        검색 결과를 LangChain Document로 변환 (융합/예산 적용 후 최종 문서에만 호출)
         
         Args:
-            result: 검색 결과 딕셔너리
+            result: 검색 결과 레코드 (SearchRecord 또는 엔진 결과 dict)
             
         Returns:
             LangChain Document
@@ -258,14 +394,6 @@ Examples:
         source = result.get("source", "")
         page = result.get("page", 0)
         
-        # page_image_path 생성 로직
-        page_image_path = ""
-        if source and page > 0:  # page가 1 이상일 때만
-            # 파일명 추출 (경로와 확장자 제거)
-            # 예: "data/gv80_owners_manual_TEST6P.pdf" → "gv80_owners_manual_TEST6P"
-            filename = os.path.splitext(os.path.basename(source))[0]
-            page_image_path = f"data/images/{filename}-page-{page}.png"
-        
         # 메타데이터 구성
         metadata = {
             "source": source,
@@ -274,10 +402,12 @@ Examples:
             "id": result.get("id", ""),
             "caption": result.get("caption", ""),
             "entity": result.get("entity"),
-            "page_image_path": page_image_path,  # 페이지 이미지 경로 추가
+            # 페이지 이미지는 인용될 때 Synthesis에서 PageImageService로 렌더링
+            "page_image_path": "",
             "similarity": result.get("similarity"),
             "rank": result.get("rank"),
             "rrf_score": result.get("rrf_score"),
+            "boosted": bool(result.get("boosted", False)),  # entity 우선 순위 일치 여부
             "human_feedback": result.get("human_feedback", ""),  # Human feedback 추가
             # 통합 score 필드 - None이 아닌 값 우선 (우선순위: rrf > similarity > rank)
             # RRF는 이미 정규화됨 (0.0-1.0)
@@ -392,27 +522,23 @@ Return ONLY the IDs, without any brackets or prefixes.
 Focus on documents that directly answer the query.""")
         ])
         
-        # LLM으로 재순위화
-        llm = ChatOpenAI(
-            model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
-            temperature=0
-        )
-        
-        structured_llm = llm.with_structured_output(RerankResult)
-        
         # 문서 텍스트 포맷팅
         doc_text = "\n".join([
             f"[ID: {d['id']}] Page {d['page']}, {d['category']}, Score: {d['score']:.2f}\nContent: {d['content_preview']}..."
             for d in doc_summaries
         ])
         
-        result = structured_llm.invoke(
+        # LLM으로 재순위화
+        result = self.gateway.invoke_structured(
+            RerankResult,
             rerank_prompt.format_messages(
                 query=query,
                 doc_count=len(documents),
                 documents=doc_text,
                 top_k=top_k
-            )
+            ),
+            temperature=0,
+            node="RERANK"
         )
         
         # 디버깅: LLM이 반환한 ID들 로깅
@@ -492,7 +618,7 @@ Focus on documents that directly answer the query.""")
     
     def __call__(self, state: MVPWorkflowState) -> Dict[str, Any]:
         """
-        노드 실행
+        노드 실행 (trace 범위 안에서, 로그 줄은 같은 trace id로 묶임)
         
         Args:
             state: 워크플로우 상태
@@ -500,6 +626,11 @@ Focus on documents that directly answer the query.""")
         Returns:
             업데이트된 상태 필드
         """
+        with request_trace("retrieval"):
+            return self._retrieve(state)
+    
+    def _retrieve(self, state: MVPWorkflowState) -> Dict[str, Any]:
+        """검색 실행 본체 (__call__ 참고)"""
         logger.info(f"[RETRIEVAL] Node started")
         
         # Multi-turn 문서 초기화 검증 로직 (첫 번째 subtask에서만)
@@ -586,6 +717,26 @@ Focus on documents that directly answer the query.""")
             else:
                 logger.info(f"[RETRIEVAL] No search filter (will search all documents)")
             
+            # 필터 사전 점검: 일치 문서가 없으면 임베딩/검색 fan-out 전에 완화
+            original_filter = filter_dict
+            filter_dict, relaxed_keys = self._preflight_filter(filter_dict)
+            if relaxed_keys:
+                logger.warning(f"[RETRIEVAL] Filter matches no documents, relaxed before search: "
+                               f"removed {relaxed_keys} -> {filter_dict}")
+                if 'metadata' not in state:
+                    state['metadata'] = {}
+                state['metadata']['retrieval_retry'] = {
+                    'retried': True,
+                    'original_filter': original_filter,
+                    'retry_reason': 'filter_matches_no_documents',
+                    'relaxed_filter': filter_dict,
+                    'relaxed_keys': relaxed_keys,
+                    'preflight': True
+                }
+            
+            # 변형별 언어 감지 + 키워드/tsquery 배치 분석 (fan-out 태스크는 메모된 분석을 사용)
+            variant_languages = self._analyze_variants(query_variations, language_detection.language)
+            
             # Multi-Query 병렬 검색 실행 (병렬성 향상)
             logger.info(f"[RETRIEVAL] Preparing {len(query_variations)} parallel search tasks")
             
@@ -597,15 +748,19 @@ Focus on documents that directly answer the query.""")
                 try:
                     logger.debug(f"[RETRIEVAL] Executing task {idx}: '{query_variant[:50]}...'")
                     
-                    # 각 쿼리 변형별로 개별 언어 감지
-                    variant_language_detection = self._detect_language(query_variant)
-                    logger.info(f"[RETRIEVAL] Task {idx} language: {variant_language_detection.language} (confidence: {variant_language_detection.confidence:.2f}) for query: '{query_variant[:50]}...'")
+                    # 선행 검색 결과가 있으면 재사용 (같은 쿼리, 필터 없음)
+                    if self.speculative is not None:
+                        speculative_result = self.speculative.take(query_variant, filter_dict)
+                        if speculative_result is not None:
+                            logger.info(f"[RETRIEVAL] Task {idx} reused speculative results")
+                            return speculative_result
                     
-                    # 감지된 언어로 검색 실행
+                    # 감지된 언어로 검색 실행 (키워드 분석은 배치로 미리 계산됨)
+                    variant_language = variant_languages[idx]
                     result = self._bilingual_search(
                         query=query_variant,
                         filter_dict=filter_dict,
-                        primary_language=variant_language_detection.language,  # 개별 감지된 언어 사용
+                        primary_language=variant_language,  # 개별 감지된 언어 사용
                         top_k=self.default_top_k
                     )
                     
@@ -615,7 +770,7 @@ Focus on documents that directly answer the query.""")
                         stats = self.hybrid_search.last_search_stats.copy()
                         # 언어 정보 추가 (집계에 필요)
                         if stats:
-                            stats['detected_language'] = variant_language_detection.language
+                            stats['detected_language'] = variant_language
                     
                     return (result, stats)  # 튜플로 반환
                     
@@ -637,7 +792,7 @@ Focus on documents that directly answer the query.""")
             results_or_errors = []
             all_search_stats = []  # 모든 검색 통계 수집
             with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                futures = [executor.submit(search_task, idx, query_variant) 
+                futures = [submit_in_context(executor, search_task, idx, query_variant) 
                           for idx, query_variant in search_tasks]
                 
                 for future in futures:
@@ -695,7 +850,6 @@ Focus on documents that directly answer the query.""")
                 logger.info(f"[RETRIEVAL] Original filter was: {filter_dict}")
                 
                 # 필터 없이 재실행 (filter_dict를 None으로 변경)
-                original_filter = filter_dict
                 filter_dict = None  # 필터 제거
                 
                 # 필터 없이 재시도하는 검색 함수
@@ -715,9 +869,7 @@ Focus on documents that directly answer the query.""")
                         stats = self.hybrid_search.last_search_stats.copy() if self.hybrid_search.last_search_stats else None
                         # 언어 정보 추가 (집계에 필요)
                         if stats:
-                            # 언어 감지
-                            variant_language_detection = detect_language(query_variant)
-                            stats['detected_language'] = variant_language_detection.language
+                            stats['detected_language'] = variant_languages[idx]
                     
                     return (result, stats)  # 튜플로 반환
                 
@@ -726,7 +878,7 @@ Focus on documents that directly answer the query.""")
                 # 재시도 실행 (동일한 병렬성 유지)
                 retry_results_or_errors = []
                 with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                    retry_futures = [executor.submit(retry_search_task, idx, query_variant) 
+                    retry_futures = [submit_in_context(executor, retry_search_task, idx, query_variant) 
                                    for idx, query_variant in search_tasks]
                     
                     for future in retry_futures:
@@ -776,28 +928,39 @@ Focus on documents that directly answer the query.""")
                 else:
                     logger.warning(f"[RETRIEVAL] Retry without filter also returned 0 documents")
             
-            # 결과 처리 및 중복 제거
-            logger.debug(f"[RETRIEVAL] Processing search results and removing duplicates...")
-            all_documents = []
-            seen_ids = set()
-            
-            for (idx, query_variant), variant_docs in zip(search_tasks, results):
-                result_count = len(variant_docs)
-                logger.debug(f"[RETRIEVAL] Query variant {idx} returned {result_count} documents")
-                
-                for doc in variant_docs:
-                    # Document ID 생성 (metadata의 id 또는 content hash)
-                    doc_id = doc.metadata.get("id")
+            # 변형 간 RRF 융합 (중복 제거 + 전역 예산)
+            logger.debug(f"[RETRIEVAL] Fusing search results across query variations...")
+            doc_by_key = {}
+            rankings = []
+            boosted_keys = set()
+            for (idx, query_variant), variant_records in zip(search_tasks, results):
+                logger.debug(f"[RETRIEVAL] Query variant {idx} returned {len(variant_records)} documents")
+                keys = []
+                for record in variant_records:
+                    # 문서 키 (id 또는 content hash)
+                    doc_id = record.get("id")
                     if not doc_id:
                         # ID가 없으면 content의 처음 100자를 기준으로
-                        doc_id = hash(doc.page_content[:100])
-                    
-                    if doc_id not in seen_ids:
-                        seen_ids.add(doc_id)
-                        # 메타데이터에 검색 변형 정보 추가
-                        doc.metadata["search_variant_idx"] = idx
-                        doc.metadata["search_variant_query"] = query_variant
-                        all_documents.append(doc)
+                        content = record.get("contextualize_text") or record.get("page_content") or record.get("translation_text") or ""
+                        doc_id = hash(content[:100])
+                    doc_by_key.setdefault(doc_id, record)
+                    if record.get("boosted"):
+                        boosted_keys.add(doc_id)
+                    keys.append(doc_id)
+                rankings.append(keys)
+            seen_ids = set(doc_by_key)
+            
+            fused = rrf_fuse(rankings, k=self.fusion_k, budget=self.fusion_budget, priority=boosted_keys)
+            all_documents = []
+            for item in fused:
+                # 예산 안에 든 문서만 Document로 변환
+                doc = self._convert_to_document(doc_by_key[item.key])
+                # 메타데이터에 검색 변형 정보 추가 (처음 찾은 변형 + 전체 출처)
+                doc.metadata["search_variant_idx"] = item.variants[0]
+                doc.metadata["search_variant_query"] = search_tasks[item.variants[0]][1]
+                doc.metadata["search_variants"] = item.variants
+                doc.metadata["fusion_score"] = item.score
+                all_documents.append(doc)
             
             # 최종 문서 리스트
             documents = all_documents
@@ -811,15 +974,17 @@ Focus on documents that directly answer the query.""")
             
             unique_count = len(seen_ids)
             total_retrieved = sum(len(result) for result in results)
-            logger.info(f"[RETRIEVAL] Results: {total_retrieved} total → {unique_count} unique → {len(documents)} final documents")
+            logger.info(f"[RETRIEVAL] Results: {total_retrieved} total → {unique_count} unique → {len(documents)} final documents "
+                        f"(fusion budget: {self.fusion_budget or 'none'})")
             
-            # 검색 결과 문서 상세 정보 로깅 (상위 3개만)
-            for i, doc in enumerate(documents[:3]):
-                source = doc.metadata.get('source', 'unknown')[:20]
-                page = doc.metadata.get('page', 'N/A')
-                category = doc.metadata.get('category', 'unknown')[:12]
-                content_preview = doc.page_content[:45].replace('\n', ' ').strip()
-                logger.info(f"[RETRIEVAL] Doc {i+1}: {source}:P.{page}:{category} - \"{content_preview}...\"")
+            # 검색 결과 문서 상세 정보 로깅 (상위 3개만, 샘플된 요청 / 느린 요청만)
+            # 느린 요청이면 trace 종료 시 생성되므로 지금의 상위 문서를 고정 (documents는 이후 재정렬로 바뀜)
+            top = documents[:3]
+            log_detail(logger, lambda: [
+                f"[RETRIEVAL] Doc {i+1}: {doc.metadata.get('source', 'unknown')[:20]}:P.{doc.metadata.get('page', 'N/A')}:"
+                f"{doc.metadata.get('category', 'unknown')[:12]} - \"{doc.page_content[:45].replace(chr(10), ' ').strip()}...\""
+                for i, doc in enumerate(top)
+            ])
             
             # CRITICAL: 최소한 하나의 결과라도 있어야 함 (에러 발생)
             if not documents and query_variations:
@@ -847,7 +1012,8 @@ Focus on documents that directly answer the query.""")
                 "language_confidence": language_detection.confidence,
                 "total_documents": len(documents),
                 "unique_documents": len(seen_ids),
-                "search_strategy": "multi_query_bilingual",
+                "search_strategy": "multi_query_rrf_fusion",
+                "fusion_budget": self.fusion_budget,
                 "confidence": self._calculate_confidence(documents)
             }
             
@@ -904,7 +1070,18 @@ Focus on documents that directly answer the query.""")
             if korean_keywords or english_keywords:
                 logger.info(f"[RETRIEVAL] Aggregated keywords - Korean: {list(korean_keywords)[:5]}, English: {list(english_keywords)[:5]}")
                 logger.info(f"[RETRIEVAL] Total search results - Keyword: {total_keyword_docs}, Semantic: {total_semantic_docs}")
-            
+
+            # 결과 캐시 히트율 (히트한 변형은 임베딩/검색 SQL 생략)
+            result_cache = getattr(self.hybrid_search, 'result_cache', None)
+            if result_cache is not None:
+                cache_hits = sum(1 for stats in all_search_stats if stats and stats.get('cache_hit'))
+                logger.info(f"[RETRIEVAL] Result cache: {cache_hits}/{len(all_search_stats)} variant searches cached "
+                            f"(overall hit rate: {result_cache.hit_rate():.1%})")
+
+            # 컴파일된 SQL 지표 (라벨별 평균 실행 시간, 샘플링된 계획/실행 시간)
+            if getattr(self.hybrid_search, 'sql_cache', None) is not None:
+                logger.debug(f"[RETRIEVAL] Compiled SQL: {self.hybrid_search.get_sql_stats()}")
+
             # 메시지 생성 - 검색 과정 상세 정보
             messages = []
             
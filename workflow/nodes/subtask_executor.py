@@ -7,7 +7,7 @@ import os
 import logging
 import time
 from typing import Dict, Any, List, Optional
-from langchain_openai import ChatOpenAI
+from workflow.llm_gateway import get_llm_gateway
 from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
@@ -182,12 +182,10 @@ class SubtaskExecutorNode:
     
     def __init__(self):
         """초기화"""
-        # ChatOpenAI 인스턴스 직접 생성
-        self.llm = ChatOpenAI(
-            model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
-            temperature=0.3,
-            openai_api_key=os.getenv("OPENAI_API_KEY")
-        )
+        # 공용 LLM 게이트웨이 (rate limit / 재시도 / 메트릭)
+        self.gateway = get_llm_gateway()
+        self.temperature = 0.3
+        self.llm = self.gateway.chat_model(temperature=self.temperature)
         
         # DB 메타데이터 헬퍼 (필수)
         self.metadata_helper = MetadataHelper()
@@ -324,12 +322,11 @@ Generate MINIMAL filter (prefer empty over wrong):""")
     
     def _generate_query_variations(self, query: str) -> List[str]:
         """쿼리 변형 생성"""
-        structured_llm = self.llm.with_structured_output(
-            QueryVariations
-        )
-        
-        result = structured_llm.invoke(
-            self.variation_prompt.format_messages(query=query)
+        result = self.gateway.invoke_structured(
+            QueryVariations,
+            self.variation_prompt.format_messages(query=query),
+            temperature=self.temperature,
+            node="SUBTASK_VARIATION"
         )
         
         # 원본 쿼리를 첫 번째로, 변형들을 추가
@@ -337,22 +334,23 @@ Generate MINIMAL filter (prefer empty over wrong):""")
     
     def _extract_query_info(self, query: str, metadata: Dict[str, Any]) -> QueryExtraction:
         """쿼리에서 필터링 정보 추출 (보수적)"""
-        structured_llm = self.llm.with_structured_output(
-            QueryExtraction
-        )
-        
         # 카테고리와 entity types, sources 문자열로 변환
         categories_str = ", ".join(metadata.get("categories", []))
         entity_types_str = ", ".join(metadata.get("entity_types", []))
         sources_str = ", ".join(metadata.get("available_sources", []))
         
-        result = structured_llm.invoke(
-            self.extraction_prompt.format_messages(
-                query=query,
-                categories=categories_str,
-                entity_types=entity_types_str,
-                sources=sources_str
-            )
+        # 결정적 분류 호출 - temperature 0 + 영속 캐시
+        result = self.gateway.invoke_structured_cached(
+            QueryExtraction,
+            self.extraction_prompt,
+            {
+                "query": query,
+                "categories": categories_str,
+                "entity_types": entity_types_str,
+                "sources": sources_str
+            },
+            temperature=0,
+            node="SUBTASK_EXTRACTION"
         )
         
         # Entity type 검증 (DB에 있는 타입만)
@@ -389,21 +387,22 @@ Generate MINIMAL filter (prefer empty over wrong):""")
                 entity={'type': '똑딱이'}
             )
         
-        structured_llm = self.llm.with_structured_output(
-            DDUFilterGeneration,
-            method="function_calling"
-        )
-        
         entity_types_str = ", ".join(metadata.get("entity_types", []))
         sources_str = ", ".join(metadata.get("available_sources", []))
         
-        result = structured_llm.invoke(
-            self.filter_prompt.format_messages(
-                query=query,
-                extraction=extraction.model_dump(),
-                entity_types=entity_types_str,
-                sources=sources_str
-            )
+        # 결정적 분류 호출 - temperature 0 + 영속 캐시
+        result = self.gateway.invoke_structured_cached(
+            DDUFilterGeneration,
+            self.filter_prompt,
+            {
+                "query": query,
+                "extraction": extraction.model_dump(),
+                "entity_types": entity_types_str,
+                "sources": sources_str
+            },
+            temperature=0,
+            method="function_calling",
+            node="SUBTASK_FILTER"
         )
         
         # Debug logging
@@ -4,19 +4,21 @@ Synthesis Node
 """
 
 import os
+import json
 import logging
-import time
-import random
 from typing import Dict, Any, List, Optional
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.documents import Document
-from langchain_core.messages import AIMessage
+from langchain_core.messages import AIMessage, SystemMessage, HumanMessage
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 
 
 from workflow.state import MVPWorkflowState
+from workflow.context_packer import ContextPacker
+from workflow.page_images import get_page_image_service
+from workflow.llm_gateway import get_llm_gateway
+from workflow.streaming import SYNTHESIS_META_DELIMITER, SYNTHESIS_STREAM_TAG, NOSTREAM_TAG, PartialStreamError
 
 load_dotenv()
 
@@ -24,11 +26,22 @@ load_dotenv()
 logger = logging.getLogger(__name__)
 
 
+class PageImageVariant(BaseModel):
+    """표시용 축소 페이지 이미지"""
+    path: str = Field(description="Variant image file path")
+    width: Optional[int] = Field(default=None, description="Width in pixels")
+    height: Optional[int] = Field(default=None, description="Height in pixels")
+    format: Optional[str] = Field(default=None, description="Image format (webp, jpeg)")
+
 class PageImageInfo(BaseModel):
     """페이지 이미지 정보"""
     path: str = Field(description="Image file path")
     page: int = Field(description="Page number")
     source: str = Field(description="Source document name")
+    width: Optional[int] = Field(default=None, description="Full-size width in pixels")
+    height: Optional[int] = Field(default=None, description="Full-size height in pixels")
+    thumbnail: Optional[PageImageVariant] = Field(default=None, description="Small preview image")
+    medium: Optional[PageImageVariant] = Field(default=None, description="Readable mid-size image")
 
 class EntityReference(BaseModel):
     """Entity information that was referenced in the answer"""
@@ -49,18 +62,43 @@ class SynthesisResult(BaseModel):
     entity_references: Optional[List[EntityReference]] = Field(default=None, description="Structured entity information (똑딱이/table/figure) referenced in answer")
     warnings: Optional[List[str]] = Field(default=None, description="Any warnings or cautions extracted from documents")
 
+class SynthesisMetadata(BaseModel):
+    """스트리밍 답변의 구조화 필드 (답변 본문 제외)"""
+    confidence: float = Field(description="Confidence score (0.0-1.0)")
+    sources_used: List[str] = Field(description="List of source references used in format: '[1]', '[2]', etc.")
+    key_points: List[str] = Field(description="Key points extracted from documents")
+    references_table: str = Field(description="References table in format: | 참조번호 | 문서명 | 페이지 | 내용 요약 |")
+
 
 class SynthesisNode:
     """검색된 문서를 기반으로 답변을 생성하는 노드"""
     
     def __init__(self):
         """초기화"""
-        # ChatOpenAI 인스턴스 직접 생성
-        self.llm = ChatOpenAI(
-            model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
-            temperature=0.1,  # 더 일관된 답변을 위해 낮은 temperature
-            openai_api_key=os.getenv("OPENAI_API_KEY")
-        )
+        # 공용 LLM 게이트웨이 (rate limit / 재시도 / 메트릭)
+        self.gateway = get_llm_gateway()
+        self.temperature = 0.1  # 더 일관된 답변을 위해 낮은 temperature
+        self.llm = self.gateway.chat_model(temperature=self.temperature)
+        
+        # 문서 컨텍스트 토큰 예산 관리 (SYNTHESIS_CONTEXT_TOKEN_BUDGET)
+        self.context_packer = ContextPacker(model=self.llm.model_name)
+        
+        # 인용된 페이지 이미지 지연 렌더링 (용량 제한 디스크 캐시)
+        self.page_images = get_page_image_service()
+        
+        # 스트리밍 모드 - 답변 토큰을 LangGraph messages 스트림으로 전달
+        self.streaming_enabled = os.getenv("SYNTHESIS_STREAMING", "false").lower() == "true"
+        self.stream_llm = self.gateway.chat_model(
+            temperature=self.temperature, streaming=True
+        ).with_config(tags=[SYNTHESIS_STREAM_TAG])
+        
+        # 스트리밍 출력 형식 지시 (답변 본문 -> 구분자 -> JSON 메타데이터)
+        self.streaming_format_instruction = f"""OUTPUT FORMAT (STREAMING MODE):
+1. Write the complete answer text first, in Markdown, with inline citations [1], [2], etc.
+2. Do NOT include the References table in the answer text.
+3. After the answer, output a line containing exactly {SYNTHESIS_META_DELIMITER}
+4. After that line, output a single JSON object with these keys and nothing else:
+   {{"confidence": <0.0-1.0>, "sources_used": ["[1]", ...], "key_points": ["..."], "references_table": "| 참조번호 | 문서명 | 페이지 | 내용 요약 |\\n..."}}"""
         
         # 답변 생성 프롬프트
         self.synthesis_prompt = ChatPromptTemplate.from_messages([
@@ -97,29 +135,10 @@ Guidelines:
 12. Place reference numbers immediately after the relevant statement
 13. When quoting or referencing policy terms, use the exact wording from the source
 
-Page Image Display Guidelines:
-14. **IMPORTANT**: If retrieved documents have page images (page_image_path in metadata):
-    - Collect all unique page images from cited documents
-    - Display them at the END of your answer in a dedicated section
-    - Group by source document and order by page number
-    - Format: ![Source Page X](path) for markdown rendering
-14. Page Image Section Format:
-    ```
-    ## 참조 페이지 이미지 (Referenced Page Images)
-    
-    ### {{source_name}}
-    ![Page 1](data/images/filename-page-1.png)
-    ![Page 3](data/images/filename-page-3.png)
-    
-    ### {{another_source}}
-    ![Page 2](data/images/another-page-2.png)
-    ```
-
 Answer Structure:
 - Start with a direct answer to the question
 - Provide supporting details from documents with inline citations [1], [2]
 - Include relevant warnings or cautions if mentioned
-- **NEW**: Add "참조 페이지 이미지 (Referenced Page Images)" section if page images exist
 - End with a "References" section listing all cited documents
 
 References Format:
@@ -177,61 +196,107 @@ Extract source filename and page from each document's metadata for proper refere
 {caption}
 {entity_info}
 {human_feedback}
-{page_image_note}
 ---
 Note: Use [{idx}] when citing this document in your answer.
 """
     
-    def _invoke_with_retry(self, structured_llm, messages, max_retries=3):
+    def _parse_stream_metadata(self, meta_text: str) -> Optional[SynthesisMetadata]:
+        """스트리밍 출력의 trailing JSON 블록 파싱 (실패 시 None)"""
+        meta_text = meta_text.strip()
+        if meta_text.startswith("```"):
+            meta_text = meta_text.strip("`")
+            meta_text = meta_text[meta_text.find("{"):]
+        start, end = meta_text.find("{"), meta_text.rfind("}")
+        if start < 0 or end <= start:
+            return None
+        try:
+            return SynthesisMetadata(**json.loads(meta_text[start:end + 1]))
+        except (json.JSONDecodeError, TypeError, ValueError):
+            return None
+    
+    def _stream_answer(self, messages) -> SynthesisResult:
         """
-        LLM 호출에 exponential backoff retry 적용
+        답변 본문을 토큰 스트리밍으로 생성하고 구조화 필드는 trailing 블록에서 추출
+        
+        본문 토큰은 stream_llm 호출을 통해 LangGraph messages 스트림으로 그대로
+        전달된다. trailing 블록이 없거나 깨진 경우 답변을 기반으로 구조화 필드만
+        가벼운 후속 호출로 파싱한다 (이 호출은 스트림에서 제외).
         
         Args:
-            structured_llm: with_structured_output()로 래핑된 LLM 인스턴스
-            messages: 프롬프트 메시지
-            max_retries: 최대 재시도 횟수 (기본값: 3)
+            messages: 답변 생성 프롬프트 메시지
             
         Returns:
-            LLM 응답 결과
+            SynthesisResult
             
         Raises:
-            Exception: 최대 재시도 후에도 실패한 경우
+            PartialStreamError: 토큰이 이미 전송된 뒤 실패한 경우 (재생성하지 않음)
+        """
+        stream_messages = list(messages) + [SystemMessage(content=self.streaming_format_instruction)]
+        
+        chunks = []
+        try:
+            return self._collect_stream(stream_messages, chunks)
+        except Exception as e:
+            if chunks:
+                raise PartialStreamError(
+                    f"Streaming failed after {len(chunks)} chunks were sent: {str(e)}"
+                ) from e
+            raise
+    
+    def _collect_stream(self, stream_messages, chunks: List[str]) -> SynthesisResult:
+        """스트리밍 호출 후 답변/구조화 필드 조립 (전송된 청크는 chunks에 기록)"""
+        for chunk in self.gateway.stream(self.stream_llm, stream_messages, node="SYNTHESIS"):
+            if chunk.content:
+                chunks.append(chunk.content)
+        full_text = "".join(chunks)
+        
+        answer, _, meta_text = full_text.partition(SYNTHESIS_META_DELIMITER)
+        answer = answer.strip()
+        meta = self._parse_stream_metadata(meta_text) if meta_text else None
+        
+        if meta is None:
+            logger.warning(f"[SYNTHESIS] Streaming metadata block missing or invalid - running follow-up parse")
+            parser_llm = self.gateway.structured(SynthesisMetadata, temperature=0).with_config(tags=[NOSTREAM_TAG])
+            meta = self.gateway.invoke(parser_llm, [
+                SystemMessage(content="Extract the structured fields for this answer. "
+                                      "Use only citation markers that appear in the answer."),
+                HumanMessage(content=f"Answer:\n{answer}")
+            ], node="SYNTHESIS").get("parsed")
+            if meta is None:
+                raise ValueError("Failed to parse synthesis metadata from streamed answer")
+        
+        logger.info(f"[SYNTHESIS] Streamed answer: {len(answer)} chars, {len(chunks)} chunks")
+        return SynthesisResult(
+            answer=answer,
+            confidence=meta.confidence,
+            sources_used=meta.sources_used,
+            key_points=meta.key_points,
+            references_table=meta.references_table
+        )
+    
+    def _run_synthesis(self, messages) -> SynthesisResult:
+        """
+        답변 생성 호출 (스트리밍 모드 여부에 따라 분기)
+        
+        재시도/backoff/rate limit은 공용 LLM 게이트웨이가 담당한다.
+        
+        Args:
+            messages: 프롬프트 메시지
+            
+        Returns:
+            SynthesisResult
         """
-        for attempt in range(max_retries + 1):  # 0부터 max_retries까지
+        if self.streaming_enabled:
             try:
-                logger.info(f"[SYNTHESIS] LLM invoke attempt {attempt + 1}/{max_retries + 1}")
-                result = structured_llm.invoke(messages)
-                logger.info(f"[SYNTHESIS] LLM invoke succeeded on attempt {attempt + 1}")
-                return result
-                
+                return self._stream_answer(messages)
+            except PartialStreamError:
+                # 답변 일부가 이미 전송됨 - 재생성하면 답변이 중복되므로 오류로 보고
+                raise
             except Exception as e:
-                error_msg = str(e).lower()
-                
-                # OpenAI API 서버 에러인지 확인
-                is_server_error = any(phrase in error_msg for phrase in [
-                    "server had an error",
-                    "internal server error", 
-                    "service unavailable",
-                    "timeout",
-                    "connection error",
-                    "temporarily unavailable"
-                ])
-                
-                if attempt == max_retries:
-                    # 최종 시도에서 실패
-                    logger.error(f"[SYNTHESIS] LLM invoke failed after {max_retries + 1} attempts: {str(e)}")
-                    raise e
-                
-                if is_server_error:
-                    # 서버 에러는 재시도
-                    wait_time = (2 ** attempt) + random.uniform(0, 1)  # 1s, 2s, 4s + jitter
-                    logger.warning(f"[SYNTHESIS] Server error detected (attempt {attempt + 1}): {str(e)}")
-                    logger.info(f"[SYNTHESIS] Retrying in {wait_time:.2f} seconds...")
-                    time.sleep(wait_time)
-                else:
-                    # 서버 에러가 아닌 경우 즉시 실패
-                    logger.error(f"[SYNTHESIS] Non-server error, not retrying: {str(e)}")
-                    raise e
+                logger.warning(f"[SYNTHESIS] Streaming generation failed before any tokens, using structured output: {str(e)}")
+        return self.gateway.invoke_structured(
+            SynthesisResult, messages, temperature=self.temperature, node="SYNTHESIS"
+        )
     
     def _format_entity_info(self, metadata: dict) -> str:
         """
@@ -333,6 +398,7 @@ Note: Use [{idx}] when citing this document in your answer.
             filtered_documents = documents
         
         page_images = []
+        seen_pages = set()
         seen_paths = set()
         
         for doc in filtered_documents:
@@ -340,21 +406,37 @@ Note: Use [{idx}] when citing this document in your answer.
                 continue
                 
             metadata = doc.metadata or {}
+            source = metadata.get("source", "")
+            page = metadata.get("page", 0)
+            
+            # 같은 페이지는 한 번만 조회 (렌더링 중복 방지)
+            page_key = (source, page)
+            if page_key in seen_pages:
+                continue
+            seen_pages.add(page_key)
+            
+            # 경로가 없으면 인용된 페이지만 지연 렌더링 (원본 + 축소 변형)
             page_image_path = metadata.get("page_image_path", "")
+            resolved = None
+            if not page_image_path and isinstance(page, int) and page > 0:
+                resolved = self.page_images.resolve_page(source, page)
+                page_image_path = resolved["path"] if resolved else ""
             
             # 유효한 경로이고 중복되지 않은 경우만 추가
             if page_image_path and page_image_path not in seen_paths:
                 seen_paths.add(page_image_path)
                 
                 # source 파일명 추출 (표시용)
-                source = metadata.get("source", "")
                 source_name = os.path.basename(source) if source else "Unknown"
                 
                 page_images.append({
                     "path": page_image_path,
                     "page": metadata.get("page", 0),
                     "source": source_name,
-                    "category": metadata.get("category", "")
+                    "category": metadata.get("category", ""),
+                    "width": resolved["width"] if resolved else None,
+                    "height": resolved["height"] if resolved else None,
+                    "variants": resolved["variants"] if resolved else {}
                 })
         
         # 페이지 번호순으로 정렬
@@ -457,39 +539,31 @@ Note: Use [{idx}] when citing this document in your answer.
         
         return warnings[:5]  # 최대 5개까지만 반환 (너무 많은 경고 방지)
     
-    def _format_documents(self, documents: List[Document], truncate: bool = False) -> str:
+    def _normalize_documents(self, documents: List[Any]) -> List[Document]:
         """
-        문서들을 프롬프트용 텍스트로 포맷팅
+        LangGraph 직렬화로 변형된 문서들을 Document 객체로 복원
         
         Args:
-            documents: 문서 리스트
-            truncate: True일 경우 문서 내용 축약 (fallback용)
+            documents: Document / JSON 문자열 / dict 혼합 리스트
             
         Returns:
-            포맷팅된 문서 텍스트
+            Document 리스트 (복원 불가능한 항목은 제외)
         """
-        if not documents:
-            return "No documents available"
-        
-        formatted_docs = []
+        normalized = []
         for idx, doc in enumerate(documents, 1):
-            # Document 객체 타입 검증 및 복원
             if isinstance(doc, str):
                 # LangGraph가 Document를 string으로 직렬화한 경우
                 try:
-                    import json
                     doc_dict = json.loads(doc)
-                    from langchain_core.documents import Document
                     doc = Document(
                         page_content=doc_dict.get("page_content", ""),
                         metadata=doc_dict.get("metadata", {})
                     )
-                except (json.JSONDecodeError, TypeError):
+                except (json.JSONDecodeError, TypeError, AttributeError):
                     logger.warning(f"[SYNTHESIS] Failed to parse document string at index {idx}")
                     continue
             elif isinstance(doc, dict):
                 # LangGraph 직렬화로 dict가 된 경우
-                from langchain_core.documents import Document
                 doc = Document(
                     page_content=doc.get("page_content", ""),
                     metadata=doc.get("metadata", {})
@@ -498,7 +572,46 @@ Note: Use [{idx}] when citing this document in your answer.
                 # 잘못된 형식의 객체인 경우
                 logger.warning(f"[SYNTHESIS] Invalid document format at index {idx}: {type(doc)}")
                 continue
+            normalized.append(doc)
+        return normalized
+    
+    def _pack_documents(self, documents: List[Any]) -> List[Document]:
+        """
+        문서 정규화 후 토큰 예산에 맞춰 패킹
+        
+        반환된 리스트가 프롬프트의 인용 번호 [1], [2], ... 기준이 되므로
+        페이지 이미지/엔티티 수집도 같은 리스트로 수행해야 한다.
+        
+        Args:
+            documents: 검색된 문서 리스트
             
+        Returns:
+            토큰 예산 안에 들어가는 Document 리스트
+        """
+        packed, stats = self.context_packer.pack(self._normalize_documents(documents))
+        if stats["dropped"] or stats["truncated"]:
+            logger.info(
+                f"[SYNTHESIS] Context budget applied - dropped {stats['dropped']} docs, "
+                f"tail truncated: {stats['truncated']}"
+            )
+        return packed
+    
+    def _format_documents(self, documents: List[Document]) -> str:
+        """
+        문서들을 프롬프트용 텍스트로 포맷팅
+        
+        Args:
+            documents: 문서 리스트
+            
+        Returns:
+            포맷팅된 문서 텍스트
+        """
+        documents = self._normalize_documents(documents or [])
+        if not documents:
+            return "No documents available"
+        
+        formatted_docs = []
+        for idx, doc in enumerate(documents, 1):
             metadata = doc.metadata
             
             # 캡션이 있으면 추가
@@ -515,25 +628,15 @@ Note: Use [{idx}] when citing this document in your answer.
             if human_feedback and isinstance(human_feedback, str) and human_feedback.strip():
                 human_feedback_text = f"- Human Verified: {human_feedback}"
             
-            # 페이지 이미지 경로가 있으면 노트 추가
-            page_image_path = metadata.get("page_image_path", "")
-            page_image_note = ""
-            if page_image_path and isinstance(page_image_path, str) and page_image_path.strip():
-                page_image_note = f"- Page Image Available: {page_image_path}"
-            
-            # 문서 내용 (truncate가 True일 때만 축약)
-            content = doc.page_content[:500] if truncate else doc.page_content
-            
             formatted_doc = self.document_formatter_prompt.format(
                 idx=idx,
                 source=metadata.get("source", "Unknown"),
                 page=metadata.get("page", "N/A"),
                 category=metadata.get("category", "Unknown"),
-                content=content,
+                content=doc.page_content,
                 caption=caption_text,
                 entity_info=entity_info_text,
-                human_feedback=human_feedback_text,
-                page_image_note=page_image_note
+                human_feedback=human_feedback_text
             )
             
             # "똑딱이" entity type을 더 명확하게 강조
@@ -550,13 +653,92 @@ Note: Use [{idx}] when citing this document in your answer.
         
         return "\n".join(formatted_docs)
     
-    def _generate_answer_with_fallback(
+    def _attach_document_details(
+        self,
+        result: SynthesisResult,
+        documents: List[Document],
+        log_tag: str = "SYNTHESIS"
+    ) -> SynthesisResult:
+        """
+        생성된 답변에 페이지 이미지, human feedback, entity, 경고사항 추가
+        
+        Args:
+            result: LLM이 생성한 답변 결과
+            documents: 프롬프트에 사용된 (패킹된) 문서 리스트
+            log_tag: 로그 prefix
+            
+        Returns:
+            보강된 답변 결과
+        """
+        # sources_used를 기반으로 인용된 문서의 페이지 이미지만 수집
+        page_images = self._collect_page_images(documents, sources_used=result.sources_used)
+        
+        # 페이지 이미지를 답변에 추가 및 page_images 필드 설정
+        if page_images:
+            result.page_images = [
+                PageImageInfo(
+                    path=img['path'],
+                    page=img['page'],
+                    source=img['source'],
+                    width=img.get('width'),
+                    height=img.get('height'),
+                    thumbnail=img.get('variants', {}).get('thumbnail'),
+                    medium=img.get('variants', {}).get('medium')
+                )
+                for img in page_images
+            ]
+            
+            # 답변 텍스트에 이미지 섹션 추가
+            image_section = "\n\n## 📎 참조 페이지 이미지\n"
+            image_section += f"### 📄 페이지 이미지 ({len(page_images)}개)\n\n"
+            
+            current_source = None
+            for img in page_images:
+                if img['source'] != current_source:
+                    current_source = img['source']
+                    image_section += f"\n### 📄 {current_source}\n"
+                
+                # 썸네일을 먼저 보여주고 클릭 시 원본 크기 이미지로 이동
+                thumbnail = img.get('variants', {}).get('thumbnail')
+                if thumbnail:
+                    image_section += f"[![Page {img['page']}]({thumbnail['path']})]({img['path']})\n"
+                else:
+                    image_section += f"![Page {img['page']}]({img['path']})\n"
+            
+            result.answer = result.answer + image_section
+            logger.info(f"[{log_tag}] Added {len(page_images)} page images from cited documents to answer")
+        
+        # 1. Human feedback 수집
+        human_feedback = self._collect_human_feedback(documents)
+        if human_feedback:
+            result.human_feedback_used = human_feedback
+            logger.info(f"[{log_tag}] Found {len(human_feedback)} human feedback entries")
+        
+        # 2. Entity references 수집 (문서 인덱스 -> 참조번호 매핑)
+        doc_idx_map = {idx: f"[{idx+1}]" for idx in range(len(documents))}
+        
+        entity_refs = self._collect_entity_references(documents, doc_idx_map)
+        if entity_refs:
+            result.entity_references = entity_refs
+            logger.info(f"[{log_tag}] Found {len(entity_refs)} entity references")
+            for ref in entity_refs[:3]:  # 처음 3개만 로깅
+                logger.info(f"[{log_tag}]   - {ref.entity_type}: {ref.title}")
+        
+        # 3. 경고사항 추출
+        warnings = self._extract_warnings(documents)
+        if warnings:
+            result.warnings = warnings
+            logger.info(f"[{log_tag}] Extracted {len(warnings)} warnings")
+        
+        return result
+    
+    def _generate_answer(
         self, 
         query: str, 
         documents: List[Document]
     ) -> SynthesisResult:
         """
-        답변 생성 (max token 에러 시 fallback 포함)
+        답변 생성 (토큰 예산 안으로 패킹된 문서 사용)
         
         Args:
             query: 질문
@@ -565,182 +747,32 @@ Note: Use [{idx}] when citing this document in your answer.
         Returns:
             생성된 답변 결과
         """
-        # 먼저 전체 문서로 시도
-        try:
-            formatted_docs = self._format_documents(documents, truncate=False)
-            
-            structured_llm = self.llm.with_structured_output(
-                SynthesisResult
-            )
-            
-            result = self._invoke_with_retry(
-                structured_llm,
-                self.synthesis_prompt.format_messages(
-                    query=query,
-                    documents=formatted_docs
-                )
+        documents = self._pack_documents(documents)
+        formatted_docs = self._format_documents(documents)
+        
+        result = self._run_synthesis(
+            self.synthesis_prompt.format_messages(
+                query=query,
+                documents=formatted_docs
             )
-            
-            # sources_used를 기반으로 인용된 문서의 페이지 이미지만 수집
-            page_images = self._collect_page_images(documents, sources_used=result.sources_used)
-            
-            # 페이지 이미지를 답변에 추가 및 page_images 필드 설정
-            if page_images:
-                # PageImageInfo 객체 리스트 생성
-                page_image_infos = []
-                for img in page_images:
-                    page_image_infos.append(PageImageInfo(
-                        path=img['path'],
-                        page=img['page'],
-                        source=img['source']
-                    ))
-                result.page_images = page_image_infos
-                
-                # 답변 텍스트에 접을 수 있는 이미지 섹션 추가
-                image_count = len(page_images)
-                image_section = "\n\n## 📎 참조 페이지 이미지\n"
-                image_section += f"### 📄 페이지 이미지 ({image_count}개)\n\n"
-                
-                current_source = None
-                for img in page_images:
-                    if img['source'] != current_source:
-                        current_source = img['source']
-                        image_section += f"\n### 📄 {current_source}\n"
-                    
-                    image_section += f"![Page {img['page']}]({img['path']})\n"
-                
-                # 이미지 섹션 완료
-                
-                # 답변에 이미지 섹션 추가
-                result.answer = result.answer + image_section
-                logger.info(f"[SYNTHESIS] Added {len(page_images)} page images from cited documents to answer")
-            
-            # 새로운 필드 수집 및 설정
-            # 1. Human feedback 수집
-            human_feedback = self._collect_human_feedback(documents)
-            if human_feedback:
-                result.human_feedback_used = human_feedback
-                logger.info(f"[SYNTHESIS] Found {len(human_feedback)} human feedback entries")
-            
-            # 2. Entity references 수집
-            # 문서 인덱스 to 참조번호 매핑 생성
-            doc_idx_map = {}
-            for idx in range(len(documents)):
-                doc_idx_map[idx] = f"[{idx+1}]"
-            
-            entity_refs = self._collect_entity_references(documents, doc_idx_map)
-            if entity_refs:
-                result.entity_references = entity_refs
-                logger.info(f"[SYNTHESIS] Found {len(entity_refs)} entity references")
-                for ref in entity_refs[:3]:  # 처음 3개만 로깅
-                    logger.info(f"[SYNTHESIS]   - {ref.entity_type}: {ref.title}")
-            
-            # 3. 경고사항 추출
-            warnings = self._extract_warnings(documents)
-            if warnings:
-                result.warnings = warnings
-                logger.info(f"[SYNTHESIS] Extracted {len(warnings)} warnings")
-            
-            # 생성된 답변 로깅
-            logger.info(f"[SYNTHESIS] === Generated Answer Summary ===")
-            logger.info(f"[SYNTHESIS] Query: {query}")
-            logger.info(f"[SYNTHESIS] Answer Length: {len(result.answer)} chars")
-            logger.info(f"[SYNTHESIS] Confidence: {result.confidence:.2f}")
-            logger.info(f"[SYNTHESIS] Sources Used: {result.sources_used}")
-            logger.info(f"[SYNTHESIS] Key Points Count: {len(result.key_points)}")
-            if result.key_points:
-                logger.info(f"[SYNTHESIS] First Key Point: {result.key_points[0]}")
-            logger.info(f"[SYNTHESIS] Full Answer:")
-            logger.info(f"[SYNTHESIS] {result.answer}")
-            logger.info(f"[SYNTHESIS] === End of Answer ===")
-            
-            return result
-            
-        except Exception as e:
-            # Token 제한 에러인 경우 fallback
-            if "maximum context length" in str(e).lower() or "token" in str(e).lower():
-                print(f"Token limit exceeded, falling back to truncated documents")
-                
-                # 문서 축약하여 재시도
-                formatted_docs = self._format_documents(documents, truncate=True)
-                
-                structured_llm = self.llm.with_structured_output(
-                    SynthesisResult
-                )
-                
-                result = self._invoke_with_retry(
-                    structured_llm,
-                    self.synthesis_prompt.format_messages(
-                        query=query,
-                        documents=formatted_docs
-                    )
-                )
-                
-                # Fallback에서도 sources_used를 기반으로 인용된 문서의 페이지 이미지만 수집
-                page_images = self._collect_page_images(documents, sources_used=result.sources_used)
-                
-                if page_images:
-                    # PageImageInfo 객체 리스트 생성
-                    page_image_infos = []
-                    for img in page_images:
-                        page_image_infos.append(PageImageInfo(
-                            path=img['path'],
-                            page=img['page'],
-                            source=img['source']
-                        ))
-                    result.page_images = page_image_infos
-                    
-                    # 답변 텍스트에 접을 수 있는 이미지 섹션 추가
-                    image_count = len(page_images)
-                    image_section = "\n\n## 📎 참조 페이지 이미지\n"
-                    image_section += f"### 📄 페이지 이미지 ({image_count}개)\n\n"
-                    
-                    current_source = None
-                    for img in page_images:
-                        if img['source'] != current_source:
-                            current_source = img['source']
-                            image_section += f"\n### 📄 {current_source}\n"
-                        
-                        image_section += f"![Page {img['page']}]({img['path']})\n"
-                    
-                    # 이미지 섹션 완료
-                    
-                    # 답변에 이미지 섹션 추가
-                    result.answer = result.answer + image_section
-                    logger.info(f"[SYNTHESIS] Added {len(page_images)} page images from cited documents to answer (fallback)")
-                
-                # Fallback에서도 새로운 필드 수집 및 설정
-                # 1. Human feedback 수집
-                human_feedback = self._collect_human_feedback(documents)
-                if human_feedback:
-                    result.human_feedback_used = human_feedback
-                    logger.info(f"[SYNTHESIS-FALLBACK] Found {len(human_feedback)} human feedback entries")
-                
-                # 2. Entity references 수집
-                doc_idx_map = {}
-                for idx in range(len(documents)):
-                    doc_idx_map[idx] = f"[{idx+1}]"
-                
-                entity_refs = self._collect_entity_references(documents, doc_idx_map)
-                if entity_refs:
-                    result.entity_references = entity_refs
-                    logger.info(f"[SYNTHESIS-FALLBACK] Found {len(entity_refs)} entity references")
-                
-                # 3. 경고사항 추출
-                warnings = self._extract_warnings(documents)
-                if warnings:
-                    result.warnings = warnings
-                    logger.info(f"[SYNTHESIS-FALLBACK] Extracted {len(warnings)} warnings")
-                
-                # Fallback 시에도 답변 로깅
-                logger.warning(f"[SYNTHESIS] Generated answer using truncated documents (fallback)")
-                logger.info(f"[SYNTHESIS] Answer Length: {len(result.answer)} chars")
-                logger.info(f"[SYNTHESIS] Confidence: {result.confidence:.2f}")
-                
-                return result
-            else:
-                # 다른 에러는 그대로 전파
-                raise e
+        )
+        
+        result = self._attach_document_details(result, documents)
+        
+        # 생성된 답변 로깅
+        logger.info(f"[SYNTHESIS] === Generated Answer Summary ===")
+        logger.info(f"[SYNTHESIS] Query: {query}")
+        logger.info(f"[SYNTHESIS] Answer Length: {len(result.answer)} chars")
+        logger.info(f"[SYNTHESIS] Confidence: {result.confidence:.2f}")
+        logger.info(f"[SYNTHESIS] Sources Used: {result.sources_used}")
+        logger.info(f"[SYNTHESIS] Key Points Count: {len(result.key_points)}")
+        if result.key_points:
+            logger.info(f"[SYNTHESIS] First Key Point: {result.key_points[0]}")
+        logger.info(f"[SYNTHESIS] Full Answer:")
+        logger.info(f"[SYNTHESIS] {result.answer}")
+        logger.info(f"[SYNTHESIS] === End of Answer ===")
+        
+        return result
     
     def __call__(self, state: MVPWorkflowState) -> Dict[str, Any]:
         """
@@ -825,7 +857,7 @@ Note: Use [{idx}] when citing this document in your answer.
             else:
                 # 첫 번째 시도
                 logger.info(f"[SYNTHESIS] Generating answer using {len(documents)} documents...")
-                synthesis_result = self._generate_answer_with_fallback(query, documents)
+                synthesis_result = self._generate_answer(query, documents)
             logger.info(f"[SYNTHESIS] Answer generated with confidence: {synthesis_result.confidence:.3f}")
             
             # 사용된 소스와 키포인트 상세 정보 로깅
@@ -996,94 +1028,29 @@ Be conservative and cite sources explicitly.
 Clearly state "문서에 정보가 없습니다" or "Information not available in documents" when relevant details are missing.""")
         ])
         
-        # 더 낮은 temperature 사용 (보수적 생성)
-        conservative_llm = ChatOpenAI(
-            model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
-            temperature=0.1,  # 매우 낮은 temperature
-            openai_api_key=os.getenv("OPENAI_API_KEY")
-        )
-        
-        # 구조화된 출력으로 답변 생성
-        structured_llm = conservative_llm.with_structured_output(
-            SynthesisResult
-        )
-        
-        # 문서 포맷팅
-        formatted_docs = self._format_documents(documents)
+        # 토큰 예산에 맞춰 문서 패킹 후 포맷팅
+        packed_documents = self._pack_documents(documents)
+        formatted_docs = self._format_documents(packed_documents)
         
         try:
-            result = self._invoke_with_retry(
-                structured_llm,
+            result = self._run_synthesis(
                 corrective_prompt.format_messages(
                     query=query,
                     documents=formatted_docs
                 )
             )
             
-            # sources_used를 기반으로 인용된 문서의 페이지 이미지만 수집
-            page_images = self._collect_page_images(documents, sources_used=result.sources_used)
-            
-            # 페이지 이미지를 답변에 추가 및 page_images 필드 설정
-            if page_images:
-                # PageImageInfo 객체 리스트 생성
-                page_image_infos = []
-                for img in page_images:
-                    page_image_infos.append(PageImageInfo(
-                        path=img['path'],
-                        page=img['page'],
-                        source=img['source']
-                    ))
-                result.page_images = page_image_infos
-                
-                # 답변 텍스트에 접을 수 있는 이미지 섹션 추가
-                image_count = len(page_images)
-                image_section = "\n\n## 📎 참조 페이지 이미지\n"
-                image_section += f"### 📄 페이지 이미지 ({image_count}개)\n\n"
-                
-                current_source = None
-                for img in page_images:
-                    if img['source'] != current_source:
-                        current_source = img['source']
-                        image_section += f"\n### 📄 {current_source}\n"
-                    
-                    image_section += f"![Page {img['page']}]({img['path']})\n"
-                
-                # 이미지 섹션 완료
-                
-                # 답변에 이미지 섹션 추가
-                result.answer = result.answer + image_section
-                logger.info(f"[SYNTHESIS] Added {len(page_images)} page images from cited documents to corrective answer")
-            
-            # 새로운 필드 수집 및 설정 (corrective answer에서도 동일하게)
-            # 1. Human feedback 수집
-            human_feedback = self._collect_human_feedback(documents)
-            if human_feedback:
-                result.human_feedback_used = human_feedback
-                logger.info(f"[SYNTHESIS-CORRECTIVE] Found {len(human_feedback)} human feedback entries")
-            
-            # 2. Entity references 수집
-            doc_idx_map = {}
-            for idx in range(len(documents)):
-                doc_idx_map[idx] = f"[{idx+1}]"
-            
-            entity_refs = self._collect_entity_references(documents, doc_idx_map)
-            if entity_refs:
-                result.entity_references = entity_refs
-                logger.info(f"[SYNTHESIS-CORRECTIVE] Found {len(entity_refs)} entity references")
-            
-            # 3. 경고사항 추출
-            warnings = self._extract_warnings(documents)
-            if warnings:
-                result.warnings = warnings
-                logger.info(f"[SYNTHESIS-CORRECTIVE] Extracted {len(warnings)} warnings")
+            result = self._attach_document_details(result, packed_documents, log_tag="SYNTHESIS-CORRECTIVE")
             
             logger.info(f"[SYNTHESIS] Corrective answer generated successfully")
             return result
             
+        except PartialStreamError:
+            raise
         except Exception as e:
             logger.error(f"[SYNTHESIS] Corrective generation failed: {str(e)}")
             # Fallback to original method
-            return self._generate_answer_with_fallback(query, documents)
+            return self._generate_answer(query, documents)
     
     def _generate_improved_answer(self, query: str, documents: List[Document],
                                        quality_feedback: Dict[str, Any],
@@ -1194,84 +1161,26 @@ Generate an IMPROVED answer that addresses all feedback.
 Focus on completeness, structure, and usefulness.""")
         ])
         
-        # 구조화된 출력으로 답변 생성
-        structured_llm = self.llm.with_structured_output(
-            SynthesisResult
-        )
-        
-        # 문서 포맷팅
-        formatted_docs = self._format_documents(documents)
+        # 토큰 예산에 맞춰 문서 패킹 후 포맷팅
+        packed_documents = self._pack_documents(documents)
+        formatted_docs = self._format_documents(packed_documents)
         
         try:
-            result = self._invoke_with_retry(
-                structured_llm,
+            result = self._run_synthesis(
                 improvement_prompt.format_messages(
                     query=query,
                     documents=formatted_docs
                 )
             )
             
-            # sources_used를 기반으로 인용된 문서의 페이지 이미지만 수집
-            page_images = self._collect_page_images(documents, sources_used=result.sources_used)
-            
-            # 페이지 이미지를 답변에 추가 및 page_images 필드 설정
-            if page_images:
-                # PageImageInfo 객체 리스트 생성
-                page_image_infos = []
-                for img in page_images:
-                    page_image_infos.append(PageImageInfo(
-                        path=img['path'],
-                        page=img['page'],
-                        source=img['source']
-                    ))
-                result.page_images = page_image_infos
-                
-                # 답변 텍스트에 접을 수 있는 이미지 섹션 추가
-                image_count = len(page_images)
-                image_section = "\n\n## 📎 참조 페이지 이미지\n"
-                image_section += f"### 📄 페이지 이미지 ({image_count}개)\n\n"
-                
-                current_source = None
-                for img in page_images:
-                    if img['source'] != current_source:
-                        current_source = img['source']
-                        image_section += f"\n### 📄 {current_source}\n"
-                    
-                    image_section += f"![Page {img['page']}]({img['path']})\n"
-                
-                # 이미지 섹션 완료
-                
-                # 답변에 이미지 섹션 추가
-                result.answer = result.answer + image_section
-                logger.info(f"[SYNTHESIS] Added {len(page_images)} page images from cited documents to improved answer")
-            
-            # 새로운 필드 수집 및 설정 (improved answer에서도 동일하게)
-            # 1. Human feedback 수집
-            human_feedback = self._collect_human_feedback(documents)
-            if human_feedback:
-                result.human_feedback_used = human_feedback
-                logger.info(f"[SYNTHESIS-IMPROVED] Found {len(human_feedback)} human feedback entries")
-            
-            # 2. Entity references 수집
-            doc_idx_map = {}
-            for idx in range(len(documents)):
-                doc_idx_map[idx] = f"[{idx+1}]"
-            
-            entity_refs = self._collect_entity_references(documents, doc_idx_map)
-            if entity_refs:
-                result.entity_references = entity_refs
-                logger.info(f"[SYNTHESIS-IMPROVED] Found {len(entity_refs)} entity references")
-            
-            # 3. 경고사항 추출
-            warnings = self._extract_warnings(documents)
-            if warnings:
-                result.warnings = warnings
-                logger.info(f"[SYNTHESIS-IMPROVED] Extracted {len(warnings)} warnings")
+            result = self._attach_document_details(result, packed_documents, log_tag="SYNTHESIS-IMPROVED")
             
             logger.info(f"[SYNTHESIS] Improved answer generated successfully")
             return result
             
+        except PartialStreamError:
+            raise
         except Exception as e:
             logger.error(f"[SYNTHESIS] Improved generation failed: {str(e)}")
             # Fallback to original method
-            return self._generate_answer_with_fallback(query, documents)
\ No newline at end of file
+            return self._generate_answer(query, documents)
\ No newline at end of file
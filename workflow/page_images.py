@@ -0,0 +1,334 @@
+"""
+Page Image Service
+답변에서 실제로 인용된 페이지만 필요할 때 렌더링하는 페이지 이미지 서비스
+
+- 처음 인용될 때 PyMuPDF로 렌더링, 이후에는 디스크 캐시에서 바로 제공
+- 원본 크기 이미지 + 표시용 축소 변형(thumbnail/medium, WebP/JPEG)
+- 전체 용량 제한 LRU 디스크 캐시 (파일 mtime = 마지막 접근 시각)
+- 캐시 파일명에 원본 PDF 버전(mtime + 크기)을 포함해 PDF가 바뀌면 다시 렌더링 (이전 파일은 LRU로 제거)
+- 사전 렌더링된 이미지/변형(scripts/0_convert_pdf_to_images.py)이 있으면 그대로 사용
+  (파일명 규칙은 ingest.pdf_to_image와 공유)
+"""
+
+import os
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+
+from ingest.pdf_to_image import ImageVariant, page_image_stem, save_pixmap, variant_filename
+
+load_dotenv()
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+# 캐시 디렉토리에서 관리하는 이미지 확장자
+IMAGE_EXTENSIONS = ("png", "jpg", "jpeg", "webp")
+
+
+class PageImageService:
+    """지연 렌더링 + 용량 제한 LRU 디스크 캐시"""
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        dpi: Optional[int] = None,
+        image_format: str = "png",
+        prerendered_dir: Optional[str] = None,
+        pdf_dir: Optional[str] = None,
+        variant_widths: Optional[Dict[str, int]] = None,
+        variant_format: Optional[str] = None,
+        variant_quality: Optional[int] = None
+    ):
+        """
+        초기화 (인자가 없으면 환경변수 사용)
+
+        Args:
+            cache_dir: 렌더링 캐시 디렉토리 (PAGE_IMAGE_CACHE_DIR)
+            max_bytes: 캐시 최대 용량 (PAGE_IMAGE_CACHE_MAX_MB)
+            dpi: 원본 크기 렌더링 해상도 (PAGE_IMAGE_DPI)
+            image_format: 원본 크기 이미지 포맷
+            prerendered_dir: 사전 렌더링 이미지 디렉토리 (PAGE_IMAGE_PRERENDERED_DIR)
+            pdf_dir: source 경로에서 PDF를 못 찾을 때 찾아볼 디렉토리 (PAGE_IMAGE_PDF_DIR)
+            variant_widths: 변형 이름 -> 최대 폭(px) (PAGE_IMAGE_THUMBNAIL_WIDTH, PAGE_IMAGE_MEDIUM_WIDTH,
+                빈 dict면 변형 없음, PAGE_IMAGE_VARIANTS=false와 동일)
+            variant_format: 변형 포맷 webp / jpeg (PAGE_IMAGE_VARIANT_FORMAT)
+            variant_quality: 변형 압축 품질 1-100 (PAGE_IMAGE_VARIANT_QUALITY)
+        """
+        self.cache_dir = Path(cache_dir or os.getenv("PAGE_IMAGE_CACHE_DIR", "data/cache/page_images"))
+        self.max_bytes = max_bytes or int(float(os.getenv("PAGE_IMAGE_CACHE_MAX_MB", "512")) * 1024 * 1024)
+        self.dpi = dpi or int(os.getenv("PAGE_IMAGE_DPI", "150"))
+        self.image_format = image_format
+        self.prerendered_dir = Path(prerendered_dir or os.getenv("PAGE_IMAGE_PRERENDERED_DIR", "data/images"))
+        self.pdf_dir = Path(pdf_dir or os.getenv("PAGE_IMAGE_PDF_DIR", "data"))
+
+        if variant_widths is None:
+            variant_widths = {}
+            if os.getenv("PAGE_IMAGE_VARIANTS", "true").lower() == "true":
+                variant_widths = {
+                    "thumbnail": int(os.getenv("PAGE_IMAGE_THUMBNAIL_WIDTH", "240")),
+                    "medium": int(os.getenv("PAGE_IMAGE_MEDIUM_WIDTH", "960"))
+                }
+        self.variant_widths = variant_widths
+        self.variant_format = (variant_format or os.getenv("PAGE_IMAGE_VARIANT_FORMAT", "webp")).lower()
+        self.variant_quality = variant_quality or int(os.getenv("PAGE_IMAGE_VARIANT_QUALITY", "80"))
+
+        self._lock = threading.Lock()
+        # 렌더링 중인 페이지별 lock (같은 페이지 중복 렌더링 방지)
+        self._render_locks: Dict[str, threading.Lock] = {}
+        # 캐시 파일 경로 -> 크기, 가장 최근 접근이 뒤쪽
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        # 이미지 경로 -> (width, height)
+        self._dimensions: Dict[str, Tuple[int, int]] = {}
+
+        self.stats = {"prerendered": 0, "hits": 0, "renders": 0, "evictions": 0, "missing": 0}
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._scan()
+
+    def _scan(self):
+        """기존 캐시 파일을 마지막 접근 순서로 등록"""
+        files = [
+            p for ext in IMAGE_EXTENSIONS for p in self.cache_dir.glob(f"*.{ext}") if p.is_file()
+        ]
+        for path in sorted(files, key=lambda p: p.stat().st_mtime):
+            size = path.stat().st_size
+            self._entries[str(path)] = size
+            self._total_bytes += size
+        if files:
+            logger.info(
+                f"[PAGE_IMAGES] Cache ready: {len(files)} images, "
+                f"{self._total_bytes / 1024 / 1024:.1f}/{self.max_bytes / 1024 / 1024:.0f} MB"
+            )
+
+    @staticmethod
+    def source_version(pdf_path: Path) -> str:
+        """원본 PDF 버전 (mtime + 크기 해시, PDF가 교체되면 캐시 키가 바뀜)"""
+        stat = pdf_path.stat()
+        return hashlib.sha1(f"{stat.st_mtime_ns}:{stat.st_size}".encode()).hexdigest()[:10]
+
+    def cache_path(self, source: str, page: int, version: str) -> Path:
+        """원본 크기 렌더링 캐시 경로 (DPI, 원본 PDF 버전별로 구분)"""
+        return self.cache_dir / f"{page_image_stem(source, page)}@{self.dpi}-{version}.{self.image_format}"
+
+    def _variant_filename(self, page_stem: str, name: str) -> str:
+        """변형 파일명 (사전 렌더링 스크립트와 같은 규칙)"""
+        variant = ImageVariant(name, self.variant_widths[name])
+        return variant_filename(page_stem, variant, self.variant_format, self.variant_quality)
+
+    def variant_path(self, source: str, page: int, name: str, version: str) -> Path:
+        """축소 변형 캐시 경로 (원본 PDF 버전별로 구분)"""
+        return self.cache_dir / self._variant_filename(f"{page_image_stem(source, page)}-{version}", name)
+
+    def _prerendered_path(self, source: str, page: int) -> Path:
+        return self.prerendered_dir / f"{page_image_stem(source, page)}.{self.image_format}"
+
+    def _prerendered_variant_path(self, source: str, page: int, name: str) -> Path:
+        return self.prerendered_dir / self._variant_filename(page_image_stem(source, page), name)
+
+    def _find_pdf(self, source: str) -> Optional[Path]:
+        """source 경로 또는 PDF 디렉토리에서 원본 PDF 찾기"""
+        for candidate in (Path(source), self.pdf_dir / os.path.basename(source)):
+            if candidate.suffix.lower() == ".pdf" and candidate.is_file():
+                return candidate
+        return None
+
+    def _touch(self, path: Path):
+        """LRU 순서 갱신 (lock 안에서 호출)"""
+        key = str(path)
+        if key not in self._entries:
+            return
+        self._entries.move_to_end(key)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _add(self, path: Path, keep: List[str]):
+        """새 렌더링 파일 등록 후 용량 초과분 제거 (lock 안에서 호출, keep은 제거 제외)"""
+        key = str(path)
+        size = path.stat().st_size
+        self._total_bytes += size - self._entries.pop(key, 0)
+        self._entries[key] = size
+
+        for old_key in list(self._entries):
+            if self._total_bytes <= self.max_bytes:
+                break
+            if old_key in keep:
+                continue
+            self._total_bytes -= self._entries.pop(old_key)
+            self._dimensions.pop(old_key, None)
+            self.stats["evictions"] += 1
+            try:
+                os.remove(old_key)
+            except OSError as e:
+                logger.warning(f"[PAGE_IMAGES] Failed to evict {old_key}: {e}")
+
+    def _dimensions_of(self, path: Path) -> Tuple[Optional[int], Optional[int]]:
+        """이미지 크기 (렌더링 시 기록, 이전 실행 파일은 헤더만 읽음)"""
+        dims = self._dimensions.get(str(path))
+        if dims is None:
+            try:
+                from PIL import Image
+                with Image.open(path) as image:
+                    dims = image.size
+                self._dimensions[str(path)] = dims
+            except Exception:
+                return None, None
+        return dims
+
+    def _render(
+        self,
+        pdf_path: Path,
+        page: int,
+        full_target: Optional[Path],
+        variant_targets: Dict[str, Path]
+    ):
+        """원본 크기 이미지와 누락된 변형을 한 번에 렌더링"""
+        import fitz  # PyMuPDF - 렌더링이 필요할 때만 로드
+
+        with fitz.open(str(pdf_path)) as pdf_document:
+            if not 1 <= page <= len(pdf_document):
+                raise ValueError(f"Page {page} out of range ({len(pdf_document)} pages)")
+            pdf_page = pdf_document[page - 1]
+
+            targets = []
+            if full_target is not None:
+                zoom = self.dpi / 72.0
+                targets.append((full_target, zoom, self.image_format))
+            page_width = pdf_page.rect.width or 1
+            for name, target in variant_targets.items():
+                zoom = self.variant_widths[name] / page_width
+                targets.append((target, zoom, self.variant_format))
+
+            for target, zoom, image_format in targets:
+                pix = pdf_page.get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+                # 임시 파일에 쓴 뒤 교체 (동시 조회 시 불완전한 파일 노출 방지)
+                tmp_path = target.with_name(f".{target.stem}.{threading.get_ident()}.tmp")
+                save_pixmap(pix, tmp_path, image_format, self.variant_quality)
+                os.replace(tmp_path, target)
+                self._dimensions[str(target)] = (pix.width, pix.height)
+
+    def resolve_page(self, source: str, page: int) -> Optional[Dict[str, Any]]:
+        """
+        페이지 이미지와 변형 조회 (없으면 렌더링)
+
+        Args:
+            source: 원본 PDF 경로 (검색 결과의 source)
+            page: 페이지 번호 (1-based)
+
+        Returns:
+            {"path", "width", "height", "variants": {name: {"path", "width", "height", "format"}}}
+            또는 None (PDF가 없거나 렌더링 실패)
+        """
+        if not source or not page or page < 1:
+            return None
+
+        prerendered = self._prerendered_path(source, page)
+        pdf_path = self._find_pdf(source)
+        version = self.source_version(pdf_path) if pdf_path is not None else None
+        if prerendered.is_file():
+            full_path = prerendered
+        elif version is not None:
+            full_path = self.cache_path(source, page, version)
+        else:
+            self.stats["missing"] += 1
+            logger.debug(f"[PAGE_IMAGES] Source PDF not found: {source}")
+            return None
+        # 변형도 사전 렌더링 파일 우선 (원본 PDF가 없으면 캐시가 최신인지 알 수 없으므로 캐시 변형 생략)
+        variant_paths = {}
+        for name in self.variant_widths:
+            prerendered_variant = self._prerendered_variant_path(source, page, name)
+            if prerendered_variant.is_file():
+                variant_paths[name] = prerendered_variant
+            elif version is not None:
+                variant_paths[name] = self.variant_path(source, page, name, version)
+
+        def missing_parts() -> Tuple[bool, List[str]]:
+            return (
+                not full_path.is_file(),
+                [name for name, path in variant_paths.items() if not path.is_file()]
+            )
+
+        key = f"{source}#{page}"
+        with self._lock:
+            render_lock = self._render_locks.setdefault(key, threading.Lock())
+
+        with render_lock:
+            full_missing, variants_missing = missing_parts()
+            if full_missing or variants_missing:
+                # 누락된 파일은 모두 원본 PDF 버전이 있는 캐시 경로 (pdf_path가 있음)
+                try:
+                    self._render(
+                        pdf_path, page, full_path if full_missing else None,
+                        {name: variant_paths[name] for name in variants_missing}
+                    )
+                except Exception as e:
+                    logger.warning(f"[PAGE_IMAGES] Failed to render {pdf_path.name} page {page}: {e}")
+                    if not full_path.is_file():
+                        return None
+                    variant_paths = {n: p for n, p in variant_paths.items() if p.is_file()}
+                else:
+                    self.stats["renders"] += 1
+                    logger.info(
+                        f"[PAGE_IMAGES] Rendered {pdf_path.name} page {page} "
+                        f"(full: {full_missing}, variants: {variants_missing})"
+                    )
+
+            # LRU 등록/갱신 (이번 페이지 파일은 제거 대상에서 제외)
+            page_files = [str(p) for p in [full_path, *variant_paths.values()] if p.parent == self.cache_dir]
+            with self._lock:
+                self._render_locks.pop(key, None)
+                for path in [full_path, *variant_paths.values()]:
+                    if path.parent != self.cache_dir:
+                        continue
+                    if str(path) in self._entries:
+                        self._touch(path)
+                    elif path.is_file():
+                        self._add(path, keep=page_files)
+                if not (full_missing or variants_missing):
+                    self.stats["hits"] += 1
+            if full_path == prerendered:
+                self.stats["prerendered"] += 1
+
+        width, height = self._dimensions_of(full_path)
+        variants = {}
+        for name, path in variant_paths.items():
+            v_width, v_height = self._dimensions_of(path)
+            variants[name] = {"path": str(path), "width": v_width, "height": v_height, "format": self.variant_format}
+        return {"path": str(full_path), "width": width, "height": height, "variants": variants}
+
+    def resolve(self, source: str, page: int) -> Optional[str]:
+        """원본 크기 페이지 이미지 경로 조회 (없으면 렌더링)"""
+        resolved = self.resolve_page(source, page)
+        return resolved["path"] if resolved else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 통계"""
+        with self._lock:
+            return {
+                **self.stats,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes
+            }
+
+
+_service: Optional[PageImageService] = None
+_service_lock = threading.Lock()
+
+
+def get_page_image_service() -> PageImageService:
+    """프로세스 공용 페이지 이미지 서비스"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = PageImageService()
+    return _service
@@ -0,0 +1,218 @@
+"""
+Speculative Retrieval
+라우팅/플래닝과 겹쳐서 원본 쿼리 검색을 미리 실행하는 모듈
+
+- 그래프 시작 시 원본 쿼리로 언어 감지 + 하이브리드 검색을 백그라운드 실행
+- 서브태스크/쿼리 변형이 같은 텍스트이고 필터가 없으면 결과 재사용
+- 라우터가 direct_response를 선택하면 결과 폐기
+- 짧은 TTL과 최대 개수로 저장소 크기 제한
+"""
+
+import os
+import re
+import time
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+
+from retrieval.tracing import request_trace, submit_in_context
+
+load_dotenv()
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """재사용 판단용 쿼리 정규화 (공백 정리, 소문자)"""
+    return _WHITESPACE.sub(" ", (query or "").strip()).lower()
+
+
+def _is_unfiltered(filter_dict: Optional[Dict[str, Any]]) -> bool:
+    """필터가 비어 있거나 모든 값이 None이면 True"""
+    if not filter_dict:
+        return True
+    return all(value in (None, [], {}, "") for value in filter_dict.values())
+
+
+class SpeculativeRetrieval:
+    """원본 쿼리 선행 검색 (RetrievalNode 결과 형식 그대로 재사용)"""
+
+    def __init__(
+        self,
+        retrieval_node,
+        max_workers: Optional[int] = None,
+        wait_seconds: Optional[float] = None,
+        ttl_seconds: Optional[float] = None,
+        max_entries: int = 32
+    ):
+        """
+        초기화 (인자가 없으면 환경변수 사용)
+
+        Args:
+            retrieval_node: RetrievalNode 인스턴스 (_initialize, _detect_language, _bilingual_search 사용)
+            max_workers: 백그라운드 검색 스레드 수 (SPECULATIVE_RETRIEVAL_WORKERS)
+            wait_seconds: 재사용 시 진행 중인 검색을 기다리는 최대 시간 (SPECULATIVE_RETRIEVAL_WAIT_SEC)
+            ttl_seconds: 선행 검색 결과 유효 시간 (SPECULATIVE_RETRIEVAL_TTL_SEC)
+            max_entries: 보관할 최대 선행 검색 수
+        """
+        self.retrieval_node = retrieval_node
+        self.max_workers = max_workers or int(os.getenv("SPECULATIVE_RETRIEVAL_WORKERS", "2"))
+        self.wait_seconds = wait_seconds if wait_seconds is not None else float(
+            os.getenv("SPECULATIVE_RETRIEVAL_WAIT_SEC", "10")
+        )
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(
+            os.getenv("SPECULATIVE_RETRIEVAL_TTL_SEC", "120")
+        )
+        self.max_entries = max_entries
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="speculative-retrieval"
+        )
+        self._lock = threading.Lock()
+        # 정규화 쿼리 -> (시작 시각, Future)
+        self._entries: "OrderedDict[str, Tuple[float, Future]]" = OrderedDict()
+
+        self.stats = {"started": 0, "hits": 0, "misses": 0, "discarded": 0, "failed": 0}
+
+    def _search(self, query: str) -> Tuple[List[Any], Optional[Dict[str, Any]]]:
+        """백그라운드 검색 (RetrievalNode.search_task와 같은 (result, stats) 형식)"""
+        node = self.retrieval_node
+        node._initialize()
+        detection = node._detect_language(query)
+        result = node._bilingual_search(
+            query=query,
+            filter_dict=None,
+            primary_language=detection.language,
+            top_k=node.default_top_k
+        )
+        stats = None
+        if getattr(node.hybrid_search, "last_search_stats", None):
+            stats = node.hybrid_search.last_search_stats.copy()
+            stats["detected_language"] = detection.language
+            stats["speculative"] = True
+        logger.info(f"[SPECULATIVE] Pre-search completed: {len(result)} docs ({detection.language})")
+        return result, stats
+
+    def _traced_search(self, query: str) -> Tuple[List[Any], Optional[Dict[str, Any]]]:
+        """
+        자체 trace 범위에서 선행 검색
+
+        호출한 요청의 trace 범위는 선행 검색보다 먼저 끝나므로, 그 trace에 보관한 상세 로그는
+        출력되지 않음. trace id만 물려받고 느린 요청 판단/지연 상세 로그는 이 범위 기준.
+        """
+        with request_trace("speculative"):
+            return self._search(query)
+
+    def _prune(self, now: float):
+        """만료/초과 엔트리 제거 (lock 안에서 호출)"""
+        for key in [k for k, (started, _) in self._entries.items() if now - started > self.ttl_seconds]:
+            _, future = self._entries.pop(key)
+            future.cancel()
+        while len(self._entries) > self.max_entries:
+            _, (_, future) = self._entries.popitem(last=False)
+            future.cancel()
+
+    def start(self, query: str) -> bool:
+        """
+        원본 쿼리 선행 검색 시작 (이미 진행 중이면 무시)
+
+        Returns:
+            새 검색을 시작했으면 True
+        """
+        key = normalize_query(query)
+        if not key:
+            return False
+
+        now = time.time()
+        with self._lock:
+            self._prune(now)
+            if key in self._entries:
+                return False
+            # 요청의 trace id를 유지 (선행 검색 로그도 같은 요청으로 묶임)
+            self._entries[key] = (now, submit_in_context(self._executor, self._traced_search, query))
+            self.stats["started"] += 1
+
+        logger.info(f"[SPECULATIVE] Started pre-search for: '{query[:50]}'")
+        return True
+
+    def take(
+        self,
+        query: str,
+        filter_dict: Optional[Dict[str, Any]] = None
+    ) -> Optional[Tuple[List[Any], Optional[Dict[str, Any]]]]:
+        """
+        선행 검색 결과 조회
+
+        필터가 없는 검색이고 정규화된 쿼리가 같을 때만 재사용한다.
+        진행 중이면 wait_seconds까지 기다린다.
+
+        Returns:
+            (result, stats) 튜플 또는 None (재사용 불가)
+        """
+        if not _is_unfiltered(filter_dict):
+            return None
+
+        key = normalize_query(query)
+        with self._lock:
+            self._prune(time.time())
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+
+        _, future = entry
+        try:
+            result, stats = future.result(timeout=self.wait_seconds)
+        except FutureTimeoutError:
+            logger.warning(f"[SPECULATIVE] Pre-search still running after {self.wait_seconds}s, searching normally")
+            with self._lock:
+                self.stats["misses"] += 1
+            return None
+        except Exception as e:
+            logger.warning(f"[SPECULATIVE] Pre-search failed, searching normally: {e}")
+            with self._lock:
+                self.stats["failed"] += 1
+                self._entries.pop(key, None)
+            return None
+
+        with self._lock:
+            self.stats["hits"] += 1
+        logger.info(f"[SPECULATIVE] Reusing pre-search results for: '{query[:50]}'")
+        # 여러 서브태스크가 같은 쿼리를 써도 리스트를 공유하지 않도록 복사
+        return list(result), (dict(stats) if stats else stats)
+
+    def discard(self, query: str):
+        """선행 검색 폐기 (direct_response 라우팅 등)"""
+        with self._lock:
+            entry = self._entries.pop(normalize_query(query), None)
+            if entry is not None:
+                self.stats["discarded"] += 1
+        if entry is not None:
+            entry[1].cancel()
+            logger.info(f"[SPECULATIVE] Discarded pre-search for: '{query[:50]}'")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """선행 검색 통계"""
+        with self._lock:
+            stats = dict(self.stats)
+            pending = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        return {
+            **stats,
+            "pending": pending,
+            "hit_rate": stats["hits"] / lookups if lookups else 0.0
+        }
+
+    def shutdown(self):
+        """백그라운드 스레드 정리"""
+        with self._lock:
+            for _, future in self._entries.values():
+                future.cancel()
+            self._entries.clear()
+        self._executor.shutdown(wait=False)
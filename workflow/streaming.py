@@ -0,0 +1,94 @@
+"""
+Synthesis Streaming Helpers
+Synthesis 노드의 답변 토큰 스트리밍 관련 상수와 필터
+
+스트리밍 모드에서 LLM은 답변 본문을 먼저 출력하고, 구분자 뒤에 구조화 필드
+(confidence, sources_used, key_points, references_table)를 JSON 블록으로 출력한다.
+LangGraph `messages` 스트림 소비자는 AnswerTokenFilter로 구분자 이후를 숨긴다.
+"""
+
+from typing import Any, Dict, Optional
+
+# 답변 본문과 구조화 필드 블록을 나누는 구분자
+SYNTHESIS_META_DELIMITER = "<<<SYNTHESIS_META>>>"
+
+# 스트리밍 LLM에 붙는 태그 (messages 스트림 필터링용)
+SYNTHESIS_STREAM_TAG = "synthesis_stream"
+
+# 스트리밍에서 제외할 LLM 호출 태그 (LangGraph 규약)
+NOSTREAM_TAG = "nostream"
+
+
+class PartialStreamError(RuntimeError):
+    """
+    답변 토큰이 이미 클라이언트로 전송된 뒤 스트리밍 생성이 실패
+
+    이 경우 답변을 다시 생성하면 클라이언트에 두 번째 답변이 이어 붙으므로
+    재생성 fallback 없이 오류로 보고한다.
+    """
+
+
+class AnswerTokenFilter:
+    """
+    스트리밍 토큰에서 답변 본문만 통과시키는 필터
+
+    구분자가 여러 청크에 걸쳐 나뉘어 도착할 수 있으므로, 구분자 접두사와
+    일치하는 꼬리 부분은 다음 청크가 올 때까지 보류한다.
+    """
+
+    def __init__(self, delimiter: str = SYNTHESIS_META_DELIMITER):
+        self.delimiter = delimiter
+        self._pending = ""
+        self.finished = False
+
+    def feed(self, text: str) -> str:
+        """
+        토큰 청크 입력
+
+        Args:
+            text: 새로 도착한 토큰 텍스트
+
+        Returns:
+            화면에 출력해도 되는 답변 텍스트 (없으면 빈 문자열)
+        """
+        if self.finished or not text:
+            return ""
+
+        buffer = self._pending + text
+        idx = buffer.find(self.delimiter)
+        if idx >= 0:
+            self.finished = True
+            self._pending = ""
+            return buffer[:idx]
+
+        # 버퍼 끝이 구분자의 접두사와 겹치면 그 부분은 보류
+        hold = 0
+        for size in range(min(len(self.delimiter) - 1, len(buffer)), 0, -1):
+            if self.delimiter.startswith(buffer[-size:]):
+                hold = size
+                break
+        self._pending = buffer[-hold:] if hold else ""
+        return buffer[:-hold] if hold else buffer
+
+    def flush(self) -> str:
+        """스트림 종료 시 보류 중인 텍스트 반환"""
+        if self.finished:
+            return ""
+        pending, self._pending = self._pending, ""
+        return pending
+
+
+def is_synthesis_stream_chunk(metadata: Optional[Dict[str, Any]]) -> bool:
+    """
+    LangGraph messages 스트림 메타데이터가 synthesis 답변 토큰인지 확인
+
+    Args:
+        metadata: (message_chunk, metadata) 튜플의 metadata
+
+    Returns:
+        synthesis 스트리밍 LLM에서 나온 토큰이면 True
+    """
+    if not metadata:
+        return False
+    tags = metadata.get("tags") or []
+    return metadata.get("langgraph_node") == "synthesis" and SYNTHESIS_STREAM_TAG in tags
@@ -57,6 +57,8 @@ def create_search_tool(max_results: int = 5) -> Optional[Union[Tool, object]]:
     return None
 
 
+from .search_cache import WebSearchCache, QuotaManager, get_search_cache
+
 # 기존 import 유지 (하위 호환성)
 try:
     from .tavily_search import TavilySearchTool
@@ -69,4 +71,7 @@ except ImportError:
     GoogleSearchTool = None
 
 
-__all__ = ["TavilySearchTool", "GoogleSearchTool", "create_search_tool"]
\ No newline at end of file
+__all__ = [
+    "TavilySearchTool", "GoogleSearchTool", "create_search_tool",
+    "WebSearchCache", "QuotaManager", "get_search_cache"
+]
\ No newline at end of file
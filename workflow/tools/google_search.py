@@ -5,30 +5,24 @@ TavilySearchTool과 100% 호환되는 인터페이스 제공
 """
 
 import os
-import time
 import asyncio
 import logging
-from typing import List, Dict, Any, Optional
-from datetime import datetime, date
-from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 
 from langchain_core.documents import Document
 from langchain_core.tools import Tool
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 
-# Google API Client
-try:
-    from googleapiclient.discovery import build
-    from googleapiclient.errors import HttpError
-    GOOGLE_API_AVAILABLE = True
-except ImportError:
-    GOOGLE_API_AVAILABLE = False
-    print("Warning: google-api-python-client not installed. Run: pip install google-api-python-client")
+from .search_cache import QuotaManager, get_search_cache, make_search_key
+from .http_client import describe_http_error, get_search_http_client
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# Google Custom Search JSON API 엔드포인트
+GOOGLE_CSE_ENDPOINT = "https://www.googleapis.com/customsearch/v1"
+
 
 class GoogleSearchResult(BaseModel):
     """Google 검색 결과"""
@@ -37,105 +31,6 @@ class GoogleSearchResult(BaseModel):
     total_results: int = Field(description="전체 결과 수")
 
 
-class QuotaManager:
-    """API 쿼터 관리자 - 일일 100회 제한 관리"""
-    
-    def __init__(self, daily_limit: int = 100):
-        """
-        초기화
-        
-        Args:
-            daily_limit: 일일 쿼리 제한 (기본 100)
-        """
-        self.daily_limit = daily_limit
-        self.queries_today = 0
-        self.last_reset = date.today()
-        self.query_log = []
-    
-    def can_query(self) -> bool:
-        """쿼리 가능 여부 확인"""
-        self._check_reset()
-        return self.queries_today < self.daily_limit
-    
-    def increment(self, query: str = ""):
-        """쿼리 카운트 증가"""
-        self._check_reset()
-        self.queries_today += 1
-        self.query_log.append({
-            "time": datetime.now(),
-            "query": query[:50] if query else "",
-            "count": self.queries_today
-        })
-        logger.debug(f"[QUOTA] Used {self.queries_today}/{self.daily_limit} queries today")
-    
-    def remaining(self) -> int:
-        """남은 쿼리 수 반환"""
-        self._check_reset()
-        return max(0, self.daily_limit - self.queries_today)
-    
-    def _check_reset(self):
-        """날짜가 바뀌었으면 카운터 리셋"""
-        if date.today() > self.last_reset:
-            self.queries_today = 0
-            self.query_log = []
-            self.last_reset = date.today()
-            logger.info(f"[QUOTA] Daily quota reset. {self.daily_limit} queries available.")
-
-
-class SearchCache:
-    """검색 결과 캐시 - API 호출 최소화"""
-    
-    def __init__(self, ttl: int = 3600):
-        """
-        초기화
-        
-        Args:
-            ttl: 캐시 유효 시간 (초, 기본 1시간)
-        """
-        self.cache = {}
-        self.ttl = ttl
-        self.hits = 0
-        self.misses = 0
-    
-    def get(self, query: str) -> Optional[List[Document]]:
-        """캐시에서 결과 가져오기"""
-        cache_key = self._make_key(query)
-        
-        if cache_key in self.cache:
-            entry_time, documents = self.cache[cache_key]
-            if time.time() - entry_time < self.ttl:
-                self.hits += 1
-                logger.debug(f"[CACHE] Hit for query: '{query[:30]}...' (hit rate: {self.hit_rate():.1%})")
-                return documents
-            else:
-                # 만료된 캐시 제거
-                del self.cache[cache_key]
-        
-        self.misses += 1
-        return None
-    
-    def set(self, query: str, documents: List[Document]):
-        """캐시에 결과 저장"""
-        cache_key = self._make_key(query)
-        self.cache[cache_key] = (time.time(), documents)
-        logger.debug(f"[CACHE] Stored {len(documents)} results for: '{query[:30]}...'")
-        
-        # 캐시 크기 제한 (최대 100개)
-        if len(self.cache) > 100:
-            # 가장 오래된 항목 제거
-            oldest_key = min(self.cache.keys(), key=lambda k: self.cache[k][0])
-            del self.cache[oldest_key]
-    
-    def hit_rate(self) -> float:
-        """캐시 히트율 계산"""
-        total = self.hits + self.misses
-        return self.hits / total if total > 0 else 0.0
-    
-    def _make_key(self, query: str) -> str:
-        """캐시 키 생성"""
-        return query.lower().strip()
-
-
 class GoogleSearchInput(BaseModel):
     """Google Search Tool의 입력 스키마"""
     query: str = Field(
@@ -165,119 +60,142 @@ class GoogleSearchTool:
                 missing.append("GOOGLE_SEARCH_ENGINE_ID")
             raise ValueError(f"Missing Google Search credentials: {missing}")
         
-        if not GOOGLE_API_AVAILABLE:
-            raise ImportError("google-api-python-client not installed. Run: pip install google-api-python-client")
-        
         self.api_key = api_key
         self.cse_id = cse_id
         self.max_results = max_results
         
-        # Google API 서비스 빌드
-        try:
-            self.service = build("customsearch", "v1", developerKey=api_key)
-            logger.info("[GOOGLE] Google Custom Search API initialized successfully")
-        except Exception as e:
-            raise ValueError(f"Failed to initialize Google Search API: {e}")
+        # 공유 HTTP 연결 풀 (keep-alive, 동시 요청 제한, 타임아웃)
+        self.http = get_search_http_client()
         
-        # 쿼터 매니저 및 캐시 초기화
-        self.quota_manager = QuotaManager(daily_limit=100)
-        self.cache = SearchCache(ttl=3600)  # 1시간 캐시
-        
-        # ThreadPoolExecutor for async operations
-        self.executor = ThreadPoolExecutor(max_workers=1)
+        # 쿼터 매니저 및 캐시 초기화 (Tavily, DirectResponse 도구와 공유, 재시작 후에도 유지)
+        self.cache = get_search_cache()
+        self.quota_manager = QuotaManager(
+            daily_limit=int(os.getenv("GOOGLE_DAILY_QUOTA", "100")),
+            provider="google",
+            store=self.cache
+        )
         
         logger.info(f"[GOOGLE] GoogleSearchTool initialized with max_results={max_results}")
     
-    def _search_sync(self, query: str, search_depth: str = "basic") -> Dict[str, Any]:
+    def _page_plan(self, search_depth: str) -> List[Tuple[int, int]]:
         """
-        동기 검색 실행 (내부용)
+        요청할 페이지 목록 (Google API는 요청당 최대 10개)
         
         Args:
-            query: 검색 쿼리
             search_depth: 검색 깊이 ("basic" 또는 "advanced")
             
         Returns:
-            검색 결과 딕셔너리
+            (start, num) 튜플 리스트
         """
         # search_depth를 결과 수로 매핑
         depth_mapping = {
             "basic": min(5, self.max_results),
             "advanced": min(10, self.max_results)
         }
-        num_results = depth_mapping.get(search_depth, self.max_results)
+        total_to_fetch = min(depth_mapping.get(search_depth, self.max_results), self.max_results)
+        return [
+            (start_index, min(10, total_to_fetch - start_index + 1))
+            for start_index in range(1, total_to_fetch + 1, 10)
+        ]
+    
+    def _page_params(self, query: str, start_index: int, num: int) -> Dict[str, Any]:
+        """페이지 요청 파라미터"""
+        return {"key": self.api_key, "cx": self.cse_id, "q": query, "num": num, "start": start_index}
+    
+    def _quota_error(self) -> Dict[str, Any]:
+        logger.warning(f"[GOOGLE] Daily quota exhausted ({self.quota_manager.daily_limit} queries)")
+        return {
+            "results": [],
+            "error": f"Google Search daily quota exhausted (limit: {self.quota_manager.daily_limit})"
+        }
+    
+    def _error_response(self, error: Exception) -> Dict[str, Any]:
+        status, error_msg = describe_http_error(error)
+        if status is not None:
+            logger.error(f"[GOOGLE] HTTP error {status}: {error}")
+        else:
+            logger.error(f"[GOOGLE] Search failed: {error}")
+        return {"results": [], "error": error_msg}
+    
+    def _search_sync(self, query: str, search_depth: str = "basic") -> Dict[str, Any]:
+        """
+        동기 검색 실행 (내부용, 페이지 순차 요청)
         
-        # 쿼터 체크
+        Args:
+            query: 검색 쿼리
+            search_depth: 검색 깊이 ("basic" 또는 "advanced")
+            
+        Returns:
+            검색 결과 딕셔너리
+        """
         if not self.quota_manager.can_query():
-            logger.warning(f"[GOOGLE] Daily quota exhausted ({self.quota_manager.daily_limit} queries)")
-            return {
-                "results": [],
-                "error": f"Google Search daily quota exhausted (limit: {self.quota_manager.daily_limit})"
-            }
+            return self._quota_error()
         
+        pages = self._page_plan(search_depth)
+        total_to_fetch = sum(num for _, num in pages)
         results = []
-        total_to_fetch = min(num_results, self.max_results)
         
         try:
-            # Google API는 한 번에 최대 10개까지만 반환
-            # 10개 이상 필요하면 여러 번 호출 (페이지네이션)
-            for start_index in range(1, total_to_fetch + 1, 10):
-                num_to_fetch = min(10, total_to_fetch - len(results))
-                
+            for start_index, num_to_fetch in pages:
                 logger.debug(f"[GOOGLE] Searching: '{query[:50]}...' (start={start_index}, num={num_to_fetch})")
-                
-                # API 호출
-                response = self.service.cse().list(
-                    q=query,
-                    cx=self.cse_id,
-                    num=num_to_fetch,
-                    start=start_index
-                ).execute()
-                
-                # 쿼터 카운트 증가
+                response = self.http.request(
+                    "GET", GOOGLE_CSE_ENDPOINT, params=self._page_params(query, start_index, num_to_fetch)
+                )
                 self.quota_manager.increment(query)
                 
-                # 결과 추출
-                items = response.get("items", [])
+                items = response.json().get("items", [])
                 results.extend(items)
                 
-                # 필요한 만큼 가져왔으면 중단
-                if len(results) >= total_to_fetch:
-                    break
-                
                 # 더 이상 결과가 없으면 중단
                 if len(items) < num_to_fetch:
                     break
-            
-            logger.info(f"[GOOGLE] Retrieved {len(results)} results (quota remaining: {self.quota_manager.remaining()})")
-            
-            return {
-                "results": results[:total_to_fetch],
-                "total": len(results),
-                "query": query
-            }
-            
-        except HttpError as e:
-            error_msg = str(e)
-            if e.resp.status == 429:
-                error_msg = "Rate limit exceeded. Please try again later."
-                logger.error(f"[GOOGLE] Rate limit error: {e}")
-            elif e.resp.status == 403:
-                error_msg = "API quota exceeded or permission denied."
-                logger.error(f"[GOOGLE] Quota/permission error: {e}")
-            else:
-                logger.error(f"[GOOGLE] HTTP error {e.resp.status}: {e}")
-            
-            return {
-                "results": [],
-                "error": error_msg
-            }
-            
         except Exception as e:
-            logger.error(f"[GOOGLE] Search failed: {e}")
-            return {
-                "results": [],
-                "error": str(e)
-            }
+            return self._error_response(e)
+        
+        logger.info(f"[GOOGLE] Retrieved {len(results)} results (quota remaining: {self.quota_manager.remaining()})")
+        return {"results": results[:total_to_fetch], "total": len(results), "query": query}
+    
+    async def _search_async(self, query: str, search_depth: str = "basic") -> Dict[str, Any]:
+        """
+        비동기 검색 실행 (내부용, 페이지 병렬 요청)
+        
+        Args:
+            query: 검색 쿼리
+            search_depth: 검색 깊이 ("basic" 또는 "advanced")
+            
+        Returns:
+            검색 결과 딕셔너리
+        """
+        if not self.quota_manager.can_query():
+            return self._quota_error()
+        
+        # 남은 쿼터만큼만 페이지 요청
+        pages = self._page_plan(search_depth)
+        remaining = self.quota_manager.remaining()
+        if remaining >= 0:
+            pages = pages[:remaining]
+        total_to_fetch = sum(num for _, num in pages)
+        
+        async def fetch_page(start_index: int, num: int) -> List[Dict[str, Any]]:
+            logger.debug(f"[GOOGLE] Searching: '{query[:50]}...' (start={start_index}, num={num})")
+            response = await self.http.arequest(
+                "GET", GOOGLE_CSE_ENDPOINT, params=self._page_params(query, start_index, num)
+            )
+            self.quota_manager.increment(query)
+            return response.json().get("items", [])
+        
+        # 한 페이지가 실패해도 이미 쿼터를 쓴 나머지 페이지 결과는 유지
+        pages_items = await asyncio.gather(*(fetch_page(start, num) for start, num in pages), return_exceptions=True)
+        failures = [(start, items) for (start, _), items in zip(pages, pages_items) if isinstance(items, BaseException)]
+        if failures and len(failures) == len(pages):
+            return self._error_response(failures[0][1])
+        for start_index, error in failures:
+            _, error_msg = describe_http_error(error)
+            logger.warning(f"[GOOGLE] Page start={start_index} failed, keeping other pages: {error_msg}")
+        
+        results = [item for items in pages_items if not isinstance(items, BaseException) for item in items]
+        logger.info(f"[GOOGLE] Retrieved {len(results)} results (quota remaining: {self.quota_manager.remaining()})")
+        return {"results": results[:total_to_fetch], "total": len(results), "query": query}
     
     def _convert_to_document(self, google_result: Dict, rank: int, query: str) -> Document:
         """
@@ -324,41 +242,20 @@ class GoogleSearchTool:
             metadata=metadata
         )
     
-    async def search(
-        self, 
-        query: str, 
-        search_depth: str = "basic"
-    ) -> List[Document]:
+    def _to_documents(self, response: Dict[str, Any], query: str) -> List[Document]:
         """
-        비동기 웹 검색 실행
+        검색 응답을 Document 리스트로 변환
         
         Args:
+            response: _search_sync/_search_async 결과
             query: 검색 쿼리
-            search_depth: 검색 깊이 ("basic" 또는 "advanced")
             
         Returns:
-            Document 리스트
+            Document 리스트 (에러 시 빈 리스트)
         """
-        # 캐시 확인
-        cached_docs = self.cache.get(query)
-        if cached_docs is not None:
-            return cached_docs
-        
-        # 비동기 실행
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(
-            self.executor,
-            self._search_sync,
-            query,
-            search_depth
-        )
-        
-        # 결과를 Document로 변환
-        documents = []
-        
         if "error" in response:
             logger.warning(f"[GOOGLE] Search error: {response['error']}")
-            return documents
+            return []
         
         results = response.get("results", [])
         
@@ -370,20 +267,38 @@ class GoogleSearchTool:
             logger.info(f"[WEB_SEARCH] Result {i+1}: \"{title}\" - {url}")
         
         # Document 변환
-        for idx, result in enumerate(results):
-            doc = self._convert_to_document(result, idx + 1, query)
-            documents.append(doc)
+        return [
+            self._convert_to_document(result, idx + 1, query)
+            for idx, result in enumerate(results)
+        ]
+    
+    async def search(
+        self, 
+        query: str, 
+        search_depth: str = "basic"
+    ) -> List[Document]:
+        """
+        비동기 웹 검색 실행 (httpx.AsyncClient, 페이지 병렬 요청)
         
-        # 캐시 저장
-        if documents:
-            self.cache.set(query, documents)
+        Args:
+            query: 검색 쿼리
+            search_depth: 검색 깊이 ("basic" 또는 "advanced")
+            
+        Returns:
+            Document 리스트
+        """
+        async def fetch() -> List[Document]:
+            return self._to_documents(await self._search_async(query, search_depth), query)
         
-        return documents
+        key = make_search_key("google", query, search_depth, self.max_results)
+        return await self.cache.aget_or_fetch(key, fetch)
     
     def search_sync(self, query: str, search_depth: str = "basic") -> List[Document]:
         """
         동기 웹 검색 (LangGraph 호환)
         
+        공유 캐시를 먼저 확인하고, 동시에 들어온 동일 쿼리는 한 번만 검색한다.
+        
         Args:
             query: 검색 쿼리
             search_depth: 검색 깊이
@@ -391,35 +306,8 @@ class GoogleSearchTool:
         Returns:
             Document 리스트
         """
-        # 캐시 확인
-        cached_docs = self.cache.get(query)
-        if cached_docs is not None:
-            return cached_docs
-        
-        # 동기 검색 실행
-        response = self._search_sync(query, search_depth)
-        
-        documents = []
-        
-        if "error" in response:
-            logger.warning(f"[GOOGLE] Search error: {response['error']}")
-            return documents
-        
-        results = response.get("results", [])
-        
-        # 결과 로깅
-        logger.info(f"[WEB_SEARCH] Found {len(results)} web results for: \"{query[:50]}{'...' if len(query) > 50 else ''}\"")
-        
-        # Document 변환
-        for idx, result in enumerate(results):
-            doc = self._convert_to_document(result, idx + 1, query)
-            documents.append(doc)
-        
-        # 캐시 저장
-        if documents:
-            self.cache.set(query, documents)
-        
-        return documents
+        key = make_search_key("google", query, search_depth, self.max_results)
+        return self.cache.get_or_fetch(key, lambda: self._to_documents(self._search_sync(query, search_depth), query))
     
     def as_tool(self) -> Tool:
         """
@@ -496,11 +384,8 @@ class GoogleSearchTool:
                 logger.warning(f"[GOOGLE] Quota exhausted: {self.quota_manager.queries_today}/{self.quota_manager.daily_limit}")
                 return False
             
-            # API 연결 테스트 (실제 검색은 하지 않음)
-            # list API를 호출하되 maxResults=0으로 설정하여 쿼터 소비 최소화
-            # 참고: 이것도 쿼터를 소비할 수 있으므로 주의
-            # 대신 service 객체가 있는지만 확인
-            if self.service is not None:
+            # 실제 검색은 쿼터를 소비하므로 HTTP 클라이언트가 있는지만 확인
+            if self.http is not None:
                 logger.debug(f"[GOOGLE] API available. Quota: {self.quota_manager.remaining()}/{self.quota_manager.daily_limit}")
                 return True
             
@@ -525,12 +410,7 @@ class GoogleSearchTool:
                 "remaining": self.quota_manager.remaining(),
                 "limit": self.quota_manager.daily_limit
             },
-            "cache": {
-                "size": len(self.cache.cache),
-                "hit_rate": f"{self.cache.hit_rate():.1%}",
-                "hits": self.cache.hits,
-                "misses": self.cache.misses
-            },
+            "cache": self.cache.get_stats(),
             "max_results": self.max_results
         }
 
@@ -549,12 +429,12 @@ def create_google_search_tool(max_results: int = 5) -> Tool:
     try:
         google = GoogleSearchTool(max_results=max_results)
         return google.as_tool()
-    except (ValueError, ImportError) as e:
+    except ValueError as e:
         logger.warning(f"Warning: {e}")
         # Fallback tool that returns empty results
         return Tool(
             name="google_web_search",
-            description="Web search (unavailable - API key missing or package not installed)",
+            description="Web search (unavailable - API key missing)",
             func=lambda query: [],
             coroutine=lambda query: [],
             args_schema=GoogleSearchInput
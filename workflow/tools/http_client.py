@@ -0,0 +1,147 @@
+"""
+Search HTTP Client
+웹 검색 도구가 공유하는 httpx 연결 풀
+
+- keep-alive 연결 풀 (동기 httpx.Client 1개, 이벤트 루프별 httpx.AsyncClient 1개)
+- 동시 요청 수 제한 (프로세스 전체, 동기/비동기 각각)
+- 요청별 타임아웃
+"""
+
+import os
+import asyncio
+import logging
+import threading
+import weakref
+from typing import Any, Optional, Tuple
+
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+
+class SearchHTTPClient:
+    """풀링된 동기/비동기 HTTP 클라이언트"""
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        transport: Optional[Any] = None
+    ):
+        """
+        초기화 (인자가 없으면 환경변수 사용)
+
+        Args:
+            max_connections: 연결 풀 크기 (WEB_SEARCH_MAX_CONNECTIONS)
+            max_concurrency: 동시 요청 수 제한 (WEB_SEARCH_MAX_CONCURRENCY)
+            timeout: 요청별 타임아웃 초 (WEB_SEARCH_TIMEOUT_SEC)
+            transport: httpx transport (테스트용 MockTransport 등)
+        """
+        self.max_connections = max_connections or int(os.getenv("WEB_SEARCH_MAX_CONNECTIONS", "20"))
+        self.max_concurrency = max_concurrency or int(os.getenv("WEB_SEARCH_MAX_CONCURRENCY", "8"))
+        self.timeout = timeout or float(os.getenv("WEB_SEARCH_TIMEOUT_SEC", "10"))
+
+        self._transport = transport
+        self._limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_connections
+        )
+        self._lock = threading.Lock()
+        self._sync_client: Optional[httpx.Client] = None
+        self._sync_semaphore = threading.BoundedSemaphore(self.max_concurrency)
+        # AsyncClient와 Semaphore는 이벤트 루프에 묶이므로 루프별로 생성
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[httpx.AsyncClient, asyncio.Semaphore]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _client(self) -> httpx.Client:
+        if self._sync_client is None:
+            with self._lock:
+                if self._sync_client is None:
+                    self._sync_client = httpx.Client(limits=self._limits, timeout=self.timeout, transport=self._transport)
+        return self._sync_client
+
+    def _async_client(self) -> Tuple[httpx.AsyncClient, asyncio.Semaphore]:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            entry = self._async_clients.get(loop)
+            if entry is None:
+                entry = (
+                    httpx.AsyncClient(limits=self._limits, timeout=self.timeout, transport=self._transport),
+                    asyncio.Semaphore(self.max_concurrency)
+                )
+                self._async_clients[loop] = entry
+        return entry
+
+    def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        동기 요청 (4xx/5xx는 httpx.HTTPStatusError)
+
+        Args:
+            method: HTTP 메서드
+            url: 요청 URL
+            **kwargs: httpx 요청 인자 (params, json, headers, timeout 등)
+        """
+        with self._sync_semaphore:
+            response = self._client().request(method, url, **kwargs)
+        response.raise_for_status()
+        return response
+
+    async def arequest(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """비동기 요청 (4xx/5xx는 httpx.HTTPStatusError)"""
+        client, semaphore = self._async_client()
+        async with semaphore:
+            response = await client.request(method, url, **kwargs)
+        response.raise_for_status()
+        return response
+
+    def close(self):
+        """동기 클라이언트 정리"""
+        with self._lock:
+            if self._sync_client is not None:
+                self._sync_client.close()
+                self._sync_client = None
+
+    async def aclose(self):
+        """현재 이벤트 루프의 비동기 클라이언트 정리"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            entry = self._async_clients.pop(loop, None)
+        if entry is not None:
+            await entry[0].aclose()
+
+
+def describe_http_error(error: Exception) -> Tuple[Optional[int], str]:
+    """
+    HTTP 예외를 (상태 코드, 메시지)로 변환
+
+    Returns:
+        상태 코드(없으면 None)와 에러 메시지
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        if status == 429:
+            return status, "Rate limit exceeded. Please try again later."
+        if status == 403:
+            return status, "API quota exceeded or permission denied."
+        return status, f"HTTP error {status}: {error.response.text[:200]}"
+    if isinstance(error, httpx.TimeoutException):
+        return None, f"Request timed out: {error}"
+    return None, str(error)
+
+
+_shared_client: Optional[SearchHTTPClient] = None
+_shared_lock = threading.Lock()
+
+
+def get_search_http_client() -> SearchHTTPClient:
+    """모든 웹 검색 도구가 공유하는 HTTP 클라이언트"""
+    global _shared_client
+    if _shared_client is None:
+        with _shared_lock:
+            if _shared_client is None:
+                _shared_client = SearchHTTPClient()
+    return _shared_client
@@ -0,0 +1,409 @@
+"""
+Web Search Cache
+Google / Tavily 검색 도구가 공유하는 웹 검색 결과 캐시
+
+- O(1) LRU + TTL 메모리 캐시 (OrderedDict)
+- 선택적 SQLite 영속화 (재시작 후에도 결과/쿼터 유지)
+- 제공자별 일일 쿼터 집계 (같은 SQLite 파일에 저장)
+- singleflight: 동시에 들어온 동일 쿼리는 업스트림 호출 1회로 합침
+"""
+
+import os
+import json
+import asyncio
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from langchain_core.documents import Document
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+
+def make_search_key(provider: str, query: str, search_depth: str, max_results: int) -> str:
+    """검색 캐시 키 (대소문자/공백 정규화)"""
+    normalized = " ".join(query.lower().split())
+    return f"{provider}|{search_depth}|{max_results}|{normalized}"
+
+
+class WebSearchCache:
+    """LRU + TTL 웹 검색 캐시 (선택적 SQLite 영속화, singleflight)"""
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[int] = None,
+        path: Optional[str] = None
+    ):
+        """
+        초기화 (인자가 없으면 환경변수 사용)
+
+        Args:
+            max_entries: 최대 엔트리 수 (WEB_SEARCH_CACHE_MAX_ENTRIES)
+            ttl_seconds: 결과 유효 시간 (WEB_SEARCH_CACHE_TTL_SECONDS)
+            path: SQLite 경로 (WEB_SEARCH_CACHE_PATH, 빈 문자열이면 메모리 전용)
+        """
+        self.max_entries = max_entries or int(os.getenv("WEB_SEARCH_CACHE_MAX_ENTRIES", "1000"))
+        self.ttl = ttl_seconds if ttl_seconds is not None else int(
+            os.getenv("WEB_SEARCH_CACHE_TTL_SECONDS", "3600")
+        )
+        self.path = path if path is not None else os.getenv(
+            "WEB_SEARCH_CACHE_PATH", "data/cache/web_search_cache.sqlite"
+        )
+
+        # key -> (저장 시각, Document 리스트), 가장 최근 사용이 뒤쪽
+        self.cache: "OrderedDict[str, Tuple[float, List[Document]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        # SQLite가 없을 때의 쿼터 사용량: provider -> (날짜, 사용량)
+        self._quota: Dict[str, Tuple[str, int]] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._writes_since_evict = 0
+
+        self._conn: Optional[sqlite3.Connection] = None
+        if self.path:
+            self._connect()
+
+    def _connect(self):
+        """SQLite 연결 및 테이블 생성"""
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS web_search_cache (
+                cache_key TEXT PRIMARY KEY,
+                documents TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS web_search_quota (
+                provider TEXT NOT NULL,
+                day TEXT NOT NULL,
+                used INTEGER NOT NULL,
+                PRIMARY KEY (provider, day)
+            )
+        """)
+
+    @property
+    def persistent(self) -> bool:
+        return self._conn is not None
+
+    @staticmethod
+    def _dump(documents: List[Document]) -> str:
+        return json.dumps(
+            [{"page_content": d.page_content, "metadata": d.metadata} for d in documents],
+            ensure_ascii=False, default=str
+        )
+
+    @staticmethod
+    def _load(raw: str) -> List[Document]:
+        return [Document(page_content=d["page_content"], metadata=d["metadata"]) for d in json.loads(raw)]
+
+    def get(self, key: str) -> Optional[List[Document]]:
+        """캐시 조회 (메모리 -> SQLite 순, 만료 시 None)"""
+        now = time.time()
+        with self._lock:
+            entry = self.cache.get(key)
+            if entry is not None:
+                if now - entry[0] < self.ttl:
+                    self.cache.move_to_end(key)
+                    self.hits += 1
+                    return list(entry[1])
+                del self.cache[key]
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT documents, created_at FROM web_search_cache WHERE cache_key = ?", (key,)
+                ).fetchone()
+                if row is not None and now - row[1] < self.ttl:
+                    documents = self._load(row[0])
+                    self._conn.execute(
+                        "UPDATE web_search_cache SET last_access = ? WHERE cache_key = ?", (now, key)
+                    )
+                    self._remember(key, row[1], documents)
+                    self.hits += 1
+                    return list(documents)
+
+            self.misses += 1
+            return None
+
+    def _remember(self, key: str, created_at: float, documents: List[Document]):
+        """메모리 LRU에 저장 (lock 안에서 호출)"""
+        self.cache[key] = (created_at, documents)
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.max_entries:
+            self.cache.popitem(last=False)
+
+    def set(self, key: str, documents: List[Document]):
+        """캐시 저장"""
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, list(documents))
+            if self._conn is not None:
+                self._conn.execute(
+                    """
+                    INSERT OR REPLACE INTO web_search_cache (cache_key, documents, created_at, last_access)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                    (key, self._dump(documents), now, now)
+                )
+                self._writes_since_evict += 1
+                if self._writes_since_evict >= 50:
+                    self._evict_persistent(now)
+
+    def _evict_persistent(self, now: float):
+        """SQLite 만료/초과 엔트리 제거 (lock 안에서 호출)"""
+        self._writes_since_evict = 0
+        self._conn.execute("DELETE FROM web_search_cache WHERE created_at < ?", (now - self.ttl,))
+        self._conn.execute(
+            """
+            DELETE FROM web_search_cache WHERE cache_key NOT IN (
+                SELECT cache_key FROM web_search_cache ORDER BY last_access DESC LIMIT ?
+            )
+            """,
+            (self.max_entries,)
+        )
+
+    def _claim(self, key: str) -> Tuple[Future, bool]:
+        """진행 중인 동일 검색 조회 또는 등록 (리더 여부 반환)"""
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = Future()
+            self._inflight[key] = future
+            return future, True
+
+    def _settle(self, key: str, future: Future, documents: Optional[List[Document]], error: Optional[BaseException]):
+        """리더 검색 완료 처리 (빈 결과는 캐시하지 않음)"""
+        if error is None and documents:
+            self.set(key, documents)
+        with self._lock:
+            self._inflight.pop(key, None)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(documents)
+
+    def get_or_fetch(self, key: str, fetch: Callable[[], List[Document]]) -> List[Document]:
+        """
+        캐시 조회 후 없으면 fetch 실행 (동일 키 동시 요청은 한 번만 실행)
+
+        빈 결과(에러 포함)는 캐시하지 않는다.
+
+        Args:
+            key: make_search_key로 만든 캐시 키
+            fetch: 업스트림 검색 함수 (Document 리스트 반환)
+
+        Returns:
+            Document 리스트
+        """
+        cached = self.get(key)
+        if cached is not None:
+            logger.debug(f"[SEARCH_CACHE] Hit: '{key[:60]}' (hit rate: {self.hit_rate():.1%})")
+            return cached
+
+        future, leader = self._claim(key)
+        if not leader:
+            logger.debug(f"[SEARCH_CACHE] Waiting for in-flight search: '{key[:60]}'")
+            return list(future.result())
+
+        try:
+            documents = fetch()
+        except BaseException as e:
+            self._settle(key, future, None, e)
+            raise
+        self._settle(key, future, documents, None)
+        return documents
+
+    async def aget_or_fetch(self, key: str, fetch: Callable[[], Awaitable[List[Document]]]) -> List[Document]:
+        """
+        get_or_fetch의 비동기 버전 (동기 호출과 진행 중 검색을 공유)
+
+        Args:
+            key: make_search_key로 만든 캐시 키
+            fetch: 업스트림 검색 코루틴 함수
+
+        Returns:
+            Document 리스트
+        """
+        cached = self.get(key)
+        if cached is not None:
+            logger.debug(f"[SEARCH_CACHE] Hit: '{key[:60]}' (hit rate: {self.hit_rate():.1%})")
+            return cached
+
+        future, leader = self._claim(key)
+        if not leader:
+            logger.debug(f"[SEARCH_CACHE] Waiting for in-flight search: '{key[:60]}'")
+            return list(await asyncio.wrap_future(future))
+
+        try:
+            documents = await fetch()
+        except BaseException as e:
+            self._settle(key, future, None, e)
+            raise
+        self._settle(key, future, documents, None)
+        return documents
+
+    def hit_rate(self) -> float:
+        """캐시 히트율 계산"""
+        total = self.hits + self.misses
+        return self.hits / total if total > 0 else 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 통계"""
+        return {
+            "size": len(self.cache),
+            "hit_rate": f"{self.hit_rate():.1%}",
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "persistent": self.persistent
+        }
+
+    # === 쿼터 저장소 ===
+
+    def load_quota(self, provider: str, day: str) -> int:
+        """저장된 제공자별 일일 사용량 조회"""
+        with self._lock:
+            if self._conn is None:
+                saved_day, used = self._quota.get(provider, (day, 0))
+                return used if saved_day == day else 0
+            row = self._conn.execute(
+                "SELECT used FROM web_search_quota WHERE provider = ? AND day = ?", (provider, day)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def increment_quota(self, provider: str, day: str) -> int:
+        """
+        제공자별 일일 사용량을 원자적으로 1 증가 (이전 날짜 기록은 삭제)
+
+        저장소의 값에 더하므로 같은 저장소를 쓰는 다른 도구 인스턴스/워커 프로세스의 호출도 합산됨.
+
+        Returns:
+            증가 후 저장된 사용량
+        """
+        with self._lock:
+            if self._conn is None:
+                saved_day, used = self._quota.get(provider, (day, 0))
+                used = (used if saved_day == day else 0) + 1
+                self._quota[provider] = (day, used)
+                return used
+            # BEGIN IMMEDIATE: 다른 프로세스의 증가와 직렬화
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT INTO web_search_quota (provider, day, used) VALUES (?, ?, 1) "
+                    "ON CONFLICT (provider, day) DO UPDATE SET used = used + 1",
+                    (provider, day)
+                )
+                used = self._conn.execute(
+                    "SELECT used FROM web_search_quota WHERE provider = ? AND day = ?", (provider, day)
+                ).fetchone()[0]
+                self._conn.execute(
+                    "DELETE FROM web_search_quota WHERE provider = ? AND day <> ?", (provider, day)
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return used
+
+
+class QuotaManager:
+    """
+    API 쿼터 관리자 - 제공자별 일일 제한 (WebSearchCache에 영속화)
+
+    store가 있으면 사용량의 기준은 저장소 (도구 인스턴스마다 관리자를 만들어도 같은 저장소를 공유하므로
+    can_query/remaining은 저장된 값을 다시 읽고, increment는 저장소에서 원자적으로 증가).
+    """
+
+    def __init__(self, daily_limit: int = 100, provider: str = "google", store: Optional[WebSearchCache] = None):
+        """
+        초기화
+
+        Args:
+            daily_limit: 일일 쿼리 제한 (0이면 제한 없이 집계만)
+            provider: 제공자 이름 ("google", "tavily")
+            store: 사용량을 저장할 캐시 (None이면 메모리에만 유지)
+        """
+        self.daily_limit = daily_limit
+        self.provider = provider
+        self.store = store
+        self._lock = threading.Lock()
+        self.last_reset = date.today()
+        self.queries_today = store.load_quota(provider, self.last_reset.isoformat()) if store else 0
+        self.query_log = []
+
+    def can_query(self) -> bool:
+        """쿼리 가능 여부 확인 (저장된 사용량 기준)"""
+        if self.daily_limit <= 0:
+            return True
+        return self._refresh() < self.daily_limit
+
+    def increment(self, query: str = ""):
+        """쿼리 카운트 증가"""
+        with self._lock:
+            self._check_reset()
+            if self.store is not None:
+                self.queries_today = self.store.increment_quota(self.provider, self.last_reset.isoformat())
+            else:
+                self.queries_today += 1
+            self.query_log.append({
+                "time": datetime.now(),
+                "query": query[:50] if query else "",
+                "count": self.queries_today
+            })
+            # 최근 기록만 유지
+            del self.query_log[:-100]
+        logger.debug(f"[QUOTA] {self.provider}: used {self.queries_today}/{self.daily_limit or '∞'} queries today")
+
+    def remaining(self) -> int:
+        """남은 쿼리 수 반환 (제한 없으면 -1)"""
+        if self.daily_limit <= 0:
+            return -1
+        return max(0, self.daily_limit - self._refresh())
+
+    def _refresh(self) -> int:
+        """날짜 확인 후 저장소의 오늘 사용량을 다시 읽음 (store가 없으면 메모리 값)"""
+        with self._lock:
+            self._check_reset()
+            if self.store is not None:
+                self.queries_today = self.store.load_quota(self.provider, self.last_reset.isoformat())
+            return self.queries_today
+
+    def _check_reset(self):
+        """날짜가 바뀌었으면 카운터 리셋"""
+        if date.today() > self.last_reset:
+            self.queries_today = 0
+            self.query_log = []
+            self.last_reset = date.today()
+            logger.info(f"[QUOTA] {self.provider}: daily quota reset. {self.daily_limit} queries available.")
+
+
+_shared_cache: Optional[WebSearchCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_search_cache() -> WebSearchCache:
+    """모든 웹 검색 도구가 공유하는 캐시 (web_search 노드, DirectResponse 도구)"""
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_lock:
+            if _shared_cache is None:
+                _shared_cache = WebSearchCache()
+    return _shared_cache
@@ -7,15 +7,18 @@ import os
 from typing import List, Dict, Any, Optional
 from langchain_core.documents import Document
 from langchain_core.tools import Tool
-from tavily import TavilyClient
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
-import asyncio
-from concurrent.futures import ThreadPoolExecutor
+
+from .search_cache import QuotaManager, get_search_cache, make_search_key
+from .http_client import describe_http_error, get_search_http_client
 
 
 load_dotenv()
 
+# Tavily Search REST 엔드포인트
+TAVILY_SEARCH_ENDPOINT = "https://api.tavily.com/search"
+
 
 class TavilySearchResult(BaseModel):
     """Tavily 검색 결과"""
@@ -38,9 +41,36 @@ class TavilySearchTool:
         if not api_key:
             raise ValueError("TAVILY_API_KEY not found in environment variables")
         
-        self.client = TavilyClient(api_key=api_key)
+        self.api_key = api_key
         self.max_results = max_results
-        self.executor = ThreadPoolExecutor(max_workers=1)
+        
+        # 공유 HTTP 연결 풀 (keep-alive, 동시 요청 제한, 타임아웃)
+        self.http = get_search_http_client()
+        
+        # 공유 캐시 및 쿼터 집계 (TAVILY_DAILY_QUOTA=0이면 제한 없이 집계만)
+        self.cache = get_search_cache()
+        self.quota_manager = QuotaManager(
+            daily_limit=int(os.getenv("TAVILY_DAILY_QUOTA", "0")),
+            provider="tavily",
+            store=self.cache
+        )
+    
+    def _request_kwargs(self, query: str, search_depth: str) -> Dict[str, Any]:
+        """Tavily 검색 요청 인자"""
+        return {
+            "headers": {"Authorization": f"Bearer {self.api_key}"},
+            "json": {
+                "query": query,
+                "search_depth": search_depth,
+                "max_results": self.max_results
+            }
+        }
+    
+    def _quota_error(self) -> Dict[str, Any]:
+        return {
+            "results": [],
+            "error": f"Tavily daily quota exhausted (limit: {self.quota_manager.daily_limit})"
+        }
     
     def _search_sync(self, query: str, search_depth: str = "basic") -> Dict[str, Any]:
         """
@@ -53,45 +83,58 @@ class TavilySearchTool:
         Returns:
             검색 결과
         """
+        if not self.quota_manager.can_query():
+            return self._quota_error()
+        
         try:
-            response = self.client.search(
-                query=query,
-                search_depth=search_depth,
-                max_results=self.max_results
+            response = self.http.request(
+                "POST", TAVILY_SEARCH_ENDPOINT, **self._request_kwargs(query, search_depth)
             )
-            return response
+            self.quota_manager.increment(query)
+            return response.json()
         except Exception as e:
             return {
                 "results": [],
-                "error": str(e)
+                "error": describe_http_error(e)[1]
             }
     
-    async def search(
-        self, 
-        query: str, 
-        search_depth: str = "basic"
-    ) -> List[Document]:
+    async def _search_async(self, query: str, search_depth: str = "basic") -> Dict[str, Any]:
         """
-        비동기 웹 검색 실행
+        비동기 검색 실행 (httpx.AsyncClient)
         
         Args:
             query: 검색 쿼리
             search_depth: 검색 깊이 ("basic" 또는 "advanced")
             
         Returns:
-            Document 리스트
+            검색 결과
         """
-        loop = asyncio.get_event_loop()
+        if not self.quota_manager.can_query():
+            return self._quota_error()
         
-        # 동기 함수를 비동기로 실행
-        response = await loop.run_in_executor(
-            self.executor,
-            self._search_sync,
-            query,
-            search_depth
-        )
+        try:
+            response = await self.http.arequest(
+                "POST", TAVILY_SEARCH_ENDPOINT, **self._request_kwargs(query, search_depth)
+            )
+            self.quota_manager.increment(query)
+            return response.json()
+        except Exception as e:
+            return {
+                "results": [],
+                "error": describe_http_error(e)[1]
+            }
+    
+    def _to_documents(self, response: Dict[str, Any], query: str) -> List[Document]:
+        """
+        검색 응답을 Document 리스트로 변환
         
-        # 결과를 Document로 변환
+        Args:
+            response: _search_sync/_search_async 결과
+            query: 검색 쿼리
+            
+        Returns:
+            Document 리스트 (에러 시 빈 리스트)
+        """
         documents = []
         
         if "error" in response:
@@ -137,51 +180,42 @@ class TavilySearchTool:
         
         return documents
     
-    def search_sync(self, query: str, search_depth: str = "basic") -> List[Document]:
+    async def search(
+        self, 
+        query: str, 
+        search_depth: str = "basic"
+    ) -> List[Document]:
         """
-        동기 웹 검색 (LangGraph 호환)
+        비동기 웹 검색 실행 (httpx.AsyncClient, 다른 세션 검색과 병렬 실행)
         
         Args:
             query: 검색 쿼리
-            search_depth: 검색 깊이
+            search_depth: 검색 깊이 ("basic" 또는 "advanced")
             
         Returns:
             Document 리스트
         """
-        response = self._search_sync(query, search_depth)
+        async def fetch() -> List[Document]:
+            return self._to_documents(await self._search_async(query, search_depth), query)
         
-        documents = []
-        
-        if "error" in response:
-            print(f"Tavily search error: {response['error']}")
-            return documents
+        key = make_search_key("tavily", query, search_depth, self.max_results)
+        return await self.cache.aget_or_fetch(key, fetch)
+    
+    def search_sync(self, query: str, search_depth: str = "basic") -> List[Document]:
+        """
+        동기 웹 검색 (LangGraph 호환)
         
-        results = response.get("results", [])
+        공유 캐시를 먼저 확인하고, 동시에 들어온 동일 쿼리는 한 번만 검색한다.
         
-        for idx, result in enumerate(results):
-            content = result.get("content", "")
-            title = result.get("title", "")
-            
-            if title:
-                content = f"**{title}**\n\n{content}"
-            
-            metadata = {
-                "source": result.get("url", ""),
-                "title": title,
-                "score": result.get("score", 0.0),
-                "published_date": result.get("published_date", ""),
-                "search_query": query,
-                "search_rank": idx + 1,
-                "search_tool": "tavily"
-            }
+        Args:
+            query: 검색 쿼리
+            search_depth: 검색 깊이
             
-            doc = Document(
-                page_content=content,
-                metadata=metadata
-            )
-            documents.append(doc)
-        
-        return documents
+        Returns:
+            Document 리스트
+        """
+        key = make_search_key("tavily", query, search_depth, self.max_results)
+        return self.cache.get_or_fetch(key, lambda: self._to_documents(self._search_sync(query, search_depth), query))
     
     def as_tool(self) -> Tool:
         """